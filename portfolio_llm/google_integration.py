@@ -19,6 +19,8 @@ Environment Variables or Streamlit Secrets:
 
 import json
 import os
+import re
+import time
 from datetime import datetime
 from typing import Dict, List, Optional, Any
 import streamlit as st
@@ -77,6 +79,10 @@ COLUMN_ORDER = [
 # Sheet name (tab)
 SHEET_NAME = "Sites"  # Adjust if your tab has a different name
 
+# How long a downloaded copy of the Sites rows serves reads before it is
+# fetched again. Writes made through the client keep it up to date.
+SNAPSHOT_TTL_SECONDS = 30
+
 
 # =============================================================================
 # GOOGLE API CLIENT
@@ -85,7 +91,8 @@ SHEET_NAME = "Sites"  # Adjust if your tab has a different name
 class GoogleSheetsClient:
     """Client for Google Sheets and Drive operations."""
     
-    def __init__(self, credentials_json: str = None, sheet_id: str = None, vdr_folder_id: str = None):
+    def __init__(self, credentials_json: str = None, sheet_id: str = None, vdr_folder_id: str = None,
+                 sheets_service=None, drive_service=None):
         """
         Initialize the Google API client.
         
@@ -93,9 +100,19 @@ class GoogleSheetsClient:
             credentials_json: Service account credentials as JSON string
             sheet_id: Google Sheet ID (from URL)
             vdr_folder_id: Google Drive folder ID for VDR uploads
+            sheets_service: Prebuilt Sheets v4 service (skips credentials; e.g. a fake for load tests)
+            drive_service: Prebuilt Drive v3 service
         """
         self.sheet_id = sheet_id or os.getenv('GOOGLE_SHEET_ID') or st.secrets.get('GOOGLE_SHEET_ID')
         self.vdr_folder_id = vdr_folder_id or os.getenv('GOOGLE_VDR_FOLDER_ID') or st.secrets.get('GOOGLE_VDR_FOLDER_ID')
+        self._tab_id = None
+        self.invalidate_cache()
+        
+        if sheets_service is not None:
+            self.credentials = None
+            self.sheets_service = sheets_service
+            self.drive_service = drive_service
+            return
         
         # Get credentials
         creds_json = credentials_json or os.getenv('GOOGLE_CREDENTIALS_JSON')
@@ -124,6 +141,72 @@ class GoogleSheetsClient:
         self.sheets_service = build('sheets', 'v4', credentials=self.credentials)
         self.drive_service = build('drive', 'v3', credentials=self.credentials)
     
+    # -------------------------------------------------------------------------
+    # ROW SNAPSHOT
+    # -------------------------------------------------------------------------
+    # One values.get of the Sites rows serves every read until it expires;
+    # site_id -> sheet row is kept alongside it so point lookups are O(1).
+    
+    def invalidate_cache(self):
+        """Forget the row snapshot; the next read downloads the sheet again."""
+        self._rows = None
+        self._row_index = {}
+        self._snapshot_at = 0.0
+    
+    def _load_rows(self, force: bool = False) -> bool:
+        """Download the Sites rows if the snapshot is missing or stale. Returns True if it did."""
+        if not force and self._rows is not None and time.time() - self._snapshot_at < SNAPSHOT_TTL_SECONDS:
+            return False
+        
+        result = self.sheets_service.spreadsheets().values().get(
+            spreadsheetId=self.sheet_id,
+            range=f"{SHEET_NAME}!A2:W"
+        ).execute()
+        
+        self._rows = result.get('values', [])
+        self._reindex()
+        self._snapshot_at = time.time()
+        return True
+    
+    def _reindex(self):
+        self._row_index = {}
+        for i, row in enumerate(self._rows):
+            if row and row[0]:
+                self._row_index.setdefault(row[0], i + 2)  # first match wins, as before
+    
+    def _lookup_row(self, site_id: str) -> tuple:
+        """(sheet row or None, True if the snapshot was downloaded for this lookup)."""
+        loaded = self._load_rows()
+        row_num = self._row_index.get(site_id)
+        if row_num is None and not loaded:
+            # Possibly added by another client since the snapshot was taken
+            loaded = self._load_rows(force=True)
+            row_num = self._row_index.get(site_id)
+        return row_num, loaded
+    
+    @staticmethod
+    def _row_to_site(row: List) -> Dict:
+        """Convert a sheet row to a site dict, parsing JSON and numeric columns."""
+        site = {}
+        for i, col_name in enumerate(COLUMN_ORDER):
+            value = row[i] if i < len(row) else ''
+            
+            # Parse JSON columns
+            if col_name.endswith('_json') and value:
+                try:
+                    site[col_name] = json.loads(value)
+                except json.JSONDecodeError:
+                    site[col_name] = value
+            # Parse numeric columns
+            elif col_name in ['target_mw', 'acreage']:
+                try:
+                    site[col_name] = int(float(value)) if value else 0
+                except ValueError:
+                    site[col_name] = 0
+            else:
+                site[col_name] = value
+        return site
+    
     # -------------------------------------------------------------------------
     # SHEETS OPERATIONS
     # -------------------------------------------------------------------------
@@ -131,43 +214,12 @@ class GoogleSheetsClient:
     def get_all_sites(self) -> List[Dict]:
         """Fetch all sites from the Google Sheet."""
         try:
-            # Read all data starting from row 2 (skip header)
-            range_name = f"{SHEET_NAME}!A2:W"
-            result = self.sheets_service.spreadsheets().values().get(
-                spreadsheetId=self.sheet_id,
-                range=range_name
-            ).execute()
-            
-            rows = result.get('values', [])
+            self._load_rows()
             sites = []
-            
-            for row in rows:
-                # Pad row to ensure all columns exist
-                while len(row) < len(COLUMN_ORDER):
-                    row.append('')
-                
-                site = {}
-                for i, col_name in enumerate(COLUMN_ORDER):
-                    value = row[i] if i < len(row) else ''
-                    
-                    # Parse JSON columns
-                    if col_name.endswith('_json') and value:
-                        try:
-                            site[col_name] = json.loads(value)
-                        except json.JSONDecodeError:
-                            site[col_name] = value
-                    # Parse numeric columns
-                    elif col_name in ['target_mw', 'acreage']:
-                        try:
-                            site[col_name] = int(float(value)) if value else 0
-                        except ValueError:
-                            site[col_name] = 0
-                    else:
-                        site[col_name] = value
-                
+            for row in self._rows:
+                site = self._row_to_site(row)
                 if site.get('site_id'):  # Only include rows with site_id
                     sites.append(site)
-            
             return sites
             
         except Exception as e:
@@ -176,26 +228,39 @@ class GoogleSheetsClient:
     
     def get_site(self, site_id: str) -> Optional[Dict]:
         """Fetch a single site by ID."""
-        sites = self.get_all_sites()
-        for site in sites:
-            if site.get('site_id') == site_id:
-                return site
-        return None
+        try:
+            row_num, _ = self._lookup_row(site_id)
+            if row_num is None:
+                return None
+            return self._row_to_site(self._rows[row_num - 2])
+            
+        except Exception as e:
+            st.error(f"Error fetching site: {str(e)}")
+            return None
     
     def find_site_row(self, site_id: str) -> Optional[int]:
-        """Find the row number for a site ID (1-indexed, accounting for header)."""
+        """
+        Find the row number for a site ID (1-indexed, accounting for header).
+        
+        Served from the row index. If the snapshot was not downloaded for this
+        call, the site_id cell of the indexed row is read back first, so rows
+        inserted or deleted by another client are never mistaken for this site.
+        """
         try:
-            range_name = f"{SHEET_NAME}!A:A"
+            row_num, loaded = self._lookup_row(site_id)
+            if row_num is None or loaded:
+                return row_num
+            
             result = self.sheets_service.spreadsheets().values().get(
                 spreadsheetId=self.sheet_id,
-                range=range_name
+                range=f"{SHEET_NAME}!A{row_num}"
             ).execute()
+            cell = result.get('values', [['']])[0]
+            if cell and cell[0] == site_id:
+                return row_num
             
-            values = result.get('values', [])
-            for i, row in enumerate(values):
-                if row and row[0] == site_id:
-                    return i + 1  # 1-indexed
-            return None
+            self._load_rows(force=True)
+            return self._row_index.get(site_id)
             
         except Exception as e:
             st.error(f"Error finding site row: {str(e)}")
@@ -209,7 +274,7 @@ class GoogleSheetsClient:
             
             # Append to sheet
             body = {'values': [row]}
-            self.sheets_service.spreadsheets().values().append(
+            result = self.sheets_service.spreadsheets().values().append(
                 spreadsheetId=self.sheet_id,
                 range=f"{SHEET_NAME}!A:W",
                 valueInputOption='USER_ENTERED',
@@ -217,9 +282,18 @@ class GoogleSheetsClient:
                 body=body
             ).execute()
             
+            # Keep the snapshot if the new row landed right after it
+            match = re.search(r'![A-Z]+(\d+)', (result or {}).get('updates', {}).get('updatedRange', ''))
+            if self._rows is not None and match and int(match.group(1)) == len(self._rows) + 2:
+                self._rows.append(row)
+                self._row_index.setdefault(row[0], len(self._rows) + 1)
+            else:
+                self.invalidate_cache()
+            
             return True
             
         except Exception as e:
+            self.invalidate_cache()
             st.error(f"Error adding site: {str(e)}")
             return False
     
@@ -245,9 +319,14 @@ class GoogleSheetsClient:
                 body=body
             ).execute()
             
+            self._rows[row_num - 2] = row
+            if row[0] != site_id:
+                self._reindex()
+            
             return True
             
         except Exception as e:
+            self.invalidate_cache()
             st.error(f"Error updating site: {str(e)}")
             return False
     
@@ -258,17 +337,7 @@ class GoogleSheetsClient:
             if not row_num:
                 return False
             
-            # Get sheet ID (not spreadsheet ID)
-            spreadsheet = self.sheets_service.spreadsheets().get(
-                spreadsheetId=self.sheet_id
-            ).execute()
-            
-            sheet_id = None
-            for sheet in spreadsheet.get('sheets', []):
-                if sheet['properties']['title'] == SHEET_NAME:
-                    sheet_id = sheet['properties']['sheetId']
-                    break
-            
+            sheet_id = self._sites_tab_id()
             if sheet_id is None:
                 st.error(f"Sheet '{SHEET_NAME}' not found")
                 return False
@@ -290,12 +359,30 @@ class GoogleSheetsClient:
                 body={'requests': [request]}
             ).execute()
             
+            # Rows below move up by one
+            del self._rows[row_num - 2]
+            self._reindex()
+            
             return True
             
         except Exception as e:
+            self.invalidate_cache()
             st.error(f"Error deleting site: {str(e)}")
             return False
     
+    def _sites_tab_id(self) -> Optional[int]:
+        """Sheet ID (not spreadsheet ID) of the Sites tab, fetched once."""
+        if self._tab_id is None:
+            spreadsheet = self.sheets_service.spreadsheets().get(
+                spreadsheetId=self.sheet_id
+            ).execute()
+            
+            for sheet in spreadsheet.get('sheets', []):
+                if sheet['properties']['title'] == SHEET_NAME:
+                    self._tab_id = sheet['properties']['sheetId']
+                    break
+        return self._tab_id
+    
     def _site_to_row(self, site_data: Dict) -> List:
         """Convert site data dict to row list for Google Sheets."""
         # Set last_updated
@@ -0,0 +1,260 @@
+"""
+Chart Render Cache
+==================
+Content-addressed cache for the matplotlib PNGs used by the PDF and PPTX
+exports.
+
+Every export used to re-render identical charts and write them to
+NamedTemporaryFile(delete=False) paths. Charts are now keyed by a hash of
+the chart kind, its input data and the styling constants it depends on:
+
+- hits are served from memory (small LRU of PNG bytes) or from disk
+- the disk store is an LRU directory of <hash>.png files with a size cap
+- callers get in-memory BytesIO handles (fpdf2 and python-pptx both accept
+  them), so no temp files are created or leaked
+
+Bump CHART_STYLE_VERSION when a chart's drawing code changes so stale PNGs
+are not reused.
+"""
+
+import hashlib
+import io
+import json
+import os
+import threading
+from collections import OrderedDict
+from dataclasses import asdict, is_dataclass
+from datetime import date, datetime
+from enum import Enum
+from functools import wraps
+from typing import Any, BinaryIO, Callable, Optional
+
+from .chart_render import RENDER_MODE
+
+
+CHART_STYLE_VERSION = 1
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "power_tracker", "charts")
+DEFAULT_MAX_DISK_BYTES = 256 * 1024 * 1024
+DEFAULT_MAX_MEMORY_BYTES = 32 * 1024 * 1024
+
+
+def _key_default(obj: Any) -> Any:
+    """json.dumps hook that gives chart inputs a stable representation."""
+    if is_dataclass(obj) and not isinstance(obj, type):
+        return {'__type__': type(obj).__name__, **asdict(obj)}
+    if isinstance(obj, Enum):
+        return obj.value
+    if isinstance(obj, (date, datetime)):
+        return obj.isoformat()
+    if hasattr(obj, 'tolist'):        # numpy arrays / scalars
+        return obj.tolist()
+    if isinstance(obj, (set, frozenset)):
+        return sorted(obj, key=repr)
+    return repr(obj)
+
+
+def chart_key(kind: str, data: Any, style: Any = None) -> str:
+    """Hash of chart kind + input data + styling constants (and render mode)."""
+    payload = json.dumps(
+        [CHART_STYLE_VERSION, RENDER_MODE, kind, style, data],
+        sort_keys=True, separators=(',', ':'), default=_key_default,
+    )
+    return hashlib.sha256(payload.encode('utf-8')).hexdigest()
+
+
+class ChartCache:
+    """Two-level (memory + disk) LRU of rendered PNG bytes."""
+
+    def __init__(
+        self,
+        directory: Optional[str] = None,
+        max_disk_bytes: int = DEFAULT_MAX_DISK_BYTES,
+        max_memory_bytes: int = DEFAULT_MAX_MEMORY_BYTES,
+    ):
+        if directory is None:
+            base = os.environ.get("PORTFOLIO_CACHE_DIR")
+            directory = os.path.join(base, "charts") if base else DEFAULT_CACHE_DIR
+        self.directory = directory
+        self.max_disk_bytes = max_disk_bytes
+        self.max_memory_bytes = max_memory_bytes
+        self._lock = threading.Lock()
+        self._memory: "OrderedDict[str, bytes]" = OrderedDict()
+        self._memory_bytes = 0
+        self._disk_bytes: Optional[int] = None
+        self.stats = {
+            'memory_hits': 0,
+            'disk_hits': 0,
+            'renders': 0,
+            'evictions': 0,
+            'errors': 0,
+        }
+
+    # -- memory tier ---------------------------------------------------------
+
+    def _remember(self, key: str, data: bytes):
+        with self._lock:
+            if key in self._memory:
+                self._memory.move_to_end(key)
+                return
+            self._memory[key] = data
+            self._memory_bytes += len(data)
+            while self._memory_bytes > self.max_memory_bytes and len(self._memory) > 1:
+                _, dropped = self._memory.popitem(last=False)
+                self._memory_bytes -= len(dropped)
+
+    # -- disk tier -----------------------------------------------------------
+
+    def _path(self, key: str) -> str:
+        return os.path.join(self.directory, f"{key}.png")
+
+    def _read_disk(self, key: str) -> Optional[bytes]:
+        path = self._path(key)
+        try:
+            with open(path, 'rb') as f:
+                data = f.read()
+            os.utime(path)  # mtime doubles as LRU recency
+            return data
+        except FileNotFoundError:
+            return None
+        except OSError as e:
+            self.stats['errors'] += 1
+            print(f"[chart_cache] Could not read {path}: {e}")
+            return None
+
+    def _write_disk(self, key: str, data: bytes):
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            path = self._path(key)
+            tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(data)
+            os.replace(tmp_path, path)  # atomic; safe with parallel exporters
+            with self._lock:
+                if self._disk_bytes is not None:
+                    self._disk_bytes += len(data)
+            self._enforce_disk_cap()
+        except OSError as e:
+            self.stats['errors'] += 1
+            print(f"[chart_cache] Could not write chart: {e}")
+
+    def _enforce_disk_cap(self):
+        with self._lock:
+            if self._disk_bytes is not None and self._disk_bytes <= self.max_disk_bytes:
+                return
+            entries = []
+            for name in os.listdir(self.directory):
+                if not name.endswith('.png'):
+                    continue
+                try:
+                    st = os.stat(os.path.join(self.directory, name))
+                except FileNotFoundError:
+                    continue
+                entries.append((st.st_mtime, st.st_size, name))
+            total = sum(size for _, size, _ in entries)
+            # Evict down to 90% of the cap so we don't rescan on every write
+            target = self.max_disk_bytes * 0.9 if total > self.max_disk_bytes else total
+            for _, size, name in sorted(entries):
+                if total <= target:
+                    break
+                try:
+                    os.remove(os.path.join(self.directory, name))
+                    total -= size
+                    self.stats['evictions'] += 1
+                except FileNotFoundError:
+                    pass
+            self._disk_bytes = total
+
+    # -- public API ----------------------------------------------------------
+
+    def get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._memory.get(key)
+            if data is not None:
+                self._memory.move_to_end(key)
+                self.stats['memory_hits'] += 1
+                return data
+        data = self._read_disk(key)
+        if data is not None:
+            self.stats['disk_hits'] += 1
+            self._remember(key, data)
+        return data
+
+    def put(self, key: str, data: bytes):
+        self._remember(key, data)
+        self._write_disk(key, data)
+
+    def get_or_render(self, key: str, render: Callable[[BinaryIO], Any]) -> bytes:
+        """Cached PNG bytes for key, calling render(buffer) on a miss."""
+        data = self.get(key)
+        if data is None:
+            buffer = io.BytesIO()
+            render(buffer)
+            data = buffer.getvalue()
+            self.stats['renders'] += 1
+            self.put(key, data)
+        return data
+
+    def clear(self):
+        """Drop every cached chart (memory and disk)."""
+        with self._lock:
+            self._memory.clear()
+            self._memory_bytes = 0
+            if os.path.isdir(self.directory):
+                for name in os.listdir(self.directory):
+                    if name.endswith('.png'):
+                        try:
+                            os.remove(os.path.join(self.directory, name))
+                        except FileNotFoundError:
+                            pass
+            self._disk_bytes = 0
+
+    def hit_rate(self) -> float:
+        hits = self.stats['memory_hits'] + self.stats['disk_hits']
+        total = hits + self.stats['renders']
+        return hits / total if total else 0.0
+
+
+_cache: Optional[ChartCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_chart_cache() -> ChartCache:
+    """Process-wide chart cache (created on first use)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ChartCache()
+        return _cache
+
+
+def render_cached(kind: str, data: Any, render: Callable[[BinaryIO], Any], style: Any = None) -> io.BytesIO:
+    """
+    PNG for a chart as a BytesIO handle, rendered only if not cached.
+
+    Args:
+        kind: Chart identifier, e.g. 'pptx.capacity_trajectory'
+        data: Everything the chart is drawn from (hashed for the key)
+        render: Callable that writes the PNG into the buffer it is given
+        style: Styling constants the chart depends on (e.g. JLL_COLORS)
+    """
+    png = get_chart_cache().get_or_render(chart_key(kind, data, style), render)
+    return io.BytesIO(png)
+
+
+def cached_chart(kind: str, style: Any = None):
+    """
+    Decorator for chart functions that return PNG bytes: the wrapped function
+    returns a BytesIO and only renders when its arguments are new.
+    """
+    def decorator(func: Callable[..., bytes]):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            return render_cached(
+                kind, {'args': args, 'kwargs': kwargs},
+                lambda buffer: buffer.write(func(*args, **kwargs)),
+                style,
+            )
+        wrapper.uncached = func
+        return wrapper
+    return decorator
@@ -0,0 +1,242 @@
+"""
+Chart Rendering
+===============
+pyplot-free rendering layer for the export charts.
+
+The chart helpers in pdf_charts.py, pptx_export.py and portfolio_export.py
+used to go through ``plt.subplots`` / ``plt.savefig`` / ``plt.close``.
+pyplot keeps a global figure registry and "current figure" state, which is
+not thread-safe and adds per-chart bookkeeping. Charts are now drawn on
+plain ``matplotlib.figure.Figure`` objects with an Agg canvas:
+
+- figures come from a small per-thread pool and are cleared and reused
+  instead of being created and destroyed for every chart
+- ``render_png`` lays the figure out, renders it straight into an
+  in-memory PNG and returns the figure to the pool
+- ``style_axes`` applies the JLL spine/tick treatment shared by the deck
+  charts
+
+Fast mode (``PORTFOLIO_FAST_CHARTS=1``) skips the ``bbox_inches='tight'``
+crop, which costs a second full draw per chart. Images keep the figure's
+nominal size instead of being trimmed to their content.
+
+Run ``python -m portfolio_manager.chart_render`` for a micro-benchmark
+against the pyplot path.
+"""
+
+import os
+import threading
+import time
+from io import BytesIO
+from typing import Any, BinaryIO, Dict, List, Optional, Sequence, Tuple, Union
+
+try:
+    import matplotlib
+    from matplotlib.figure import Figure
+    from matplotlib.backends.backend_agg import FigureCanvasAgg
+    MATPLOTLIB_AVAILABLE = True
+except ImportError:
+    MATPLOTLIB_AVAILABLE = False
+
+
+DEFAULT_DPI = 150
+FAST_RENDER = os.environ.get("PORTFOLIO_FAST_CHARTS", "").strip().lower() in ("1", "true", "yes")
+RENDER_MODE = "fast" if FAST_RENDER else "tight"
+
+# Idle figures kept per thread; charts are drawn one at a time per thread
+MAX_POOLED_FIGURES = 4
+
+_SUBPLOT_PARAMS = ('left', 'bottom', 'right', 'top', 'wspace', 'hspace')
+
+
+# =============================================================================
+# FIGURE POOL
+# =============================================================================
+
+class FigurePool:
+    """
+    Per-thread pool of Agg-backed figures.
+
+    Each thread only ever sees its own figures, so parallel exporters never
+    share matplotlib state.
+    """
+
+    def __init__(self, max_size: int = MAX_POOLED_FIGURES):
+        self.max_size = max_size
+        self._local = threading.local()
+        self.stats = {'created': 0, 'reused': 0}
+
+    def _free(self) -> List['Figure']:
+        free = getattr(self._local, 'free', None)
+        if free is None:
+            free = self._local.free = []
+        return free
+
+    def acquire(self, width: float, height: float, facecolor: str = 'white') -> 'Figure':
+        """Blank figure of the given size (inches)."""
+        if not MATPLOTLIB_AVAILABLE:
+            raise ImportError("matplotlib required")
+        free = self._free()
+        if free:
+            fig = free.pop()
+            fig.set_size_inches(width, height)
+            fig.set_facecolor(facecolor)
+            self.stats['reused'] += 1
+        else:
+            fig = Figure(figsize=(width, height), facecolor=facecolor)
+            FigureCanvasAgg(fig)
+            self.stats['created'] += 1
+        return fig
+
+    def release(self, fig: 'Figure'):
+        """Clear a figure and keep it for the next chart on this thread."""
+        free = self._free()
+        if len(free) >= self.max_size:
+            return
+        fig.clear()
+        # tight_layout() moves the subplot params; start the next chart from rc defaults
+        fig.subplotpars.update(**{
+            name: matplotlib.rcParams[f'figure.subplot.{name}'] for name in _SUBPLOT_PARAMS
+        })
+        free.append(fig)
+
+
+_pool: Optional[FigurePool] = None
+_pool_lock = threading.Lock()
+
+
+def get_figure_pool() -> FigurePool:
+    """Process-wide figure pool (created on first use)."""
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = FigurePool()
+        return _pool
+
+
+# =============================================================================
+# FIGURES AND STYLING
+# =============================================================================
+
+def new_figure(width: float, height: float, facecolor: str = 'white') -> 'Figure':
+    """Pooled figure to draw on; hand it to render_png/save_figure when done."""
+    return get_figure_pool().acquire(width, height, facecolor)
+
+
+def subplots(width: float, height: float, facecolor: str = 'white', **subplot_kw) -> Tuple['Figure', Any]:
+    """pyplot-free equivalent of ``plt.subplots(figsize=..., subplot_kw=...)``."""
+    fig = new_figure(width, height, facecolor)
+    ax = fig.add_subplot(111, **subplot_kw)
+    return fig, ax
+
+
+def style_axes(
+    ax,
+    hide_spines: Sequence[str] = ('top', 'right'),
+    spine_color: Optional[str] = None,
+    tick_color: Optional[str] = None,
+):
+    """JLL axes treatment: drop the given spines, recolor the rest and the ticks."""
+    for name, spine in ax.spines.items():
+        if name in hide_spines:
+            spine.set_visible(False)
+        elif spine_color:
+            spine.set_color(spine_color)
+    if tick_color:
+        ax.tick_params(colors=tick_color)
+
+
+# =============================================================================
+# RENDERING
+# =============================================================================
+
+def render_png(fig: 'Figure', dpi: int = DEFAULT_DPI, layout: bool = True, crop: bool = True,
+               **savefig_kwargs) -> bytes:
+    """
+    Render a figure to PNG bytes and return it to the pool.
+
+    Args:
+        fig: Figure from new_figure/subplots
+        dpi: Output resolution
+        layout: Apply tight_layout before drawing
+        crop: Trim to the drawn content (bbox_inches='tight'); ignored in fast mode
+        savefig_kwargs: Passed through to Figure.savefig (facecolor, edgecolor, ...)
+    """
+    try:
+        if layout:
+            fig.tight_layout()
+        if crop and not FAST_RENDER:
+            savefig_kwargs.setdefault('bbox_inches', 'tight')
+        buffer = BytesIO()
+        fig.savefig(buffer, format='png', dpi=dpi, **savefig_kwargs)
+        return buffer.getvalue()
+    finally:
+        get_figure_pool().release(fig)
+
+
+def save_figure(fig: 'Figure', target: Union[str, BinaryIO], **render_kwargs) -> Union[str, BinaryIO]:
+    """render_png into a file path or writable binary file object; returns target."""
+    png = render_png(fig, **render_kwargs)
+    if isinstance(target, (str, os.PathLike)):
+        with open(target, 'wb') as f:
+            f.write(png)
+    else:
+        target.write(png)
+    return target
+
+
+# =============================================================================
+# MICRO-BENCHMARK
+# =============================================================================
+
+def _draw_benchmark_chart(ax):
+    categories = ['Power', 'Site Control', 'Zoning', 'Water', 'Fiber', 'Environmental']
+    values = [75, 50, 100, 25, 75, 50]
+    ax.barh(range(len(categories)), values, color='#2ecc71', edgecolor='black', linewidth=0.5)
+    ax.set_yticks(range(len(categories)))
+    ax.set_yticklabels(categories)
+    ax.set_title('Infrastructure Readiness', fontsize=14, fontweight='bold', loc='left')
+    ax.grid(axis='x', alpha=0.3, linestyle='--')
+
+
+def benchmark(iterations: int = 30) -> Dict[str, float]:
+    """Milliseconds per chart for the pyplot path and this module (with and without the crop)."""
+    import matplotlib.pyplot as plt
+
+    def pyplot_chart():
+        fig, ax = plt.subplots(figsize=(6, 4), facecolor='white')
+        _draw_benchmark_chart(ax)
+        plt.tight_layout()
+        buffer = BytesIO()
+        plt.savefig(buffer, format='png', dpi=DEFAULT_DPI, bbox_inches='tight', facecolor='white')
+        plt.close()
+        return buffer.getvalue()
+
+    def agg_chart(crop: bool):
+        fig, ax = subplots(6, 4)
+        _draw_benchmark_chart(ax)
+        return render_png(fig, crop=crop, facecolor='white')
+
+    cases = {
+        'pyplot': pyplot_chart,
+        'agg': lambda: agg_chart(True),
+        'agg (no crop)': lambda: agg_chart(False),
+    }
+    results = {}
+    for name, func in cases.items():
+        func()  # warm-up (font cache, first canvas)
+        started = time.perf_counter()
+        for _ in range(iterations):
+            func()
+        results[name] = (time.perf_counter() - started) / iterations * 1000
+    return results
+
+
+if __name__ == "__main__":
+    matplotlib.use('Agg')
+
+    results = benchmark()
+    baseline = results['pyplot']
+    for name, ms in results.items():
+        print(f"{name:<22} {ms:7.1f} ms/chart  ({baseline / ms:.2f}x)")
+    print(f"Figure pool: {get_figure_pool().stats}")
@@ -13,12 +13,17 @@ Author: Portfolio Manager Extension
 Version: 1.0.0
 """
 
-from dataclasses import dataclass, field, asdict
+from collections import deque
+from dataclasses import dataclass, field, asdict, replace
 from datetime import date, datetime, timedelta
 from enum import Enum
+from functools import lru_cache
+from types import MappingProxyType
 from typing import Dict, List, Optional, Tuple, Any, Union
+import base64
 import json
 import re
+import zlib
 
 # =============================================================================
 # ENUMS & CONSTANTS
@@ -109,6 +114,9 @@ DEFAULT_LEAD_TIMES = {
     'screening_typical': {'min': 8, 'typical': 12, 'max': 20},
 }
 
+# Milestone whose finish defines energization / project end
+END_MILESTONE = "POST-UTL-09"
+
 # Owner colors for visualization
 OWNER_COLORS = {
     Owner.SELLER: "#10b981",      # Emerald
@@ -186,6 +194,7 @@ class MilestoneInstance:
     # Override values
     duration_override: Optional[int] = None  # weeks
     owner_override: Optional[str] = None
+    derived_duration: Optional[int] = None   # lead-time weeks last applied automatically
     
     # Tracking
     assigned_to: str = ""
@@ -200,6 +209,9 @@ class MilestoneInstance:
     # Flags
     is_active: bool = True
     on_critical_path: bool = False
+    
+    # CPM results (calculated) - late finish minus early finish, in days
+    total_float_days: Optional[int] = None
 
 
 @dataclass
@@ -225,6 +237,69 @@ class WhatIfScenario:
     new_critical_path: List[str] = field(default_factory=list)
 
 
+@dataclass
+class ScenarioOverlay:
+    """
+    Copy-on-write view of a CriticalPathData for what-if evaluation.
+    
+    Stores only the overridden fields (duration, owner, is_active) per
+    milestone; everything else is read from the shared base data.
+    """
+    base: 'CriticalPathData'
+    overrides: Dict[str, Dict[str, Any]] = field(default_factory=dict)
+    
+    @classmethod
+    def from_scenario(cls, base: 'CriticalPathData', scenario: WhatIfScenario) -> 'ScenarioOverlay':
+        overlay = cls(base=base)
+        for override in scenario.overrides:
+            if override.milestone_id in base.milestones and override.field in ('duration', 'owner', 'is_active'):
+                overlay.overrides.setdefault(override.milestone_id, {})[override.field] = override.new_value
+        return overlay
+    
+    def is_active(self, ms_id: str) -> bool:
+        override = self.overrides.get(ms_id)
+        if override and 'is_active' in override:
+            return override['is_active']
+        return self.base.milestones[ms_id].is_active
+    
+    def owner(self, ms_id: str) -> Optional[str]:
+        override = self.overrides.get(ms_id)
+        if override and 'owner' in override:
+            return override['owner']
+        return self.base.milestones[ms_id].owner_override
+    
+    def changes_activity(self) -> bool:
+        return any('is_active' in o for o in self.overrides.values())
+
+
+@dataclass
+class ScenarioResult:
+    """Schedule results for a base plan or a scenario overlay."""
+    scenario_id: str
+    name: str
+    start_date: date
+    early: Dict[str, Tuple[date, date]] = field(default_factory=dict)
+    total_float_days: Dict[str, int] = field(default_factory=dict)
+    critical_path: List[str] = field(default_factory=list)
+    primary_driver: str = ""
+    primary_driver_category: str = ""
+    recomputed: int = 0                 # milestones rescheduled for this result
+    overlay: Optional[ScenarioOverlay] = None
+    _graph: Any = field(default=None, repr=False)
+    
+    @property
+    def calculated_energization(self) -> Optional[str]:
+        if END_MILESTONE in self.early:
+            return self.early[END_MILESTONE][1].isoformat()
+        return None
+    
+    @property
+    def total_duration_weeks(self) -> int:
+        if END_MILESTONE in self.early:
+            return (self.early[END_MILESTONE][1] - self.start_date).days // 7
+        return 0
+
+
 @dataclass
 class CriticalPathConfig:
     """Site-level critical path configuration."""
@@ -277,10 +352,12 @@ class CriticalPathData:
 # MILESTONE TEMPLATES LIBRARY
 # =============================================================================
 
-def get_milestone_templates() -> Dict[str, MilestoneTemplate]:
+def _build_milestone_templates() -> Dict[str, MilestoneTemplate]:
     """
-    Return all milestone templates organized by ID.
+    Build all milestone templates organized by ID.
     Covers both pre-sale and post-sale phases.
+    
+    Called once per process by get_template_table(); use get_milestone_templates().
     """
     templates = {}
     
@@ -804,6 +881,130 @@ def get_milestone_templates() -> Dict[str, MilestoneTemplate]:
     return templates
 
 
+# =============================================================================
+# COMPILED TEMPLATE TABLE
+# =============================================================================
+
+# Transformer lead-time key by minimum voltage (checked high to low)
+TRANSFORMER_VOLTAGE_KEYS = (
+    (345, 'transformer_345kv'),
+    (230, 'transformer_230kv'),
+    (138, 'transformer_138kv'),
+    (0, 'transformer_69kv'),
+)
+
+
+def voltage_bucket(voltage_kv: int) -> int:
+    """Collapse a voltage to the transformer bucket it selects (345/230/138/0)."""
+    for threshold, _ in TRANSFORMER_VOLTAGE_KEYS:
+        if voltage_kv >= threshold:
+            return threshold
+    return 0
+
+
+@dataclass(frozen=True)
+class CompiledTemplateTable:
+    """
+    Immutable, integer-indexed view of the milestone template catalog.
+    
+    Built once per process (and inherited by forked pool workers). Arrays are
+    aligned by template index: ids[i], durations_typical[i], predecessors[i]...
+    """
+    ids: Tuple[str, ...]
+    index: Any                                   # MappingProxy: id -> int
+    templates: Any                               # MappingProxy: id -> MilestoneTemplate
+    durations_min: Tuple[int, ...]
+    durations_typical: Tuple[int, ...]
+    durations_max: Tuple[int, ...]
+    predecessors: Tuple[Tuple[int, ...], ...]
+    successors: Tuple[Tuple[int, ...], ...]
+    lead_time_keys: Tuple[Optional[str], ...]
+    is_transformer: Tuple[bool, ...]
+    is_sis: Tuple[bool, ...]
+    
+    def __len__(self) -> int:
+        return len(self.ids)
+    
+    def resolve_lead_time_key(self, ms_id: str, voltage_kv: int, iso: str) -> Optional[str]:
+        """DEFAULT_LEAD_TIMES key that drives a milestone's duration, or None."""
+        idx = self.index.get(ms_id)
+        if idx is None:
+            return None
+        return _resolved_lead_time_keys(voltage_bucket(voltage_kv), (iso or '').lower())[idx]
+
+
+@lru_cache(maxsize=None)
+def get_template_table() -> CompiledTemplateTable:
+    """Compile the template catalog once per process."""
+    templates = _build_milestone_templates()
+    ids = tuple(templates)
+    index = {ms_id: i for i, ms_id in enumerate(ids)}
+    
+    predecessors = tuple(
+        tuple(index[p] for p in templates[ms_id].predecessors if p in index)
+        for ms_id in ids
+    )
+    successors: List[List[int]] = [[] for _ in ids]
+    for i, preds in enumerate(predecessors):
+        for p in preds:
+            successors[p].append(i)
+    
+    return CompiledTemplateTable(
+        ids=ids,
+        index=MappingProxyType(index),
+        templates=MappingProxyType(templates),
+        durations_min=tuple(templates[i].duration_min for i in ids),
+        durations_typical=tuple(templates[i].duration_typical for i in ids),
+        durations_max=tuple(templates[i].duration_max for i in ids),
+        predecessors=predecessors,
+        successors=tuple(tuple(s) for s in successors),
+        lead_time_keys=tuple(templates[i].lead_time_key for i in ids),
+        is_transformer=tuple(
+            'transformer' in i.lower() or bool(templates[i].lead_time_key and 'transformer' in templates[i].lead_time_key)
+            for i in ids
+        ),
+        is_sis=tuple('sis' in templates[i].name.lower() for i in ids),
+    )
+
+
+@lru_cache(maxsize=None)
+def _resolved_lead_time_keys(bucket: int, iso_lower: str) -> Tuple[Optional[str], ...]:
+    """
+    Per-template lead-time key for one (voltage bucket, ISO) combination.
+    
+    Mirrors the original string matching in _get_adjusted_duration, but is
+    computed once per combination instead of on every call.
+    """
+    table = get_template_table()
+    transformer_key = dict(TRANSFORMER_VOLTAGE_KEYS)[bucket]
+    sis_key = f"sis_{iso_lower}"
+    
+    keys = []
+    for i in range(len(table)):
+        if table.is_transformer[i]:
+            keys.append(transformer_key)
+        elif table.is_sis[i] and sis_key in DEFAULT_LEAD_TIMES:
+            keys.append(sis_key)
+        elif table.lead_time_keys[i] and table.lead_time_keys[i] in DEFAULT_LEAD_TIMES:
+            keys.append(table.lead_time_keys[i])
+        else:
+            keys.append(None)
+    return tuple(keys)
+
+
+def get_milestone_templates() -> Dict[str, MilestoneTemplate]:
+    """
+    Return all milestone templates organized by ID (read-only, shared).
+    Covers both pre-sale and post-sale phases.
+    """
+    return get_template_table().templates
+
+
+def _override_for(tmpl: MilestoneTemplate, duration: int) -> Optional[int]:
+    """duration_override that represents ``duration`` (None when it is the template default)."""
+    return duration if duration != tmpl.duration_typical else None
+
+
 # =============================================================================
 # CRITICAL PATH ENGINE
 # =============================================================================
@@ -812,7 +1013,10 @@ class CriticalPathEngine:
     """Engine for calculating and analyzing critical path."""
     
     def __init__(self):
-        self.templates = get_milestone_templates()
+        self.table = get_template_table()
+        self.templates = self.table.templates
+        # active-template mask -> (order, predecessors, successors); treat as read-only
+        self._graph_cache: Dict[bytes, Tuple[List[str], Dict[str, List[str]], Dict[str, List[str]]]] = {}
     
     def initialize_site(
         self,
@@ -851,7 +1055,8 @@ class CriticalPathEngine:
             # Create instance
             instance = MilestoneInstance(
                 template_id=tmpl_id,
-                duration_override=duration if duration != tmpl.duration_typical else None,
+                duration_override=_override_for(tmpl, duration),
+                derived_duration=duration if tmpl.lead_time_key else None,
                 is_active=True,
                 on_critical_path=tmpl.is_critical_default,
             )
@@ -867,217 +1072,462 @@ class CriticalPathEngine:
         if tmpl.lead_time_key and tmpl.lead_time_key in config.lead_time_overrides:
             return config.lead_time_overrides[tmpl.lead_time_key]
         
-        # Transformer - adjust for voltage
-        if 'transformer' in tmpl.id.lower() or (tmpl.lead_time_key and 'transformer' in tmpl.lead_time_key):
-            if config.voltage_kv >= 345:
-                key = 'transformer_345kv'
-            elif config.voltage_kv >= 230:
-                key = 'transformer_230kv'
-            elif config.voltage_kv >= 138:
-                key = 'transformer_138kv'
-            else:
-                key = 'transformer_69kv'
+        # Transformer by voltage, SIS by ISO, else the template's own key
+        key = self.table.resolve_lead_time_key(tmpl.id, config.voltage_kv, config.iso)
+        if key:
             return DEFAULT_LEAD_TIMES.get(key, {}).get('typical', tmpl.duration_typical)
         
-        # SIS - adjust for ISO
-        if 'sis' in tmpl.name.lower():
-            iso_key = f"sis_{config.iso.lower()}"
-            if iso_key in DEFAULT_LEAD_TIMES:
-                return DEFAULT_LEAD_TIMES[iso_key]['typical']
+        return tmpl.duration_typical
+    
+    def refresh_lead_times(self, data: CriticalPathData) -> int:
+        """
+        Re-derive lead-time driven durations from the current DEFAULT_LEAD_TIMES
+        and the site's lead_time_overrides. Completed milestones are left alone.
         
-        # Use template lead time key
-        if tmpl.lead_time_key and tmpl.lead_time_key in DEFAULT_LEAD_TIMES:
-            return DEFAULT_LEAD_TIMES[tmpl.lead_time_key]['typical']
+        Only durations that still hold the automatically derived value are
+        replaced; a duration the user (or an agent) entered is kept. Milestones
+        saved before derived_duration was recorded count as user-entered
+        unless they have no override at all.
         
-        return tmpl.duration_typical
+        Returns the number of milestones whose duration changed.
+        """
+        changed = 0
+        for ms_id, instance in data.milestones.items():
+            tmpl = self.templates.get(ms_id)
+            if not tmpl or not tmpl.lead_time_key or instance.actual_end:
+                continue
+            if instance.derived_duration is None:
+                automatic = instance.duration_override is None
+            else:
+                automatic = instance.duration_override == _override_for(tmpl, instance.derived_duration)
+            if not automatic:
+                continue
+            duration = self._get_adjusted_duration(tmpl, data.config)
+            instance.derived_duration = duration
+            new_override = _override_for(tmpl, duration)
+            if instance.duration_override != new_override:
+                instance.duration_override = new_override
+                changed += 1
+        return changed
+    
+    def build_dependency_graph(
+        self,
+        data: CriticalPathData,
+        overlay: Optional['ScenarioOverlay'] = None,
+    ) -> Tuple[List[str], Dict[str, List[str]], Dict[str, List[str]]]:
+        """
+        Build the active milestone DAG and its topological order (Kahn's algorithm).
+        
+        Inactive or missing predecessors are ignored, as in the original sweep.
+        Graphs are memoized per set of active templates; callers must not
+        mutate the returned lists/dicts.
+        
+        Returns:
+            (order, predecessors, successors) restricted to active milestones
+        
+        Raises:
+            ValueError: if the active milestones contain a dependency cycle
+        """
+        table = self.table
+        index = table.index
+        mask = bytearray(len(table))
+        for ms_id, instance in data.milestones.items():
+            i = index.get(ms_id)
+            if i is not None and (overlay.is_active(ms_id) if overlay else instance.is_active):
+                mask[i] = 1
+        
+        # The graph depends only on which templates are active
+        key = bytes(mask)
+        cached = self._graph_cache.get(key)
+        if cached is not None:
+            return cached
+        
+        active = [i for i in range(len(table)) if mask[i]]
+        pred_idx = {i: [p for p in table.predecessors[i] if mask[p]] for i in active}
+        succ_idx = {i: [s_idx for s_idx in table.successors[i] if mask[s_idx]] for i in active}
+        indegree = {i: len(pred_idx[i]) for i in active}
+        
+        queue = deque(i for i in active if indegree[i] == 0)
+        order_idx = []
+        while queue:
+            i = queue.popleft()
+            order_idx.append(i)
+            for s_idx in succ_idx[i]:
+                indegree[s_idx] -= 1
+                if indegree[s_idx] == 0:
+                    queue.append(s_idx)
+        
+        ids = table.ids
+        if len(order_idx) < len(active):
+            cyclic = sorted(ids[i] for i in active if indegree[i] > 0)
+            raise ValueError(f"Dependency cycle among milestones: {', '.join(cyclic)}")
+        
+        order = [ids[i] for i in order_idx]
+        predecessors = {ids[i]: [ids[p] for p in pred_idx[i]] for i in active}
+        successors = {ids[i]: [ids[s_idx] for s_idx in succ_idx[i]] for i in active}
+        
+        self._graph_cache[key] = (order, predecessors, successors)
+        return order, predecessors, successors
+    
+    def _get_duration(self, data: CriticalPathData, ms_id: str, overlay: Optional['ScenarioOverlay'] = None) -> int:
+        """Effective duration in weeks for an active milestone."""
+        if overlay is not None:
+            override = overlay.overrides.get(ms_id)
+            if override and 'duration' in override:
+                return override['duration']
+        instance = data.milestones[ms_id]
+        if instance.duration_override is not None:
+            return instance.duration_override
+        tmpl = self.templates.get(ms_id)
+        return tmpl.duration_typical if tmpl else 0
+    
+    def _forward_pass(
+        self,
+        data: CriticalPathData,
+        order: List[str],
+        predecessors: Dict[str, List[str]],
+        start_date: date,
+        overlay: Optional['ScenarioOverlay'] = None,
+        base_early: Optional[Dict[str, Tuple[date, date]]] = None,
+        dirty: Optional[set] = None,
+    ) -> Dict[str, Tuple[date, date]]:
+        """
+        Early start/finish per milestone, in topological order. Does not mutate data.
+        
+        With base_early and dirty, only the dirty milestones are recomputed and
+        every other milestone reuses its base dates.
+        """
+        early: Dict[str, Tuple[date, date]] = {}
+        for ms_id in order:
+            if dirty is not None and ms_id not in dirty and ms_id in base_early:
+                early[ms_id] = base_early[ms_id]
+                continue
+            
+            instance = data.milestones[ms_id]
+            duration_weeks = self._get_duration(data, ms_id, overlay)
+            
+            # If already complete, use actual dates as anchor
+            if instance.actual_end:
+                ms_end = date.fromisoformat(instance.actual_end)
+                if instance.actual_start:
+                    ms_start = date.fromisoformat(instance.actual_start)
+                else:
+                    # Estimate start based on duration
+                    ms_start = ms_end - timedelta(weeks=duration_weeks)
+                early[ms_id] = (ms_start, ms_end)
+                continue
+            
+            # Normal calculation for incomplete items
+            ms_start = start_date
+            for pred_id in predecessors[ms_id]:
+                pred_end = early[pred_id][1]
+                if pred_end > ms_start:
+                    ms_start = pred_end
+            early[ms_id] = (ms_start, ms_start + timedelta(weeks=duration_weeks))
+        
+        return early
+    
+    def _total_float(
+        self,
+        order: List[str],
+        successors: Dict[str, List[str]],
+        early: Dict[str, Tuple[date, date]],
+    ) -> Dict[str, int]:
+        """
+        Backward pass: late start/finish and total float (days) from early dates.
+        
+        The project finish is the energization milestone (or the latest finish
+        if it is not scheduled). Branches that do not feed energization are
+        never given negative float.
+        """
+        floats: Dict[str, int] = {}
+        if not order:
+            return floats
+        project_finish = early[END_MILESTONE][1] if END_MILESTONE in early else max(e[1] for e in early.values())
+        
+        late_start: Dict[str, date] = {}
+        for ms_id in reversed(order):
+            es, ef = early[ms_id]
+            succ = successors[ms_id]
+            if succ:
+                lf = min(late_start[s] for s in succ)
+            else:
+                lf = max(ef, project_finish)
+            late_start[ms_id] = lf - (ef - es)
+            floats[ms_id] = (lf - ef).days
+        return floats
+    
+    def _critical_chain(
+        self,
+        order: List[str],
+        predecessors: Dict[str, List[str]],
+        floats: Dict[str, int],
+    ) -> List[str]:
+        """Zero-float milestones that feed energization, in topological order."""
+        if END_MILESTONE not in predecessors:
+            return []
+        
+        feeds_end = {END_MILESTONE}
+        stack = [END_MILESTONE]
+        while stack:
+            for pred_id in predecessors[stack.pop()]:
+                if pred_id not in feeds_end:
+                    feeds_end.add(pred_id)
+                    stack.append(pred_id)
+        
+        return [ms_id for ms_id in order if ms_id in feeds_end and floats[ms_id] <= 0]
+    
+    def _primary_driver(
+        self,
+        data: CriticalPathData,
+        critical_path: List[str],
+        overlay: Optional['ScenarioOverlay'] = None,
+    ) -> Tuple[str, str]:
+        """Longest milestone on the critical path -> (milestone id, workstream)."""
+        driver, category = "", ""
+        max_duration = 0
+        for ms_id in critical_path:
+            instance = data.milestones.get(ms_id)
+            tmpl = self.templates.get(ms_id)
+            if instance and tmpl:
+                override = overlay.overrides.get(ms_id, {}) if overlay else {}
+                duration = override.get('duration', instance.duration_override) or tmpl.duration_typical
+                if duration > max_duration:
+                    max_duration = duration
+                    driver, category = ms_id, tmpl.workstream.value
+        return driver, category
     
     def calculate_schedule(
         self,
         data: CriticalPathData,
         start_date: Optional[date] = None
     ) -> CriticalPathData:
-        """Calculate schedule using forward pass algorithm."""
+        """
+        Calculate schedule using CPM: one forward pass in topological order for
+        early start/finish, then a backward pass for late dates and total float.
+        """
         
         if start_date is None:
             start_date = date.today()
         
-        scheduled = {}
-        
-        def get_duration(ms_id: str) -> int:
-            instance = data.milestones.get(ms_id)
-            if not instance or not instance.is_active:
-                return 0
-            if instance.duration_override is not None:
-                return instance.duration_override
-            tmpl = self.templates.get(ms_id)
-            return tmpl.duration_typical if tmpl else 0
-        
-        def get_earliest_start(ms_id: str) -> date:
-            tmpl = self.templates.get(ms_id)
-            if not tmpl or not tmpl.predecessors:
-                return start_date
-            
-            earliest = start_date
-            for pred_id in tmpl.predecessors:
-                if pred_id in scheduled:
-                    # Use actual end if available (for completed tasks), otherwise target end
-                    pred_instance = data.milestones.get(pred_id)
-                    if pred_instance and pred_instance.actual_end:
-                         pred_end = date.fromisoformat(pred_instance.actual_end)
-                    else:
-                        pred_end = scheduled[pred_id]['end']
-                    
-                    if pred_end > earliest:
-                        earliest = pred_end
-            return earliest
+        order, predecessors, successors = self.build_dependency_graph(data)
         
         # Forward pass
-        max_iterations = len(data.milestones) * 2
-        iteration = 0
+        early = self._forward_pass(data, order, predecessors, start_date)
+        for ms_id, (ms_start, ms_end) in early.items():
+            instance = data.milestones[ms_id]
+            if instance.actual_end:
+                # Ensure target matches actual for consistency
+                instance.target_start = ms_start.isoformat()
+                instance.target_end = ms_end.isoformat()
+            else:
+                if instance.target_start is None:
+                    instance.target_start = ms_start.isoformat()
+                if instance.target_end is None:
+                    instance.target_end = ms_end.isoformat()
         
-        while len(scheduled) < len([m for m in data.milestones.values() if m.is_active]) and iteration < max_iterations:
-            iteration += 1
-            
-            for ms_id, instance in data.milestones.items():
-                if ms_id in scheduled or not instance.is_active:
-                    continue
-                
-                tmpl = self.templates.get(ms_id)
-                if not tmpl:
-                    continue
-                
-                # Check predecessors
-                predecessors_ready = True
-                for pred_id in tmpl.predecessors:
-                    pred = data.milestones.get(pred_id)
-                    if pred and pred.is_active and pred_id not in scheduled:
-                        predecessors_ready = False
-                        break
-                
-                if predecessors_ready:
-                    # If already complete, use actual dates as anchor
-                    if instance.actual_end:
-                        ms_end = date.fromisoformat(instance.actual_end)
-                        if instance.actual_start:
-                            ms_start = date.fromisoformat(instance.actual_start)
-                        else:
-                            # Estimate start based on duration
-                            duration_weeks = get_duration(ms_id)
-                            ms_start = ms_end - timedelta(weeks=duration_weeks)
-                        
-                        scheduled[ms_id] = {'start': ms_start, 'end': ms_end, 'duration': (ms_end - ms_start).days // 7}
-                        
-                        # Ensure target matches actual for consistency
-                        instance.target_start = ms_start.isoformat()
-                        instance.target_end = ms_end.isoformat()
-                        continue
-
-                    # Normal calculation for incomplete items
-                    ms_start = get_earliest_start(ms_id)
-                    duration_weeks = get_duration(ms_id)
-                    ms_end = ms_start + timedelta(weeks=duration_weeks)
-                    
-                    scheduled[ms_id] = {'start': ms_start, 'end': ms_end, 'duration': duration_weeks}
-                    
-                    # Update instance
-                    if instance.target_start is None:
-                        instance.target_start = ms_start.isoformat()
-                    if instance.target_end is None:
-                        instance.target_end = ms_end.isoformat()
+        # Backward pass
+        for ms_id, float_days in self._total_float(order, successors, early).items():
+            data.milestones[ms_id].total_float_days = float_days
         
         # Calculate total duration and find energization date
-        if "POST-UTL-09" in scheduled:
-            data.calculated_energization = scheduled["POST-UTL-09"]['end'].isoformat()
-            data.total_duration_weeks = (scheduled["POST-UTL-09"]['end'] - start_date).days // 7
+        if END_MILESTONE in early:
+            data.calculated_energization = early[END_MILESTONE][1].isoformat()
+            data.total_duration_weeks = (early[END_MILESTONE][1] - start_date).days // 7
         
         data.last_calculated = datetime.now().isoformat()
         
         return data
     
     def identify_critical_path(self, data: CriticalPathData) -> List[str]:
-        """Identify the critical path to energization."""
+        """
+        Identify the critical path to energization.
         
-        end_milestone = "POST-UTL-09"  # ENERGIZATION
+        Returns every zero-float milestone that feeds energization, in
+        topological order, so parallel critical chains are all included.
+        """
+        order, predecessors, successors = self.build_dependency_graph(data)
         
-        def trace_back(ms_id: str, path: List[str]) -> List[str]:
-            path.append(ms_id)
-            
-            tmpl = self.templates.get(ms_id)
-            if not tmpl or not tmpl.predecessors:
-                return path
-            
-            # Find predecessor with latest end date
-            latest_pred = None
-            latest_end = None
-            
-            for pred_id in tmpl.predecessors:
-                instance = data.milestones.get(pred_id)
-                if not instance or not instance.is_active:
-                    continue
-                
-                if instance.target_end:
-                    end_date = date.fromisoformat(instance.target_end)
-                    if latest_end is None or end_date > latest_end:
-                        latest_end = end_date
-                        latest_pred = pred_id
-            
-            if latest_pred:
-                return trace_back(latest_pred, path)
-            
-            return path
+        # Floats missing (e.g. data saved before CPM) -> derive from target dates
+        if any(data.milestones[ms_id].total_float_days is None for ms_id in order):
+            early = {}
+            for ms_id in order:
+                instance = data.milestones[ms_id]
+                if not (instance.target_start and instance.target_end):
+                    early = None
+                    break
+                early[ms_id] = (
+                    date.fromisoformat(instance.target_start),
+                    date.fromisoformat(instance.target_end),
+                )
+            if early is None:
+                self.calculate_schedule(data)
+            else:
+                for ms_id, float_days in self._total_float(order, successors, early).items():
+                    data.milestones[ms_id].total_float_days = float_days
         
-        critical_path = trace_back(end_milestone, [])
-        critical_path.reverse()
+        floats = {ms_id: data.milestones[ms_id].total_float_days for ms_id in order}
+        critical_path = self._critical_chain(order, predecessors, floats)
         
         # Update instances
-        for ms_id in critical_path:
-            if ms_id in data.milestones:
-                data.milestones[ms_id].on_critical_path = True
+        critical_set = set(critical_path)
+        for ms_id, instance in data.milestones.items():
+            instance.on_critical_path = ms_id in critical_set
         
         data.critical_path = critical_path
         
         # Identify primary driver
         if critical_path:
-            max_duration = 0
-            for ms_id in critical_path:
-                instance = data.milestones.get(ms_id)
-                tmpl = self.templates.get(ms_id)
-                if instance and tmpl:
-                    duration = instance.duration_override or tmpl.duration_typical
-                    if duration > max_duration:
-                        max_duration = duration
-                        data.primary_driver = ms_id
-                        data.primary_driver_category = tmpl.workstream.value
+            data.primary_driver, data.primary_driver_category = self._primary_driver(data, critical_path)
         
         return critical_path
     
-    def apply_scenario(self, data: CriticalPathData, scenario: WhatIfScenario) -> CriticalPathData:
-        """Apply a what-if scenario and recalculate."""
-        import copy
+    # -------------------------------------------------------------------------
+    # What-if scenarios
+    # -------------------------------------------------------------------------
+    
+    def base_schedule(self, data: CriticalPathData, start_date: Optional[date] = None) -> ScenarioResult:
+        """
+        Schedule the base data from scratch without mutating it.
         
-        # Deep copy the data
-        scenario_data = copy.deepcopy(data)
-        scenario_data.config.active_scenario_id = scenario.id
+        Used as the shared starting point that scenario overlays patch.
+        """
+        if start_date is None:
+            start_date = date.today()
+        order, predecessors, successors = self.build_dependency_graph(data)
+        early = self._forward_pass(data, order, predecessors, start_date)
+        floats = self._total_float(order, successors, early)
+        critical_path = self._critical_chain(order, predecessors, floats)
+        driver, category = self._primary_driver(data, critical_path)
         
-        # Apply overrides
-        for override in scenario.overrides:
-            if override.milestone_id in scenario_data.milestones:
-                instance = scenario_data.milestones[override.milestone_id]
-                if override.field == 'duration':
-                    instance.duration_override = override.new_value
-                elif override.field == 'owner':
-                    instance.owner_override = override.new_value
-                elif override.field == 'is_active':
-                    instance.is_active = override.new_value
+        return ScenarioResult(
+            scenario_id="",
+            name="Base",
+            start_date=start_date,
+            early=early,
+            total_float_days=floats,
+            critical_path=critical_path,
+            primary_driver=driver,
+            primary_driver_category=category,
+            recomputed=len(order),
+            _graph=(order, predecessors, successors),
+        )
+    
+    def evaluate_scenario(
+        self,
+        data: CriticalPathData,
+        scenario: WhatIfScenario,
+        base: Optional[ScenarioResult] = None,
+        start_date: Optional[date] = None,
+    ) -> ScenarioResult:
+        """
+        Evaluate a what-if scenario as a copy-on-write overlay.
+        
+        Only the overridden fields are stored, the base data is never copied
+        or mutated, and only milestones downstream of an override are
+        rescheduled. Also fills scenario.energization_delta_weeks and
+        scenario.new_critical_path.
+        """
+        if base is None:
+            base = self.base_schedule(data, start_date)
+        overlay = ScenarioOverlay.from_scenario(data, scenario)
+        
+        base_order, base_preds, base_succs = base._graph
+        if overlay.changes_activity():
+            order, predecessors, successors = self.build_dependency_graph(data, overlay)
+        else:
+            order, predecessors, successors = base_order, base_preds, base_succs
+        
+        # Everything reachable from an override (in either graph) must be rescheduled
+        dirty = set()
+        stack = [ms_id for ms_id in overlay.overrides if ms_id in successors or ms_id in base_succs]
+        while stack:
+            ms_id = stack.pop()
+            if ms_id in dirty:
+                continue
+            dirty.add(ms_id)
+            stack.extend(successors.get(ms_id, ()))
+            stack.extend(base_succs.get(ms_id, ()))
         
-        # Recalculate
-        # Reset dates first
-        for instance in scenario_data.milestones.values():
-            instance.target_start = None
-            instance.target_end = None
+        early = self._forward_pass(
+            data, order, predecessors, base.start_date,
+            overlay=overlay, base_early=base.early, dirty=dirty,
+        )
+        floats = self._total_float(order, successors, early)
+        critical_path = self._critical_chain(order, predecessors, floats)
+        driver, category = self._primary_driver(data, critical_path, overlay)
         
-        scenario_data = self.calculate_schedule(scenario_data)
-        scenario_data.critical_path = self.identify_critical_path(scenario_data)
+        result = ScenarioResult(
+            scenario_id=scenario.id,
+            name=scenario.name,
+            start_date=base.start_date,
+            early=early,
+            total_float_days=floats,
+            critical_path=critical_path,
+            primary_driver=driver,
+            primary_driver_category=category,
+            recomputed=len(dirty & set(order)),
+            overlay=overlay,
+            _graph=(order, predecessors, successors),
+        )
+        
+        scenario.energization_delta_weeks = base.total_duration_weeks - result.total_duration_weeks
+        scenario.new_critical_path = list(critical_path)
+        return result
+    
+    def compare_scenarios(
+        self,
+        data: CriticalPathData,
+        scenarios: List[WhatIfScenario],
+        start_date: Optional[date] = None,
+    ) -> Tuple[ScenarioResult, List[ScenarioResult]]:
+        """Schedule the base once and evaluate every scenario against it."""
+        base = self.base_schedule(data, start_date)
+        return base, [self.evaluate_scenario(data, sc, base=base) for sc in scenarios]
+    
+    def apply_scenario(self, data: CriticalPathData, scenario: WhatIfScenario) -> CriticalPathData:
+        """
+        Apply a what-if scenario and return a recalculated CriticalPathData.
+        
+        Built from evaluate_scenario: milestone instances are shallow-copied
+        with the scenario's dates (notes, blockers and source_docs are shared
+        with the base, not deep-copied). Prefer evaluate_scenario when only
+        the results are needed.
+        """
+        result = self.evaluate_scenario(data, scenario)
+        overlay = result.overlay
+        critical_set = set(result.critical_path)
+        
+        milestones = {}
+        for ms_id, instance in data.milestones.items():
+            changes = {'target_start': None, 'target_end': None, 'total_float_days': None}
+            override = overlay.overrides.get(ms_id, {})
+            if 'duration' in override:
+                changes['duration_override'] = override['duration']
+            if 'owner' in override:
+                changes['owner_override'] = override['owner']
+            if 'is_active' in override:
+                changes['is_active'] = override['is_active']
+            if ms_id in result.early:
+                ms_start, ms_end = result.early[ms_id]
+                changes['target_start'] = ms_start.isoformat()
+                changes['target_end'] = ms_end.isoformat()
+                changes['total_float_days'] = result.total_float_days[ms_id]
+            changes['on_critical_path'] = ms_id in critical_set
+            milestones[ms_id] = replace(instance, **changes)
+        
+        scenario_data = replace(
+            data,
+            config=replace(data.config, active_scenario_id=scenario.id),
+            milestones=milestones,
+            critical_path=list(result.critical_path),
+            primary_driver=result.primary_driver,
+            primary_driver_category=result.primary_driver_category,
+            last_calculated=datetime.now().isoformat(),
+        )
+        if result.calculated_energization:
+            scenario_data.calculated_energization = result.calculated_energization
+            scenario_data.total_duration_weeks = result.total_duration_weeks
         
         return scenario_data
     
@@ -1259,35 +1709,193 @@ def parse_document_for_updates(text: str, site_id: str) -> List[Dict]:
 # SERIALIZATION (for Google Sheets storage)
 # =============================================================================
 
-def serialize_critical_path(data: CriticalPathData) -> str:
-    """Serialize critical path data to JSON string for storage."""
-    
-    def convert_to_dict(obj):
-        """Convert object to dict, handling dataclasses and enums."""
-        if isinstance(obj, Enum):
-            return obj.value
-        elif hasattr(obj, '__dataclass_fields__'):
-            # It's a dataclass - use asdict
-            result = {}
-            for key, value in asdict(obj).items():
-                result[key] = convert_to_dict(value)
-            return result
-        elif isinstance(obj, dict):
-            return {k: convert_to_dict(v) for k, v in obj.items()}
-        elif isinstance(obj, list):
-            return [convert_to_dict(item) for item in obj]
-        else:
-            return obj
+# Compact cell format: prefix + base64(zlib(minimal JSON)). Anything without
+# the prefix is the original verbose JSON and is still read as before.
+CP_COMPACT_PREFIX = "cp2:"
+CP_COMPACT_VERSION = 2
+
+# Dates are stored as day offsets from this epoch
+_DATE_EPOCH = date(2000, 1, 1).toordinal()
+
+# Short keys for milestone fields (append-only; unknown fields keep their name)
+_MILESTONE_CODES = {
+    'status': 's', 'completion_pct': 'p',
+    'target_start': 'ts', 'actual_start': 'as', 'target_end': 'te', 'actual_end': 'ae',
+    'duration_override': 'd', 'owner_override': 'o',
+    'assigned_to': 'a', 'notes': 'n', 'blockers': 'b', 'source_docs': 'sd',
+    'last_updated': 'lu', 'updated_by': 'ub',
+    'is_active': 'x', 'on_critical_path': 'c', 'total_float_days': 'f',
+    'derived_duration': 'dd',
+}
+_MILESTONE_FIELDS = {code: name for name, code in _MILESTONE_CODES.items()}
+_MILESTONE_DATE_FIELDS = ('target_start', 'actual_start', 'target_end', 'actual_end')
+
+# Status ordinals (append-only)
+_STATUS_CODES = tuple(MilestoneStatus)
+
+
+def _to_dict(obj):
+    """Convert object to dict, handling dataclasses and enums."""
+    if isinstance(obj, Enum):
+        return obj.value
+    elif hasattr(obj, '__dataclass_fields__'):
+        # It's a dataclass - use asdict
+        result = {}
+        for key, value in asdict(obj).items():
+            result[key] = _to_dict(value)
+        return result
+    elif isinstance(obj, dict):
+        return {k: _to_dict(v) for k, v in obj.items()}
+    elif isinstance(obj, list):
+        return [_to_dict(item) for item in obj]
+    else:
+        return obj
+
+
+def _pack_date(value: Optional[str]) -> Any:
+    """ISO date -> day offset; anything else is kept as-is."""
+    if isinstance(value, str) and len(value) == 10:
+        try:
+            return date.fromisoformat(value).toordinal() - _DATE_EPOCH
+        except ValueError:
+            pass
+    return value
+
+
+def _unpack_date(value: Any) -> Optional[str]:
+    if isinstance(value, int):
+        return date.fromordinal(value + _DATE_EPOCH).isoformat()
+    return value
+
+
+def _non_default_fields(obj, defaults) -> Dict[str, Any]:
+    """Dataclass fields of obj that differ from the defaults instance."""
+    return {
+        name: getattr(obj, name)
+        for name in obj.__dataclass_fields__
+        if getattr(obj, name) != getattr(defaults, name)
+    }
+
+
+def encode_critical_path(data: CriticalPathData) -> str:
+    """
+    Compact, versioned encoding for the critical_path_json cell.
     
-    return json.dumps(convert_to_dict(data), indent=None)
+    Only values that differ from the dataclass defaults are kept, dates are
+    day offsets and statuses are ordinals; the result is zlib-compressed and
+    base64-encoded.
+    """
+    milestone_defaults = MilestoneInstance(template_id='')
+    milestones = {}
+    for ms_id, instance in data.milestones.items():
+        fields = _non_default_fields(instance, milestone_defaults)
+        fields.pop('template_id', None)
+        packed = {}
+        for name, value in fields.items():
+            if name == 'status':
+                value = _STATUS_CODES.index(value)
+            elif name in _MILESTONE_DATE_FIELDS:
+                value = _pack_date(value)
+            packed[_MILESTONE_CODES.get(name, name)] = value
+        if instance.template_id != ms_id:
+            packed['id'] = instance.template_id
+        milestones[ms_id] = packed
+    
+    payload = {
+        'v': CP_COMPACT_VERSION,
+        'c': _non_default_fields(data.config, CriticalPathConfig(site_id='')),
+        'm': milestones,
+    }
+    top = _non_default_fields(data, CriticalPathData(config=data.config))
+    for name in ('config', 'milestones'):
+        top.pop(name, None)
+    if 'calculated_energization' in top:
+        top['calculated_energization'] = _pack_date(top['calculated_energization'])
+    if 'scenarios' in top:
+        top['scenarios'] = _to_dict(top['scenarios'])
+    payload['d'] = top
+    
+    raw = json.dumps(payload, separators=(',', ':')).encode('utf-8')
+    return CP_COMPACT_PREFIX + base64.b64encode(zlib.compress(raw, 9)).decode('ascii')
+
+
+def _decode_compact(cell: str) -> Dict[str, Any]:
+    raw = zlib.decompress(base64.b64decode(cell[len(CP_COMPACT_PREFIX):]))
+    payload = json.loads(raw)
+    if payload.get('v', 0) > CP_COMPACT_VERSION:
+        raise ValueError(f"critical path encoding v{payload.get('v')} is newer than supported v{CP_COMPACT_VERSION}")
+    return payload
+
+
+def _critical_path_from_compact(payload: Dict[str, Any]) -> CriticalPathData:
+    config = CriticalPathConfig(**{'site_id': '', **payload.get('c', {})})
+    
+    milestones = {}
+    for ms_id, packed in payload.get('m', {}).items():
+        kwargs = {'template_id': packed.get('id', ms_id)}
+        for code, value in packed.items():
+            if code == 'id':
+                continue
+            name = _MILESTONE_FIELDS.get(code, code)
+            if name == 'status':
+                value = _STATUS_CODES[value] if isinstance(value, int) else MilestoneStatus(value)
+            elif name in _MILESTONE_DATE_FIELDS:
+                value = _unpack_date(value)
+            kwargs[name] = value
+        milestones[ms_id] = MilestoneInstance(**kwargs)
+    
+    top = dict(payload.get('d', {}))
+    scenarios = _scenarios_from_dict(top.pop('scenarios', {}))
+    if 'calculated_energization' in top:
+        top['calculated_energization'] = _unpack_date(top['calculated_energization'])
+    
+    return CriticalPathData(config=config, milestones=milestones, scenarios=scenarios, **top)
+
+
+def _scenarios_from_dict(raw: Dict[str, Any]) -> Dict[str, WhatIfScenario]:
+    scenarios = {}
+    for sc_id, sc_data in raw.items():
+        overrides = []
+        for o in sc_data.get('overrides', []):
+            overrides.append(ScenarioOverride(
+                milestone_id=o.get('milestone_id', ''),
+                field=o.get('field', ''),
+                original_value=o.get('original_value'),
+                new_value=o.get('new_value'),
+                description=o.get('description', ''),
+            ))
+        scenarios[sc_id] = WhatIfScenario(
+            id=sc_id,
+            name=sc_data.get('name', ''),
+            description=sc_data.get('description', ''),
+            overrides=overrides,
+            energization_delta_weeks=sc_data.get('energization_delta_weeks', 0),
+            new_critical_path=sc_data.get('new_critical_path', []),
+        )
+    return scenarios
+
+
+def serialize_critical_path(data: CriticalPathData, compact: bool = True) -> str:
+    """
+    Serialize critical path data for storage.
+    
+    compact=True (default) writes the encode_critical_path() format;
+    compact=False writes the original verbose JSON.
+    """
+    if compact:
+        return encode_critical_path(data)
+    return json.dumps(_to_dict(data), indent=None)
 
 
 def deserialize_critical_path(json_str: str) -> Optional[CriticalPathData]:
-    """Deserialize critical path data from JSON string."""
+    """Deserialize critical path data from either the compact or the JSON format."""
     if not json_str:
         return None
     
     try:
+        if json_str.startswith(CP_COMPACT_PREFIX):
+            return _critical_path_from_compact(_decode_compact(json_str))
+        
         data = json.loads(json_str)
         
         # Reconstruct config
@@ -1318,6 +1926,7 @@ def deserialize_critical_path(json_str: str) -> Optional[CriticalPathData]:
                 actual_end=ms_data.get('actual_end'),
                 duration_override=ms_data.get('duration_override'),
                 owner_override=ms_data.get('owner_override'),
+                derived_duration=ms_data.get('derived_duration'),
                 assigned_to=ms_data.get('assigned_to', ''),
                 notes=ms_data.get('notes', ''),
                 blockers=ms_data.get('blockers', []),
@@ -1326,33 +1935,13 @@ def deserialize_critical_path(json_str: str) -> Optional[CriticalPathData]:
                 updated_by=ms_data.get('updated_by', ''),
                 is_active=ms_data.get('is_active', True),
                 on_critical_path=ms_data.get('on_critical_path', False),
-            )
-        
-        # Reconstruct scenarios
-        scenarios = {}
-        for sc_id, sc_data in data.get('scenarios', {}).items():
-            overrides = []
-            for o in sc_data.get('overrides', []):
-                overrides.append(ScenarioOverride(
-                    milestone_id=o.get('milestone_id', ''),
-                    field=o.get('field', ''),
-                    original_value=o.get('original_value'),
-                    new_value=o.get('new_value'),
-                    description=o.get('description', ''),
-                ))
-            scenarios[sc_id] = WhatIfScenario(
-                id=sc_id,
-                name=sc_data.get('name', ''),
-                description=sc_data.get('description', ''),
-                overrides=overrides,
-                energization_delta_weeks=sc_data.get('energization_delta_weeks', 0),
-                new_critical_path=sc_data.get('new_critical_path', []),
+                total_float_days=ms_data.get('total_float_days'),
             )
         
         return CriticalPathData(
             config=config,
             milestones=milestones,
-            scenarios=scenarios,
+            scenarios=_scenarios_from_dict(data.get('scenarios', {})),
             critical_path=data.get('critical_path', []),
             total_duration_weeks=data.get('total_duration_weeks', 0),
             calculated_energization=data.get('calculated_energization'),
@@ -1361,6 +1950,8 @@ def deserialize_critical_path(json_str: str) -> Optional[CriticalPathData]:
             schedule_risk=data.get('schedule_risk', 'medium'),
             last_calculated=data.get('last_calculated'),
             version=data.get('version', '1.0'),
+            document_scan_history=data.get('document_scan_history', {}),
+            intelligence_database=data.get('intelligence_database', {}),
         )
         
     except Exception as e:
@@ -1432,6 +2023,115 @@ def initialize_critical_path_for_site(site: Dict) -> CriticalPathData:
     return cp_data
 
 
+# =============================================================================
+# PORTFOLIO BATCH RECALCULATION
+# =============================================================================
+
+# Engine owned by each pool worker; built once by the initializer so the
+# template table is constructed once per process, not once per site.
+_worker_engine: Optional[CriticalPathEngine] = None
+
+
+def _init_portfolio_worker(lead_times: Dict[str, Dict[str, int]]):
+    """Process pool initializer: sync lead times from the parent and build the engine."""
+    global _worker_engine
+    DEFAULT_LEAD_TIMES.clear()
+    DEFAULT_LEAD_TIMES.update(lead_times)
+    _resolved_lead_time_keys.cache_clear()
+    _worker_engine = CriticalPathEngine()
+
+
+def _recalculate_site_job(job: Tuple[str, str, Optional[date], bool]) -> Dict[str, Any]:
+    """Recalculate one site's schedule (runs inside a pool worker or in-process)."""
+    site_id, json_str, start_date, refresh_lead_times = job
+    engine = _worker_engine or CriticalPathEngine()
+    
+    try:
+        data = deserialize_critical_path(json_str)
+        if data is None:
+            return {'site_id': site_id, 'error': 'Could not deserialize critical path'}
+        
+        if refresh_lead_times:
+            engine.refresh_lead_times(data)
+        
+        for ms in data.milestones.values():
+            ms.target_start = ms.target_end = None
+        data = engine.calculate_schedule(data, start_date)
+        engine.identify_critical_path(data)
+        
+        return {
+            'site_id': site_id,
+            'calculated_energization': data.calculated_energization,
+            'total_duration_weeks': data.total_duration_weeks,
+            'critical_path': data.critical_path,
+            'primary_driver': data.primary_driver,
+            'primary_driver_category': data.primary_driver_category,
+            'critical_path_json': serialize_critical_path(data),
+            'error': None,
+        }
+    except Exception as e:
+        return {'site_id': site_id, 'error': f"{type(e).__name__}: {e}"}
+
+
+def recalculate_portfolio(
+    sites: Dict[str, Dict],
+    start_date: Optional[date] = None,
+    workers: Optional[int] = None,
+    refresh_lead_times: bool = True,
+) -> Dict[str, Dict[str, Any]]:
+    """
+    Recompute critical-path schedules for every site that has one.
+    
+    Sites are fanned out across a ProcessPoolExecutor. Each worker builds the
+    template table once and receives the parent's current DEFAULT_LEAD_TIMES,
+    so a lead-time change (e.g. DEFAULT_LEAD_TIMES['transformer_345kv'])
+    refreshes the whole portfolio in one call.
+    
+    Args:
+        sites: site_id -> site dict (with critical_path_json)
+        start_date: Schedule start (defaults to today)
+        workers: Pool size; 1 runs in-process. Defaults to os.cpu_count()
+        refresh_lead_times: Re-derive lead-time driven durations before scheduling
+            (durations entered by hand are kept; see refresh_lead_times)
+    
+    Returns:
+        site_id -> {calculated_energization, total_duration_weeks, critical_path,
+                    primary_driver, primary_driver_category, critical_path_json, error}
+    """
+    import os
+    from concurrent.futures import ProcessPoolExecutor
+    
+    if start_date is None:
+        start_date = date.today()
+    
+    jobs = [
+        (site_id, site.get(CRITICAL_PATH_COLUMN), start_date, refresh_lead_times)
+        for site_id, site in sites.items()
+        if site.get(CRITICAL_PATH_COLUMN)
+    ]
+    if not jobs:
+        return {}
+    
+    workers = workers or os.cpu_count() or 1
+    workers = min(workers, len(jobs))
+    
+    if workers > 1:
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_portfolio_worker,
+                initargs=(dict(DEFAULT_LEAD_TIMES),),
+            ) as pool:
+                chunksize = max(1, len(jobs) // (workers * 4))
+                results = list(pool.map(_recalculate_site_job, jobs, chunksize=chunksize))
+            return {r['site_id']: r for r in results}
+        except Exception as e:
+            # e.g. process spawning not permitted in this environment
+            print(f"[critical_path] Process pool unavailable, recalculating serially: {e}")
+    
+    return {job[0]: _recalculate_site_job(job) for job in jobs}
+
+
 # =============================================================================
 # MAIN (for testing)
 # =============================================================================
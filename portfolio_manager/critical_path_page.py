@@ -30,7 +30,10 @@ from .critical_path import (
     save_critical_path_to_site,
     initialize_critical_path_for_site,
     parse_document_for_updates,
+    recalculate_portfolio,
+    CRITICAL_PATH_COLUMN,
 )
+from .schedule_risk import DISTRIBUTIONS, DEFAULT_TRIALS, simulate_schedule, apply_schedule_risk
 
 
 def sync_site_data_to_critical_path(site: Dict, cp_data: CriticalPathData) -> bool:
@@ -681,6 +684,7 @@ def show_critical_path_page():
                 cp_data.milestones[tmpl_id] = MilestoneInstance(
                     template_id=tmpl_id,
                     duration_override=duration if duration != tmpl.duration_typical else None,
+                    derived_duration=duration if tmpl.lead_time_key else None,
                     is_active=True,
                     on_critical_path=tmpl.is_critical_default,
                 )
@@ -1026,6 +1030,68 @@ def show_critical_path_page():
             if tmpl:
                 icon = {"Complete": "✅", "In Progress": "🔄", "Blocked": "🚫"}.get(instance.status.value, "⬜")
                 st.write(f"{icon} {tmpl.name} ({tmpl.owner.value})")
+        
+        st.markdown("---")
+        st.subheader("🎲 Schedule Risk (Monte Carlo)")
+        st.caption("Samples milestone durations between their min/typical/max lead times and reports the energization date spread.")
+        
+        col1, col2, col3 = st.columns([1, 1, 1])
+        with col1:
+            distribution = st.selectbox("Distribution", list(DISTRIBUTIONS), key="mc_dist",
+                format_func=lambda d: d.upper() if d == "pert" else d.title())
+        with col2:
+            trials = st.select_slider("Trials", options=[1000, 5000, 10000, 25000, 50000], value=DEFAULT_TRIALS, key="mc_trials")
+        with col3:
+            st.write("")
+            run_mc = st.button("▶️ Run Simulation", key="mc_run", use_container_width=True)
+        
+        mc_key = f"mc_result_{selected_site_id}"
+        if run_mc:
+            with st.spinner(f"Simulating {trials:,} schedules..."):
+                st.session_state[mc_key] = simulate_schedule(cp_data, trials=trials, distribution=distribution, engine=engine)
+        
+        mc = st.session_state.get(mc_key)
+        if mc:
+            col1, col2, col3, col4 = st.columns(4)
+            with col1:
+                st.metric("P50", mc.p50)
+            with col2:
+                st.metric("P80", mc.p80)
+            with col3:
+                st.metric("P95", mc.p95)
+            with col4:
+                if mc.probability_on_target is not None:
+                    st.metric("On-Target Chance", f"{mc.probability_on_target:.0%}")
+                else:
+                    st.metric("Simulated Risk", mc.risk_level().upper())
+            
+            start = date.fromisoformat(mc.start_date)
+            finish_dates = [start + timedelta(days=int(d)) for d in mc.finish_days]
+            fig = go.Figure(go.Histogram(x=finish_dates, nbinsx=50, marker_color="#6366f1"))
+            for label, value, color in (("P50", mc.p50, "#10b981"), ("P80", mc.p80, "#f59e0b"), ("P95", mc.p95, "#ef4444")):
+                fig.add_vline(x=value, line_dash="dash", line_color=color)
+                fig.add_annotation(x=value, y=1, yref="paper", text=label, showarrow=False, font=dict(color=color))
+            fig.update_layout(height=300, margin=dict(l=10, r=10, t=30, b=10),
+                title=f"Energization dates - {mc.trials:,} trials ({mc.elapsed_seconds:.2f}s)", showlegend=False)
+            st.plotly_chart(fig, use_container_width=True)
+            
+            drivers = [
+                {"Milestone": templates[ms_id].name, "Owner": templates[ms_id].owner.value, "Criticality": f"{ci:.0%}"}
+                for ms_id, ci in mc.top_drivers(15) if ms_id in templates
+            ]
+            if drivers:
+                st.write("**Criticality Index** (share of trials on the driving path)")
+                st.dataframe(pd.DataFrame(drivers), use_container_width=True, hide_index=True)
+            
+            if mc.risk_level() != cp_data.schedule_risk:
+                if st.button(f"💾 Set Schedule Risk to {mc.risk_level().upper()}", key="mc_apply"):
+                    apply_schedule_risk(cp_data, mc)
+                    site = save_critical_path_to_site(site, cp_data)
+                    sites[selected_site_id] = site
+                    from .streamlit_app import save_database
+                    save_database(db)
+                    st.success("Schedule risk updated and saved!")
+                    st.rerun()
     
     with tab3:
         phase_filter = st.selectbox("Phase", ["All"] + [p.value for p in Phase])
@@ -1077,17 +1143,61 @@ def show_critical_path_page():
             from .streamlit_app import save_database
             save_database(db)
             st.rerun()
+        
+        st.markdown("---")
+        st.caption("Apply current default lead times to every site with a critical path. Durations edited by hand are kept.")
+        if st.button("🔁 Recalculate All Sites"):
+            with st.spinner("Recalculating portfolio schedules..."):
+                results = recalculate_portfolio(sites)
+            
+            errors = {sid: r['error'] for sid, r in results.items() if r.get('error')}
+            for sid, result in results.items():
+                if not result.get('error'):
+                    sites[sid][CRITICAL_PATH_COLUMN] = result['critical_path_json']
+            
+            if len(errors) < len(results):
+                from .streamlit_app import save_database
+                save_database(db)
+            
+            st.dataframe(pd.DataFrame([
+                {
+                    'Site': sites[sid].get('name', sid),
+                    'Energization': r.get('calculated_energization'),
+                    'Total (wks)': r.get('total_duration_weeks'),
+                    'Primary Driver': r.get('primary_driver'),
+                    'Error': r.get('error') or '',
+                }
+                for sid, r in results.items()
+            ]), use_container_width=True, hide_index=True)
+            st.success(f"Recalculated {len(results) - len(errors)} of {len(results)} sites")
     
     with tab5:
         st.subheader("What-If Scenarios")
         
-        for scenario_def in get_predefined_scenarios():
+        scenario_defs = get_predefined_scenarios()
+        
+        if st.button("📊 Compare All Scenarios"):
+            scenarios = [engine.create_scenario(sd['name'], sd['description'], sd['overrides']) for sd in scenario_defs]
+            base, results = engine.compare_scenarios(cp_data, scenarios)
+            st.dataframe(pd.DataFrame([
+                {
+                    'Scenario': r.name,
+                    'Energization': r.calculated_energization,
+                    'Total (wks)': r.total_duration_weeks,
+                    'Savings (wks)': base.total_duration_weeks - r.total_duration_weeks,
+                    'Primary Driver': r.primary_driver,
+                    'Critical Items': len(r.critical_path),
+                }
+                for r in [base] + results
+            ]), use_container_width=True, hide_index=True)
+        
+        for scenario_def in scenario_defs:
             with st.expander(f"💡 {scenario_def['name']}"):
                 st.write(scenario_def['description'])
                 
                 if st.button(f"Test", key=f"test_{scenario_def['name']}"):
                     scenario = engine.create_scenario(scenario_def['name'], scenario_def['description'], scenario_def['overrides'])
-                    scenario_data = engine.apply_scenario(cp_data, scenario)
+                    scenario_data = engine.evaluate_scenario(cp_data, scenario)
                     delta = cp_data.total_duration_weeks - scenario_data.total_duration_weeks
                     
                     col1, col2 = st.columns(2)
@@ -0,0 +1,641 @@
+"""
+Fake gspread
+============
+In-memory stand-in for the part of gspread the app uses (``Client.open``,
+``Spreadsheet`` and ``Worksheet``). It lets schema migrations and the
+load/save path run without Google credentials.
+
+Every method that gspread implements as a Sheets API request is counted
+in ``FakeClient.calls`` under the REST method it maps to
+(``spreadsheets.get``, ``values.batchGet``, ``spreadsheets.batchUpdate``,
+...), so a caller can check how many round trips an operation costs.
+
+The client can also behave like the real service under load:
+
+- ``latency``: seconds slept per request
+- ``quota_per_minute``: requests beyond this in a sliding 60 s window fail
+  with a 429 ``APIError``, as the real per-user quota does
+- ``fail_next(n)``: the next ``n`` requests fail with 429
+
+``FakeClient.cells`` counts cell values read and written, so an operation
+that downloads the whole sheet to touch one row shows up even when its
+request count looks fine.
+
+``FakeSheetsService`` and ``FakeDriveService`` expose the same data
+through the googleapiclient discovery interface
+(``service.spreadsheets().values().get(...).execute()``). That is the
+interface ``portfolio_llm``'s ``GoogleSheetsClient`` uses.
+
+Only what the app needs is supported: values are stored as strings and
+numbers exactly as written (RAW), and formulas and formatting are ignored.
+"""
+
+import itertools
+import random
+import re
+import time
+from collections import Counter, deque
+from typing import Any, Callable, Deque, Dict, Iterable, List, Optional, Tuple
+
+from gspread.exceptions import APIError, SpreadsheetNotFound, WorksheetNotFound
+from gspread.utils import a1_range_to_grid_range, numericise_all, rowcol_to_a1
+
+
+def split_range(name: str) -> Tuple[Optional[str], str]:
+    """"'Sheet name'!A1:B2" -> ("Sheet name", "A1:B2"); no sheet part -> (None, name)."""
+    if '!' not in name:
+        return None, name
+    title, cells = name.rsplit('!', 1)
+    if title.startswith("'") and title.endswith("'"):
+        title = title[1:-1].replace("''", "'")
+    return title, cells
+
+
+class FakeWorksheet:
+    """One tab: a list of rows plus a grid size, like the real sheet."""
+
+    def __init__(self, spreadsheet: 'FakeSpreadsheet', title: str, sheet_id: int, rows: int, cols: int):
+        self.spreadsheet = spreadsheet
+        self.title = title
+        self.id = sheet_id
+        self.row_count = rows
+        self.col_count = cols
+        self._cells: List[List[Any]] = []
+
+    def __repr__(self) -> str:
+        return f"<FakeWorksheet {self.title!r} id:{self.id}>"
+
+    def _call(self, method: str):
+        self.spreadsheet.client.record(method)
+
+    def _returned(self, rows: List[List[Any]]) -> List[List[Any]]:
+        self.spreadsheet.client.cells['read'] += sum(len(r) for r in rows)
+        return rows
+
+    # -- raw grid access (no request counted) --------------------------------
+
+    def values(self) -> List[List[Any]]:
+        """Used rows, right-padded to the widest used row (what values.get returns)."""
+        last = len(self._cells)
+        while last and not any(v not in ('', None) for v in self._cells[last - 1]):
+            last -= 1
+        rows = [list(r) for r in self._cells[:last]]
+        width = max((self._row_width(r) for r in rows), default=0)
+        return [(r + [''] * width)[:width] for r in rows]
+
+    @staticmethod
+    def _row_width(row: List[Any]) -> int:
+        width = len(row)
+        while width and row[width - 1] in ('', None):
+            width -= 1
+        return width
+
+    def read(self, cells: str) -> List[List[Any]]:
+        grid = a1_range_to_grid_range(cells)
+        rows = self.values()
+        r0, r1 = grid.get('startRowIndex', 0), grid.get('endRowIndex', len(rows))
+        c0, c1 = grid.get('startColumnIndex', 0), grid.get('endColumnIndex')
+        out = []
+        for row in rows[r0:r1]:
+            part = row[c0:c1] if c1 is not None else row[c0:]
+            width = self._row_width(part)
+            out.append(part[:width])
+        while out and not out[-1]:
+            out.pop()
+        return out
+
+    def write(self, row: int, col: int, values: List[List[Any]]):
+        """Write a block with its top-left cell at (row, col), 0-based."""
+        for r_off, row_values in enumerate(values):
+            r = row + r_off
+            c_end = col + len(row_values)
+            if r >= self.row_count or c_end > self.col_count:
+                raise ValueError(
+                    f"Range exceeds grid limits: {self.title} has {self.row_count}x{self.col_count}"
+                )
+            self.spreadsheet.client.cells['written'] += len(row_values)
+            while len(self._cells) <= r:
+                self._cells.append([])
+            line = self._cells[r]
+            if len(line) < c_end:
+                line.extend([''] * (c_end - len(line)))
+            line[col:c_end] = list(row_values)
+
+    def clear_block(self, grid: Dict[str, int]):
+        r0, c0 = grid.get('startRowIndex', 0), grid.get('startColumnIndex', 0)
+        r1 = grid.get('endRowIndex', len(self._cells))
+        for r in range(r0, min(r1, len(self._cells))):
+            line = self._cells[r]
+            c1 = grid.get('endColumnIndex', len(line))
+            for c in range(c0, min(c1, len(line))):
+                line[c] = ''
+
+    # -- gspread Worksheet API -----------------------------------------------
+
+    def row_values(self, row: int) -> List[Any]:
+        self._call('values.get')
+        rows = self.values()
+        return self._returned([list(rows[row - 1][:self._row_width(rows[row - 1])]) if row <= len(rows) else []])[0]
+
+    def get_all_values(self) -> List[List[Any]]:
+        self._call('values.get')
+        return self._returned(self.values())
+
+    def get_all_records(self) -> List[Dict[str, Any]]:
+        self._call('values.get')
+        rows = self._returned(self.values())
+        if not rows:
+            return []
+        return [dict(zip(rows[0], numericise_all(row))) for row in rows[1:]]
+
+    def update_cell(self, row: int, col: int, value: Any):
+        self._call('values.update')
+        self.write(row - 1, col - 1, [[value]])
+
+    def update(self, range_name: Any, values: Any = None, **kwargs):
+        # gspread 6 accepts update(values, range_name) as well as the old order
+        if isinstance(range_name, list):
+            range_name, values = values or 'A1', range_name
+        self._call('values.update')
+        grid = a1_range_to_grid_range(range_name)
+        self.write(grid.get('startRowIndex', 0), grid.get('startColumnIndex', 0), values)
+
+    def append_row(self, values: List[Any], **kwargs):
+        self.append_rows([values])
+
+    def append_rows(self, values: List[List[Any]], **kwargs):
+        self._call('values.append')
+        start = len(self.values())
+        needed_rows = start + len(values) - self.row_count
+        if needed_rows > 0:
+            self.row_count += needed_rows
+        needed_cols = max((len(v) for v in values), default=0) - self.col_count
+        if needed_cols > 0:
+            self.col_count += needed_cols
+        self.write(start, 0, values)
+
+    def get(self, range_name: Optional[str] = None, **kwargs) -> List[List[Any]]:
+        self._call('values.get')
+        return self._returned(self.read(range_name) if range_name else self.values())
+
+    def batch_get(self, ranges: Iterable[str], **kwargs) -> List[List[List[Any]]]:
+        self._call('values.batchGet')
+        return [self._returned(self.read(r)) for r in ranges]
+
+    def batch_update(self, data: List[Dict[str, Any]], **kwargs) -> Dict[str, Any]:
+        """Worksheet-relative values batch update (``[{'range': 'A2:C2', 'values': [...]}]``)."""
+        self._call('values.batchUpdate')
+        for item in data:
+            grid = a1_range_to_grid_range(item['range'])
+            self.write(grid.get('startRowIndex', 0), grid.get('startColumnIndex', 0), item['values'])
+        return {'totalUpdatedCells': sum(len(r) for item in data for r in item['values'])}
+
+    def clear(self):
+        self._call('values.clear')
+        self._cells = []
+
+    def add_rows(self, rows: int):
+        self._call('spreadsheets.batchUpdate')
+        self.row_count += rows
+
+    def add_cols(self, cols: int):
+        self._call('spreadsheets.batchUpdate')
+        self.col_count += cols
+
+
+class FakeSpreadsheet:
+    """A spreadsheet: ordered worksheets plus the values/batchUpdate endpoints."""
+
+    def __init__(self, client: 'FakeClient', title: str, spreadsheet_id: str):
+        self.client = client
+        self.title = title
+        self.id = spreadsheet_id
+        self._sheets: Dict[str, FakeWorksheet] = {}
+        self._sheet_ids = itertools.count(0)
+
+    def __repr__(self) -> str:
+        return f"<FakeSpreadsheet {self.title!r} sheets:{list(self._sheets)}>"
+
+    def _call(self, method: str):
+        self.client.record(method)
+
+    def _sheet(self, title: Optional[str]) -> FakeWorksheet:
+        if title is None:
+            return next(iter(self._sheets.values()))
+        if title not in self._sheets:
+            raise WorksheetNotFound(title)
+        return self._sheets[title]
+
+    def _by_id(self, sheet_id: int) -> FakeWorksheet:
+        for ws in self._sheets.values():
+            if ws.id == sheet_id:
+                return ws
+        raise WorksheetNotFound(str(sheet_id))
+
+    def _new_sheet(self, title: str, rows: int, cols: int, sheet_id: Optional[int] = None) -> FakeWorksheet:
+        if title in self._sheets:
+            raise ValueError(f'A sheet with the name "{title}" already exists.')
+        if sheet_id is None:
+            sheet_id = next(self._sheet_ids)
+            while any(ws.id == sheet_id for ws in self._sheets.values()):
+                sheet_id = next(self._sheet_ids)
+        ws = FakeWorksheet(self, title, sheet_id, rows, cols)
+        self._sheets[title] = ws
+        return ws
+
+    # -- worksheet management ------------------------------------------------
+
+    def worksheets(self) -> List[FakeWorksheet]:
+        self._call('spreadsheets.get')
+        return list(self._sheets.values())
+
+    def worksheet(self, title: str) -> FakeWorksheet:
+        self._call('spreadsheets.get')
+        return self._sheet(title)
+
+    @property
+    def sheet1(self) -> FakeWorksheet:
+        self._call('spreadsheets.get')
+        return self._sheet(None)
+
+    def add_worksheet(self, title: str, rows: int = 1000, cols: int = 26, **kwargs) -> FakeWorksheet:
+        self._call('spreadsheets.batchUpdate')
+        return self._new_sheet(title, rows, cols)
+
+    def del_worksheet(self, worksheet: FakeWorksheet):
+        self._call('spreadsheets.batchUpdate')
+        self._sheets.pop(worksheet.title, None)
+
+    # -- values endpoints ----------------------------------------------------
+
+    def values_get(self, range_name: str, params: Optional[Dict] = None) -> Dict[str, Any]:
+        self._call('values.get')
+        return self._value_range(range_name)
+
+    def values_batch_get(self, ranges: Iterable[str], params: Optional[Dict] = None) -> Dict[str, Any]:
+        self._call('values.batchGet')
+        return {'spreadsheetId': self.id, 'valueRanges': [self._value_range(r) for r in ranges]}
+
+    def values_update(self, range_name: str, params: Optional[Dict] = None, body: Optional[Dict] = None):
+        self._call('values.update')
+        self._write_range(range_name, (body or {}).get('values', []))
+        return {'updatedRange': range_name}
+
+    def values_batch_update(self, body: Optional[Dict] = None, params: Optional[Dict] = None):
+        self._call('values.batchUpdate')
+        for item in (body or {}).get('data', []):
+            self._write_range(item['range'], item.get('values', []))
+        return {'totalUpdatedCells': sum(len(r) for d in (body or {}).get('data', []) for r in d.get('values', []))}
+
+    def values_append(self, range_name: str, params: Optional[Dict] = None, body: Optional[Dict] = None):
+        title, _ = split_range(range_name)
+        ws = self._sheet(title)
+        values = (body or {}).get('values', [])
+        start = len(ws.values()) + 1
+        ws.append_rows(values)
+        end_col = rowcol_to_a1(1, max((len(v) for v in values), default=1)).rstrip('0123456789')
+        return {'updates': {
+            'updatedRange': f"{ws.title}!A{start}:{end_col}{start + len(values) - 1}",
+            'updatedRows': len(values),
+        }}
+
+    def values_clear(self, range_name: str):
+        self._call('values.clear')
+        title, cells = split_range(range_name)
+        self._sheet(title).clear_block(a1_range_to_grid_range(cells))
+        return {}
+
+    def fetch_sheet_metadata(self, params: Optional[Dict] = None) -> Dict[str, Any]:
+        self._call('spreadsheets.get')
+        return {
+            'spreadsheetId': self.id,
+            'properties': {'title': self.title},
+            'sheets': [
+                {'properties': {
+                    'sheetId': ws.id,
+                    'title': ws.title,
+                    'gridProperties': {'rowCount': ws.row_count, 'columnCount': ws.col_count},
+                }}
+                for ws in self._sheets.values()
+            ],
+        }
+
+    def values_batch_clear(self, body: Optional[Dict] = None, params: Optional[Dict] = None):
+        self._call('values.batchClear')
+        for name in (body or {}).get('ranges', []):
+            title, cells = split_range(name)
+            self._sheet(title).clear_block(a1_range_to_grid_range(cells))
+        return {}
+
+    def _value_range(self, name: str) -> Dict[str, Any]:
+        title, cells = split_range(name)
+        ws = self._sheet(title)
+        values = ws._returned(ws.read(cells))
+        out = {'range': name, 'majorDimension': 'ROWS'}
+        if values:
+            out['values'] = values
+        return out
+
+    def _write_range(self, name: str, values: List[List[Any]]):
+        title, cells = split_range(name)
+        grid = a1_range_to_grid_range(cells)
+        self._sheet(title).write(grid.get('startRowIndex', 0), grid.get('startColumnIndex', 0), values)
+
+    # -- structural batchUpdate ----------------------------------------------
+
+    def batch_update(self, body: Dict[str, Any]) -> Dict[str, Any]:
+        """Supports addSheet, appendDimension, deleteDimension and updateCells."""
+        self._call('spreadsheets.batchUpdate')
+        replies = []
+        for request in body.get('requests', []):
+            (kind, spec), = request.items()
+            if kind == 'addSheet':
+                props = spec.get('properties', {})
+                grid = props.get('gridProperties', {})
+                ws = self._new_sheet(props['title'], grid.get('rowCount', 1000),
+                                     grid.get('columnCount', 26), props.get('sheetId'))
+                replies.append({'addSheet': {'properties': {'sheetId': ws.id, 'title': ws.title}}})
+                continue
+            if kind == 'appendDimension':
+                ws = self._by_id(spec['sheetId'])
+                if spec['dimension'] == 'COLUMNS':
+                    ws.col_count += spec['length']
+                else:
+                    ws.row_count += spec['length']
+            elif kind == 'deleteDimension':
+                rng = spec['range']
+                ws = self._by_id(rng['sheetId'])
+                start, end = rng['startIndex'], rng['endIndex']
+                if rng['dimension'] == 'ROWS':
+                    del ws._cells[start:end]
+                    ws.row_count -= end - start
+                else:
+                    for line in ws._cells:
+                        del line[start:end]
+                    ws.col_count -= end - start
+            elif kind == 'updateCells':
+                start = spec['start']
+                ws = self._by_id(start['sheetId'])
+                rows = [
+                    [_cell_value(cell) for cell in row.get('values', [])]
+                    for row in spec.get('rows', [])
+                ]
+                ws.write(start.get('rowIndex', 0), start.get('columnIndex', 0), rows)
+            else:
+                raise NotImplementedError(f"FakeSpreadsheet.batch_update does not support {kind}")
+            replies.append({})
+        return {'spreadsheetId': self.id, 'replies': replies}
+
+
+def _cell_value(cell: Dict[str, Any]) -> Any:
+    value = cell.get('userEnteredValue', {})
+    for key in ('stringValue', 'numberValue', 'boolValue', 'formulaValue'):
+        if key in value:
+            return value[key]
+    return ''
+
+
+class _ErrorResponse:
+    """Just enough of requests.Response for gspread's APIError."""
+
+    def __init__(self, code: int, message: str, status: str):
+        self.status_code = code
+        self.text = message
+        self._error = {'code': code, 'message': message, 'status': status}
+
+    def json(self) -> Dict[str, Any]:
+        return {'error': self._error}
+
+
+def quota_error(method: str) -> APIError:
+    return APIError(_ErrorResponse(
+        429, f"Quota exceeded for quota metric 'Requests' ({method})", 'RESOURCE_EXHAUSTED'
+    ))
+
+
+class FakeClient:
+    """Stand-in for ``gspread.Client``; ``calls`` counts API requests by method."""
+
+    def __init__(
+        self,
+        latency: float = 0.0,
+        quota_per_minute: Optional[int] = None,
+        error_rate: float = 0.0,
+        seed: int = 0,
+    ):
+        self.latency = latency
+        self.quota_per_minute = quota_per_minute
+        self.error_rate = error_rate
+        self.calls: Counter = Counter()
+        self.errors: Counter = Counter()
+        self.cells: Counter = Counter()     # 'read' / 'written' cell values, a proxy for payload size
+        self._spreadsheets: Dict[str, FakeSpreadsheet] = {}
+        self._ids = itertools.count(1)
+        self._window: Deque[float] = deque()
+        self._fail_next = 0
+        self._random = random.Random(seed)
+
+    def record(self, method: str):
+        """Count one API request, then apply the configured latency/quota/errors."""
+        self.calls[method] += 1
+        now = time.monotonic()
+        if self.quota_per_minute is not None:
+            while self._window and now - self._window[0] >= 60:
+                self._window.popleft()
+        failed = self._fail_next > 0
+        if failed:
+            self._fail_next -= 1
+        elif self.quota_per_minute is not None and len(self._window) >= self.quota_per_minute:
+            failed = True
+        elif self.error_rate and self._random.random() < self.error_rate:
+            failed = True
+        if self.quota_per_minute is not None:
+            self._window.append(now)
+        if self.latency:
+            time.sleep(self.latency)
+        if failed:
+            self.errors[method] += 1
+            raise quota_error(method)
+
+    def fail_next(self, count: int = 1):
+        """Make the next ``count`` requests fail with 429."""
+        self._fail_next += count
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    def reset_calls(self):
+        self.calls.clear()
+        self.errors.clear()
+        self.cells.clear()
+        self._window.clear()
+
+    def create(self, title: str, **kwargs) -> FakeSpreadsheet:
+        self.record('drive.files.create')
+        spreadsheet = FakeSpreadsheet(self, title, f"fake-{next(self._ids)}")
+        spreadsheet._new_sheet('Sheet1', 1000, 26)
+        self._spreadsheets[title] = spreadsheet
+        return spreadsheet
+
+    def open(self, title: str, **kwargs) -> FakeSpreadsheet:
+        # gspread: a Drive files.list lookup by name, then the spreadsheet metadata
+        self.record('drive.files.list')
+        self.record('spreadsheets.get')
+        if title not in self._spreadsheets:
+            raise SpreadsheetNotFound(title)
+        return self._spreadsheets[title]
+
+    def open_by_key(self, key: str) -> FakeSpreadsheet:
+        self.record('spreadsheets.get')
+        for spreadsheet in self._spreadsheets.values():
+            if spreadsheet.id == key:
+                return spreadsheet
+        raise SpreadsheetNotFound(key)
+
+
+# =============================================================================
+# DISCOVERY-API ADAPTERS (googleapiclient style)
+# =============================================================================
+
+class _Request:
+    """Deferred call, run by execute() like googleapiclient's HttpRequest."""
+
+    def __init__(self, fn: Callable[[], Any]):
+        self._fn = fn
+
+    def execute(self, num_retries: int = 0) -> Any:
+        return self._fn()
+
+
+class _ValuesResource:
+    def __init__(self, service: 'FakeSheetsService'):
+        self._service = service
+
+    def get(self, spreadsheetId: str, range: str, **kwargs) -> _Request:
+        book = self._service.book(spreadsheetId)
+        return _Request(lambda: book.values_get(range))
+
+    def batchGet(self, spreadsheetId: str, ranges: List[str], **kwargs) -> _Request:
+        book = self._service.book(spreadsheetId)
+        return _Request(lambda: book.values_batch_get(ranges))
+
+    def update(self, spreadsheetId: str, range: str, body: Dict, **kwargs) -> _Request:
+        book = self._service.book(spreadsheetId)
+        return _Request(lambda: book.values_update(range, body=body))
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict, **kwargs) -> _Request:
+        book = self._service.book(spreadsheetId)
+        return _Request(lambda: book.values_batch_update(body=body))
+
+    def append(self, spreadsheetId: str, range: str, body: Dict, **kwargs) -> _Request:
+        book = self._service.book(spreadsheetId)
+        return _Request(lambda: book.values_append(range, body=body))
+
+    def clear(self, spreadsheetId: str, range: str, **kwargs) -> _Request:
+        book = self._service.book(spreadsheetId)
+        return _Request(lambda: book.values_clear(range))
+
+
+class _SpreadsheetsResource:
+    def __init__(self, service: 'FakeSheetsService'):
+        self._service = service
+
+    def values(self) -> _ValuesResource:
+        return _ValuesResource(self._service)
+
+    def get(self, spreadsheetId: str, **kwargs) -> _Request:
+        book = self._service.book(spreadsheetId)
+        return _Request(book.fetch_sheet_metadata)
+
+    def batchUpdate(self, spreadsheetId: str, body: Dict, **kwargs) -> _Request:
+        book = self._service.book(spreadsheetId)
+        return _Request(lambda: book.batch_update(body))
+
+
+class FakeSheetsService:
+    """``build('sheets', 'v4')`` stand-in backed by a FakeClient's spreadsheets."""
+
+    def __init__(self, client: FakeClient):
+        self.client = client
+
+    def book(self, spreadsheet_id: str) -> FakeSpreadsheet:
+        for spreadsheet in self.client._spreadsheets.values():
+            if spreadsheet.id == spreadsheet_id:
+                return spreadsheet
+        raise SpreadsheetNotFound(spreadsheet_id)
+
+    def spreadsheets(self) -> _SpreadsheetsResource:
+        return _SpreadsheetsResource(self)
+
+
+_QUERY_CLAUSE = re.compile(
+    r"^\s*(?:(?P<field>name|mimeType)\s*=\s*'(?P<value>(?:[^'\\]|\\.)*)'"
+    r"|'(?P<parent>[^']*)'\s+in\s+parents"
+    r"|trashed\s*=\s*(?P<trashed>true|false))\s*$"
+)
+
+
+class _FilesResource:
+    def __init__(self, service: 'FakeDriveService'):
+        self._service = service
+
+    def list(self, q: str = '', fields: str = '', **kwargs) -> _Request:
+        service = self._service
+
+        def run():
+            service.client.record('drive.files.list')
+            return {'files': [dict(f) for f in service.records.values() if service.matches(f, q)]}
+        return _Request(run)
+
+    def create(self, body: Dict, media_body: Any = None, fields: str = '', **kwargs) -> _Request:
+        service = self._service
+
+        def run():
+            service.client.record('drive.files.create')
+            file_id = f"file-{next(service._ids)}"
+            size = 0
+            if media_body is not None and hasattr(media_body, 'size'):
+                size = media_body.size() or 0
+            record = {
+                'id': file_id,
+                'name': body.get('name', ''),
+                'mimeType': body.get('mimeType') or getattr(media_body, 'mimetype', lambda: '')() or '',
+                'parents': list(body.get('parents', [])),
+                'webViewLink': f"https://drive.example/{file_id}",
+                'createdTime': time.strftime('%Y-%m-%dT%H:%M:%SZ', time.gmtime()),
+                'size': str(size),
+                'trashed': False,
+            }
+            service.records[file_id] = record
+            return dict(record)
+        return _Request(run)
+
+
+class FakeDriveService:
+    """``build('drive', 'v3')`` stand-in: files().list/create over an in-memory tree."""
+
+    def __init__(self, client: FakeClient):
+        self.client = client
+        self.records: Dict[str, Dict[str, Any]] = {}
+        self._ids = itertools.count(1)
+
+    def files(self) -> _FilesResource:
+        return _FilesResource(self)
+
+    @staticmethod
+    def matches(record: Dict[str, Any], query: str) -> bool:
+        """Evaluate the ``and``-joined subset of Drive query syntax the app uses."""
+        for clause in filter(None, (c.strip() for c in re.split(r'\s+and\s+', query or ''))):
+            match = _QUERY_CLAUSE.match(clause)
+            if not match:
+                raise NotImplementedError(f"FakeDriveService cannot evaluate: {clause}")
+            if match.group('field'):
+                if record.get(match.group('field')) != match.group('value').replace("\\'", "'"):
+                    return False
+            elif match.group('parent') is not None:
+                if match.group('parent') not in record.get('parents', []):
+                    return False
+            elif (match.group('trashed') == 'true') != record.get('trashed', False):
+                return False
+        return True
@@ -0,0 +1,179 @@
+"""
+Local Snapshot Cache
+====================
+Persistent write-through cache for the portfolio database.
+
+load_database() used to re-open the spreadsheet, download Sites, Metadata
+and Utilities and re-parse every *_json column on every call. This module
+keeps the last loaded/saved database in a local SQLite file so that:
+
+- reads within the TTL are served locally with no API calls
+- after the TTL, a single cheap read of the Metadata ``last_updated`` value
+  decides whether the cached copy is still current (revalidation)
+- the full sheet is only re-downloaded when the remote revision changed
+- save_database() writes through, so the cache never lags our own edits
+
+Edits made directly in the Google Sheet (outside the app) do not touch
+Metadata ``last_updated``; use "Refresh from Google Sheets" in Settings to
+pick those up.
+"""
+
+import json
+import os
+import sqlite3
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "power_tracker")
+DEFAULT_TTL_SECONDS = 300
+
+
+def _storage_default(obj: Any) -> Any:
+    """Store lazy site records in their compact (still-undecoded) form."""
+    if hasattr(obj, 'to_storage_dict'):
+        return obj.to_storage_dict()
+    return str(obj)
+
+
+@dataclass
+class CachedSnapshot:
+    """One cached copy of the database plus the revision it was taken at."""
+    key: str
+    revision: str
+    fetched_at: float
+    db: Dict[str, Any]
+    layout: Dict[str, Any]
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    def is_fresh(self, ttl_seconds: float) -> bool:
+        return self.age() < ttl_seconds
+
+
+class SnapshotCache:
+    """
+    SQLite-backed snapshot store with hit/miss accounting.
+
+    Counters are per-process and reset on restart; the snapshot itself
+    survives restarts so a cold start can render from local data.
+    """
+
+    def __init__(self, path: Optional[str] = None, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        if path is None:
+            cache_dir = os.environ.get("PORTFOLIO_CACHE_DIR", DEFAULT_CACHE_DIR)
+            path = os.path.join(cache_dir, "portfolio_snapshot.sqlite")
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,          # served within TTL, no API calls
+            'revalidated': 0,   # TTL expired, remote revision unchanged
+            'misses': 0,        # full download from Sheets
+            'writes': 0,        # write-through after save/load
+            'errors': 0,
+        }
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _init_db(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS snapshots (
+                    key TEXT PRIMARY KEY,
+                    revision TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    db_json TEXT NOT NULL,
+                    layout_json TEXT NOT NULL
+                )
+            """)
+
+    def get(self, key: str) -> Optional[CachedSnapshot]:
+        """Return the cached snapshot for key, or None."""
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT revision, fetched_at, db_json, layout_json FROM snapshots WHERE key = ?",
+                    (key,)
+                ).fetchone()
+            if not row:
+                return None
+            return CachedSnapshot(
+                key=key,
+                revision=row[0],
+                fetched_at=row[1],
+                db=json.loads(row[2]),
+                layout=json.loads(row[3]),
+            )
+        except (sqlite3.Error, json.JSONDecodeError) as e:
+            self.stats['errors'] += 1
+            print(f"[local_cache] Could not read snapshot: {e}")
+            return None
+
+    def put(self, key: str, revision: str, db: Dict[str, Any], layout: Optional[Dict[str, Any]] = None):
+        """Store (or replace) the snapshot for key."""
+        try:
+            payload = json.dumps(db, default=_storage_default)
+            layout_payload = json.dumps(layout or {})
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO snapshots (key, revision, fetched_at, db_json, layout_json) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, str(revision or ''), time.time(), payload, layout_payload)
+                )
+            self.stats['writes'] += 1
+        except (sqlite3.Error, TypeError, ValueError) as e:
+            self.stats['errors'] += 1
+            print(f"[local_cache] Could not write snapshot: {e}")
+
+    def touch(self, key: str):
+        """Mark the snapshot as freshly validated (restarts its TTL)."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("UPDATE snapshots SET fetched_at = ? WHERE key = ?", (time.time(), key))
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[local_cache] Could not touch snapshot: {e}")
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one snapshot (or all of them)."""
+        try:
+            with self._lock, self._connect() as conn:
+                if key is None:
+                    conn.execute("DELETE FROM snapshots")
+                else:
+                    conn.execute("DELETE FROM snapshots WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[local_cache] Could not invalidate snapshot: {e}")
+
+    def record(self, outcome: str):
+        """Increment one of the hit/miss counters."""
+        self.stats[outcome] = self.stats.get(outcome, 0) + 1
+
+    def hit_rate(self) -> float:
+        """Share of loads served without a full download (0-1)."""
+        served = self.stats['hits'] + self.stats['revalidated']
+        total = served + self.stats['misses']
+        return served / total if total else 0.0
+
+
+_cache: Optional[SnapshotCache] = None
+_cache_lock = threading.Lock()
+
+
+def get_snapshot_cache(ttl_seconds: Optional[float] = None) -> SnapshotCache:
+    """Process-wide snapshot cache (created on first use)."""
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = SnapshotCache(ttl_seconds=ttl_seconds or DEFAULT_TTL_SECONDS)
+        return _cache
@@ -0,0 +1,252 @@
+"""
+Page Registry
+=============
+Lazy page loading for the Streamlit app.
+
+streamlit_app used to import every page module at module top, so each cold
+start paid for plotly, fpdf, python-pptx/matplotlib, the LLM SDKs and the
+research stack even though a session only ever shows one page. Pages are
+now registered by module path and imported the first time they are
+selected:
+
+- ``PageRegistry.resolve`` imports a page's module on first use and keeps
+  the render function; later reruns (and other sessions) reuse it
+- ``optional_import`` is the same lazy import for helpers that pages use
+  (PPTX export, profile builder, research agent); failures are remembered
+  and reported instead of breaking the whole app
+- ``import_status`` lists what was imported lazily in this process and
+  what it cost
+
+The import profiler runs ``python -X importtime`` in a subprocess, so it
+measures cold import cost regardless of what this process already loaded.
+Settings shows both.
+
+Run ``python -m portfolio_manager.page_registry`` to profile the app's
+startup imports from the command line.
+"""
+
+import importlib
+import importlib.util
+import os
+import re
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from types import ModuleType
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+
+PACKAGE = __package__ or 'portfolio_manager'
+
+
+# =============================================================================
+# LAZY IMPORTS
+# =============================================================================
+
+_modules: Dict[str, Optional[ModuleType]] = {}
+_import_times: Dict[str, float] = {}
+_import_errors: Dict[str, str] = {}
+_import_lock = threading.Lock()
+
+
+def optional_import(name: str, package: str = PACKAGE) -> Optional[ModuleType]:
+    """
+    Import a module on first use; None if it (or a dependency) is missing.
+
+    Relative names (".pptx_export") resolve against the app package. The
+    outcome is cached, so a missing dependency is only attempted once.
+    """
+    full_name = importlib.util.resolve_name(name, package) if name.startswith('.') else name
+    with _import_lock:
+        if full_name in _modules:
+            return _modules[full_name]
+        started = time.perf_counter()
+        try:
+            module = importlib.import_module(full_name)
+        except ImportError as e:
+            module = None
+            _import_errors[full_name] = str(e)
+            print(f"[page_registry] {full_name} not available: {e}")
+        _import_times[full_name] = time.perf_counter() - started
+        _modules[full_name] = module
+        return module
+
+
+def import_error(name: str, package: str = PACKAGE) -> Optional[str]:
+    """Why optional_import(name) returned None (None if it succeeded or was never tried)."""
+    full_name = importlib.util.resolve_name(name, package) if name.startswith('.') else name
+    return _import_errors.get(full_name)
+
+
+def import_status() -> List[Dict[str, Any]]:
+    """Modules imported through optional_import in this process, slowest first."""
+    rows = [
+        {
+            'module': name,
+            'import_ms': round(_import_times.get(name, 0.0) * 1000, 1),
+            'status': 'error' if name in _import_errors else 'loaded',
+            'error': _import_errors.get(name, ''),
+        }
+        for name in _modules
+    ]
+    return sorted(rows, key=lambda row: row['import_ms'], reverse=True)
+
+
+# =============================================================================
+# PAGE REGISTRY
+# =============================================================================
+
+@dataclass
+class PageSpec:
+    """One navigation entry: either an in-app render function or a module + attribute."""
+    label: str
+    key: str
+    module: Optional[str] = None        # e.g. ".critical_path_page"
+    attr: Optional[str] = None          # render function in that module
+    render: Optional[Callable] = None   # already-imported render function
+    args: Tuple = ()
+    activity: Optional[str] = None      # Command Center node to log on view
+    hidden: bool = False                # routable but not shown in navigation
+    unavailable: str = ""               # message when the module can't be imported
+
+
+class PageRegistry:
+    """Ordered page table; page modules are imported on first resolve()."""
+
+    def __init__(self):
+        self._pages: Dict[str, PageSpec] = {}
+
+    def add(self, label: str, key: str, **kwargs) -> PageSpec:
+        spec = PageSpec(label=label, key=key, **kwargs)
+        self._pages[key] = spec
+        return spec
+
+    def get(self, key: str) -> Optional[PageSpec]:
+        return self._pages.get(key)
+
+    def labels(self) -> Dict[str, str]:
+        """Navigation label -> page key for the visible pages, in registration order."""
+        return {spec.label: spec.key for spec in self._pages.values() if not spec.hidden}
+
+    def lazy_modules(self) -> Dict[str, str]:
+        """Label -> absolute module name for the pages imported on demand."""
+        return {
+            spec.label: importlib.util.resolve_name(spec.module, PACKAGE) if spec.module.startswith('.') else spec.module
+            for spec in self._pages.values() if spec.module
+        }
+
+    def resolve(self, key: str) -> Tuple[Optional[Callable], Optional[str]]:
+        """(render function, None) or (None, error message)."""
+        spec = self._pages.get(key)
+        if spec is None:
+            return None, f"Unknown page: {key}"
+        if spec.render is not None:
+            return spec.render, None
+        module = optional_import(spec.module)
+        if module is None:
+            return None, spec.unavailable or f"{spec.label} is not available: {import_error(spec.module)}"
+        render = getattr(module, spec.attr, None)
+        if render is None:
+            return None, f"{spec.module} has no {spec.attr}()"
+        return render, None
+
+
+# =============================================================================
+# IMPORT-TIME PROFILER
+# =============================================================================
+
+_IMPORTTIME_LINE = re.compile(r'^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)')
+
+
+@dataclass
+class ImportRecord:
+    """One line of ``-X importtime`` output."""
+    module: str
+    self_ms: float
+    cumulative_ms: float
+    depth: int          # 1 = imported directly by the profiled statement
+
+
+def parse_importtime(output: str) -> List[ImportRecord]:
+    """Parse ``python -X importtime`` stderr into records (in import order)."""
+    records = []
+    for line in output.splitlines():
+        match = _IMPORTTIME_LINE.match(line)
+        if match:
+            records.append(ImportRecord(
+                module=match.group(4),
+                self_ms=int(match.group(1)) / 1000,
+                cumulative_ms=int(match.group(2)) / 1000,
+                depth=(len(match.group(3)) - 1) // 2 + 1,
+            ))
+    return records
+
+
+@dataclass
+class ImportProfile:
+    """Cold-import cost of a set of modules, measured in a fresh interpreter."""
+    modules: List[str]
+    records: List[ImportRecord] = field(default_factory=list)
+    wall_ms: float = 0.0
+    error: str = ""
+
+    @property
+    def total_ms(self) -> float:
+        """Cumulative cost of the profiled modules (interpreter startup excluded)."""
+        wanted = set(self.modules)
+        return sum(r.cumulative_ms for r in self.records if r.depth == 1 and r.module in wanted)
+
+    def top(self, limit: int = 25, max_depth: Optional[int] = None) -> List[ImportRecord]:
+        """Most expensive imports by cumulative time (optionally only the outer levels)."""
+        records = [r for r in self.records if max_depth is None or r.depth <= max_depth]
+        return sorted(records, key=lambda r: r.cumulative_ms, reverse=True)[:limit]
+
+    def by_package(self, prefix: str = PACKAGE) -> List[ImportRecord]:
+        """This app's own modules, slowest first."""
+        return sorted(
+            (r for r in self.records if r.module == prefix or r.module.startswith(prefix + '.')),
+            key=lambda r: r.cumulative_ms, reverse=True
+        )
+
+
+def profile_imports(modules: Sequence[str], timeout: float = 120) -> ImportProfile:
+    """
+    Import ``modules`` in a fresh ``python -X importtime`` subprocess.
+
+    Runs from the directory containing the app package so absolute
+    ``portfolio_manager.*`` names resolve as they do under ``streamlit run``.
+    """
+    modules = list(modules)
+    profile = ImportProfile(modules)
+    project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    env = dict(os.environ)
+    env['PYTHONPATH'] = os.pathsep.join(filter(None, [project_root, env.get('PYTHONPATH')]))
+    code = "; ".join(f"import {name}" for name in modules)
+    started = time.perf_counter()
+    try:
+        proc = subprocess.run(
+            [sys.executable, "-X", "importtime", "-c", code],
+            capture_output=True, text=True, cwd=project_root, env=env, timeout=timeout,
+        )
+    except (OSError, subprocess.TimeoutExpired) as e:
+        profile.error = str(e)
+        return profile
+    profile.wall_ms = (time.perf_counter() - started) * 1000
+    profile.records = parse_importtime(proc.stderr)
+    if proc.returncode != 0:
+        errors = [line for line in proc.stderr.splitlines() if not line.startswith('import time:')]
+        profile.error = errors[-1] if errors else f"exit code {proc.returncode}"
+    return profile
+
+
+if __name__ == "__main__":
+    targets = sys.argv[1:] or [f"{PACKAGE}.streamlit_app"]
+    result = profile_imports(targets)
+    if result.error:
+        print(f"Import failed: {result.error}")
+    print(f"Cold import of {', '.join(targets)}: {result.total_ms:.0f} ms "
+          f"({result.wall_ms:.0f} ms wall incl. interpreter start)")
+    for record in result.top(20, max_depth=3):
+        print(f"{record.cumulative_ms:9.1f} ms  {'  ' * (record.depth - 1)}{record.module}")
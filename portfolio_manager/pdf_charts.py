@@ -2,29 +2,39 @@
 """
 This module contains helper functions for generating charts and visualizations
 for the comprehensive portfolio PDF export using matplotlib.
+
+Each chart is returned as an in-memory PNG (BytesIO) from the chart render
+cache, so identical inputs are only drawn once and no temp files are left.
+Charts are drawn on pooled Agg figures (chart_render), not through pyplot.
 """
 
 import matplotlib
-matplotlib.use('Agg')  # Use non-interactive backend
-import matplotlib.pyplot as plt
 import matplotlib.patches as mpatches
 from matplotlib.patches import Rectangle, FancyBboxPatch
 import numpy as np
 from io import BytesIO
 from typing import Dict, List, Tuple
-import tempfile
 import os
 
+from .chart_cache import cached_chart
+from .chart_render import render_png, subplots
+
+
+def _png_bytes(fig) -> bytes:
+    """Lay out and render a pooled figure to PNG bytes."""
+    return render_png(fig, facecolor='white')
+
 
-def create_pie_chart(data: Dict[str, float], title: str, colors: List[str] = None) -> str:
-    """Create a pie chart and return the temporary file path."""
-    fig, ax = plt.subplots(figsize=(6, 6), facecolor='white')
+@cached_chart('pdf.pie')
+def create_pie_chart(data: Dict[str, float], title: str, colors: List[str] = None) -> BytesIO:
+    """Create a pie chart and return it as an in-memory PNG."""
+    fig, ax = subplots(6, 6)
     
     labels = list(data.keys())
     values = list(data.values())
     
     if colors is None:
-        colors = plt.cm.Set3(np.linspace(0, 1, len(labels)))
+        colors = matplotlib.colormaps['Set3'](np.linspace(0, 1, len(labels)))
     
     wedges, texts, autotexts = ax.pie(
         values, labels=labels, autopct='%1.1f%%',
@@ -38,20 +48,15 @@ def create_pie_chart(data: Dict[str, float], title: str, colors: List[str] = Non
         autotext.set_fontsize(9)
     
     ax.set_title(title, fontsize=14, weight='bold', pad=20)
-    plt.tight_layout()
     
-    # Save to temporary file
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-    plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    
-    return tmp_file.name
+    return _png_bytes(fig)
 
 
+@cached_chart('pdf.bar')
 def create_bar_chart(categories: List[str], values: List[float], title: str, 
-                      ylabel: str = "Value", color: str = '#3498db') -> str:
-    """Create a bar chart and return the temporary file path."""
-    fig, ax = plt.subplots(figsize=(8, 5), facecolor='white')
+                      ylabel: str = "Value", color: str = '#3498db') -> BytesIO:
+    """Create a bar chart and return it as an in-memory PNG."""
+    fig, ax = subplots(8, 5)
     
     x_pos = np.arange(len(categories))
     bars = ax.bar(x_pos, values, color=color, alpha=0.8, edgecolor='black', linewidth=0.5)
@@ -71,19 +76,14 @@ def create_bar_chart(categories: List[str], values: List[float], title: str,
     ax.grid(axis='y', alpha=0.3, linestyle='--')
     ax.set_axisbelow(True)
     
-    plt.tight_layout()
-    
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-    plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    
-    return tmp_file.name
+    return _png_bytes(fig)
 
 
+@cached_chart('pdf.horizontal_bar')
 def create_horizontal_bar_chart(labels: List[str], values: List[float], title: str,
-                                  max_value: float = 100, color: str = '#2ecc71') -> str:
+                                  max_value: float = 100, color: str = '#2ecc71') -> BytesIO:
     """Create horizontal bar chart for rankings."""
-    fig, ax = plt.subplots(figsize=(7, len(labels) * 0.5 + 1), facecolor='white')
+    fig, ax = subplots(7, len(labels) * 0.5 + 1)
     
     y_pos = np.arange(len(labels))
     bars = ax.barh(y_pos, values, color=color, alpha=0.8, edgecolor='black', linewidth=0.5)
@@ -103,19 +103,14 @@ def create_horizontal_bar_chart(labels: List[str], values: List[float], title: s
     ax.set_axisbelow(True)
     ax.invert_yaxis()  # Top score at top
     
-    plt.tight_layout()
-    
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-    plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    
-    return tmp_file.name
+    return _png_bytes(fig)
 
 
+@cached_chart('pdf.stacked_area')
 def create_stacked_area_chart(years: List[int], ic_data: List[float], gen_data: List[float], 
-                                title: str = "Capacity Trajectory") -> str:
+                                title: str = "Capacity Trajectory") -> BytesIO:
     """Create stacked area chart for capacity over time."""
-    fig, ax = plt.subplots(figsize=(10, 5), facecolor='white')
+    fig, ax = subplots(10, 5)
     
     ax.fill_between(years, 0, ic_data, alpha=0.6, color='#3498db', label='Interconnection MW')
     ax.fill_between(years, 0, gen_data, alpha=0.6, color='#e74c3c', label='Generation MW')
@@ -130,25 +125,20 @@ def create_stacked_area_chart(years: List[int], ic_data: List[float], gen_data:
     ax.grid(True, alpha=0.3, linestyle='--')
     ax.set_axisbelow(True)
     
-    plt.tight_layout()
-    
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-    plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    
-    return tmp_file.name
+    return _png_bytes(fig)
 
 
-def create_timeline_heatmap(years: List[int], mw_by_year: List[float], title: str = "Capacity Coming Online") -> str:
+@cached_chart('pdf.timeline_heatmap')
+def create_timeline_heatmap(years: List[int], mw_by_year: List[float], title: str = "Capacity Coming Online") -> BytesIO:
     """Create a timeline heatmap showing capacity additions by year."""
-    fig, ax = plt.subplots(figsize=(12, 2), facecolor='white')
+    fig, ax = subplots(12, 2)
     
     # Normalize values for color mapping
     max_val = max(mw_by_year) if mw_by_year else 1
     normalized = [v / max_val if max_val > 0 else 0 for v in mw_by_year]
     
     # Create colormap
-    cmap = plt.cm.RdYlGn_r  # Red (high) to Green (low)
+    cmap = matplotlib.colormaps['RdYlGn_r']  # Red (high) to Green (low)
     
     # Draw rectangles for each year
     for i, (year, val, norm_val) in enumerate(zip(years, mw_by_year, normalized)):
@@ -168,19 +158,14 @@ def create_timeline_heatmap(years: List[int], mw_by_year: List[float], title: st
     ax.set_title(title, fontsize=14, weight='bold', pad=30)
     ax.axis('off')
     
-    plt.tight_layout()
-    
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-    plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    
-    return tmp_file.name
+    return _png_bytes(fig)
 
 
+@cached_chart('pdf.progress_bars')
 def create_progress_bars(categories: List[str], values: List[float], max_val: float = 100,
-                          title: str = "Progress") -> str:
+                          title: str = "Progress") -> BytesIO:
     """Create visual progress bars for program tracker stages."""
-    fig, ax = plt.subplots(figsize=(8, len(categories) * 0.6 + 1), facecolor='white')
+    fig, ax = subplots(8, len(categories) * 0.6 + 1)
     
     y_pos = np.arange(len(categories))
     
@@ -214,17 +199,13 @@ def create_progress_bars(categories: List[str], values: List[float], max_val: fl
     ax.grid(axis='x', alpha=0.3, linestyle='--')
     ax.set_axisbelow(True)
     
-    plt.tight_layout()
-    
-    tmp_file = tempfile.NamedTemporaryFile(delete=False, suffix='.png')
-    plt.savefig(tmp_file.name, dpi=150, bbox_inches='tight', facecolor='white')
-    plt.close()
-    
-    return tmp_file.name
+    return _png_bytes(fig)
 
 
 def cleanup_temp_file(filepath: str):
-    """Remove temporary chart file."""
+    """Remove temporary chart file (no-op for in-memory charts)."""
+    if not isinstance(filepath, str):
+        return
     try:
         if os.path.exists(filepath):
             os.unlink(filepath)
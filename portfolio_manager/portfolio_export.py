@@ -12,8 +12,8 @@ import copy
 import io
 from typing import List, Dict, Any
 from datetime import datetime
-import matplotlib.pyplot as plt
 import numpy as np
+from matplotlib.ticker import FuncFormatter
 
 try:
     from pptx import Presentation
@@ -36,6 +36,7 @@ from .pptx_export import (
     add_critical_path_text, add_score_breakdown_text, add_market_text
 )
 from .program_tracker import calculate_portfolio_summary, ProgramTrackerData
+from .chart_render import render_png, subplots
 
 
 def copy_slide_from_external(source_slide, dest_prs):
@@ -568,20 +569,16 @@ def add_portfolio_metrics_slide(prs, sites, index=None):
 
     # Charts (Generated via Matplotlib)
     # 1. Pipeline by Stage
-    fig, ax = plt.subplots(figsize=(6, 4))
+    fig, ax = subplots(6, 4)
     stages = list(summary['by_stage'].keys())
     values = [sum(s['weighted'] for s in summary['by_stage'][stage]) for stage in stages]
     
     ax.bar(stages, values, color=[JLL_COLORS['teal'], JLL_COLORS['amber'], JLL_COLORS['light_blue'], JLL_COLORS['green']])
     ax.set_title('Weighted Value by Stage', fontsize=12, fontweight='bold', color=JLL_COLORS['dark_blue'])
-    ax.yaxis.set_major_formatter(plt.FuncFormatter(lambda x, p: f'${x/1e6:.0f}M'))
-    plt.xticks(rotation=45)
-    plt.tight_layout()
-    
-    img_stream = io.BytesIO()
-    plt.savefig(img_stream, format='png', dpi=150)
-    img_stream.seek(0)
-    plt.close()
+    ax.yaxis.set_major_formatter(FuncFormatter(lambda x, p: f'${x/1e6:.0f}M'))
+    ax.tick_params(axis='x', labelrotation=45)
+    
+    img_stream = io.BytesIO(render_png(fig, crop=False))
     
     slide.shapes.add_picture(img_stream, Inches(4.0), Inches(1.5), Inches(5.0), Inches(3.5))
     
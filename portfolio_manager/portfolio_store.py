@@ -0,0 +1,476 @@
+"""
+Portfolio Store
+===============
+One process-wide copy of the portfolio database, shared by every Streamlit
+session.
+
+run() used to call load_database() once per browser session, so every
+session restored (or downloaded) its own full copy of the portfolio, and a
+save in one session was invisible to the others until they happened to
+reload. The store keeps one immutable snapshot per portfolio version and
+gives each session a copy-on-write view of it:
+
+- ``PortfolioStore.current`` returns the latest snapshot. It is loaded once
+  per process and its remote revision is checked at most once per TTL,
+  however many sessions are open
+- ``checkout`` wraps a snapshot in a ``SessionPortfolio``. Metadata and
+  utilities are copied; site records stay shared until the session writes
+  to one (or takes a container out of it with ``sites[site_id]``), at
+  which point only that record is cloned. Reads never copy
+- ``commit`` rebases a session's edits (sites it changed, added or removed
+  and the top-level entries it modified) onto the latest snapshot, runs the
+  save and publishes the result as the next version. Other sessions pick
+  it up on their next rerun
+
+Published snapshots are never mutated, so memory grows with the number of
+live versions (normally one) plus the records sessions actually edited,
+not with the number of sessions. An old version is released once no
+session view refers to it any more.
+"""
+
+import copy
+import threading
+import time
+import weakref
+from collections import Counter
+from collections.abc import ItemsView, Mapping, MutableMapping, ValuesView
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, Optional, Set, Tuple
+
+from .site_record import SiteRecord
+
+
+DEFAULT_TTL_SECONDS = 300
+
+_ATOMIC = (str, bytes, int, float, bool, type(None))
+
+
+def isolate(value: Any) -> Any:
+    """Deep copy of a container value; immutable values are shared as-is."""
+    return value if isinstance(value, _ATOMIC) else copy.deepcopy(value)
+
+
+def clone_site(site: Any) -> Any:
+    """Private, editable copy of one site record."""
+    if isinstance(site, SharedSite):
+        return site.copy()
+    if isinstance(site, SiteRecord):
+        return site.isolated_copy()
+    return copy.deepcopy(site)
+
+
+def sites_equal(a: Any, b: Any) -> bool:
+    """Same site content? Compares undecoded JSON columns without decoding them."""
+    if isinstance(a, SiteRecord) and isinstance(b, SiteRecord):
+        if set(a) != set(b):
+            return False
+        for key in a:
+            raw_a, raw_b = a.raw_json(key), b.raw_json(key)
+            if raw_a is not None and raw_a == raw_b:
+                continue
+            if a.peek(key) != b.peek(key):
+                return False
+        return True
+    plain_a = dict(a.items()) if isinstance(a, Mapping) else a
+    plain_b = dict(b.items()) if isinstance(b, Mapping) else b
+    return plain_a == plain_b
+
+
+# =============================================================================
+# SNAPSHOTS AND SESSION VIEWS
+# =============================================================================
+
+@dataclass
+class PortfolioSnapshot:
+    """One published version of the database. Never mutated after publish."""
+    version: int
+    db: Dict[str, Any]
+    revision: str           # Metadata last_updated at load/commit
+    source: str             # 'load' or 'commit'
+    created_at: float = field(default_factory=time.time)
+    checked_at: float = field(default_factory=time.time)
+
+    def age(self) -> float:
+        """Seconds since the remote revision was last confirmed."""
+        return time.time() - self.checked_at
+
+
+class SharedSite(MutableMapping):
+    """
+    Session handle on a site record that may still be shared.
+
+    Reads go straight to the shared record. The first write (set, delete,
+    update, pop...) clones the record into the session and applies the
+    write there. Handles from ``sites[site_id]`` also clone when a
+    container value (phases, non_power, ...) is read, since the caller may
+    edit it in place. Handles from ``get``/``values``/``items`` are for
+    reading: container values they return are private copies, so an
+    in-place edit can never reach the shared snapshot.
+    """
+
+    __slots__ = ('_sites', '_site_id', '_editable')
+
+    def __init__(self, sites: 'SessionSites', site_id: str, editable: bool):
+        self._sites = sites
+        self._site_id = site_id
+        self._editable = editable
+
+    def _record(self) -> Any:
+        """The session's own copy if it has one, else the shared record."""
+        return self._sites._record(self._site_id)
+
+    def _owned(self) -> Any:
+        return self._sites._own_copy(self._site_id)
+
+    def __getitem__(self, key: str) -> Any:
+        record = self._record()
+        if self._site_id in self._sites._own:
+            return record[key]
+        if key not in record:
+            raise KeyError(key)
+        if isinstance(record, SiteRecord) and record.raw_json(key) is not None:
+            # Undecoded JSON column: peek decodes a fresh object without memoizing
+            return self._owned()[key] if self._editable else record.peek(key)
+        value = record[key]
+        if isinstance(value, _ATOMIC):
+            return value
+        return self._owned()[key] if self._editable else isolate(value)
+
+    def __setitem__(self, key: str, value: Any):
+        self._owned()[key] = value
+
+    def __delitem__(self, key: str):
+        del self._owned()[key]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._record())
+
+    def __len__(self) -> int:
+        return len(self._record())
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._record()
+
+    def __getattr__(self, name: str) -> Any:
+        # SiteRecord helpers (peek, raw_json, ...) on whichever record is current
+        if name.startswith('_'):
+            raise AttributeError(name)
+        return getattr(self._record(), name)
+
+    def __deepcopy__(self, memo: Dict[int, Any]) -> Any:
+        return self.copy()
+
+    def __repr__(self) -> str:
+        state = 'cloned' if self._site_id in self._sites._own else 'shared'
+        return f"SharedSite({self._site_id!r}, {state})"
+
+    def copy(self) -> Any:
+        """Independent, editable copy (not attached to the session)."""
+        return clone_site(self._record())
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully decoded plain dict, detached from the shared record."""
+        plain = self.copy()
+        return plain.to_dict() if isinstance(plain, SiteRecord) else dict(plain)
+
+
+class _SiteItems(ItemsView):
+    def __iter__(self):
+        for site_id in self._mapping:
+            yield site_id, self._mapping._reader(site_id)
+
+
+class _SiteValues(ValuesView):
+    def __iter__(self):
+        for site_id in self._mapping:
+            yield self._mapping._reader(site_id)
+
+
+class SessionSites(MutableMapping):
+    """
+    Copy-on-write view of a snapshot's sites.
+
+    Sites the session has not written to are handed out as ``SharedSite``
+    handles over the shared record; the first write clones just that
+    record into the session. Membership tests, iteration and len() never
+    clone. Deletions are tracked as ids.
+    """
+
+    def __init__(self, base: Dict[str, Any]):
+        self._base = base
+        self._own: Dict[str, Any] = {}
+        self._deleted: Set[str] = set()
+
+    def _record(self, site_id: str) -> Any:
+        if site_id in self._own:
+            return self._own[site_id]
+        if site_id in self._deleted or site_id not in self._base:
+            raise KeyError(site_id)
+        return self._base[site_id]
+
+    def _own_copy(self, site_id: str) -> Any:
+        if site_id not in self._own:
+            self._own[site_id] = clone_site(self._record(site_id))
+        return self._own[site_id]
+
+    def _handle(self, site_id: str, editable: bool) -> Any:
+        if site_id in self._own:
+            return self._own[site_id]
+        self._record(site_id)   # KeyError for unknown / deleted ids
+        return SharedSite(self, site_id, editable)
+
+    def _reader(self, site_id: str) -> Any:
+        return self._handle(site_id, editable=False)
+
+    def __getitem__(self, site_id: str) -> Any:
+        return self._handle(site_id, editable=True)
+
+    def get(self, site_id: str, default: Any = None) -> Any:
+        return self._reader(site_id) if site_id in self else default
+
+    def items(self) -> ItemsView:
+        return _SiteItems(self)
+
+    def values(self) -> ValuesView:
+        return _SiteValues(self)
+
+    def __setitem__(self, site_id: str, site: Any):
+        if isinstance(site, SharedSite):
+            if site._sites is self and site._site_id == site_id and site_id in self:
+                return      # the handle already is this site
+            site = site.copy()
+        self._own[site_id] = site
+        self._deleted.discard(site_id)
+
+    def __delitem__(self, site_id: str):
+        if site_id not in self:
+            raise KeyError(site_id)
+        self._own.pop(site_id, None)
+        if site_id in self._base:
+            self._deleted.add(site_id)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from (k for k in self._base if k not in self._deleted)
+        yield from (k for k in self._own if k not in self._base)
+
+    def __len__(self) -> int:
+        added = sum(1 for k in self._own if k not in self._base)
+        return len(self._base) - len(self._deleted) + added
+
+    def __contains__(self, site_id: object) -> bool:
+        return site_id in self._own or (site_id in self._base and site_id not in self._deleted)
+
+    def __repr__(self) -> str:
+        return f"SessionSites({len(self)} sites, {len(self._own)} cloned, {len(self._deleted)} deleted)"
+
+    def copy(self) -> Dict[str, Any]:
+        return dict(self.items())
+
+    @property
+    def cloned(self) -> int:
+        """Records this session holds a private copy of."""
+        return len(self._own)
+
+    def changes(self) -> Tuple[Dict[str, Any], Set[str]]:
+        """(site_id -> record for sites added or edited, ids removed) relative to the base."""
+        changed = {
+            site_id: site for site_id, site in self._own.items()
+            if site_id not in self._base or not sites_equal(site, self._base[site_id])
+        }
+        return changed, set(self._deleted)
+
+
+class SessionPortfolio(dict):
+    """A session's working copy of one snapshot; used exactly like the plain db dict."""
+
+    def __init__(self, snapshot: PortfolioSnapshot):
+        super().__init__({k: isolate(v) for k, v in snapshot.db.items() if k != 'sites'})
+        self['sites'] = SessionSites(snapshot.db.get('sites', {}))
+        self.snapshot = snapshot
+
+    @property
+    def version(self) -> int:
+        return self.snapshot.version
+
+    __hash__ = object.__hash__      # needed for the store's WeakSet
+
+
+# =============================================================================
+# STORE
+# =============================================================================
+
+class PortfolioStore:
+    """Versioned, process-wide portfolio database with per-session views."""
+
+    def __init__(self, ttl_seconds: float = DEFAULT_TTL_SECONDS):
+        self.ttl_seconds = ttl_seconds
+        self._snapshot: Optional[PortfolioSnapshot] = None
+        self._next_version = 1
+        # Held across load/save so concurrent sessions never publish out of order
+        self._lock = threading.RLock()
+        self._views: 'weakref.WeakSet[SessionPortfolio]' = weakref.WeakSet()
+        self.stats = {'loads': 0, 'revalidations': 0, 'checkouts': 0,
+                      'commits': 0, 'rebased': 0, 'invalidations': 0}
+
+    @property
+    def version(self) -> int:
+        return self._snapshot.version if self._snapshot else 0
+
+    def current(
+        self,
+        load: Callable[[bool], Dict[str, Any]],
+        remote_revision: Optional[Callable[[], str]] = None,
+        revalidate: bool = False,
+        force_refresh: bool = False,
+    ) -> PortfolioSnapshot:
+        """
+        Latest snapshot, loading or revalidating it if needed.
+
+        Args:
+            load: Called with ``force_refresh`` to build the db dict
+            remote_revision: Cheap remote revision read, used once the TTL expires
+            revalidate: Check the remote revision now instead of waiting for the TTL
+            force_refresh: Reload even if the snapshot is current
+        """
+        with self._lock:
+            snapshot = self._snapshot
+            if snapshot is None or force_refresh:
+                return self._publish(load(force_refresh), 'load')
+            if remote_revision is None or (not revalidate and snapshot.age() < self.ttl_seconds):
+                return snapshot
+            self.stats['revalidations'] += 1
+            try:
+                revision = remote_revision()
+            except Exception as e:
+                print(f"[portfolio_store] Revision check failed, keeping v{snapshot.version}: {e}")
+                snapshot.checked_at = time.time()
+                return snapshot
+            if revision == snapshot.revision:
+                snapshot.checked_at = time.time()
+                return snapshot
+            print(f"[portfolio_store] Remote revision changed ({snapshot.revision!r} -> {revision!r}), reloading")
+            return self._publish(load(True), 'load')
+
+    def checkout(self, snapshot: Optional[PortfolioSnapshot] = None) -> SessionPortfolio:
+        """New session view of ``snapshot`` (default: the latest one)."""
+        snapshot = snapshot or self._snapshot
+        if snapshot is None:
+            raise RuntimeError("Portfolio store is empty; call current() first")
+        view = SessionPortfolio(snapshot)
+        with self._lock:
+            self._views.add(view)
+            self.stats['checkouts'] += 1
+        return view
+
+    def is_current(self, db: Any) -> bool:
+        """True if ``db`` is a view of the latest version."""
+        return isinstance(db, SessionPortfolio) and self._snapshot is not None \
+            and db.version == self._snapshot.version
+
+    def commit(self, db: Dict[str, Any], save: Callable[[Dict[str, Any]], None]) -> PortfolioSnapshot:
+        """
+        Merge a session's edits into the latest version, save it, publish it.
+
+        ``db`` may be a SessionPortfolio (only its edits are applied) or a
+        plain dict (treated as a full replacement, e.g. an imported backup).
+        ``save`` receives the merged db and writes it out; if it raises,
+        nothing is published.
+        """
+        with self._lock:
+            merged = self.rebase(db)
+            save(merged)
+            self.stats['commits'] += 1
+            return self._publish(merged, 'commit')
+
+    def rebase(self, db: Dict[str, Any]) -> Dict[str, Any]:
+        """The db dict that results from applying ``db``'s edits to the latest version."""
+        with self._lock:
+            latest = self._snapshot
+            if not isinstance(db, SessionPortfolio) or latest is None:
+                return self._detached_copy(db)
+            if db.version != latest.version:
+                self.stats['rebased'] += 1
+            base = db.snapshot.db
+            merged = dict(latest.db)
+
+            session_sites = db.get('sites')
+            if isinstance(session_sites, SessionSites) and session_sites._base is base.get('sites'):
+                sites = dict(latest.db.get('sites', {}))
+                changed, deleted = session_sites.changes()
+                for site_id in deleted:
+                    sites.pop(site_id, None)
+                for site_id, site in changed.items():
+                    sites[site_id] = clone_site(site)
+                merged['sites'] = sites
+            else:
+                # The page replaced db['sites'] wholesale
+                merged['sites'] = {k: clone_site(v) for k, v in (session_sites or {}).items()}
+
+            for key in (set(base) | set(db)) - {'sites'}:
+                if key not in db:
+                    merged.pop(key, None)
+                elif key not in base or db[key] != base[key]:
+                    merged[key] = self._merge_entry(base.get(key), db[key], latest.db.get(key))
+            return merged
+
+    def invalidate(self):
+        """Drop the current snapshot; the next current() call reloads."""
+        with self._lock:
+            self._snapshot = None
+            self.stats['invalidations'] += 1
+
+    def metrics(self) -> Dict[str, Any]:
+        """Version, live sessions per version and copy-on-write counters."""
+        with self._lock:
+            views = list(self._views)
+            snapshot = self._snapshot
+        per_version = Counter(view.version for view in views)
+        cloned = sum(
+            view['sites'].cloned for view in views if isinstance(view.get('sites'), SessionSites)
+        )
+        return {
+            'version': snapshot.version if snapshot else 0,
+            'sites': len(snapshot.db.get('sites', {})) if snapshot else 0,
+            'revision': snapshot.revision if snapshot else '',
+            'age_seconds': snapshot.age() if snapshot else 0.0,
+            'sessions': len(views),
+            'sessions_per_version': dict(sorted(per_version.items())),
+            'cloned_records': cloned,
+            **self.stats,
+        }
+
+    # -- internals -----------------------------------------------------------
+
+    def _publish(self, db: Dict[str, Any], source: str) -> PortfolioSnapshot:
+        if source == 'load':
+            self.stats['loads'] += 1
+        snapshot = PortfolioSnapshot(
+            version=self._next_version,
+            db=db,
+            revision=str(db.get('metadata', {}).get('last_updated', '')),
+            source=source,
+        )
+        self._next_version += 1
+        self._snapshot = snapshot
+        return snapshot
+
+    @staticmethod
+    def _detached_copy(db: Dict[str, Any]) -> Dict[str, Any]:
+        out = {k: isolate(v) for k, v in db.items() if k != 'sites'}
+        out['sites'] = {k: clone_site(v) for k, v in db.get('sites', {}).items()}
+        return out
+
+    @staticmethod
+    def _merge_entry(base: Any, mine: Any, latest: Any) -> Any:
+        """Top-level entry: per-key merge for dicts (utilities, metadata), else last writer wins."""
+        if not (isinstance(base, dict) and isinstance(mine, dict) and isinstance(latest, dict)):
+            return isolate(mine)
+        merged = dict(latest)
+        for key, value in mine.items():
+            if key not in base or value != base[key]:
+                merged[key] = isolate(value)
+        for key in base:
+            if key not in mine:
+                merged.pop(key, None)
+        return merged
+
@@ -25,7 +25,6 @@ Diagnostic Sections Captured:
 import os
 import io
 import json
-import tempfile
 from datetime import datetime
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field
@@ -33,10 +32,8 @@ from copy import deepcopy
 
 # For chart generation
 try:
-    import matplotlib
-    matplotlib.use('Agg')
-    import matplotlib.pyplot as plt
     import matplotlib.dates as mdates
+    from matplotlib.patches import Circle
     from matplotlib.ticker import MaxNLocator
     import numpy as np
     MATPLOTLIB_AVAILABLE = True
@@ -49,6 +46,9 @@ try:
 except ImportError:
     PANDAS_AVAILABLE = False
 
+from .chart_cache import render_cached
+from .chart_render import new_figure, save_figure, style_axes, subplots
+
 # Import Triage Module
 try:
     from .triage import add_all_intelligence_slides
@@ -634,7 +634,7 @@ def generate_capacity_trajectory_chart(
     if not MATPLOTLIB_AVAILABLE:
         raise ImportError("matplotlib required")
 
-    fig, ax = plt.subplots(figsize=(width, height), facecolor='white')
+    fig, ax = subplots(width, height)
     ax.set_facecolor('white')
 
     dates = [datetime(year, 1, 1) for year in trajectory.years]
@@ -670,16 +670,16 @@ def generate_capacity_trajectory_chart(
     ax.grid(True, axis='x', linestyle='-', alpha=0.2, color=JLL_COLORS['medium_gray'])
     ax.legend(loc='upper left', frameon=True, framealpha=0.9, fontsize=10)
 
-    for spine in ['top', 'right']:
-        ax.spines[spine].set_visible(False)
-    ax.spines['left'].set_color(JLL_COLORS['medium_gray'])
-    ax.spines['bottom'].set_color(JLL_COLORS['medium_gray'])
-    ax.tick_params(colors=JLL_COLORS['dark_gray'])
+    style_axes(ax, spine_color=JLL_COLORS['medium_gray'], tick_color=JLL_COLORS['dark_gray'])
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
-    plt.close()
-    return output_path
+    return save_figure(fig, output_path, facecolor='white', edgecolor='none')
+
+
+# site_data keys drawn by generate_critical_path_chart (its cache key)
+INFRASTRUCTURE_READINESS_FIELDS = (
+    'power_stage', 'site_control_stage', 'zoning_stage', 'water_stage',
+    'fiber_available', 'environmental_complete',
+)
 
 
 def generate_critical_path_chart(
@@ -693,7 +693,7 @@ def generate_critical_path_chart(
     if not MATPLOTLIB_AVAILABLE:
         raise ImportError("matplotlib required")
 
-    fig, ax = plt.subplots(figsize=(width, height), facecolor='white')
+    fig, ax = subplots(width, height)
     
     ax.set_title('Infrastructure Readiness', fontsize=14, fontweight='bold',
                   color=JLL_COLORS['dark_blue'], loc='left', pad=10)
@@ -719,14 +719,10 @@ def generate_critical_path_chart(
     ax.set_yticks(y_positions)
     ax.set_yticklabels([c[0] for c in categories], fontsize=10)
     ax.set_xlim(0, 115)
-    for spine in ['top', 'right', 'bottom']:
-        ax.spines[spine].set_visible(False)
+    style_axes(ax, hide_spines=('top', 'right', 'bottom'))
     ax.tick_params(bottom=False, labelbottom=False)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
-    plt.close()
-    return output_path
+    return save_figure(fig, output_path, facecolor='white', edgecolor='none')
 
 
 def generate_score_radar_chart(scores: ScoreAnalysis, site_name: str, output_path: str,
@@ -743,7 +739,7 @@ def generate_score_radar_chart(scores: ScoreAnalysis, site_name: str, output_pat
     values_closed = values + values[:1]
     angles_closed = angles + angles[:1]
 
-    fig, ax = plt.subplots(figsize=(width, height), subplot_kw=dict(polar=True), facecolor='white')
+    fig, ax = subplots(width, height, polar=True)
     
     # Fill area
     ax.fill(angles_closed, values_closed, color=JLL_COLORS['teal'], alpha=0.25)
@@ -761,10 +757,7 @@ def generate_score_radar_chart(scores: ScoreAnalysis, site_name: str, output_pat
     ax.set_yticklabels(['25', '50', '75', '100'], fontsize=8, color=JLL_COLORS['medium_gray'])
     ax.grid(True, color=JLL_COLORS['medium_gray'], alpha=0.3)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
-    plt.close()
-    return output_path
+    return save_figure(fig, output_path, facecolor='white', edgecolor='none')
 
 
 def generate_score_summary_chart(scores: ScoreAnalysis, site_name: str, output_path: str,
@@ -773,7 +766,7 @@ def generate_score_summary_chart(scores: ScoreAnalysis, site_name: str, output_p
     if not MATPLOTLIB_AVAILABLE:
         raise ImportError("matplotlib required")
 
-    fig = plt.figure(figsize=(width, height), facecolor='white')
+    fig = new_figure(width, height)
     gs = fig.add_gridspec(1, 2, width_ratios=[1.2, 1], wspace=0.3)
 
     # Left: Radar chart
@@ -812,7 +805,7 @@ def generate_score_summary_chart(scores: ScoreAnalysis, site_name: str, output_p
     # Score circle
     score_color = JLL_COLORS['green'] if scores.overall_score >= 70 else (
         JLL_COLORS['amber'] if scores.overall_score >= 50 else JLL_COLORS['red'])
-    circle = plt.Circle((0.5, 0.75), 0.15, color=score_color, alpha=0.2, transform=ax2.transAxes)
+    circle = Circle((0.5, 0.75), 0.15, color=score_color, alpha=0.2, transform=ax2.transAxes)
     ax2.add_patch(circle)
     ax2.text(0.5, 0.75, f'{scores.overall_score:.0f}', fontsize=36, fontweight='bold',
             color=score_color, ha='center', va='center', transform=ax2.transAxes)
@@ -850,10 +843,7 @@ def generate_score_summary_chart(scores: ScoreAnalysis, site_name: str, output_p
         ax2.text(0.8, y_pos, f'{weight*100:.0f}%', fontsize=10, va='center', ha='center',
                 color=JLL_COLORS['medium_gray'], transform=ax2.transAxes)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
-    plt.close()
-    return output_path
+    return save_figure(fig, output_path, facecolor='white', edgecolor='none')
 
 
 def generate_market_analysis_chart(market_data: Dict, site_name: str, output_path: str,
@@ -864,7 +854,7 @@ def generate_market_analysis_chart(market_data: Dict, site_name: str, output_pat
     if not MATPLOTLIB_AVAILABLE:
         raise ImportError("matplotlib required")
 
-    fig, ax1 = plt.subplots(figsize=(width, height), facecolor='white')
+    fig, ax1 = subplots(width, height)
     
     ax1.set_title('New Generation Capacity: State Comparison', fontsize=11, fontweight='bold',
                   color=JLL_COLORS['dark_blue'], loc='left', pad=8)
@@ -923,10 +913,7 @@ def generate_market_analysis_chart(market_data: Dict, site_name: str, output_pat
     ax1.legend(lines1 + lines2, labels1 + labels2, loc='upper center', 
                bbox_to_anchor=(0.5, -0.15), ncol=2, fontsize=8, frameon=False)
 
-    plt.tight_layout()
-    plt.savefig(output_path, dpi=150, bbox_inches='tight', facecolor='white', edgecolor='none')
-    plt.close()
-    return output_path
+    return save_figure(fig, output_path, facecolor='white', edgecolor='none')
 
 
 # =============================================================================
@@ -1602,7 +1589,7 @@ def export_site_to_pptx(
     output_path: str,
     config: ExportConfig = None,
 ) -> str:
-    """Export site data to PowerPoint."""
+    """Export site data to PowerPoint (output_path may also be a binary file object)."""
     print(f"[DEBUG] export_site_to_pptx called with template_path='{template_path}', output_path='{output_path}'")
     
     if not template_path:
@@ -1620,7 +1607,7 @@ def export_site_to_pptx(
         raise ImportError("python-pptx required")
 
     config = config or ExportConfig()
-    prs = Presentation(template_path)
+    prs = open_template(template_path)
     replacements = build_replacements(site_data, config)
     
     # Check if we have structured profile data
@@ -1835,14 +1822,15 @@ def export_site_to_pptx(
         add_header_bar(slide, f"{site_data.get('name', 'Site')}: Capacity Trajectory",
                       Inches, Pt, RGBColor)
 
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            chart_path = tmp.name
-        print(f"[DEBUG] Generating trajectory chart at {chart_path}")
-        generate_capacity_trajectory_chart(trajectory, site_data.get('name', 'Site'),
-                                           chart_path, phases, subtitle=config.chart_subtitle)
-        slide.shapes.add_picture(chart_path, Inches(0.4), Inches(0.8), width=Inches(12.5))
+        site_name = site_data.get('name', 'Site')
+        chart_png = render_cached(
+            'pptx.capacity_trajectory', (trajectory, site_name, phases, config.chart_subtitle),
+            lambda out: generate_capacity_trajectory_chart(trajectory, site_name, out, phases,
+                                                           subtitle=config.chart_subtitle),
+            style=JLL_COLORS,
+        )
+        slide.shapes.add_picture(chart_png, Inches(0.4), Inches(0.8), width=Inches(12.5))
         add_footer(slide, 5, Inches, Pt, RGBColor)
-        os.unlink(chart_path)
 
     # ADD SLIDE: Infrastructure & Critical Path (WHITE background)
     if config.include_infrastructure and MATPLOTLIB_AVAILABLE:
@@ -1853,12 +1841,14 @@ def export_site_to_pptx(
         
         add_header_bar(slide, "Infrastructure & Critical Path", Inches, Pt, RGBColor)
 
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            infra_path = tmp.name
-        print(f"[DEBUG] Generating infra chart at {infra_path}")
         # Generate Infrastructure Chart (Right side)
-        generate_critical_path_chart(phases, site_data, infra_path, width=6, height=5)
-        slide.shapes.add_picture(infra_path, Inches(6.8), Inches(1.5), width=Inches(6.0))
+        readiness = {key: site_data.get(key) for key in INFRASTRUCTURE_READINESS_FIELDS}
+        infra_png = render_cached(
+            'pptx.infrastructure_readiness', readiness,
+            lambda out: generate_critical_path_chart(phases, site_data, out, width=6, height=5),
+            style=JLL_COLORS,
+        )
+        slide.shapes.add_picture(infra_png, Inches(6.8), Inches(1.5), width=Inches(6.0))
         
         # Add Critical Path Text (Left side)
         add_critical_path_text(slide, phases)
@@ -1881,7 +1871,6 @@ def export_site_to_pptx(
             p.font.color.rgb = RGBColor.from_string(JLL_COLORS['medium_gray'][1:])
 
         add_footer(slide, 6, Inches, Pt, RGBColor)
-        os.unlink(infra_path)
 
     # ADD SLIDE: Score Analysis (WHITE background)
     if config.include_score_analysis and MATPLOTLIB_AVAILABLE:
@@ -1904,17 +1893,18 @@ def export_site_to_pptx(
             fiber_score=scores_data.get('fiber', 0),
         )
         
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            score_path = tmp.name
-        print(f"[DEBUG] Generating score chart at {score_path}")
-        generate_score_radar_chart(scores, site_data.get('name', 'Site'), score_path, width=6, height=6)
-        slide.shapes.add_picture(score_path, Inches(0.5), Inches(1.5), width=Inches(6.0))
+        site_name = site_data.get('name', 'Site')
+        score_png = render_cached(
+            'pptx.score_radar', (scores, site_name),
+            lambda out: generate_score_radar_chart(scores, site_name, out, width=6, height=6),
+            style=JLL_COLORS,
+        )
+        slide.shapes.add_picture(score_png, Inches(0.5), Inches(1.5), width=Inches(6.0))
         
         # Add Score Breakdown Text (Right side)
         add_score_breakdown_text(slide, scores)
         
         add_footer(slide, 7, Inches, Pt, RGBColor)
-        os.unlink(score_path)
 
     # ADD SLIDE: Market Analysis (WHITE background)
     if config.include_market_analysis and MATPLOTLIB_AVAILABLE:
@@ -2005,19 +1995,19 @@ def export_site_to_pptx(
             'incentives': market_raw.get('incentives', defaults.get('incentives', [])),
         }
         
-        with tempfile.NamedTemporaryFile(suffix='.png', delete=False) as tmp:
-            market_path = tmp.name
-            
-        print(f"[DEBUG] Generating market chart at {market_path}")
         # Generate Market Chart (Top Left)
-        generate_market_analysis_chart(market_data, site_data.get('name', 'Site'), market_path, width=6, height=3.5)
-        slide.shapes.add_picture(market_path, Inches(0.5), Inches(1.5), width=Inches(6.0))
+        site_name = site_data.get('name', 'Site')
+        market_png = render_cached(
+            'pptx.market_analysis', (market_data, site_name),
+            lambda out: generate_market_analysis_chart(market_data, site_name, out, width=6, height=3.5),
+            style=JLL_COLORS,
+        )
+        slide.shapes.add_picture(market_png, Inches(0.5), Inches(1.5), width=Inches(6.0))
         
         # Add Market Text Quadrants
         add_market_text(slide, market_data)
         
         add_footer(slide, 8, Inches, Pt, RGBColor)
-        os.unlink(market_path)
 
     # REORDER: Move Thank You to end
     def move_slide_to_end(prs, slide_index):
@@ -2041,21 +2031,158 @@ def export_site_to_pptx(
     return output_path
 
 
-def export_multiple_sites(sites: List[Dict], template_path: str,
-                          output_dir: str, config: ExportConfig = None) -> List[str]:
-    """Export multiple sites."""
+# =============================================================================
+# PORTFOLIO EXPORT PIPELINE
+# =============================================================================
+
+# (absolute path, mtime) -> template file bytes, read once per process
+_template_cache: Dict[Tuple[str, float], bytes] = {}
+
+
+def open_template(template_path: str):
+    """Open the template as a fresh Presentation from bytes cached per process."""
+    from pptx import Presentation
+
+    key = (os.path.abspath(template_path), os.path.getmtime(template_path))
+    data = _template_cache.get(key)
+    if data is None:
+        with open(template_path, 'rb') as f:
+            data = f.read()
+        _template_cache.clear()
+        _template_cache[key] = data
+    return Presentation(io.BytesIO(data))
+
+
+def _init_export_worker(template_path: str):
+    """Pool initializer: load the template bytes once per worker."""
+    try:
+        open_template(template_path)
+    except Exception as e:
+        print(f"[pptx_export] Worker could not preload template: {e}")
+
+
+def _export_site_job(job: Tuple[str, Dict, str, ExportConfig]) -> Dict[str, Any]:
+    """Render one site's deck (charts included) into memory. Runs in a pool worker."""
+    site_id, site_data, template_path, config = job
+    result = {'site_id': site_id, 'filename': f"{site_id}_profile.pptx", 'data': None, 'error': None}
+    try:
+        buffer = io.BytesIO()
+        export_site_to_pptx(site_data, template_path, buffer, config)
+        result['data'] = buffer.getvalue()
+    except Exception as e:
+        result['error'] = str(e)
+    return result
+
+
+def iter_site_exports(
+    sites: List[Tuple[str, Dict]],
+    template_path: str,
+    config: ExportConfig = None,
+    workers: Optional[int] = None,
+):
+    """
+    Export (site_id, site_data) pairs in a process pool, yielding each result
+    as soon as its deck is finished (completion order, not input order).
+
+    Each result is {site_id, filename, data (pptx bytes), error}. workers=1 (or
+    a platform without process spawning) exports in-process.
+    """
+    from concurrent.futures import ProcessPoolExecutor, as_completed
+
     config = config or ExportConfig()
-    os.makedirs(output_dir, exist_ok=True)
-    output_paths = []
-    for site in sites:
-        site_id = site.get('site_id', 'site')
-        output_path = os.path.join(output_dir, f"{site_id}_profile.pptx")
+    jobs = [(site_id, site_data, template_path, config) for site_id, site_data in sites]
+    if not jobs:
+        return
+
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    pool = None
+    if workers > 1:
         try:
-            export_site_to_pptx(site, template_path, output_path, config)
-            output_paths.append(output_path)
+            pool = ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_export_worker,
+                initargs=(template_path,),
+            )
         except Exception as e:
-            print(f"Error exporting {site_id}: {e}")
-    return output_paths
+            print(f"[pptx_export] Process pool unavailable, exporting serially: {e}")
+
+    if pool is None:
+        for job in jobs:
+            yield _export_site_job(job)
+        return
+
+    with pool:
+        futures = {pool.submit(_export_site_job, job): job for job in jobs}
+        for future in as_completed(futures):
+            # Drop finished futures (and their deck bytes) as we go
+            job = futures.pop(future)
+            try:
+                result = future.result()
+            except Exception as e:
+                # Worker died or the job could not be pickled; retry in-process
+                print(f"[pptx_export] Pool export failed for {job[0]} ({e}), retrying in-process")
+                result = _export_site_job(job)
+            yield result
+
+
+def export_sites_to_zip(
+    sites: Dict[str, Dict],
+    template_path: str,
+    zip_target,
+    config: ExportConfig = None,
+    workers: Optional[int] = None,
+    progress=None,
+) -> Dict[str, Any]:
+    """
+    Export every site's deck into one zip archive.
+
+    Decks are written into the zip as they finish, so only the decks in flight
+    are held in memory.
+
+    Args:
+        sites: site_id -> site_data (as passed to export_site_to_pptx)
+        template_path: PPTX template
+        zip_target: Output path or writable binary file object
+        config: Export options shared by every site
+        workers: Pool size (defaults to os.cpu_count())
+        progress: Optional callback(done, total, site_id, error)
+
+    Returns:
+        {'files': [filenames written], 'errors': {site_id: message}}
+    """
+    import zipfile
+
+    total = len(sites)
+    summary = {'files': [], 'errors': {}}
+    with zipfile.ZipFile(zip_target, 'w', compression=zipfile.ZIP_DEFLATED) as zf:
+        for done, result in enumerate(iter_site_exports(list(sites.items()), template_path, config, workers), 1):
+            if result['error']:
+                summary['errors'][result['site_id']] = result['error']
+                print(f"Error exporting {result['site_id']}: {result['error']}")
+            else:
+                zf.writestr(result['filename'], result['data'])
+                summary['files'].append(result['filename'])
+            if progress:
+                progress(done, total, result['site_id'], result['error'])
+    return summary
+
+
+def export_multiple_sites(sites: List[Dict], template_path: str,
+                          output_dir: str, config: ExportConfig = None,
+                          workers: Optional[int] = None) -> List[str]:
+    """Export multiple sites (in parallel) to {site_id}_profile.pptx files."""
+    os.makedirs(output_dir, exist_ok=True)
+    items = [(site.get('site_id', 'site'), site) for site in sites]
+    written = {}
+    for result in iter_site_exports(items, template_path, config, workers):
+        if result['error']:
+            print(f"Error exporting {result['site_id']}: {result['error']}")
+            continue
+        output_path = os.path.join(output_dir, result['filename'])
+        with open(output_path, 'wb') as f:
+            f.write(result['data'])
+        written[result['site_id']] = output_path
+    return [written[site_id] for site_id, _ in items if site_id in written]
 
 
 def analyze_template(template_path: str) -> Dict:
@@ -2127,6 +2254,7 @@ __all__ = [
     'CapacityTrajectory', 'PhaseData', 'ScoreAnalysis', 'RiskOpportunity', 
     'SiteProfileData', 'MarketAnalysis',
     'ExportConfig', 'export_site_to_pptx', 'export_multiple_sites',
+    'export_sites_to_zip', 'iter_site_exports', 'open_template',
     'generate_capacity_trajectory_chart', 'generate_critical_path_chart',
     'generate_score_radar_chart', 'generate_score_summary_chart',
     'generate_market_analysis_chart', 'analyze_template', 'JLL_COLORS',
@@ -780,34 +780,7 @@ def show_portfolio_export(sites: Dict):
                     try:
                         with st.spinner("Generating portfolio export..."):
                             # Prepare data with full profiles
-                            export_sites = {}
-                            import json
-                            from .pptx_export import SiteProfileData
-                            
-                            for sid, s in selected_sites.items():
-                                site_copy = s.copy()
-                                
-                                # Hydrate SiteProfileData from profile_json if available
-                                if 'profile_json' in s and s['profile_json']:
-                                    try:
-                                        p_dict = json.loads(s['profile_json'])
-                                        # Create SiteProfileData object
-                                        # We use from_dict if available, or constructor
-                                        if hasattr(SiteProfileData, 'from_dict'):
-                                            profile_obj = SiteProfileData.from_dict(p_dict)
-                                        else:
-                                            # Fallback: try to match fields
-                                            profile_obj = SiteProfileData(**{
-                                                k: v for k, v in p_dict.items() 
-                                                if k in SiteProfileData.__dataclass_fields__
-                                            })
-                                        
-                                        site_copy['profile'] = profile_obj
-                                        print(f"[DEBUG] Hydrated profile for {sid}")
-                                    except Exception as e:
-                                        print(f"[WARNING] Failed to hydrate profile for {sid}: {e}")
-                                
-                                export_sites[sid] = site_copy
+                            export_sites = _prepare_export_sites(selected_sites)
                             
                             config = ExportConfig(
                                 include_capacity_trajectory=include_trajectory,
@@ -841,6 +814,89 @@ def show_portfolio_export(sites: Dict):
                         st.error(f"Export failed: {e}")
                         import traceback
                         st.code(traceback.format_exc())
+        
+        if st.button("📦 Export Individual Decks (.zip)", use_container_width=True,
+                     help="One deck per site, rendered in parallel and bundled into a zip archive."):
+            if not selected_sites:
+                st.warning("Please select at least one site.")
+            else:
+                import io
+                from .pptx_export import export_sites_to_zip
+                
+                default_template = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'Sample Site Profile Template.pptx')
+                template_path = default_template if os.path.exists(default_template) else st.session_state.get('export_template_path', '')
+                
+                if not template_path or not os.path.exists(template_path):
+                    st.error("Template not found. Please ensure 'Sample Site Profile Template.pptx' exists.")
+                else:
+                    config = ExportConfig(
+                        include_capacity_trajectory=include_trajectory,
+                        include_infrastructure=include_infra,
+                        include_score_analysis=include_score,
+                        include_market_analysis=include_market,
+                        include_site_boundary=include_boundary,
+                        include_topography=include_topo
+                    )
+                    export_sites = _prepare_export_sites(selected_sites)
+                    
+                    progress_bar = st.progress(0.0, text="Starting export...")
+                    
+                    def on_progress(done, total, site_id, error):
+                        name = export_sites[site_id].get('name', site_id)
+                        status = f"❌ {name}: {error}" if error else f"✅ {name}"
+                        progress_bar.progress(done / total, text=f"{done}/{total} - {status}")
+                    
+                    buffer = io.BytesIO()
+                    summary = export_sites_to_zip(export_sites, template_path, buffer, config, progress=on_progress)
+                    
+                    if summary['errors']:
+                        st.warning(f"{len(summary['errors'])} site(s) failed: " + ", ".join(summary['errors']))
+                    if summary['files']:
+                        st.success(f"✅ Exported {len(summary['files'])} decks")
+                        st.download_button(
+                            "⬇️ Download Decks (.zip)",
+                            data=buffer.getvalue(),
+                            file_name=f"Site_Profiles_{datetime.now().strftime('%Y%m%d_%H%M%S')}.zip",
+                            mime="application/zip",
+                            use_container_width=True,
+                        )
+
+
+def _prepare_export_sites(selected_sites: Dict) -> Dict:
+    """Copy the selected sites for export, hydrating SiteProfileData from profile_json."""
+    export_sites = {}
+    import json
+    from .pptx_export import SiteProfileData
+    
+    for sid, s in selected_sites.items():
+        site_copy = s.copy()
+        
+        # Hydrate SiteProfileData from profile_json if available
+        if 'profile_json' in s and s['profile_json']:
+            try:
+                # SiteRecord cells decode to a dict; sessions may hold a JSON string
+                p_dict = s['profile_json']
+                if isinstance(p_dict, str):
+                    p_dict = json.loads(p_dict)
+                # Create SiteProfileData object
+                # We use from_dict if available, or constructor
+                if hasattr(SiteProfileData, 'from_dict'):
+                    profile_obj = SiteProfileData.from_dict(p_dict)
+                else:
+                    # Fallback: try to match fields
+                    profile_obj = SiteProfileData(**{
+                        k: v for k, v in p_dict.items() 
+                        if k in SiteProfileData.__dataclass_fields__
+                    })
+                
+                site_copy['profile'] = profile_obj
+                print(f"[DEBUG] Hydrated profile for {sid}")
+            except Exception as e:
+                print(f"[WARNING] Failed to hydrate profile for {sid}: {e}")
+        
+        export_sites[sid] = site_copy
+    
+    return export_sites
 
 
 
@@ -0,0 +1,444 @@
+"""
+Research Crawler
+================
+Concurrent page/PDF fetcher for the utility research agent.
+
+UtilityResearchAgent.run_full_research used to work through its six topics
+one after another, and each topic fetched its pages serially with a bare
+``requests.get`` (new connection every time). The crawler lets all topics
+run at once on one asyncio loop:
+
+- one pooled ``requests.Session`` (keep-alive) shared by every fetch
+- at most ``max_per_host`` concurrent requests per host, ``max_connections``
+  overall; blocking work runs on the crawler's own thread pool
+- a URL requested by several topics is fetched once (in-flight dedupe)
+- extracted page/PDF text is kept on disk; within ``fresh_seconds`` it is
+  served without a request, after that it is revalidated with
+  If-None-Match / If-Modified-Since and a 304 reuses the stored text
+
+Run ``python -m portfolio_manager.research_crawler`` to benchmark against
+the serial fetch path using a local HTTP fixture server.
+"""
+
+import asyncio
+import io
+import os
+import sqlite3
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterable, List, Optional
+from urllib.parse import urldefrag, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+from bs4 import BeautifulSoup
+import PyPDF2
+
+
+USER_AGENT = (
+    'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 '
+    '(KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+)
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "power_tracker")
+DEFAULT_MAX_PER_HOST = 2
+DEFAULT_MAX_CONNECTIONS = 16
+DEFAULT_FRESH_SECONDS = 3600
+PAGE_TIMEOUT = 10
+PDF_TIMEOUT = 15
+
+HTML_TEXT_LIMIT = 15000
+PDF_TEXT_LIMIT = 20000
+PDF_MAX_PAGES = 10
+
+
+# =============================================================================
+# TEXT EXTRACTION
+# =============================================================================
+
+def is_pdf(url: str, content_type: str = '') -> bool:
+    return url.lower().endswith('.pdf') or 'application/pdf' in (content_type or '').lower()
+
+
+def extract_html_text(html: str) -> str:
+    """Visible text of an HTML page (scripts, styles and chrome removed)."""
+    soup = BeautifulSoup(html, 'html.parser')
+    for element in soup(["script", "style", "nav", "footer", "header"]):
+        element.decompose()
+    return soup.get_text(separator=' ', strip=True)[:HTML_TEXT_LIMIT]
+
+
+def extract_pdf_text(data: bytes) -> str:
+    """Text of the first PDF_MAX_PAGES pages."""
+    reader = PyPDF2.PdfReader(io.BytesIO(data))
+    text = ""
+    for i in range(min(len(reader.pages), PDF_MAX_PAGES)):
+        text += (reader.pages[i].extract_text() or "") + "\n"
+    return text[:PDF_TEXT_LIMIT]
+
+
+def normalize_url(url: str) -> str:
+    """Dedupe key: fragment dropped, scheme/host lower-cased."""
+    url, _ = urldefrag(url.strip())
+    parsed = urlparse(url)
+    return parsed._replace(scheme=parsed.scheme.lower(), netloc=parsed.netloc.lower()).geturl()
+
+
+# =============================================================================
+# HTTP SESSION
+# =============================================================================
+
+_session: Optional[requests.Session] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session(pool_size: int = DEFAULT_MAX_CONNECTIONS) -> requests.Session:
+    """Process-wide keep-alive session (created on first use)."""
+    global _session
+    with _session_lock:
+        if _session is None:
+            session = requests.Session()
+            adapter = HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size)
+            session.mount('http://', adapter)
+            session.mount('https://', adapter)
+            session.headers['User-Agent'] = USER_AGENT
+            _session = session
+        return _session
+
+
+# =============================================================================
+# PAGE CACHE
+# =============================================================================
+
+@dataclass
+class CachedPage:
+    """Extracted text of one URL plus its HTTP validators."""
+    url: str
+    etag: str
+    last_modified: str
+    fetched_at: float
+    text: str
+
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+
+class PageCache:
+    """SQLite store of extracted page text keyed by normalized URL."""
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            cache_dir = os.environ.get("PORTFOLIO_CACHE_DIR", DEFAULT_CACHE_DIR)
+            path = os.path.join(cache_dir, "research_pages.sqlite")
+        self.path = path
+        self._lock = threading.Lock()
+        self.stats = {'writes': 0, 'errors': 0}
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _init_db(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS pages (
+                    url TEXT PRIMARY KEY,
+                    etag TEXT NOT NULL,
+                    last_modified TEXT NOT NULL,
+                    fetched_at REAL NOT NULL,
+                    text TEXT NOT NULL
+                )
+            """)
+
+    def get(self, url: str) -> Optional[CachedPage]:
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT etag, last_modified, fetched_at, text FROM pages WHERE url = ?", (url,)
+                ).fetchone()
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[research_crawler] Could not read page cache: {e}")
+            return None
+        return CachedPage(url, *row) if row else None
+
+    def put(self, url: str, etag: str, last_modified: str, text: str):
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO pages (url, etag, last_modified, fetched_at, text) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (url, etag or '', last_modified or '', time.time(), text)
+                )
+            self.stats['writes'] += 1
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[research_crawler] Could not write page cache: {e}")
+
+    def touch(self, url: str):
+        """Mark a page as freshly revalidated."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("UPDATE pages SET fetched_at = ? WHERE url = ?", (time.time(), url))
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[research_crawler] Could not touch page cache: {e}")
+
+    def clear(self):
+        with self._lock, self._connect() as conn:
+            conn.execute("DELETE FROM pages")
+
+
+_page_cache: Optional[PageCache] = None
+_page_cache_lock = threading.Lock()
+
+
+def get_page_cache() -> PageCache:
+    """Process-wide page cache (created on first use)."""
+    global _page_cache
+    with _page_cache_lock:
+        if _page_cache is None:
+            _page_cache = PageCache()
+        return _page_cache
+
+
+# =============================================================================
+# CRAWLER
+# =============================================================================
+
+class ResearchCrawler:
+    """
+    Fetches pages for one research run.
+
+    Create one per run (its semaphores and in-flight table belong to the
+    run's event loop) and ``close()`` it afterwards, or use it as a context
+    manager. The HTTP session and page cache are shared across runs.
+    """
+
+    def __init__(
+        self,
+        session: Optional[requests.Session] = None,
+        cache: Optional[PageCache] = None,
+        max_per_host: int = DEFAULT_MAX_PER_HOST,
+        max_connections: int = DEFAULT_MAX_CONNECTIONS,
+        fresh_seconds: float = DEFAULT_FRESH_SECONDS,
+        use_cache: bool = True,
+    ):
+        self.session = session or get_http_session(max_connections)
+        self.cache = (cache or get_page_cache()) if use_cache else None
+        self.max_per_host = max_per_host
+        self.fresh_seconds = fresh_seconds
+        self._executor = ThreadPoolExecutor(max_workers=max_connections, thread_name_prefix='research')
+        self._connections = asyncio.Semaphore(max_connections)
+        self._hosts: Dict[str, asyncio.Semaphore] = {}
+        self._inflight: Dict[str, asyncio.Future] = {}
+        self.stats = {
+            'requests': 0,
+            'fetched': 0,
+            'not_modified': 0,   # 304 on revalidation
+            'cache_hits': 0,     # fresh, no request
+            'deduped': 0,        # same URL already fetched/in flight this run
+            'errors': 0,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+
+    async def run_blocking(self, func: Callable[..., Any], *args) -> Any:
+        """Run a blocking call (search, LLM, parsing) on the crawler's thread pool."""
+        return await asyncio.get_running_loop().run_in_executor(self._executor, lambda: func(*args))
+
+    def _host_slot(self, url: str) -> asyncio.Semaphore:
+        host = urlparse(url).netloc
+        if host not in self._hosts:
+            self._hosts[host] = asyncio.Semaphore(self.max_per_host)
+        return self._hosts[host]
+
+    async def fetch(self, url: str) -> str:
+        """Extracted text of url ('' on failure); concurrent callers share one fetch."""
+        key = normalize_url(url)
+        future = self._inflight.get(key)
+        if future is None:
+            future = self._inflight[key] = asyncio.ensure_future(self._fetch(key))
+        else:
+            self.stats['deduped'] += 1
+        return await future
+
+    async def fetch_many(self, urls: Iterable[str]) -> List[str]:
+        return list(await asyncio.gather(*(self.fetch(url) for url in urls)))
+
+    async def _fetch(self, url: str) -> str:
+        cached = self.cache.get(url) if self.cache else None
+        if cached and cached.age() < self.fresh_seconds:
+            self.stats['cache_hits'] += 1
+            return cached.text
+
+        headers = {}
+        if cached and cached.etag:
+            headers['If-None-Match'] = cached.etag
+        if cached and cached.last_modified:
+            headers['If-Modified-Since'] = cached.last_modified
+        timeout = PDF_TIMEOUT if is_pdf(url) else PAGE_TIMEOUT
+
+        async with self._host_slot(url), self._connections:
+            self.stats['requests'] += 1
+            try:
+                response = await self.run_blocking(
+                    lambda: self.session.get(url, headers=headers, timeout=timeout)
+                )
+                if response.status_code == 304 and cached:
+                    self.stats['not_modified'] += 1
+                    self.cache.touch(url)
+                    return cached.text
+                response.raise_for_status()
+            except requests.RequestException as e:
+                self.stats['errors'] += 1
+                print(f"Fetch error for {url}: {e}")
+                return cached.text if cached else ""
+
+        content_type = response.headers.get('Content-Type', '')
+        try:
+            if is_pdf(url, content_type):
+                text = await self.run_blocking(extract_pdf_text, response.content)
+            else:
+                text = await self.run_blocking(extract_html_text, response.text)
+        except Exception as e:
+            self.stats['errors'] += 1
+            print(f"Parse error for {url}: {e}")
+            return ""
+
+        self.stats['fetched'] += 1
+        if self.cache:
+            self.cache.put(
+                url, response.headers.get('ETag', ''), response.headers.get('Last-Modified', ''), text
+            )
+        return text
+
+
+def run_async(coro):
+    """asyncio.run that also works when the calling thread already has a loop running."""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
+
+# =============================================================================
+# FIXTURE SERVER + BENCHMARK
+# =============================================================================
+
+def start_fixture_server(pages: Dict[str, bytes], latency: float = 0.3):
+    """
+    Local HTTP server for crawler tests.
+
+    Serves ``pages`` (path -> body; ``.pdf`` paths as application/pdf) after
+    ``latency`` seconds, with ETag/Last-Modified and 304 support. Returns
+    (server, base_url, hits) where hits counts full 200 responses per path.
+    """
+    import hashlib
+    from email.utils import formatdate
+    from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+    hits: Dict[str, int] = {}
+    started = formatdate(time.time(), usegmt=True)
+
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            time.sleep(latency)
+            body = pages.get(self.path)
+            if body is None:
+                self.send_error(404)
+                return
+            etag = '"%s"' % hashlib.md5(body).hexdigest()
+            if self.headers.get('If-None-Match') == etag:
+                self.send_response(304)
+                self.send_header('ETag', etag)
+                self.end_headers()
+                return
+            hits[self.path] = hits.get(self.path, 0) + 1
+            self.send_response(200)
+            self.send_header('Content-Type', 'application/pdf' if self.path.endswith('.pdf') else 'text/html')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('ETag', etag)
+            self.send_header('Last-Modified', started)
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            pass
+
+    server = ThreadingHTTPServer(('127.0.0.1', 0), Handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://127.0.0.1:{server.server_address[1]}", hits
+
+
+def _fixture_pdf(text: str) -> bytes:
+    from fpdf import FPDF
+    pdf = FPDF()
+    pdf.add_page()
+    pdf.set_font('Helvetica', size=11)
+    pdf.multi_cell(0, 6, text)
+    return bytes(pdf.output())
+
+
+def benchmark(latency: float = 0.3) -> Dict[str, Any]:
+    """Six topics x three URLs (some shared between topics): serial vs crawler vs warm cache."""
+    import tempfile
+
+    paragraph = "Queue position, transmission upgrades and large load tariffs. " * 40
+    pages = {f"/topic{t}/page{p}": f"<html><body><p>{t}-{p} {paragraph}</p></body></html>".encode()
+             for t in range(6) for p in range(2)}
+    pages["/shared/irp.pdf"] = _fixture_pdf("Integrated Resource Plan. " + paragraph[:600])
+    server, base, hits = start_fixture_server(pages, latency)
+    topics = [[f"{base}/topic{t}/page0", f"{base}/topic{t}/page1", f"{base}/shared/irp.pdf"]
+              for t in range(6)]
+    results: Dict[str, Any] = {}
+
+    try:
+        started = time.perf_counter()
+        for urls in topics:
+            for url in urls:
+                response = requests.get(url, headers={'User-Agent': USER_AGENT}, timeout=PAGE_TIMEOUT)
+                extract_pdf_text(response.content) if is_pdf(url) else extract_html_text(response.text)
+        results['serial_s'] = time.perf_counter() - started
+
+        with tempfile.TemporaryDirectory() as tmp:
+            cache = PageCache(os.path.join(tmp, "pages.sqlite"))
+
+            async def crawl(crawler):
+                return await asyncio.gather(*(crawler.fetch_many(urls) for urls in topics))
+
+            for label, fresh in (('crawler_s', 3600), ('warm_cache_s', 3600), ('revalidate_s', 0)):
+                with ResearchCrawler(session=requests.Session(), cache=cache, max_per_host=4,
+                                     fresh_seconds=fresh) as crawler:
+                    started = time.perf_counter()
+                    texts = run_async(crawl(crawler))
+                    results[label] = time.perf_counter() - started
+                    results[label.replace('_s', '_stats')] = dict(crawler.stats)
+            results['pdf_text_ok'] = 'Integrated Resource Plan' in texts[0][2]
+    finally:
+        server.shutdown()
+    return results
+
+
+if __name__ == "__main__":
+    results = benchmark()
+    print(f"serial fetch:        {results['serial_s']:.2f}s (18 requests)")
+    print(f"crawler (cold):      {results['crawler_s']:.2f}s  {results['crawler_stats']}")
+    print(f"crawler (warm):      {results['warm_cache_s']:.2f}s  {results['warm_cache_stats']}")
+    print(f"crawler (revalidate):{results['revalidate_s']:.2f}s  {results['revalidate_stats']}")
+    print(f"PDF text extracted:  {results['pdf_text_ok']}")
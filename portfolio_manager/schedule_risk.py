@@ -0,0 +1,319 @@
+"""
+Schedule Risk Simulation
+========================
+Monte Carlo energization dates for a site's critical path.
+
+The deterministic CPM pass in critical_path.py uses one duration per
+milestone. Here every active milestone gets a three-point estimate
+(min / most likely / max) built from its template range or, for equipment
+and ISO studies, from the DEFAULT_LEAD_TIMES range; durations are sampled
+from a triangular or PERT distribution and all trials are scheduled at once
+as NumPy arrays (one row per milestone, one column per trial) over the
+engine's topological order.
+
+Results:
+- P50 / P80 / P95 energization dates
+- probability of meeting the site's target energization date (if set)
+- criticality index per milestone: share of trials in which it drives
+  energization
+"""
+
+import time
+from dataclasses import dataclass, field
+from datetime import date, timedelta
+from typing import Dict, List, Optional, Tuple
+
+import numpy as np
+
+from .critical_path import (
+    CriticalPathData,
+    CriticalPathEngine,
+    DEFAULT_LEAD_TIMES,
+    END_MILESTONE,
+)
+
+
+DISTRIBUTIONS = ("pert", "triangular")
+DEFAULT_TRIALS = 10_000
+REPORT_PERCENTILES = (50, 80, 95)
+
+# Trials within this many days of the driving predecessor's finish count as driven
+_DRIVE_TOLERANCE_DAYS = 1e-6
+
+
+@dataclass
+class ScheduleRiskResult:
+    """Outcome of one Monte Carlo run for a site."""
+    site_id: str
+    trials: int
+    distribution: str
+    start_date: str                                   # ISO date
+    deterministic_energization: Optional[str]         # ISO date from calculate_schedule
+    percentiles: Dict[int, str]                       # 50 -> ISO date
+    mean_weeks: float
+    std_weeks: float
+    criticality: Dict[str, float]                     # milestone id -> 0..1
+    target_energization: Optional[str] = None
+    probability_on_target: Optional[float] = None
+    elapsed_seconds: float = 0.0
+    finish_days: Optional[np.ndarray] = field(default=None, repr=False)  # per-trial offsets
+
+    @property
+    def p50(self) -> str:
+        return self.percentiles.get(50)
+
+    @property
+    def p80(self) -> str:
+        return self.percentiles.get(80)
+
+    @property
+    def p95(self) -> str:
+        return self.percentiles.get(95)
+
+    def risk_level(self) -> str:
+        """
+        low / medium / high, in the vocabulary of CriticalPathData.schedule_risk.
+
+        Uses the chance of meeting the target date when one is set, otherwise
+        the P50 -> P95 spread.
+        """
+        if self.probability_on_target is not None:
+            if self.probability_on_target >= 0.8:
+                return "low"
+            if self.probability_on_target >= 0.5:
+                return "medium"
+            return "high"
+
+        spread_weeks = (date.fromisoformat(self.p95) - date.fromisoformat(self.p50)).days / 7
+        if spread_weeks < 13:
+            return "low"
+        if spread_weeks < 26:
+            return "medium"
+        return "high"
+
+    def top_drivers(self, limit: int = 10) -> List[Tuple[str, float]]:
+        """Milestones most often on the driving path, highest first."""
+        ranked = sorted(self.criticality.items(), key=lambda kv: kv[1], reverse=True)
+        return [(ms_id, ci) for ms_id, ci in ranked[:limit] if ci > 0]
+
+    def to_dict(self) -> Dict:
+        return {
+            'site_id': self.site_id,
+            'trials': self.trials,
+            'distribution': self.distribution,
+            'start_date': self.start_date,
+            'deterministic_energization': self.deterministic_energization,
+            'percentiles': {str(p): d for p, d in self.percentiles.items()},
+            'mean_weeks': round(self.mean_weeks, 1),
+            'std_weeks': round(self.std_weeks, 1),
+            'criticality': {k: round(v, 4) for k, v in self.criticality.items()},
+            'target_energization': self.target_energization,
+            'probability_on_target': self.probability_on_target,
+            'risk_level': self.risk_level(),
+        }
+
+
+# =============================================================================
+# THREE-POINT ESTIMATES
+# =============================================================================
+
+def three_point_estimates(
+    engine: CriticalPathEngine,
+    data: CriticalPathData,
+    order: List[str],
+) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    (min, most likely, max) durations in weeks, aligned with order.
+
+    The most likely value is the duration the deterministic schedule uses
+    (including user overrides). The range around it keeps the proportions of
+    the DEFAULT_LEAD_TIMES entry that drives the milestone, or of the
+    template's own min/typical/max when no lead-time key applies.
+    """
+    config = data.config
+    table = engine.table
+    n = len(order)
+    lo = np.empty(n)
+    mode = np.empty(n)
+    hi = np.empty(n)
+
+    for i, ms_id in enumerate(order):
+        likely = float(engine._get_duration(data, ms_id))
+        key = table.resolve_lead_time_key(ms_id, config.voltage_kv, config.iso)
+        lead = DEFAULT_LEAD_TIMES.get(key) if key else None
+        if lead and lead.get('typical'):
+            low_ratio = lead['min'] / lead['typical']
+            high_ratio = lead['max'] / lead['typical']
+        else:
+            tmpl = engine.templates[ms_id]
+            typical = tmpl.duration_typical
+            low_ratio = tmpl.duration_min / typical if typical else 1.0
+            high_ratio = tmpl.duration_max / typical if typical else 1.0
+
+        mode[i] = likely
+        lo[i] = min(likely, likely * low_ratio)
+        hi[i] = max(likely, likely * high_ratio)
+
+    return lo, mode, hi
+
+
+def sample_durations(
+    lo: np.ndarray,
+    mode: np.ndarray,
+    hi: np.ndarray,
+    trials: int,
+    distribution: str = "pert",
+    rng: Optional[np.random.Generator] = None,
+) -> np.ndarray:
+    """Sampled durations in weeks, shape (milestones, trials)."""
+    if distribution not in DISTRIBUTIONS:
+        raise ValueError(f"Unknown distribution '{distribution}' (expected one of {DISTRIBUTIONS})")
+    rng = rng or np.random.default_rng()
+
+    lo = lo[:, None]
+    mode = mode[:, None]
+    hi = hi[:, None]
+    width = hi - lo
+    fixed = width <= 0
+    safe_width = np.where(fixed, 1.0, width)
+
+    if distribution == "pert":
+        alpha = 1 + 4 * (mode - lo) / safe_width
+        beta = 1 + 4 * (hi - mode) / safe_width
+        shape = (lo.shape[0], trials)
+        samples = lo + rng.beta(np.broadcast_to(alpha, shape), np.broadcast_to(beta, shape)) * safe_width
+    else:
+        # Inverse CDF of the triangular distribution (handles mode == lo / hi)
+        u = rng.random((lo.shape[0], trials))
+        split = (mode - lo) / safe_width
+        left = lo + np.sqrt(u * safe_width * (mode - lo))
+        right = hi - np.sqrt((1 - u) * safe_width * (hi - mode))
+        samples = np.where(u < split, left, right)
+
+    return np.where(fixed, mode, samples)
+
+
+# =============================================================================
+# SIMULATION
+# =============================================================================
+
+def simulate_schedule(
+    data: CriticalPathData,
+    trials: int = DEFAULT_TRIALS,
+    distribution: str = "pert",
+    start_date: Optional[date] = None,
+    seed: Optional[int] = None,
+    engine: Optional[CriticalPathEngine] = None,
+) -> ScheduleRiskResult:
+    """
+    Run a vectorized Monte Carlo schedule for one site.
+
+    Completed milestones keep their actual dates in every trial, exactly as
+    in the deterministic forward pass. Does not mutate data.
+    """
+    started = time.perf_counter()
+    engine = engine or CriticalPathEngine()
+    if start_date is None:
+        start_date = date.today()
+    if trials < 1:
+        raise ValueError("trials must be at least 1")
+
+    base = engine.base_schedule(data, start_date)
+    order, predecessors, successors = base._graph
+    position = {ms_id: i for i, ms_id in enumerate(order)}
+    n = len(order)
+
+    lo, mode, hi = three_point_estimates(engine, data, order)
+    weeks = sample_durations(lo, mode, hi, trials, distribution, np.random.default_rng(seed))
+    durations = weeks * 7.0  # days
+
+    # Forward pass over all trials at once; offsets are days from start_date
+    early_start = np.zeros((n, trials))
+    early_finish = np.zeros((n, trials))
+    anchored = np.zeros(n, dtype=bool)
+    for i, ms_id in enumerate(order):
+        instance = data.milestones[ms_id]
+        if instance.actual_end:
+            finish = (date.fromisoformat(instance.actual_end) - start_date).days
+            if instance.actual_start:
+                early_start[i] = (date.fromisoformat(instance.actual_start) - start_date).days
+            else:
+                early_start[i] = finish - durations[i]
+            early_finish[i] = finish
+            anchored[i] = True
+            continue
+
+        es = early_start[i]
+        for pred_id in predecessors[ms_id]:
+            np.maximum(es, early_finish[position[pred_id]], out=es)
+        np.add(es, durations[i], out=early_finish[i])
+
+    if END_MILESTONE in position:
+        end_idx = position[END_MILESTONE]
+        finish_days = early_finish[end_idx]
+        driving = np.zeros((n, trials), dtype=bool)
+        driving[end_idx] = True
+    else:
+        finish_days = early_finish.max(axis=0)
+        driving = early_finish >= finish_days - _DRIVE_TOLERANCE_DAYS
+
+    # Backward trace of the driving chain: a predecessor drives a milestone in
+    # a trial when it finishes exactly when that milestone starts
+    for i in range(n - 1, -1, -1):
+        if anchored[i]:
+            continue
+        ms_id = order[i]
+        for pred_id in predecessors[ms_id]:
+            p = position[pred_id]
+            driving[p] |= driving[i] & (early_finish[p] >= early_start[i] - _DRIVE_TOLERANCE_DAYS)
+
+    criticality = dict(zip(order, driving.mean(axis=1).tolist()))
+
+    # Round up to whole days (a partial day still misses that day)
+    finish_whole = np.ceil(finish_days - _DRIVE_TOLERANCE_DAYS)
+    percentiles = {
+        p: (start_date + timedelta(days=int(v))).isoformat()
+        for p, v in zip(REPORT_PERCENTILES, np.percentile(finish_whole, REPORT_PERCENTILES, method='higher'))
+    }
+
+    target = data.config.target_energization
+    probability = None
+    if target:
+        target_offset = (date.fromisoformat(target) - start_date).days
+        probability = float(np.mean(finish_whole <= target_offset))
+
+    return ScheduleRiskResult(
+        site_id=data.config.site_id,
+        trials=trials,
+        distribution=distribution,
+        start_date=start_date.isoformat(),
+        deterministic_energization=base.calculated_energization,
+        percentiles=percentiles,
+        mean_weeks=float(finish_days.mean() / 7),
+        std_weeks=float(finish_days.std() / 7),
+        criticality=criticality,
+        target_energization=target,
+        probability_on_target=probability,
+        elapsed_seconds=time.perf_counter() - started,
+        finish_days=finish_whole,
+    )
+
+
+def apply_schedule_risk(data: CriticalPathData, result: ScheduleRiskResult) -> str:
+    """Store the simulated risk level on the site's critical path data."""
+    data.schedule_risk = result.risk_level()
+    return data.schedule_risk
+
+
+if __name__ == "__main__":
+    engine = CriticalPathEngine()
+    site = engine.initialize_site("demo_site", target_mw=300, voltage_kv=345, iso="SPP")
+
+    for dist in DISTRIBUTIONS:
+        result = simulate_schedule(site, trials=DEFAULT_TRIALS, distribution=dist, start_date=date(2025, 1, 1), seed=7, engine=engine)
+        print(f"\n{dist.upper()} - {result.trials:,} trials in {result.elapsed_seconds:.3f}s")
+        print(f"  Deterministic: {result.deterministic_energization}")
+        print(f"  P50: {result.p50}  P80: {result.p80}  P95: {result.p95}")
+        print(f"  Risk: {result.risk_level()}")
+        for ms_id, ci in result.top_drivers(5):
+            print(f"    {ci:6.1%}  {engine.templates[ms_id].name}")
@@ -0,0 +1,337 @@
+"""
+Schema Migrations
+=================
+Versioned header migrations for the tracker spreadsheet.
+
+load_database() used to read the Sites header row on every load and add
+each missing column with its own ``update_cell`` call. The triage module
+ran a second copy of that check for its own columns and the Triage_Log
+tab. The sheet layout now has a version number instead. It is stored in
+the ``schema_version`` column of the Metadata tab, which the load path
+reads anyway:
+
+- recorded version == latest migration: nothing else is read or written
+- otherwise: one ``spreadsheets.get`` (tab list and grid sizes), one
+  ``values.batchGet`` (header rows of the affected tabs), and one
+  ``spreadsheets.batchUpdate``. The batch update adds missing tabs, grows
+  grids, writes every new header cell and records the new version
+
+Migrations only ever add: columns are appended after the existing headers,
+so existing data never moves. A tab listed with ``exact=True`` has its
+header row rewritten when it differs.
+
+The runner only needs ``worksheets``, ``values_batch_get`` and
+``batch_update``, so it runs unchanged against ``fake_gspread``. Run
+``python -m portfolio_manager.schema_migrations`` for a self-check.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from .sheets_sync import METADATA_HEADERS, METADATA_SHEET, SITES_HEADERS, SITES_SHEET
+
+
+SCHEMA_VERSION_KEY = 'schema_version'
+TRIAGE_LOG_SHEET = "Triage_Log"
+
+
+@dataclass(frozen=True)
+class Migration:
+    """One schema step: columns that must exist on one tab from this version on."""
+    version: int
+    description: str
+    sheet: str
+    columns: Tuple[str, ...]
+    exact: bool = False        # header row must equal ``columns`` exactly
+    rows: int = 1000           # grid rows when the tab has to be created
+
+
+def _triage_columns() -> Tuple[Tuple[str, ...], Tuple[str, ...]]:
+    # Imported lazily: triage.storage imports this module
+    from .triage.models import SITES_DIAGNOSIS_COLUMNS, SITES_TRIAGE_COLUMNS, TRIAGE_LOG_COLUMNS
+    return tuple(SITES_TRIAGE_COLUMNS + SITES_DIAGNOSIS_COLUMNS), tuple(TRIAGE_LOG_COLUMNS)
+
+
+def default_migrations() -> List[Migration]:
+    """The app's schema history, oldest first."""
+    sites_triage, triage_log = _triage_columns()
+    return [
+        Migration(1, "Sites columns written by the save path", SITES_SHEET, tuple(SITES_HEADERS)),
+        Migration(2, "Triage and diagnosis columns on Sites", SITES_SHEET, sites_triage),
+        Migration(3, "Triage_Log tab", TRIAGE_LOG_SHEET, triage_log, exact=True),
+    ]
+
+
+def latest_version(migrations: Sequence[Migration]) -> int:
+    return max((m.version for m in migrations), default=0)
+
+
+def recorded_version(metadata: Optional[Dict[str, Any]]) -> int:
+    """Schema version stored in a Metadata row (0 if missing or unreadable)."""
+    try:
+        return int(float((metadata or {}).get(SCHEMA_VERSION_KEY) or 0))
+    except (TypeError, ValueError):
+        return 0
+
+
+@dataclass
+class MigrationResult:
+    from_version: int
+    to_version: int
+    applied: List[str] = field(default_factory=list)
+    added_columns: Dict[str, List[str]] = field(default_factory=dict)
+    rewritten_headers: List[str] = field(default_factory=list)
+    created_sheets: List[str] = field(default_factory=list)
+    requests: int = 0
+
+    @property
+    def skipped(self) -> bool:
+        """True when the recorded version was current and nothing was requested."""
+        return self.requests == 0
+
+    @property
+    def changed(self) -> bool:
+        return bool(self.added_columns or self.rewritten_headers or self.created_sheets)
+
+    def summary(self) -> str:
+        if self.skipped:
+            return f"schema v{self.to_version} (current)"
+        parts = [f"schema v{self.from_version} -> v{self.to_version}"]
+        if self.created_sheets:
+            parts.append(f"created {', '.join(self.created_sheets)}")
+        for sheet, columns in self.added_columns.items():
+            parts.append(f"{sheet}: +{len(columns)} columns ({', '.join(columns)})")
+        if self.rewritten_headers:
+            parts.append(f"rewrote headers of {', '.join(self.rewritten_headers)}")
+        parts.append(f"{self.requests} request(s)")
+        return "; ".join(parts)
+
+
+# =============================================================================
+# PLANNING
+# =============================================================================
+
+def _quote(title: str) -> str:
+    return "'" + title.replace("'", "''") + "'"
+
+
+def _cells(values: Iterable[Any]) -> Dict[str, Any]:
+    return {'values': [
+        {'userEnteredValue': {'numberValue': v} if isinstance(v, (int, float)) and not isinstance(v, bool)
+         else {'stringValue': str(v)}}
+        for v in values
+    ]}
+
+
+def _update_cells(sheet_id: int, row: int, col: int, values: Sequence[Any]) -> Dict[str, Any]:
+    return {'updateCells': {
+        'start': {'sheetId': sheet_id, 'rowIndex': row, 'columnIndex': col},
+        'rows': [_cells(values)],
+        'fields': 'userEnteredValue',
+    }}
+
+
+class _TabPlan:
+    """Header changes for one tab, accumulated across migrations."""
+
+    def __init__(self, title: str, sheet_id: int, col_count: int, header: List[str], exists: bool, rows: int):
+        self.title = title
+        self.sheet_id = sheet_id
+        self.col_count = col_count
+        self.original = list(header)
+        self.header = list(header)
+        self.exists = exists
+        self.rows = rows
+        self.rewrite = not exists
+
+    def require(self, migration: Migration):
+        if migration.exact:
+            if self.header != list(migration.columns):
+                self.header = list(migration.columns)
+                self.rewrite = True
+        else:
+            self.header.extend(c for c in migration.columns if c not in self.header)
+
+    def requests(self) -> List[Dict[str, Any]]:
+        out = []
+        width = len(self.header)
+        if not self.exists:
+            out.append({'addSheet': {'properties': {
+                'sheetId': self.sheet_id,
+                'title': self.title,
+                'gridProperties': {'rowCount': self.rows, 'columnCount': max(width, 26)},
+            }}})
+        elif width > self.col_count:
+            out.append({'appendDimension': {
+                'sheetId': self.sheet_id, 'dimension': 'COLUMNS', 'length': width - self.col_count,
+            }})
+        if self.rewrite:
+            stale = len(self.original) - width
+            out.append(_update_cells(self.sheet_id, 0, 0, self.header + [''] * max(stale, 0)))
+        elif width > len(self.original):
+            out.append(_update_cells(self.sheet_id, 0, len(self.original), self.header[len(self.original):]))
+        return out
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def migrate_schema(
+    spreadsheet,
+    metadata: Optional[Dict[str, Any]] = None,
+    migrations: Optional[Sequence[Migration]] = None,
+    force: bool = False,
+    sheets: Optional[Iterable[str]] = None,
+) -> MigrationResult:
+    """
+    Bring the spreadsheet's headers up to the latest migration.
+
+    Args:
+        spreadsheet: gspread Spreadsheet (or fake_gspread.FakeSpreadsheet)
+        metadata: The Metadata row as already loaded. When it records the
+            latest version the call returns without any request. Updated in
+            place with the new version.
+        migrations: Schema history (default: default_migrations())
+        force: Re-check every migration even if the version is current
+        sheets: Only migrate these tabs. The version is recorded only if
+            nothing pending was left out.
+    """
+    migrations = sorted(migrations if migrations is not None else default_migrations(),
+                        key=lambda m: m.version)
+    target = latest_version(migrations)
+    known = recorded_version(metadata) if metadata is not None else None
+    if known is not None and known >= target and not force:
+        return MigrationResult(known, known)
+
+    # 1. Tab list and grid sizes
+    tabs = {ws.title: ws for ws in spreadsheet.worksheets()}
+    requests_made = 1
+
+    # 2. Header rows of every tab involved (plus the Metadata version cell)
+    wanted = set(sheets) if sheets is not None else None
+    selected = [m for m in migrations if wanted is None or m.sheet in wanted]
+    titles = [t for t in dict.fromkeys([m.sheet for m in selected] + [METADATA_SHEET]) if t in tabs]
+    ranges = [f"{_quote(t)}!1:2" if t == METADATA_SHEET else f"{_quote(t)}!1:1" for t in titles]
+    rows: Dict[str, List[List[Any]]] = {}
+    if ranges:
+        response = spreadsheet.values_batch_get(ranges)
+        requests_made += 1
+        for title, value_range in zip(titles, response.get('valueRanges', [])):
+            rows[title] = value_range.get('values', [])
+
+    meta_rows = rows.get(METADATA_SHEET, [])
+    meta_header = [str(h) for h in (meta_rows[0] if meta_rows else [])]
+    meta_values = list(meta_rows[1]) if len(meta_rows) > 1 else []
+    if known is None:
+        known = recorded_version(dict(zip(meta_header, meta_values)))
+    pending = [m for m in selected if force or m.version > known]
+    skipped_pending = [m for m in migrations if m.version > known and m not in selected]
+
+    # 3. One batchUpdate with every change
+    next_id = max((ws.id for ws in tabs.values()), default=0) + 1
+    plans: Dict[str, _TabPlan] = {}
+    for migration in pending:
+        plan = plans.get(migration.sheet)
+        if plan is None:
+            ws = tabs.get(migration.sheet)
+            if ws is not None:
+                header = [str(h) for h in (rows.get(migration.sheet) or [[]])[0]]
+                plan = _TabPlan(ws.title, ws.id, ws.col_count, header, True, migration.rows)
+            else:
+                plan = _TabPlan(migration.sheet, next_id, 0, [], False, migration.rows)
+                next_id += 1
+            plans[migration.sheet] = plan
+        plan.require(migration)
+
+    new_version = max([known] + [m.version for m in pending]) if not skipped_pending else known
+    result = MigrationResult(known, new_version, applied=[m.description for m in pending])
+    requests: List[Dict[str, Any]] = []
+    for plan in plans.values():
+        requests.extend(plan.requests())
+        if not plan.exists:
+            result.created_sheets.append(plan.title)
+        elif plan.rewrite:
+            result.rewritten_headers.append(plan.title)
+        elif len(plan.header) > len(plan.original):
+            result.added_columns[plan.title] = plan.header[len(plan.original):]
+
+    if new_version != recorded_version(dict(zip(meta_header, meta_values))) or not meta_header:
+        requests.extend(_version_requests(tabs.get(METADATA_SHEET), meta_header, new_version, next_id))
+
+    if requests:
+        spreadsheet.batch_update({'requests': requests})
+        requests_made += 1
+    result.requests = requests_made
+    if metadata is not None:
+        metadata[SCHEMA_VERSION_KEY] = new_version
+    if result.changed or result.from_version != result.to_version:
+        print(f"[schema_migrations] {result.summary()}")
+    return result
+
+
+def _version_requests(meta_ws, header: List[str], version: int, new_id: int) -> List[Dict[str, Any]]:
+    """Requests that record ``version`` in Metadata (creating the tab if needed)."""
+    if meta_ws is None:
+        now = datetime.now().isoformat()
+        headers = list(METADATA_HEADERS)
+        values = {'created': now, 'last_updated': now, 'version': '1.0', SCHEMA_VERSION_KEY: version}
+        return [
+            {'addSheet': {'properties': {
+                'sheetId': new_id, 'title': METADATA_SHEET,
+                'gridProperties': {'rowCount': 10, 'columnCount': max(len(headers), 5)},
+            }}},
+            {'updateCells': {
+                'start': {'sheetId': new_id, 'rowIndex': 0, 'columnIndex': 0},
+                'rows': [_cells(headers), _cells(values.get(h, '') for h in headers)],
+                'fields': 'userEnteredValue',
+            }},
+        ]
+    out = []
+    if SCHEMA_VERSION_KEY in header:
+        col = header.index(SCHEMA_VERSION_KEY)
+    else:
+        col = len(header)
+        if col + 1 > meta_ws.col_count:
+            out.append({'appendDimension': {'sheetId': meta_ws.id, 'dimension': 'COLUMNS',
+                                            'length': col + 1 - meta_ws.col_count}})
+        out.append(_update_cells(meta_ws.id, 0, col, [SCHEMA_VERSION_KEY]))
+    out.append(_update_cells(meta_ws.id, 1, col, [version]))
+    return out
+
+
+if __name__ == "__main__":
+    from .fake_gspread import FakeClient
+
+    client = FakeClient()
+    book = client.create("Sites Tracker - App")
+    sites = book.add_worksheet("Sites", rows=1000, cols=26)
+    sites.append_row(["site_id", "name", "state", "utility", "target_mw"])
+    sites.append_row(["s1", "Alpha", "TX", "Oncor", 300])
+    meta = book.add_worksheet("Metadata", rows=10, cols=5)
+    meta.append_rows([METADATA_HEADERS, ["2024-01-01", "2024-01-02", "1.0"]])
+
+    # Old path: one row_values + one update_cell per missing column
+    wanted = [c for m in default_migrations() if m.sheet == SITES_SHEET for c in m.columns]
+    missing = [c for c in dict.fromkeys(wanted) if c not in sites.row_values(1)]
+    print(f"Legacy header check would make {1 + len(missing)} requests for {len(missing)} columns")
+
+    client.reset_calls()
+    metadata = meta.get_all_records()[0]
+    client.reset_calls()
+    first = migrate_schema(book, metadata)
+    print(f"First load:  {first.summary()} (API calls: {dict(client.calls)})")
+    assert first.requests == 3 and first.to_version == latest_version(default_migrations())
+    assert sites.row_values(1)[:5] == ["site_id", "name", "state", "utility", "target_mw"]
+    assert sites.get_all_values()[1][:2] == ["s1", "Alpha"]
+
+    client.reset_calls()
+    again = migrate_schema(book, meta.get_all_records()[0])
+    print(f"Next load:   {again.summary()} (API calls after Metadata read: {client.total_calls - 1})")
+    assert again.skipped
+
+    forced = migrate_schema(book, metadata, force=True)
+    print(f"Forced:      {forced.summary()}")
+    assert not forced.changed
+    print("OK")
@@ -0,0 +1,474 @@
+"""
+Sheets Load Test
+================
+Offline load test for every Google Sheets code path, run against
+``fake_gspread``.
+
+Each scenario runs against a freshly seeded fake spreadsheet at several
+portfolio sizes. It reports API requests (by REST method), cells read and
+written, quota errors and wall time. The scenarios are:
+
+- app: load_database_from_sheets, write_database for a one-site edit, a
+  new site and a full rewrite, and the schema migration from v0
+- triage: save_triage_to_log / load_triage_log
+- portfolio_llm GoogleSheetsClient: get_all_sites, get_site, update_site,
+  add_site, delete_site
+- cleanup_duplicates.cleanup_test_sites
+
+``CALL_BUDGETS`` is the most requests each scenario may make at any size.
+A request count that grows with the number of sites is call
+amplification; ``--check`` fails when a budget is exceeded.
+
+Usage::
+
+    python -m portfolio_manager.sheets_load_test
+    python -m portfolio_manager.sheets_load_test --sizes 10 100 1000 --latency 0.02 --check
+    python -m portfolio_manager.sheets_load_test --quota 60      # per-minute quota errors
+"""
+
+import argparse
+import contextlib
+import json
+import os
+import sys
+import tempfile
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence
+
+from .fake_gspread import FakeClient, FakeDriveService, FakeSheetsService, FakeSpreadsheet
+
+
+SHEET_TITLE = "Sites Tracker - App"
+LLM_SHEET_TITLE = "Sites Tracker - LLM"
+DEFAULT_SIZES = (10, 100, 1000)
+
+# Max API requests per scenario, independent of portfolio size
+CALL_BUDGETS: Dict[str, int] = {
+    'app.load': 9,
+    'app.save_edit': 2,            # column A layout check + one batch write
+    'app.save_moved': 3,           # layout check fails -> full rewrite
+    'app.save_add': 2,
+    'app.save_full': 5,            # includes reopening the spreadsheet
+    'app.migrate_v0': 3,
+    'triage.save_log': 4,
+    'triage.load_log': 4,
+    'gsc.get_all_sites': 1,
+    'gsc.get_site': 1,
+    'gsc.update_site': 2,
+    'gsc.add_site': 1,
+    'gsc.delete_site': 3,
+    'gsc.site_session': 9,         # 3 verified updates + verified delete; reads are free
+    'cleanup.test_sites': 6,       # one append per kept row (3 kept)
+}
+
+
+@dataclass
+class ScenarioResult:
+    scenario: str
+    sites: int
+    calls: Dict[str, int]
+    cells_read: int
+    cells_written: int
+    errors: int
+    wall_ms: float
+    error: str = ""
+
+    @property
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    @property
+    def over_budget(self) -> bool:
+        budget = CALL_BUDGETS.get(self.scenario)
+        return budget is not None and self.total_calls > budget
+
+
+@dataclass
+class Backend:
+    """A fake client plus the spreadsheets one scenario runs against."""
+    client: FakeClient
+    app: FakeSpreadsheet
+    llm: FakeSpreadsheet
+    sites: int
+
+
+# =============================================================================
+# SEEDING
+# =============================================================================
+
+def synthetic_site(i: int) -> Dict[str, Any]:
+    """A realistic-looking site: scalar fields plus a few JSON columns."""
+    states = ['TX', 'OK', 'GA', 'VA', 'OH', 'AZ']
+    return {
+        'name': f"Site {i:04d}",
+        'state': states[i % len(states)],
+        'utility': f"Utility {i % 17}",
+        'target_mw': 100 + (i * 37) % 900,
+        'acreage': 200 + i % 500,
+        'iso': 'ERCOT' if i % 2 else 'PJM',
+        'county': f"County {i % 40}",
+        'developer': f"Developer {i % 11}",
+        'last_updated': '2024-06-01T00:00:00',
+        'phases': [{'phase': n, 'mw': 100, 'screening_status': 'Complete'} for n in range(1, 3)],
+        'risks': [f"risk {i}-{n}" for n in range(3)],
+        'schedule': {'energization': f"{2027 + i % 4}-Q{1 + i % 4}"},
+        'client': f"Client {i % 5}",
+        'total_fee_potential': 250000,
+        'contract_status': 'Yes' if i % 3 else 'No',
+    }
+
+
+def seed_backend(sites: int, **client_kwargs) -> Backend:
+    """Fake spreadsheets laid out as the app and portfolio_llm expect, with ``sites`` rows."""
+    from .schema_migrations import default_migrations, latest_version
+    from .sheets_sync import METADATA_HEADERS, SITES_HEADERS, _cell, build_site_row
+    from .triage.models import TRIAGE_LOG_COLUMNS
+
+    client = FakeClient(**client_kwargs)
+    quota, client.quota_per_minute = client.quota_per_minute, None   # seeding is free
+
+    app = client.create(SHEET_TITLE)
+    sites_ws = app.add_worksheet("Sites", rows=max(1000, sites + 50), cols=len(SITES_HEADERS))
+    rows = [list(SITES_HEADERS)]
+    rows += [[_cell(v) for v in build_site_row(f"site_{i:04d}", synthetic_site(i))] for i in range(sites)]
+    sites_ws.append_rows(rows)
+    meta = app.add_worksheet("Metadata", rows=10, cols=5)
+    meta.append_rows([
+        list(METADATA_HEADERS),
+        ['2024-01-01T00:00:00', '2024-06-01T00:00:00', '1.0', latest_version(default_migrations())],
+    ])
+    utils = app.add_worksheet("Utilities", rows=100, cols=10)
+    utils.append_rows([["utility_name", "state", "last_updated", "research_json"]] + [
+        [f"Utility {n}", 'TX', '2024-06-01', json.dumps({'summary': 'x' * 200})] for n in range(17)
+    ])
+    log = app.add_worksheet("Triage_Log", rows=max(1000, sites + 50), cols=len(TRIAGE_LOG_COLUMNS))
+    log.append_rows([list(TRIAGE_LOG_COLUMNS)] + [
+        _triage_row(i, len(TRIAGE_LOG_COLUMNS)) for i in range(sites)
+    ])
+
+    llm = client.create(LLM_SHEET_TITLE)
+    llm_ws = llm.add_worksheet("Sites", rows=max(1000, sites + 50), cols=26)
+    llm_ws.append_rows([_llm_header()] + [_llm_row(i) for i in range(sites)])
+
+    client.reset_calls()
+    client.quota_per_minute = quota
+    return Backend(client, app, llm, sites)
+
+
+def _triage_row(i: int, width: int) -> List[Any]:
+    row = [f"T{i:05d}", '2024-06-01', f"County {i % 40}", 'TX', 150, 'Q4 2027', 'Utility LOI',
+           'broker', '', '', f"Utility {i % 17}", 'ERCOT', 'county']
+    row += [''] * (width - len(row))
+    return row[:width]
+
+
+def _llm_header() -> List[str]:
+    from portfolio_llm.google_integration import COLUMN_ORDER
+    return list(COLUMN_ORDER)
+
+
+def _llm_row(i: int) -> List[Any]:
+    from portfolio_llm.google_integration import COLUMN_ORDER
+    site = synthetic_site(i)
+    row = []
+    for col in COLUMN_ORDER:
+        if col == 'site_id':
+            row.append(f"site_{i:04d}")
+        elif col.endswith('_json'):
+            row.append(json.dumps(site.get(col[:-5], [])))
+        else:
+            row.append(str(site.get(col, '')))
+    return row
+
+
+# =============================================================================
+# SCENARIOS
+# =============================================================================
+
+@contextlib.contextmanager
+def app_backend(backend: Backend) -> Iterator[Any]:
+    """streamlit_app wired to the fake client (and a fresh sync state)."""
+    from . import streamlit_app
+    from .sheets_sync import get_sync_state
+
+    original = streamlit_app.get_sheets_client
+    streamlit_app.get_sheets_client = lambda: backend.client
+    get_sync_state().clear()
+    try:
+        yield streamlit_app
+    finally:
+        streamlit_app.get_sheets_client = original
+        get_sync_state().clear()
+
+
+def _loaded_app_db(backend: Backend) -> Dict[str, Any]:
+    """Setup step: a loaded db (sync state primed), not counted against the scenario."""
+    from . import streamlit_app
+    quota, backend.client.quota_per_minute = backend.client.quota_per_minute, None
+    db = streamlit_app.load_database_from_sheets()
+    backend.client.quota_per_minute = quota
+    return db
+
+
+def scenario_app_load(backend: Backend):
+    from . import streamlit_app
+    return lambda: _expect(len(streamlit_app.load_database_from_sheets()['sites']) == backend.sites,
+                           "wrong site count")
+
+
+def scenario_app_save_edit(backend: Backend):
+    from . import streamlit_app
+    db = _loaded_app_db(backend)
+    site_id = next(reversed(list(db['sites'])))
+
+    def run():
+        db['sites'][site_id]['target_mw'] = 999
+        streamlit_app.write_database(db)
+    return run
+
+
+def scenario_app_save_moved(backend: Backend):
+    # Another writer deletes row 2 after the load; the diff save must not trust the old rows
+    from . import streamlit_app
+    db = _loaded_app_db(backend)
+    site_id = next(reversed(list(db['sites'])))
+    sites_ws = backend.app._sheet("Sites")
+    backend.app.batch_update({'requests': [{'deleteDimension': {'range': {
+        'sheetId': sites_ws.id, 'dimension': 'ROWS', 'startIndex': 1, 'endIndex': 2}}}]})
+
+    def run():
+        db['sites'][site_id]['target_mw'] = 999
+        streamlit_app.write_database(db)
+        rows = {row[0]: row for row in sites_ws.values()[1:] if row and row[0]}
+        _expect(len(rows) == backend.sites, "sites lost by the save")
+        _expect(str(rows[site_id][4]) == '999', "edit landed on the wrong row")
+    return run
+
+
+def scenario_app_save_add(backend: Backend):
+    from . import streamlit_app
+    db = _loaded_app_db(backend)
+
+    def run():
+        db['sites']['site_new'] = dict(synthetic_site(backend.sites + 1))
+        streamlit_app.write_database(db)
+    return run
+
+
+def scenario_app_save_full(backend: Backend):
+    from . import streamlit_app
+    from .sheets_sync import get_sync_state
+    db = _loaded_app_db(backend)
+    get_sync_state().clear()
+    return lambda: streamlit_app.write_database(db)
+
+
+def scenario_app_migrate_v0(backend: Backend):
+    from .schema_migrations import migrate_schema
+    metadata = {'schema_version': 0}
+    return lambda: migrate_schema(backend.app, metadata)
+
+
+def scenario_triage_save_log(backend: Backend):
+    from .triage.models import TRIAGE_LOG_COLUMNS, TriageLogRecord
+    from .triage.storage import save_triage_to_log
+    record = TriageLogRecord.from_row(_triage_row(backend.sites + 1, len(TRIAGE_LOG_COLUMNS)))
+    return lambda: _expect(save_triage_to_log(record, spreadsheet=_opened(backend)), "save_triage_to_log failed")
+
+
+def scenario_triage_load_log(backend: Backend):
+    from .triage.storage import load_triage_log
+    return lambda: load_triage_log(limit=500, spreadsheet=_opened(backend))
+
+
+def _opened(backend: Backend) -> FakeSpreadsheet:
+    # What the triage helpers pay to open the spreadsheet themselves
+    return backend.client.open(SHEET_TITLE)
+
+
+def _gsc(backend: Backend):
+    from portfolio_llm.google_integration import GoogleSheetsClient
+    return GoogleSheetsClient(
+        sheet_id=backend.llm.id,
+        vdr_folder_id='vdr-root',
+        sheets_service=FakeSheetsService(backend.client),
+        drive_service=FakeDriveService(backend.client),
+    )
+
+
+def scenario_gsc_get_all_sites(backend: Backend):
+    gsc = _gsc(backend)
+    return lambda: _expect(len(gsc.get_all_sites()) == backend.sites, "wrong site count")
+
+
+def scenario_gsc_get_site(backend: Backend):
+    gsc = _gsc(backend)
+    site_id = f"site_{backend.sites - 1:04d}"
+    return lambda: _expect(gsc.get_site(site_id), f"{site_id} not found")
+
+
+def scenario_gsc_update_site(backend: Backend):
+    gsc = _gsc(backend)
+    site_id = f"site_{backend.sites - 1:04d}"
+    site = {**synthetic_site(backend.sites - 1), 'site_id': site_id, 'target_mw': 999}
+    return lambda: _expect(gsc.update_site(site_id, site), "update_site failed")
+
+
+def scenario_gsc_add_site(backend: Backend):
+    gsc = _gsc(backend)
+    site = {**synthetic_site(backend.sites), 'site_id': 'site_new'}
+    return lambda: _expect(gsc.add_site(site), "add_site failed")
+
+
+def scenario_gsc_delete_site(backend: Backend):
+    gsc = _gsc(backend)
+    site_id = f"site_{backend.sites // 2:04d}"
+    return lambda: _expect(gsc.delete_site(site_id), "delete_site failed")
+
+
+def scenario_gsc_site_session(backend: Backend):
+    # Site pages after the list page: point ops against an already loaded snapshot
+    gsc = _gsc(backend)
+    gsc.get_all_sites()
+    ids = [f"site_{i * backend.sites // 10:04d}" for i in range(10)]
+
+    def run():
+        for site_id in ids:
+            _expect(gsc.get_site(site_id), f"{site_id} not found")
+        for i, site_id in enumerate(ids[:3]):
+            site = {**synthetic_site(i * backend.sites // 10), 'site_id': site_id, 'target_mw': 999}
+            _expect(gsc.update_site(site_id, site), "update_site failed")
+        _expect(gsc.delete_site(ids[-1]), "delete_site failed")
+        _expect(gsc.get_site(ids[0])['target_mw'] == 999, "update not visible")
+    return run
+
+
+def scenario_cleanup_test_sites(backend: Backend):
+    sys.path.insert(0, _repo_root())
+    from cleanup_duplicates import cleanup_test_sites
+    ws = backend.app._sheet("Sites")
+    return lambda: cleanup_test_sites(ws, keep_names=['Site 0000', 'Site 0001', 'Site 0002'])
+
+
+SCENARIOS: Dict[str, Callable[[Backend], Callable[[], Any]]] = {
+    'app.load': scenario_app_load,
+    'app.save_edit': scenario_app_save_edit,
+    'app.save_moved': scenario_app_save_moved,
+    'app.save_add': scenario_app_save_add,
+    'app.save_full': scenario_app_save_full,
+    'app.migrate_v0': scenario_app_migrate_v0,
+    'triage.save_log': scenario_triage_save_log,
+    'triage.load_log': scenario_triage_load_log,
+    'gsc.get_all_sites': scenario_gsc_get_all_sites,
+    'gsc.get_site': scenario_gsc_get_site,
+    'gsc.update_site': scenario_gsc_update_site,
+    'gsc.add_site': scenario_gsc_add_site,
+    'gsc.delete_site': scenario_gsc_delete_site,
+    'gsc.site_session': scenario_gsc_site_session,
+    'cleanup.test_sites': scenario_cleanup_test_sites,
+}
+
+
+def _expect(value: Any, message: str) -> Any:
+    if not value:
+        raise AssertionError(message)
+    return value
+
+
+def _repo_root() -> str:
+    return os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+# =============================================================================
+# RUNNER
+# =============================================================================
+
+def run_scenario(name: str, sites: int, **client_kwargs) -> ScenarioResult:
+    backend = seed_backend(sites, **client_kwargs)
+    error, wall_ms = "", 0.0
+    with app_backend(backend):
+        try:
+            run = SCENARIOS[name](backend)
+        except Exception as e:
+            run, error = None, f"setup: {type(e).__name__}: {e}"
+        if run is not None:
+            backend.client.reset_calls()
+            started = time.perf_counter()
+            try:
+                run()
+            except Exception as e:
+                error = f"{type(e).__name__}: {e}"
+            wall_ms = (time.perf_counter() - started) * 1000
+    client = backend.client
+    return ScenarioResult(
+        scenario=name,
+        sites=sites,
+        calls=dict(client.calls),
+        cells_read=client.cells['read'],
+        cells_written=client.cells['written'],
+        errors=sum(client.errors.values()),
+        wall_ms=wall_ms,
+        error=error,
+    )
+
+
+def run_load_test(
+    sizes: Sequence[int] = DEFAULT_SIZES,
+    scenarios: Optional[Sequence[str]] = None,
+    **client_kwargs,
+) -> List[ScenarioResult]:
+    results = []
+    for name in scenarios or SCENARIOS:
+        for sites in sizes:
+            results.append(run_scenario(name, sites, **client_kwargs))
+    return results
+
+
+def format_report(results: List[ScenarioResult], verbose: bool = False) -> str:
+    lines = [
+        f"{'scenario':<20} {'sites':>6} {'calls':>6} {'budget':>6} {'cells rd':>9} "
+        f"{'cells wr':>9} {'429s':>5} {'wall ms':>9}",
+        "-" * 78,
+    ]
+    for r in results:
+        flag = "  OVER BUDGET" if r.over_budget else ""
+        lines.append(
+            f"{r.scenario:<20} {r.sites:>6} {r.total_calls:>6} {CALL_BUDGETS.get(r.scenario, '-'):>6} "
+            f"{r.cells_read:>9} {r.cells_written:>9} {r.errors:>5} {r.wall_ms:>9.1f}{flag}"
+        )
+        if verbose:
+            lines.append(f"{'':<28}{', '.join(f'{k}={v}' for k, v in sorted(r.calls.items()))}")
+        if r.error:
+            lines.append(f"{'':<28}error: {r.error}")
+    return "\n".join(lines)
+
+
+def main(argv: Optional[Sequence[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.split("\n\n")[0])
+    parser.add_argument('--sizes', type=int, nargs='+', default=list(DEFAULT_SIZES))
+    parser.add_argument('--scenario', action='append', choices=sorted(SCENARIOS),
+                        help="Run only this scenario (repeatable)")
+    parser.add_argument('--latency', type=float, default=0.0, help="Seconds per API request")
+    parser.add_argument('--quota', type=int, default=None, help="Requests per minute before 429s")
+    parser.add_argument('--check', action='store_true', help="Exit 1 if any call budget is exceeded")
+    parser.add_argument('-v', '--verbose', action='store_true', help="Show calls by REST method")
+    args = parser.parse_args(argv)
+
+    results = run_load_test(args.sizes, args.scenario, latency=args.latency, quota_per_minute=args.quota)
+    print(format_report(results, args.verbose))
+
+    over = [r for r in results if r.over_budget]
+    failed = [r for r in results if r.error and not r.errors]
+    if over:
+        print(f"\n{len(over)} scenario run(s) over their call budget")
+    if failed:
+        print(f"{len(failed)} scenario run(s) failed")
+    return 1 if args.check and (over or failed) else 0
+
+
+if __name__ == "__main__":
+    # Keep the app's local caches out of the user's cache dir
+    os.environ.setdefault("PORTFOLIO_CACHE_DIR", tempfile.mkdtemp(prefix="sheets_load_test_"))
+    sys.path.insert(0, _repo_root())
+    sys.exit(main())
@@ -0,0 +1,553 @@
+"""
+Sheets Sync Engine
+==================
+Incremental (diff-based) persistence for the Sites worksheet.
+
+The original save path cleared the whole Sites tab and re-appended every
+site one API call at a time. This module keeps a process-wide snapshot of
+what the sheet looked like after the last load/save:
+
+- site_id -> sheet row index
+- the serialized row for every site
+
+On save, each site is re-serialized and compared against that snapshot.
+Only the cells that actually changed are written, together with the
+Metadata timestamp, in a single ``values_batch_update`` request. New sites
+are written below the last row and removed sites are deleted with one
+structural batch request.
+
+Before writing, column A is read once and checked against the row index.
+If the snapshot cannot be trusted (no prior load, header layout drift,
+rows sorted, inserted or deleted in the Sheet or by another writer), the
+engine falls back to a full rewrite that still uses one write request
+instead of clear + append-per-row.
+"""
+
+import threading
+from typing import Any, Dict, List, Optional, Tuple
+
+from .program_tracker import ProgramTrackerData
+from .site_record import dump_json_column
+
+
+# =============================================================================
+# SCHEMA
+# =============================================================================
+
+SITES_SHEET = "Sites"
+METADATA_SHEET = "Metadata"
+
+SITES_HEADERS = [
+    "site_id", "name", "state", "utility", "target_mw", "acreage", "iso", "county",
+    "developer", "land_status", "community_support", "political_support",
+    "dev_experience", "capital_status", "financial_status", "last_updated",
+    "phases_json", "onsite_gen_json", "schedule_json", "non_power_json",
+    "risks_json", "opps_json", "questions_json",
+    # Program tracker columns
+    "client", "total_fee_potential", "contract_status",
+    "site_control_stage", "power_stage", "marketing_stage", "buyer_stage",
+    "zoning_stage", "water_stage", "incentives_stage",
+    "probability", "weighted_fee", "tracker_notes",
+    # Site profile builder columns
+    "profile_json", "latitude", "longitude",
+    # Critical path column
+    "critical_path_json",
+    # Triage & Diagnosis columns
+    "phase", "triage_date", "triage_verdict", "triage_red_flags_json",
+    "diagnosis_date", "diagnosis_json", "validated_timeline", "timeline_risk",
+    "claim_validation_json", "diagnosis_recommendation", "diagnosis_top_risks",
+    "diagnosis_follow_ups", "research_summary"
+]
+
+# schema_version is maintained by schema_migrations
+METADATA_HEADERS = ['created', 'last_updated', 'version', 'schema_version']
+
+TRACKER_FIELDS = (
+    'client', 'total_fee_potential', 'contract_status',
+    'site_control_stage', 'power_stage', 'marketing_stage', 'buyer_stage',
+    'zoning_stage', 'water_stage', 'incentives_stage', 'tracker_notes',
+)
+
+
+def build_site_row(site_id: str, site: Dict) -> List[Any]:
+    """Serialize a site dict into a Sites row (ordered as SITES_HEADERS)."""
+    # Recalculate tracker probabilities before saving (only the tracker fields,
+    # so lazily-decoded JSON columns are not unpacked)
+    tracker_fields = {k: site[k] for k in TRACKER_FIELDS if k in site}
+    tracker_data = ProgramTrackerData.from_dict({**tracker_fields, 'site_id': site_id})
+    tracker_data.update_calculations()
+
+    return [
+        site_id,
+        site.get('name', ''),
+        site.get('state', ''),
+        site.get('utility', ''),
+        site.get('target_mw', 0),
+        site.get('acreage', 0),
+        site.get('iso', ''),
+        site.get('county', ''),
+        site.get('developer', ''),
+        site.get('land_status', ''),
+        site.get('community_support', ''),
+        site.get('political_support', ''),
+        site.get('dev_experience', ''),
+        site.get('capital_status', ''),
+        site.get('financial_status', ''),
+        site.get('last_updated', ''),
+        dump_json_column(site, 'phases'),
+        dump_json_column(site, 'onsite_gen'),
+        dump_json_column(site, 'schedule'),
+        dump_json_column(site, 'non_power'),
+        dump_json_column(site, 'risks'),
+        dump_json_column(site, 'opps'),
+        dump_json_column(site, 'questions'),
+        # Program tracker columns
+        tracker_data.client,
+        tracker_data.total_fee_potential,
+        tracker_data.contract_status,
+        tracker_data.site_control_stage,
+        tracker_data.power_stage,
+        tracker_data.marketing_stage,
+        tracker_data.buyer_stage,
+        tracker_data.zoning_stage,
+        tracker_data.water_stage,
+        tracker_data.incentives_stage,
+        tracker_data.probability,
+        tracker_data.weighted_fee,
+        tracker_data.tracker_notes,
+        # Site profile builder columns
+        dump_json_column(site, 'profile_json'),
+        site.get('latitude', ''),
+        site.get('longitude', ''),
+        # Critical path column
+        site.get('critical_path_json', ''),
+        # Triage & Diagnosis columns
+        site.get('phase', ''),
+        site.get('triage_date', ''),
+        site.get('triage_verdict', ''),
+        site.get('triage_red_flags_json', ''),
+        site.get('diagnosis_date', ''),
+        site.get('diagnosis_json', ''),
+        site.get('validated_timeline', ''),
+        site.get('timeline_risk', ''),
+        site.get('claim_validation_json', ''),
+        site.get('diagnosis_recommendation', ''),
+        site.get('diagnosis_top_risks', ''),
+        site.get('diagnosis_follow_ups', ''),
+        site.get('research_summary', '')
+    ]
+
+
+def col_to_letter(col: int) -> str:
+    """Convert a 1-based column number to A1 column letters (1 -> A, 27 -> AA)."""
+    letters = ''
+    while col > 0:
+        col, rem = divmod(col - 1, 26)
+        letters = chr(65 + rem) + letters
+    return letters
+
+
+def a1_range(sheet_title: str, row: int, first_col: int, last_col: int) -> str:
+    """Build an A1 range for a single row span, e.g. 'Sites'!C5:F5."""
+    return f"'{sheet_title}'!{col_to_letter(first_col)}{row}:{col_to_letter(last_col)}{row}"
+
+
+def _cell(value: Any) -> Any:
+    """Normalize a cell value for comparison and JSON transport."""
+    return '' if value is None else value
+
+
+# =============================================================================
+# SYNC STATE
+# =============================================================================
+
+class SitesSyncState:
+    """
+    Snapshot of the Sites worksheet as of the last load/save.
+
+    Shared by every session in the process; guarded by a lock so two saves
+    cannot interleave their row bookkeeping.
+    """
+
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.clear()
+
+    def clear(self):
+        """Forget the snapshot; the next save falls back to a full rewrite."""
+        self.spreadsheet = None
+        self.sheet_id: Optional[int] = None
+        self.row_count: int = 0
+        self.headers: List[str] = []
+        self.row_index: Dict[str, int] = {}
+        self.snapshot: Dict[str, List[Any]] = {}
+        self.next_row: int = 2
+        self.loaded = False
+
+    def record_load(
+        self,
+        spreadsheet,
+        sites_ws,
+        headers: List[str],
+        row_index: Dict[str, int],
+        sites: Dict[str, Dict],
+        data_row_count: int,
+    ):
+        """
+        Record the sheet layout right after load_database().
+
+        Args:
+            spreadsheet: gspread Spreadsheet the data came from
+            sites_ws: Sites worksheet
+            headers: Header row as it exists in the sheet
+            row_index: site_id -> 1-based sheet row
+            sites: Parsed site dicts (baseline for dirty detection)
+            data_row_count: Number of data rows returned (excluding header)
+        """
+        with self.lock:
+            self.spreadsheet = spreadsheet
+            self.sheet_id = getattr(sites_ws, 'id', None)
+            self.row_count = getattr(sites_ws, 'row_count', 0) or 0
+            self.headers = list(headers)
+            self.row_index = dict(row_index)
+            self.snapshot = {
+                site_id: build_site_row(site_id, site)
+                for site_id, site in sites.items()
+                if site_id in self.row_index
+            }
+            self.next_row = data_row_count + 2
+            self.loaded = True
+
+    def export_layout(self) -> Dict[str, Any]:
+        """JSON-safe copy of the row layout (for the local snapshot cache)."""
+        with self.lock:
+            if not self.loaded:
+                return {}
+            return {
+                'sheet_id': self.sheet_id,
+                'row_count': self.row_count,
+                'headers': list(self.headers),
+                'row_index': dict(self.row_index),
+                'next_row': self.next_row,
+            }
+
+    def restore_layout(self, layout: Dict[str, Any], sites: Dict[str, Dict], spreadsheet=None):
+        """Rebuild the snapshot from a cached layout instead of re-reading the sheet."""
+        with self.lock:
+            if not layout or not layout.get('headers'):
+                self.clear()
+                return
+            self.spreadsheet = spreadsheet or self.spreadsheet
+            self.sheet_id = layout.get('sheet_id')
+            self.row_count = layout.get('row_count', 0) or 0
+            self.headers = list(layout['headers'])
+            self.row_index = {k: int(v) for k, v in layout.get('row_index', {}).items()}
+            self.snapshot = {
+                site_id: build_site_row(site_id, site)
+                for site_id, site in sites.items()
+                if site_id in self.row_index
+            }
+            self.next_row = layout.get('next_row', len(self.row_index) + 2)
+            self.loaded = True
+
+    def dirty_site_ids(self, sites: Dict[str, Dict]) -> List[str]:
+        """Site ids whose serialized row differs from the snapshot."""
+        with self.lock:
+            return [
+                site_id for site_id, site in sites.items()
+                if self.snapshot.get(site_id) != build_site_row(site_id, site)
+            ]
+
+    def can_diff(self) -> bool:
+        """True when the recorded layout allows cell-level writes."""
+        return (
+            self.loaded
+            and self.spreadsheet is not None
+            and all(h in self.headers for h in SITES_HEADERS)
+        )
+
+
+_sync_state = SitesSyncState()
+
+
+def get_sync_state() -> SitesSyncState:
+    """Process-wide Sites sync state."""
+    return _sync_state
+
+
+# =============================================================================
+# SAVE PLANNING
+# =============================================================================
+
+def _changed_spans(old: Optional[List[Any]], new: List[Any]) -> List[Tuple[int, int]]:
+    """Contiguous [start, end] index spans (0-based, inclusive) where rows differ."""
+    spans = []
+    start = None
+    for i, value in enumerate(new):
+        changed = old is None or i >= len(old) or _cell(old[i]) != _cell(value)
+        if changed and start is None:
+            start = i
+        elif not changed and start is not None:
+            spans.append((start, i - 1))
+            start = None
+    if start is not None:
+        spans.append((start, len(new) - 1))
+    return spans
+
+
+def _row_value_ranges(
+    row_num: int,
+    headers: List[str],
+    old: Optional[List[Any]],
+    new: List[Any],
+) -> List[Dict]:
+    """Value ranges for the changed cells of one row in sheet column order."""
+    # Re-order both rows into the sheet's actual column layout
+    positions = {h: i for i, h in enumerate(SITES_HEADERS)}
+    width = len(headers)
+    sheet_new = [''] * width
+    sheet_old = [''] * width if old is not None else None
+    for col, header in enumerate(headers):
+        src = positions.get(header)
+        if src is None:
+            continue
+        sheet_new[col] = _cell(new[src])
+        if sheet_old is not None:
+            sheet_old[col] = _cell(old[src])
+
+    # Columns we do not own must never be written
+    owned = [headers[i] in positions for i in range(width)]
+    ranges = []
+    for start, end in _changed_spans(sheet_old, sheet_new):
+        span_start = None
+        for col in range(start, end + 1):
+            if owned[col] and span_start is None:
+                span_start = col
+            elif not owned[col] and span_start is not None:
+                ranges.append((span_start, col - 1))
+                span_start = None
+        if span_start is not None:
+            ranges.append((span_start, end))
+
+    return [
+        {
+            'range': a1_range(SITES_SHEET, row_num, s + 1, e + 1),
+            'values': [sheet_new[s:e + 1]],
+        }
+        for s, e in ranges
+    ]
+
+
+def _metadata_range(metadata: Dict) -> Dict:
+    return {
+        'range': f"'{METADATA_SHEET}'!A1:{col_to_letter(len(METADATA_HEADERS))}2",
+        'values': [
+            METADATA_HEADERS,
+            [_cell(metadata.get(k, '')) for k in METADATA_HEADERS],
+        ],
+    }
+
+
+# =============================================================================
+# SAVE EXECUTION
+# =============================================================================
+
+def _layout_matches(spreadsheet, state: SitesSyncState) -> bool:
+    """
+    True if column A still has every site on its recorded row and nothing below.
+
+    The row index comes from the last load/save (or the local cache), so a
+    manual sort/insert/delete in the Sheet or another writer would otherwise
+    make cell-level writes land on a different site's row. Costs one read of
+    column A.
+    """
+    result = spreadsheet.values_get(f"'{SITES_SHEET}'!A:A")
+    column = [row[0] if row else '' for row in result.get('values', [])]
+    while column and column[-1] == '':
+        column.pop()
+    if len(column) > state.next_row - 1:
+        return False
+    return all(
+        row - 1 < len(column) and column[row - 1] == site_id
+        for site_id, row in state.row_index.items()
+    )
+
+
+def save_sites_incremental(spreadsheet, db: Dict, state: Optional[SitesSyncState] = None) -> Dict:
+    """
+    Persist db['sites'] and db['metadata'] using the smallest set of requests.
+
+    Returns a stats dict: mode ('diff' or 'full'), dirty, added, deleted, requests.
+    """
+    state = state or get_sync_state()
+    sites = db.get('sites', {})
+    metadata = db.get('metadata', {})
+
+    with state.lock:
+        if state.spreadsheet is None:
+            state.spreadsheet = spreadsheet
+        if not state.can_diff():
+            return _save_full(spreadsheet, db, state)
+
+        spreadsheet = state.spreadsheet
+        if not _layout_matches(spreadsheet, state):
+            print("[sheets_sync] Sites rows moved since the last load/save; rewriting the tab")
+            stats = _save_full(spreadsheet, db, state)
+            stats['requests'] += 1
+            return stats
+
+        stats = {'mode': 'diff', 'dirty': 0, 'added': 0, 'deleted': 0, 'requests': 1}
+
+        # 1. Deleted sites -> one structural request, bottom-up so indices stay valid
+        removed = [sid for sid in state.row_index if sid not in sites]
+        if removed:
+            if state.sheet_id is None:
+                return _save_full(spreadsheet, db, state)
+            rows = sorted((state.row_index[sid] for sid in removed), reverse=True)
+            spreadsheet.batch_update({'requests': [
+                {
+                    'deleteDimension': {
+                        'range': {
+                            'sheetId': state.sheet_id,
+                            'dimension': 'ROWS',
+                            'startIndex': row - 1,
+                            'endIndex': row,
+                        }
+                    }
+                }
+                for row in rows
+            ]})
+            stats['requests'] += 1
+            stats['deleted'] = len(removed)
+            for sid in removed:
+                state.row_index.pop(sid, None)
+                state.snapshot.pop(sid, None)
+            ascending = sorted(rows)
+            for sid, row in state.row_index.items():
+                state.row_index[sid] = row - sum(1 for r in ascending if r < row)
+            state.next_row -= len(rows)
+            state.row_count -= len(rows)
+
+        # 2. Changed cells of existing rows + rows for new sites
+        data = []
+        new_rows: List[Tuple[str, List[Any]]] = []
+        for site_id, site in sites.items():
+            row = build_site_row(site_id, site)
+            if site_id in state.row_index:
+                old = state.snapshot.get(site_id)
+                if old == row:
+                    continue
+                ranges = _row_value_ranges(state.row_index[site_id], state.headers, old, row)
+                if ranges:
+                    data.extend(ranges)
+                    stats['dirty'] += 1
+                state.snapshot[site_id] = row
+            else:
+                new_rows.append((site_id, row))
+
+        appended_via_api = False
+        if new_rows:
+            last_row = state.next_row + len(new_rows) - 1
+            if state.row_count and last_row <= state.row_count:
+                for offset, (site_id, row) in enumerate(new_rows):
+                    row_num = state.next_row + offset
+                    data.extend(_row_value_ranges(row_num, state.headers, None, row))
+                    state.row_index[site_id] = row_num
+                    state.snapshot[site_id] = row
+                state.next_row = last_row + 1
+            else:
+                appended_via_api = True
+            stats['added'] = len(new_rows)
+
+        data.append(_metadata_range(metadata))
+        spreadsheet.values_batch_update(body={'valueInputOption': 'RAW', 'data': data})
+        stats['requests'] += 1
+
+        # 3. Grid is full -> let the API grow it (rare: only when adding past the last row)
+        if appended_via_api:
+            sites_ws = spreadsheet.worksheet(SITES_SHEET)
+            positions = {h: i for i, h in enumerate(SITES_HEADERS)}
+            rows = [
+                [_cell(row[positions[h]]) if h in positions else '' for h in state.headers]
+                for _, row in new_rows
+            ]
+            sites_ws.append_rows(rows, value_input_option='RAW')
+            stats['requests'] += 2
+            for offset, (site_id, row) in enumerate(new_rows):
+                state.row_index[site_id] = state.next_row + offset
+                state.snapshot[site_id] = row
+            state.next_row += len(new_rows)
+            state.row_count = max(state.row_count, state.next_row - 1)
+
+        return stats
+
+
+def _save_full(spreadsheet, db: Dict, state: SitesSyncState) -> Dict:
+    """
+    Rewrite the whole Sites tab in one write request (no clear-first window),
+    then clear any leftover rows/columns from the previous layout.
+    """
+    sites = db.get('sites', {})
+    sites_ws = spreadsheet.worksheet(SITES_SHEET)
+
+    rows = [list(SITES_HEADERS)]
+    row_index = {}
+    snapshot = {}
+    for site_id, site in sites.items():
+        row = build_site_row(site_id, site)
+        row_index[site_id] = len(rows) + 1
+        snapshot[site_id] = row
+        rows.append([_cell(v) for v in row])
+
+    old_last_row = max(state.next_row - 1, 1) if state.loaded else sites_ws.row_count
+    old_width = max(len(state.headers), len(SITES_HEADERS))
+
+    requests = 1  # worksheet metadata lookup
+    if len(rows) > sites_ws.row_count:
+        sites_ws.add_rows(len(rows) - sites_ws.row_count)
+        requests += 1
+
+    # Columns outside SITES_HEADERS are cleared below, so the recorded schema
+    # version no longer holds; the next load re-runs the migrations
+    db['metadata'] = {**db.get('metadata', {}), 'schema_version': ''}
+
+    spreadsheet.values_batch_update(body={
+        'valueInputOption': 'RAW',
+        'data': [
+            {
+                'range': f"'{SITES_SHEET}'!A1:{col_to_letter(len(SITES_HEADERS))}{len(rows)}",
+                'values': rows,
+            },
+            _metadata_range(db['metadata']),
+        ],
+    })
+    requests += 1
+
+    stale = []
+    if old_last_row > len(rows):
+        stale.append(f"'{SITES_SHEET}'!A{len(rows) + 1}:{col_to_letter(old_width)}{old_last_row}")
+    if old_width > len(SITES_HEADERS):
+        stale.append(
+            f"'{SITES_SHEET}'!{col_to_letter(len(SITES_HEADERS) + 1)}1:"
+            f"{col_to_letter(old_width)}{len(rows)}"
+        )
+    if stale:
+        spreadsheet.values_batch_clear(body={'ranges': stale})
+        requests += 1
+
+    state.spreadsheet = spreadsheet
+    state.sheet_id = getattr(sites_ws, 'id', None)
+    state.row_count = max(sites_ws.row_count, len(rows))
+    state.headers = list(SITES_HEADERS)
+    state.row_index = row_index
+    state.snapshot = snapshot
+    state.next_row = len(rows) + 1
+    state.loaded = True
+
+    return {
+        'mode': 'full',
+        'dirty': len(sites),
+        'added': 0,
+        'deleted': 0,
+        'requests': requests,
+    }
@@ -0,0 +1,193 @@
+"""
+Site Record
+===========
+Lazy-decoding mapping used for site rows loaded from Google Sheets.
+
+load_database() used to json.loads every *_json column of every row up
+front, even though most pages only read a handful of scalar fields. A
+SiteRecord keeps the raw cell strings and decodes a JSON column the first
+time it is read, memoizing the result. It behaves like the plain site dict
+the rest of the app already uses (``site['phases']``, ``site.get(...)``,
+``site.copy()``, ``site.update(...)``).
+
+It also remembers which JSON columns were decoded or assigned. Columns
+that were never touched are written back as their original cell string by
+the save path, so an edit to ``target_mw`` does not re-serialize risks,
+phases or the profile.
+
+``critical_path_json`` is not decoded here at all: it stays a raw string
+and is only parsed by the critical path page.
+"""
+
+import copy
+import json
+from collections.abc import Mapping, MutableMapping
+from typing import Any, Callable, Dict, Iterator, Optional, Set
+
+
+# site key -> (sheet column, default factory)
+JSON_COLUMNS: Dict[str, tuple] = {
+    'phases': ('phases_json', list),
+    'onsite_gen': ('onsite_gen_json', dict),
+    'schedule': ('schedule_json', dict),
+    'non_power': ('non_power_json', dict),
+    'risks': ('risks_json', list),
+    'opps': ('opps_json', list),
+    'questions': ('questions_json', list),
+    'profile_json': ('profile_json', dict),
+}
+
+# Columns returned exactly as json.loads gives them, without the type check.
+# The profile pages store profile_json as a JSON string (json.dumps of the
+# profile dict), so the cell decodes to a str that consumers parse again.
+UNTYPED_JSON_COLUMNS = {'profile_json'}
+
+RAW_STORAGE_KEY = '__raw_json__'
+
+
+def decode_json_cell(raw: Any, default_factory: Callable[[], Any], typed: bool = True) -> Any:
+    """Decode one JSON cell, falling back to the default on blanks, bad JSON or (if typed) wrong type."""
+    if not raw or not str(raw).strip():
+        return default_factory()
+    try:
+        parsed = json.loads(raw)
+    except (json.JSONDecodeError, TypeError):
+        return default_factory()
+    if not typed:
+        return parsed
+    return parsed if isinstance(parsed, default_factory) else default_factory()
+
+
+def decode_column(key: str, raw: Any) -> Any:
+    """Decode the cell for site key ``key`` the way load_database expects it."""
+    _, default_factory = JSON_COLUMNS[key]
+    return decode_json_cell(raw, default_factory, typed=key not in UNTYPED_JSON_COLUMNS)
+
+
+class SiteRecord(MutableMapping):
+    """Site dict whose JSON columns are decoded on first access."""
+
+    __slots__ = ('_data', '_raw', '_touched')
+
+    def __init__(self, data: Optional[Dict[str, Any]] = None, raw_json: Optional[Dict[str, str]] = None):
+        self._data: Dict[str, Any] = dict(data or {})
+        # Undecoded JSON cells, keyed by site key (e.g. 'phases')
+        self._raw: Dict[str, str] = {
+            k: v for k, v in (raw_json or {}).items()
+            if k in JSON_COLUMNS and k not in self._data
+        }
+        self._touched: Set[str] = set()
+
+    # -- Mapping protocol ----------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        if key in self._raw:
+            # Decoded values are mutable; assume the caller may edit them in place
+            self._data[key] = decode_column(key, self._raw.pop(key))
+            self._touched.add(key)
+        return self._data[key]
+
+    def __setitem__(self, key: str, value: Any):
+        self._raw.pop(key, None)
+        self._data[key] = value
+        if key in JSON_COLUMNS:
+            self._touched.add(key)
+
+    def __delitem__(self, key: str):
+        if key in self._raw:
+            del self._raw[key]
+        else:
+            del self._data[key]
+        self._touched.discard(key)
+
+    def __iter__(self) -> Iterator[str]:
+        yield from self._data
+        yield from (k for k in self._raw if k not in self._data)
+
+    def __len__(self) -> int:
+        return len(self._data) + len(self._raw)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._data or key in self._raw
+
+    def __repr__(self) -> str:
+        return f"SiteRecord({self._data!r}, undecoded={sorted(self._raw)})"
+
+    # -- dict conveniences ---------------------------------------------------
+
+    def copy(self) -> 'SiteRecord':
+        """Shallow copy that keeps undecoded columns undecoded."""
+        clone = SiteRecord(self._data)
+        clone._raw = dict(self._raw)
+        clone._touched = set(self._touched)
+        return clone
+
+    def isolated_copy(self) -> 'SiteRecord':
+        """Copy whose decoded values can be edited without affecting this record."""
+        clone = SiteRecord(copy.deepcopy(self._data))
+        clone._raw = dict(self._raw)
+        clone._touched = set(self._touched)
+        return clone
+
+    def peek(self, key: str, default: Any = None) -> Any:
+        """Value of ``key`` without memoizing a decode (safe on shared records)."""
+        if key in self._raw:
+            return decode_column(key, self._raw[key])
+        return self._data.get(key, default)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Fully decoded plain dict (decodes every remaining JSON column)."""
+        return {k: self[k] for k in list(self)}
+
+    # -- persistence helpers -------------------------------------------------
+
+    def raw_json(self, key: str) -> Optional[str]:
+        """Original cell string for an untouched JSON column, else None."""
+        return self._raw.get(key)
+
+    def is_decoded(self, key: str) -> bool:
+        return key in JSON_COLUMNS and key not in self._raw
+
+    @property
+    def touched_columns(self) -> Set[str]:
+        """JSON columns that were decoded or assigned since load."""
+        return set(self._touched)
+
+    def to_storage_dict(self) -> Dict[str, Any]:
+        """JSON-safe form for the local snapshot cache; undecoded cells stay raw."""
+        out = dict(self._data)
+        if self._raw:
+            out[RAW_STORAGE_KEY] = dict(self._raw)
+        return out
+
+    @classmethod
+    def from_storage_dict(cls, stored: Dict[str, Any]) -> 'SiteRecord':
+        """Inverse of to_storage_dict (also accepts a plain site dict)."""
+        data = dict(stored)
+        raw = data.pop(RAW_STORAGE_KEY, None) or {}
+        return cls(data, raw)
+
+
+def dump_json_column(site: Any, key: str) -> str:
+    """
+    Serialized cell value for a JSON column.
+
+    Untouched SiteRecord columns are returned verbatim so they are never
+    re-serialized; everything else goes through json.dumps as before.
+    """
+    _, default_factory = JSON_COLUMNS[key]
+    if isinstance(site, SiteRecord):
+        raw = site.raw_json(key)
+        if raw is not None:
+            return raw
+    return json.dumps(site.get(key, default_factory()))
+
+
+def json_default(obj: Any) -> Any:
+    """json.dumps ``default=`` hook that understands SiteRecord (and other mappings)."""
+    if isinstance(obj, SiteRecord):
+        return obj.to_dict()
+    if isinstance(obj, Mapping):
+        # Session handles (portfolio_store.SharedSite) detach themselves
+        return obj.to_dict() if hasattr(obj, 'to_dict') else dict(obj)
+    return str(obj)
@@ -15,15 +15,16 @@ Features:
 import streamlit as st
 # Force reload: v3.3 - Schedule Calculation Fix
 import pandas as pd
+import numpy as np
 import json
 import os
+from dataclasses import dataclass
 from datetime import date, datetime
 from typing import Dict, List, Optional
-import plotly.express as px
-import plotly.graph_objects as go
-from fpdf import FPDF
 
 # Import our modules
+# Page modules and heavy optional dependencies (plotly, fpdf, python-pptx,
+# the LLM/research stack) are imported on first use - see page_registry.py
 from .state_analysis import (
     STATE_PROFILES, get_state_profile, calculate_state_score,
     generate_state_context_section, rank_all_states, compare_states,
@@ -33,27 +34,17 @@ from .program_tracker import (
     ProgramTrackerData, TRACKER_COLUMN_ORDER, TRACKER_COLUMNS,
     calculate_portfolio_summary
 )
-from .program_management_page import show_program_tracker
-from .research_module import show_research_module
-from .system_flow import show_system_flow
-from .design_system_module import render_design_system_page
-
-# Import Triage Module
-try:
-    from .triage import (
-        show_quick_triage,
-        show_triage_log,
-    )
-    from .triage.diagnosis_page import show_full_diagnosis, show_site_intelligence
-    from .triage.intelligence_page import show_intelligence_center
-    from .triage.tracker_integration import render_intelligence_summary, show_intel_summary_widget
-    from .triage.storage import ensure_triage_columns_exist, ensure_triage_log_sheet_exists
-    TRIAGE_AVAILABLE = True
-except ImportError as e:
-    TRIAGE_AVAILABLE = False
-    print(f"Triage module not available: {e}")
+from .sheets_sync import get_sync_state, save_sites_incremental
+from .local_cache import get_snapshot_cache, DEFAULT_TTL_SECONDS
+from .portfolio_store import PortfolioStore, SessionPortfolio
+from .schema_migrations import migrate_schema
+from .llm_gateway import get_llm_gateway
+from .site_record import SiteRecord, JSON_COLUMNS, json_default
+from .page_registry import (
+    PageRegistry, optional_import, import_status, profile_imports,
+)
 
-# Import Triage Module
+# Import Triage Module (light; the sidebar widget needs it on every page)
 try:
     from .triage import (
         show_quick_triage,
@@ -68,53 +59,6 @@ except ImportError as e:
     TRIAGE_AVAILABLE = False
     print(f"Triage module not available: {e}")
 
-# Import PPTX export module
-try:
-    from .pptx_export import (
-        export_site_to_pptx,
-        create_default_template,
-        CapacityTrajectory,
-        PhaseData,
-        ScoreAnalysis,
-        ExportConfig,
-    )
-    PPTX_AVAILABLE = True
-except ImportError as e:
-    PPTX_AVAILABLE = False
-    PPTX_IMPORT_ERROR = str(e)
-
-# Import Site Profile Builder
-try:
-    from .site_profile_builder import (
-        SiteProfileBuilder, 
-        SiteProfileData,
-        get_human_input_form_fields,
-        map_app_to_profile,
-        build_research_prompt,
-        AI_RESEARCHABLE_FIELDS,
-        HUMAN_INPUT_FIELDS,
-    )
-    PROFILE_BUILDER_AVAILABLE = True
-except ImportError as e:
-    PROFILE_BUILDER_AVAILABLE = False
-    print(f"Profile builder not available: {e}")
-
-# Import Utility Research Agent
-try:
-    from .utility_agent import UtilityResearchAgent
-    UTILITY_AGENT_AVAILABLE = True
-except ImportError as e:
-    UTILITY_AGENT_AVAILABLE = False
-    print(f"Utility agent not available: {e}")
-
-# Critical Path integration
-try:
-    from .critical_path_page import show_critical_path_page, get_critical_path_summary
-    CRITICAL_PATH_AVAILABLE = True
-except ImportError as e:
-    CRITICAL_PATH_AVAILABLE = False
-    print(f"Critical path not available: {e}")
-
 
 # =============================================================================
 # DATABASE MANAGEMENT - Google Sheets Integration
@@ -141,7 +85,111 @@ def get_sheets_client():
     
     return gspread.authorize(credentials)
 
-def load_database() -> Dict:
+def get_db_cache_ttl() -> float:
+    """Local snapshot TTL in seconds (secrets: DB_CACHE_TTL_SECONDS)."""
+    try:
+        return float(st.secrets.get("DB_CACHE_TTL_SECONDS", DEFAULT_TTL_SECONDS))
+    except Exception:
+        return DEFAULT_TTL_SECONDS
+
+def read_remote_revision(sheet) -> str:
+    """Metadata last_updated value - a single small read used as the revision key."""
+    result = sheet.values_get("'Metadata'!B2")
+    values = result.get('values', [])
+    return str(values[0][0]) if values and values[0] else ''
+
+def restore_cached_db(db: Dict) -> Dict:
+    """Turn cached site dicts back into lazily-decoding SiteRecords."""
+    db['sites'] = {
+        site_id: SiteRecord.from_storage_dict(site)
+        for site_id, site in db.get('sites', {}).items()
+    }
+    return db
+
+@st.cache_resource
+def get_portfolio_store() -> PortfolioStore:
+    """Portfolio database shared by every session of this server process."""
+    return PortfolioStore(get_db_cache_ttl())
+
+def current_portfolio(revalidate: bool = False, force_refresh: bool = False):
+    """Latest shared portfolio version (loaded once per process, revalidated per TTL)."""
+    def remote_revision() -> str:
+        sheet = get_sync_state().spreadsheet or get_sheets_client().open(SHEET_NAME)
+        return read_remote_revision(sheet)
+    return get_portfolio_store().current(
+        fetch_database, remote_revision, revalidate=revalidate, force_refresh=force_refresh
+    )
+
+def load_database(revalidate: bool = False, force_refresh: bool = False) -> Dict:
+    """
+    Session copy of the shared portfolio database.
+    
+    Sites are copy-on-write: records are shared with the other sessions
+    until this session reads one (see portfolio_store).
+    
+    Args:
+        revalidate: Check the remote revision now instead of waiting for the TTL
+        force_refresh: Download the full sheet again (for every session)
+    """
+    store = get_portfolio_store()
+    return store.checkout(current_portfolio(revalidate, force_refresh))
+
+def refresh_session_db():
+    """Move this session to the latest shared version if another session saved."""
+    db = st.session_state.get('db')
+    if not isinstance(db, SessionPortfolio):
+        return  # a detached copy (e.g. a loaded JSON backup) is left alone
+    snapshot = current_portfolio()
+    if snapshot.version == db.version:
+        return
+    st.session_state.db = get_portfolio_store().checkout(snapshot)
+    if st.session_state.get('committed_version') != snapshot.version:
+        st.toast("Portfolio updated by another session - showing the latest data")
+
+def fetch_database(force_refresh: bool = False) -> Dict:
+    """
+    Load site database, serving from the local snapshot cache when current.
+    
+    Called by the portfolio store, not per session.
+    
+    Args:
+        force_refresh: Ignore the cache and download the full sheet
+    """
+    cache = get_snapshot_cache(get_db_cache_ttl())
+    sync_state = get_sync_state()
+    cached = None if force_refresh else cache.get(SHEET_NAME)
+    
+    if cached:
+        if cached.is_fresh(cache.ttl_seconds):
+            cache.record('hits')
+            db = restore_cached_db(cached.db)
+            sync_state.restore_layout(cached.layout, db['sites'])
+            return db
+        try:
+            sheet = sync_state.spreadsheet or get_sheets_client().open(SHEET_NAME)
+            if read_remote_revision(sheet) == cached.revision:
+                cache.record('revalidated')
+                cache.touch(SHEET_NAME)
+                db = restore_cached_db(cached.db)
+                sync_state.restore_layout(cached.layout, db['sites'], sheet)
+                return db
+        except Exception as e:
+            print(f"[fetch_database] Revision check failed, reloading from Sheets: {e}")
+    
+    cache.record('misses')
+    db = load_database_from_sheets()
+    cache.put(SHEET_NAME, db['metadata'].get('last_updated', ''), db, sync_state.export_layout())
+    return db
+
+def records_from_values(values: List[List]) -> List[Dict]:
+    """Rows below the header as dicts - what get_all_records() returns, without a second read."""
+    from gspread.utils import numericise_all
+    if not values:
+        return []
+    headers = values[0]
+    return [dict(zip(headers, numericise_all(list(row)))) for row in values[1:]]
+
+def load_database_from_sheets() -> Dict:
     """Load site database from Google Sheets."""
     import time
     
@@ -151,69 +199,43 @@ def load_database() -> Dict:
             client = get_sheets_client()
             sheet = client.open(SHEET_NAME)
             
-            # Try to get Sites worksheet, create if doesn't exist
+            # Metadata first: it carries the schema version
             try:
-                sites_ws = sheet.worksheet("Sites")
-                
-                # Check if new columns exist, add if missing
-                try:
-                    existing_headers = sites_ws.row_values(1)
-                    required_headers = [
-                        "site_id", "name", "state", "utility", "target_mw", "acreage", "iso", "county",
-                        "developer", "land_status", "community_support", "political_support",
-                        "dev_experience", "capital_status", "financial_status", "last_updated",
-                        "phases_json", "onsite_gen_json", "schedule_json", "non_power_json",
-                        "risks_json", "opps_json", "questions_json",
-                        "client", "total_fee_potential", "contract_status",
-                        "site_control_stage", "power_stage", "marketing_stage", "buyer_stage",
-                        "zoning_stage", "water_stage", "incentives_stage",
-                        "probability", "weighted_fee", "tracker_notes",
-                        # Site profile builder columns
-                        "profile_json", "latitude", "longitude",
-                        # Critical path column
-                        "critical_path_json"
-                    ]
-                    
-                    # Find missing columns
-                    missing_columns = [h for h in required_headers if h not in existing_headers]
-                    
-                    if missing_columns:
-                        st.info(f"📋 Updating Google Sheets schema: Adding {len(missing_columns)} new columns ({', '.join(missing_columns)})...")
-                        
-                        # Add missing columns to header row
-                        next_col = len(existing_headers) + 1
-                        for i, col_name in enumerate(missing_columns):
-                            sites_ws.update_cell(1, next_col + i, col_name)
-                        
-                        st.success(f"✅ Added {len(missing_columns)} columns to Google Sheets")
-                except Exception as e:
-                    st.warning(f"Could not update schema: {e}")
-                    
+                meta_ws = sheet.worksheet("Metadata")
+                meta_rows = meta_ws.get_all_records()
+                metadata = meta_rows[0] if meta_rows else {
+                    'created': datetime.now().isoformat(),
+                    'last_updated': datetime.now().isoformat(),
+                    'version': '1.0'
+                }
             except:
-                # Worksheet doesn't exist, create it
-                sites_ws = sheet.add_worksheet(title="Sites", rows=1000, cols=50)
-                # Add headers
-                headers = [
-                    "site_id", "name", "state", "utility", "target_mw", "acreage", "iso", "county",
-                    "developer", "land_status", "community_support", "political_support",
-                    "dev_experience", "capital_status", "financial_status", "last_updated",
-                    "phases_json", "onsite_gen_json", "schedule_json", "non_power_json",
-                    "risks_json", "opps_json", "questions_json",
-                    # Program tracker columns
-                    "client", "total_fee_potential", "contract_status",
-                    "site_control_stage", "power_stage", "marketing_stage", "buyer_stage",
-                    "zoning_stage", "water_stage", "incentives_stage",
-                    "probability", "weighted_fee", "tracker_notes",
-                    # Site profile builder columns
-                    "profile_json", "latitude", "longitude",
-                    # Critical path column
-                    "critical_path_json"
-                ]
-                sites_ws.append_row(headers)
+                meta_ws = sheet.add_worksheet(title="Metadata", rows=10, cols=5)
+                meta_ws.append_row(['created', 'last_updated', 'version'])
+                metadata = {
+                    'created': datetime.now().isoformat(),
+                    'last_updated': datetime.now().isoformat(),
+                    'version': '1.0'
+                }
+                meta_ws.append_row([metadata['created'], metadata['last_updated'], metadata['version']])
             
-            # Load all site data with retry
+            # Schema migrations (no request at all when Metadata already has the current version)
             try:
-                all_rows = sites_ws.get_all_records()
+                migration = migrate_schema(sheet, metadata)
+                if migration.changed:
+                    st.success(f"📋 Updated Google Sheets schema: {migration.summary()}")
+            except Exception as e:
+                st.warning(f"Could not update schema: {e}")
+            
+            try:
+                sites_ws = sheet.worksheet("Sites")
+            except Exception:
+                # Tab deleted after the version was recorded
+                migrate_schema(sheet, metadata, force=True)
+                sites_ws = sheet.worksheet("Sites")
+            
+            # Load all site data with retry (header row comes with it)
+            try:
+                all_values = sites_ws.get_all_values()
             except Exception as e:
                 st.warning(f"Error fetching data (attempt {attempt + 1}/{max_retries}): {e}")
                 if attempt < max_retries - 1:
@@ -221,14 +243,18 @@ def load_database() -> Dict:
                     continue
                 else:
                     raise
+            sheet_headers = list(all_values[0]) if all_values else []
+            all_rows = records_from_values(all_values)
             
             sites = {}
+            row_index = {}
             
-            for row in all_rows:
+            for row_num, row in enumerate(all_rows, start=2):
                 if not row.get('site_id'):
                     continue
                     
                 site_id = row['site_id']
+                row_index[site_id] = row_num
                 
                 # Safe conversion helper for numeric fields
                 def safe_int(value, default=0):
@@ -258,24 +284,8 @@ def load_database() -> Dict:
                     'last_updated': str(row.get('last_updated', '')),
                 }
                 
-                # Parse JSON fields with better error handling
-                for json_field in ['phases', 'onsite_gen', 'schedule', 'non_power', 'risks', 'opps', 'questions']:
-                    json_key = f'{json_field}_json'
-                    default_value = [] if json_field in ['risks', 'opps', 'questions', 'phases'] else {}
-                    
-                    json_str = row.get(json_key, '')
-                    if json_str and json_str.strip():
-                        try:
-                            parsed = json.loads(json_str)
-                            # Validate the parsed data type
-                            if json_field in ['risks', 'opps', 'questions', 'phases']:
-                                site[json_field] = parsed if isinstance(parsed, list) else default_value
-                            else:
-                                site[json_field] = parsed if isinstance(parsed, dict) else default_value
-                        except json.JSONDecodeError:
-                            site[json_field] = default_value
-                    else:
-                        site[json_field] = default_value
+                # JSON columns stay as raw cell strings; SiteRecord decodes on first access
+                raw_json = {key: row.get(column, '') for key, (column, _) in JSON_COLUMNS.items()}
                 
                 # Load program tracker fields
                 site['client'] = str(row.get('client', ''))
@@ -301,16 +311,6 @@ def load_database() -> Dict:
                     
                 site['tracker_notes'] = str(row.get('tracker_notes', ''))
                 
-                # Load site profile builder fields
-                profile_json_str = row.get('profile_json', '')
-                if profile_json_str and profile_json_str.strip():
-                    try:
-                        site['profile_json'] = json.loads(profile_json_str)
-                    except json.JSONDecodeError:
-                        site['profile_json'] = {}
-                else:
-                    site['profile_json'] = {}
-                
                 # Load coordinates
                 try:
                     lat = row.get('latitude', '')
@@ -333,26 +333,13 @@ def load_database() -> Dict:
                 else:
                     site['critical_path_json'] = ''
                 
-                sites[site_id] = site
+                sites[site_id] = SiteRecord(site, raw_json)
             
-            # Try to get metadata
-            try:
-                meta_ws = sheet.worksheet("Metadata")
-                meta_rows = meta_ws.get_all_records()
-                metadata = meta_rows[0] if meta_rows else {
-                    'created': datetime.now().isoformat(),
-                    'last_updated': datetime.now().isoformat(),
-                    'version': '1.0'
-                }
-            except:
-                meta_ws = sheet.add_worksheet(title="Metadata", rows=10, cols=5)
-                meta_ws.append_row(['created', 'last_updated', 'version'])
-                metadata = {
-                    'created': datetime.now().isoformat(),
-                    'last_updated': datetime.now().isoformat(),
-                    'version': '1.0'
-                }
-                meta_ws.append_row([metadata['created'], metadata['last_updated'], metadata['version']])
+            # Remember the row layout so save_database can write only changed cells
+            if sheet_headers:
+                get_sync_state().record_load(sheet, sites_ws, sheet_headers, row_index, sites, len(all_rows))
+            else:
+                get_sync_state().clear()
             
             # Load Utilities
             utilities = {}
@@ -405,124 +392,49 @@ def load_database() -> Dict:
                 st.error("CRITICAL ERROR: Could not load database from Google Sheets. Saving is disabled to protect data.")
                 raise e
 
-def save_database(db: Dict):
-    """Save site database to Google Sheets."""
-    try:
+def write_database(db: Dict):
+    """
+    Write a full db dict to Google Sheets.
+    
+    Only the cells of sites that changed since the last load/save are written
+    (see sheets_sync); falls back to a single full rewrite when the sheet
+    layout is unknown.
+    """
+    # Update metadata (replaced, not edited: the dict may belong to a published version)
+    db['metadata'] = {**db.get('metadata', {}), 'last_updated': datetime.now().isoformat()}
+    
+    sync_state = get_sync_state()
+    sheet = sync_state.spreadsheet
+    if sheet is None:
         client = get_sheets_client()
         sheet = client.open(SHEET_NAME)
-        sites_ws = sheet.worksheet("Sites")
-        
-        # Update metadata
-        db['metadata']['last_updated'] = datetime.now().isoformat()
-        
-        # Clear existing data (except headers)
-        sites_ws.clear()
-        
-        # Re-add headers
-        headers = [
-            "site_id", "name", "state", "utility", "target_mw", "acreage", "iso", "county",
-            "developer", "land_status", "community_support", "political_support",
-            "dev_experience", "capital_status", "financial_status", "last_updated",
-            "phases_json", "onsite_gen_json", "schedule_json", "non_power_json",
-            "risks_json", "opps_json", "questions_json",
-            # Program tracker columns
-            "client", "total_fee_potential", "contract_status",
-            "site_control_stage", "power_stage", "marketing_stage", "buyer_stage",
-            "zoning_stage", "water_stage", "incentives_stage",
-            "probability", "weighted_fee", "tracker_notes",
-            # Site profile builder columns
-            "profile_json", "latitude", "longitude",
-            # Critical path column
-            "critical_path_json",
-            # Triage & Diagnosis columns
-            "phase", "triage_date", "triage_verdict", "triage_red_flags_json",
-            "diagnosis_date", "diagnosis_json", "validated_timeline", "timeline_risk",
-            "claim_validation_json", "diagnosis_recommendation", "diagnosis_top_risks",
-            "diagnosis_follow_ups", "research_summary"
-        ]
-        sites_ws.append_row(headers)
-        
-        # Add all sites
-        for site_id, site in db['sites'].items():
-            # Recalculate tracker probabilities before saving
-            tracker_data = ProgramTrackerData.from_dict({**site, 'site_id': site_id})
-            tracker_data.update_calculations()
-            
-            row = [
-                site_id,
-                site.get('name', ''),
-                site.get('state', ''),
-                site.get('utility', ''),
-                site.get('target_mw', 0),
-                site.get('acreage', 0),
-                site.get('iso', ''),
-                site.get('county', ''),
-                site.get('developer', ''),
-                site.get('land_status', ''),
-                site.get('community_support', ''),
-                site.get('political_support', ''),
-                site.get('dev_experience', ''),
-                site.get('capital_status', ''),
-                site.get('financial_status', ''),
-                site.get('last_updated', ''),
-                json.dumps(site.get('phases', [])),
-                json.dumps(site.get('onsite_gen', {})),
-                json.dumps(site.get('schedule', {})),
-                json.dumps(site.get('non_power', {})),
-                json.dumps(site.get('risks', [])),
-                json.dumps(site.get('opps', [])),
-                json.dumps(site.get('questions', [])),
-                # Program tracker columns
-                tracker_data.client,
-                tracker_data.total_fee_potential,
-                tracker_data.contract_status,
-                tracker_data.site_control_stage,
-                tracker_data.power_stage,
-                tracker_data.marketing_stage,
-                tracker_data.buyer_stage,
-                tracker_data.zoning_stage,
-                tracker_data.water_stage,
-                tracker_data.incentives_stage,
-                tracker_data.probability,
-                tracker_data.weighted_fee,
-                tracker_data.tracker_notes,
-                # Site profile builder columns
-                json.dumps(site.get('profile_json', {})),
-                site.get('latitude', ''),
-                site.get('longitude', ''),
-                # Critical path column
-                site.get('critical_path_json', ''),
-                # Triage & Diagnosis columns
-                site.get('phase', ''),
-                site.get('triage_date', ''),
-                site.get('triage_verdict', ''),
-                site.get('triage_red_flags_json', ''),
-                site.get('diagnosis_date', ''),
-                site.get('diagnosis_json', ''),
-                site.get('validated_timeline', ''),
-                site.get('timeline_risk', ''),
-                site.get('claim_validation_json', ''),
-                site.get('diagnosis_recommendation', ''),
-                site.get('diagnosis_top_risks', ''),
-                site.get('diagnosis_follow_ups', ''),
-                site.get('research_summary', '')
-            ]
-            sites_ws.append_row(row)
-        
-        # Update metadata sheet
-        try:
-            meta_ws = sheet.worksheet("Metadata")
-            meta_ws.clear()
-            meta_ws.append_row(['created', 'last_updated', 'version'])
-            meta_ws.append_row([
-                db['metadata']['created'],
-                db['metadata']['last_updated'],
-                db['metadata']['version']
-            ])
-        except:
-            pass
+    
+    stats = save_sites_incremental(sheet, db, sync_state)
+    print(f"[save_database] {stats['mode']}: {stats['dirty']} changed, "
+          f"{stats['added']} added, {stats['deleted']} deleted, {stats['requests']} request(s)")
+    
+    # Write-through so the next load is served locally
+    get_snapshot_cache(get_db_cache_ttl()).put(
+        SHEET_NAME, db['metadata']['last_updated'], db, sync_state.export_layout()
+    )
+
+def save_database(db: Dict):
+    """
+    Save site database to Google Sheets.
+    
+    This session's edits are merged into the latest shared version before
+    writing, so saving never reverts sites another session changed in the
+    meantime. The result is published to every session as a new version.
+    """
+    try:
+        snapshot = get_portfolio_store().commit(db, write_database)
+        db['metadata'] = dict(snapshot.db.get('metadata', {}))
+        st.session_state.committed_version = snapshot.version
             
     except Exception as e:
+        # Snapshot may no longer match the sheet; force a full rewrite next time
+        get_sync_state().clear()
+        get_snapshot_cache(get_db_cache_ttl()).invalidate(SHEET_NAME)
         st.error(f"Error saving to Google Sheets: {e}")
 
 # Expose save function to session state for agent tools
@@ -545,38 +457,129 @@ def delete_site(db: Dict, site_id: str):
 # SCORING ENGINE
 # =============================================================================
 
+# Score components in matrix column order, with their default weights
+SCORE_COMPONENTS = ('state', 'power', 'relationship', 'execution', 'fundamentals', 'financial')
+DEFAULT_SCORE_WEIGHTS = {
+    'state': 0.20, 'power': 0.25, 'relationship': 0.20,
+    'execution': 0.15, 'fundamentals': 0.10, 'financial': 0.10,
+}
+
+
+def calculate_site_components(site: Dict) -> Dict[str, float]:
+    """Unweighted component scores (0-100) for one site."""
+    state_profile = get_state_profile(site.get('state', ''))
+    return {
+        'state': state_profile.overall_score if state_profile else 50,
+        'power': calculate_power_pathway_score(site),
+        'relationship': calculate_relationship_score(site),
+        'execution': calculate_execution_score(site),
+        'fundamentals': calculate_fundamentals_score(site),
+        'financial': calculate_financial_score(site),
+    }
+
+
 def calculate_site_score(site: Dict, weights: Dict) -> Dict:
     """Calculate comprehensive site score with custom weights."""
     
-    state_profile = get_state_profile(site.get('state', ''))
-    state_score = state_profile.overall_score if state_profile else 50
-    
-    power_score = calculate_power_pathway_score(site)
-    relationship_score = calculate_relationship_score(site)
-    execution_score = calculate_execution_score(site)
-    fundamentals_score = calculate_fundamentals_score(site)
-    financial_score = calculate_financial_score(site)
-    
-    weighted_score = (
-        state_score * weights.get('state', 0.20) +
-        power_score * weights.get('power', 0.25) +
-        relationship_score * weights.get('relationship', 0.20) +
-        execution_score * weights.get('execution', 0.15) +
-        fundamentals_score * weights.get('fundamentals', 0.10) +
-        financial_score * weights.get('financial', 0.10)
+    components = calculate_site_components(site)
+    
+    weighted_score = sum(
+        components[key] * weights.get(key, DEFAULT_SCORE_WEIGHTS[key])
+        for key in SCORE_COMPONENTS
     )
     
     return {
         'overall_score': round(weighted_score, 1),
-        'state_score': state_score,
-        'power_score': round(power_score, 1),
-        'relationship_score': round(relationship_score, 1),
-        'execution_score': round(execution_score, 1),
-        'fundamentals_score': round(fundamentals_score, 1),
-        'financial_score': round(financial_score, 1),
+        'state_score': components['state'],
+        'power_score': round(components['power'], 1),
+        'relationship_score': round(components['relationship'], 1),
+        'execution_score': round(components['execution'], 1),
+        'fundamentals_score': round(components['fundamentals'], 1),
+        'financial_score': round(components['financial'], 1),
         'weights': weights
     }
 
+
+@dataclass
+class SiteScoreMatrix:
+    """
+    Component scores for every site, extracted once per data load.
+    
+    components[i, j] is site_ids[i]'s score for SCORE_COMPONENTS[j], so a
+    new set of weights is one vectorized matrix-vector product instead of a
+    pass over every site's scorers.
+    """
+    key: tuple
+    site_ids: List[str]
+    components: np.ndarray          # (sites, len(SCORE_COMPONENTS))
+    attributes: pd.DataFrame        # Site, State, State Tier, MW, Stage + rounded component columns
+    
+    def weight_vector(self, weights: Dict) -> np.ndarray:
+        return np.array([weights.get(key, DEFAULT_SCORE_WEIGHTS[key]) for key in SCORE_COMPONENTS])
+    
+    def overall(self, weights: Dict) -> np.ndarray:
+        """Weighted overall score per site, rounded like calculate_site_score."""
+        # Column-by-column accumulation in calculate_site_score's order; a BLAS
+        # product may sum differently and flip .x5 rounding ties
+        w = self.weight_vector(weights)
+        total = np.zeros(len(self.site_ids))
+        for j in range(len(SCORE_COMPONENTS)):
+            total += self.components[:, j] * w[j]
+        # np.round rounds 54.15 (really 54.1499...) up; built-in round does not
+        return np.array([round(v, 1) for v in total.tolist()])
+    
+    def ranked(self, weights: Dict) -> pd.DataFrame:
+        """Attributes plus rounded scores, sorted best first with a Rank column."""
+        df = self.attributes.copy()
+        df.insert(df.columns.get_loc('Stage') + 1, 'Overall', self.overall(weights))
+        df = df.sort_values('Overall', ascending=False, kind='stable').reset_index(drop=True)
+        df.insert(0, 'Rank', np.arange(1, len(df) + 1))
+        return df
+
+
+def _score_matrix_key(db: Dict) -> tuple:
+    """Changes whenever the database is reloaded or saved."""
+    sites = db.get('sites', {})
+    return (id(sites), len(sites), db.get('metadata', {}).get('last_updated'))
+
+
+def build_score_matrix(db: Dict) -> SiteScoreMatrix:
+    """Run the per-site scorers once for every site."""
+    sites = db.get('sites', {})
+    site_ids = list(sites)
+    components = np.zeros((len(site_ids), len(SCORE_COMPONENTS)))
+    rows = []
+    for i, site_id in enumerate(site_ids):
+        site = sites.get(site_id)   # read-only handle: no per-session copy
+        site_components = calculate_site_components(site)
+        components[i] = [site_components[key] for key in SCORE_COMPONENTS]
+        state_profile = get_state_profile(site.get('state', ''))
+        rows.append({
+            'Site': site.get('name', site_id), 'State': site.get('state', ''),
+            'State Tier': state_profile.tier if state_profile else 'N/A',
+            'MW': site.get('target_mw', 0), 'Stage': determine_stage(site),
+            'State Score': site_components['state'],
+            'Power': round(site_components['power'], 1),
+            'Relationship': round(site_components['relationship'], 1),
+            'Execution': round(site_components['execution'], 1),
+            'Fundamentals': round(site_components['fundamentals'], 1),
+            'Financial': round(site_components['financial'], 1),
+        })
+    attributes = pd.DataFrame(rows, columns=[
+        'Site', 'State', 'State Tier', 'MW', 'Stage',
+        'State Score', 'Power', 'Relationship', 'Execution', 'Fundamentals', 'Financial',
+    ])
+    return SiteScoreMatrix(_score_matrix_key(db), site_ids, components, attributes)
+
+
+def get_score_matrix(db: Dict) -> SiteScoreMatrix:
+    """Session-cached score matrix, rebuilt only after a load or save."""
+    matrix = st.session_state.get('score_matrix')
+    if matrix is None or matrix.key != _score_matrix_key(db):
+        matrix = build_score_matrix(db)
+        st.session_state.score_matrix = matrix
+    return matrix
+
 def calculate_power_pathway_score(site: Dict) -> float:
     """Calculate power pathway score (0-100) based on detailed phasing."""
     score = 0
@@ -842,11 +845,70 @@ def log_activity(node_key):
         st.session_state.node_updates = {}
     st.session_state.node_updates[node_key] = get_est_timestamp()
 
+_page_registry: Optional[PageRegistry] = None
+
+
+def get_page_registry() -> PageRegistry:
+    """Navigation table; page modules outside this file are imported on first selection."""
+    global _page_registry
+    if _page_registry is not None:
+        return _page_registry
+    
+    registry = PageRegistry()
+    registry.add("📊 Dashboard", "dashboard", render=show_dashboard, activity='Dash')
+    registry.add("🏭 Site Database", "sites", render=show_site_database, activity='Session') # Viewing data
+    registry.add("💬 AI Chat", "chat", render=show_ai_chat, activity='Chat')
+    registry.add("📁 VDR Upload", "vdr", render=show_vdr_upload, activity='VDR') # User is interacting with VDR module
+    registry.add("➕ Add/Edit Site", "add_edit", render=show_add_edit_site, activity='Human') # Manual input form
+    registry.add("🏆 Rankings", "rankings", render=show_rankings, activity='Scorer') # Viewing scores
+    registry.add("📊 Program Tracker", "tracker", module=".program_management_page",
+                 attr="show_program_tracker", activity='Tracker')
+    registry.add("⚡ Critical Path", "critical_path", module=".critical_path_page",
+                 attr="show_critical_path_page", activity='CriticalPath',
+                 unavailable="Critical Path module not available")
+    registry.add("🗺️ State Analysis", "state_analysis", render=show_state_analysis,
+                 activity='SupplyDemand') # Viewing macro analysis
+    registry.add("🔬 Research Framework", "research", module=".research_module",
+                 attr="show_research_module", activity='DeepResearch') # Viewing research
+    registry.add("🔍 Utility Research", "utility_research", render=show_utility_research,
+                 activity='UtilAgent', hidden=True) # Archived
+    # No log needed for the NOC, we are viewing the logs
+    registry.add("🧩 Network Operations Center (NOC)", "noc", module=".system_flow", attr="show_system_flow")
+    registry.add("🎨 Design System", "design_system", module=".design_system_module",
+                 attr="render_design_system_page", args=(st,), hidden=True) # Archived
+    registry.add("⚙️ Settings", "settings", render=show_settings)
+    
+    # Add Triage Navigation if available
+    if TRIAGE_AVAILABLE:
+        registry.add("🚦 Quick Triage", "triage", render=show_quick_triage)
+        registry.add("🔬 Full Diagnosis", "diagnosis", render=show_full_diagnosis)
+        registry.add("🔍 Intelligence Center", "intelligence", render=show_intelligence_center)
+        registry.add("📋 Triage Log", "triage_log", render=show_triage_log)
+    
+    _page_registry = registry
+    return registry
+
+
+def route_page(page: str):
+    """Log the Command Center activity for a page and render it (importing it if needed)."""
+    registry = get_page_registry()
+    spec = registry.get(page) or registry.get("dashboard")
+    if spec.activity:
+        log_activity(spec.activity)
+    render, error = registry.resolve(spec.key)
+    if render is None:
+        st.error(error)
+        return
+    render(*spec.args)
+
+
 def run():
     # st.set_page_config() is handled by the main app
     
     if 'db' not in st.session_state:
         st.session_state.db = load_database()
+    else:
+        refresh_session_db()
     
     if 'weights' not in st.session_state:
         st.session_state.weights = {
@@ -871,32 +933,8 @@ def run():
         st.session_state.node_updates = {}
         
     # Use session state for navigation
-    # Define pages
-    pages = {
-        "📊 Dashboard": "dashboard",
-        "🏭 Site Database": "sites",
-        "💬 AI Chat": "chat",
-        "📁 VDR Upload": "vdr",
-        "➕ Add/Edit Site": "add_edit",
-        "🏆 Rankings": "rankings",
-        "📊 Program Tracker": "tracker",
-        "⚡ Critical Path": "critical_path",
-        "🗺️ State Analysis": "state_analysis",
-        "🔬 Research Framework": "research",
-        # "🔍 Utility Research": "utility_research", # Archived
-        "🧩 Network Operations Center (NOC)": "noc",
-        # "🎨 Design System": "design_system", # Archived
-        "⚙️ Settings": "settings"
-    }
+    pages = get_page_registry().labels()
     
-    # Add Triage Navigation if available
-    if TRIAGE_AVAILABLE:
-        # Insert new pages
-        pages["🚦 Quick Triage"] = "triage"
-        pages["🔬 Full Diagnosis"] = "diagnosis"
-        pages["🔍 Intelligence Center"] = "intelligence"
-        pages["📋 Triage Log"] = "triage_log"
-
     # Sidebar selection
     selected_label = st.sidebar.radio(
         "Navigation",
@@ -927,69 +965,7 @@ def run():
                         st.error("Schema update failed.")
 
     # Route and Log Activity
-    if page == "dashboard": 
-        log_activity('Dash')
-        show_dashboard()
-    elif page == "sites": 
-        log_activity('Session') # Viewing data
-        show_site_database()
-    elif page == "chat": 
-        log_activity('Chat')
-        show_ai_chat()
-    elif page == "vdr": 
-        log_activity('VDR') # User is interacting with VDR module
-        show_vdr_upload()
-    elif page == "add_edit": 
-        log_activity('Human') # Manual input form
-        show_add_edit_site()
-    elif page == "rankings": 
-        log_activity('Scorer') # Viewing scores
-        show_rankings()
-    elif page == "tracker": 
-        log_activity('Tracker')
-        show_program_tracker()
-    elif page == "state_analysis": 
-        log_activity('SupplyDemand') # Viewing macro analysis
-        show_state_analysis()
-    elif page == "research": 
-        log_activity('DeepResearch') # Viewing research
-        show_research_module()
-    elif page == "utility_research": 
-        log_activity('UtilAgent')
-        show_utility_research()
-    elif page == "critical_path":
-        log_activity('CriticalPath')
-        if CRITICAL_PATH_AVAILABLE:
-            show_critical_path_page()
-        else:
-            st.error("Critical Path module not available")
-    elif page == "noc":
-        # No log needed, we are viewing the logs
-        show_system_flow()
-    elif page == "design_system":
-        render_design_system_page(st)
-    elif page == "settings": 
-        show_settings()
-    elif page == "triage":
-        if TRIAGE_AVAILABLE:
-            show_quick_triage()
-        else:
-            st.error("Triage module not loaded.")
-    elif page == "diagnosis":
-        if TRIAGE_AVAILABLE:
-            show_full_diagnosis()
-        else:
-            st.error("Diagnosis module not loaded.")
-    elif page == "intelligence":
-        if TRIAGE_AVAILABLE:
-            show_intelligence_center()
-        else:
-            st.error("Intelligence module not loaded.")
-    elif page == "triage_log":
-        if TRIAGE_AVAILABLE:
-            show_triage_log()
-        else:
-            st.error("Triage log module not loaded.")
+    route_page(page)
 
 
 # ... (skipping unchanged functions) ...
@@ -1028,6 +1004,8 @@ def show_site_details(site_id: str):
 
 def generate_site_report_pdf(site: Dict, scores: Dict, stage: str, state_context: Dict) -> bytes:
     """Generate comprehensive PDF report with visualizations and market research."""
+    from fpdf import FPDF
+    
     class PDF(FPDF):
         def header(self):
             self.set_font('Helvetica', 'B', 10)
@@ -1468,7 +1446,7 @@ def generate_portfolio_pdf(site_ids: list, db: Dict, weights: Dict) -> bytes:
     sites_data = []
     for site_id in site_ids:
         if site_id in sites:
-            site = sites[site_id]
+            site = sites.get(site_id)
             scores = calculate_site_score(site, weights)
             stage = determine_stage(site)
             sites_data.append({'id': site_id, 'site': site, 'scores': scores, 'stage': stage})
@@ -1805,7 +1783,7 @@ def generate_portfolio_pdf(site_ids: list, db: Dict, weights: Dict) -> bytes:
     sites_data = []
     for site_id in site_ids:
         if site_id in sites:
-            site = sites[site_id]
+            site = sites.get(site_id)
             scores = calculate_site_score(site, weights)
             stage = determine_stage(site)
             sites_data.append({'id': site_id, 'site': site, 'scores': scores, 'stage': stage})
@@ -2061,7 +2039,7 @@ def generate_portfolio_pdf(site_ids: list, db: Dict, weights: Dict) -> bytes:
     sites_data = []
     for site_id in site_ids:
         if site_id in sites:
-            site = sites[site_id]
+            site = sites.get(site_id)
             scores = calculate_site_score(site, weights)
             stage = determine_stage(site)
             sites_data.append({'id': site_id, 'site': site, 'scores': scores, 'stage': stage})
@@ -2235,7 +2213,7 @@ def generate_portfolio_pdf(site_ids: list, db: Dict, weights: Dict) -> bytes:
 
 def get_or_create_template(template_dir: str = "/tmp/pptx_templates") -> str:
     """Get existing template or create a new one."""
-    from portfolio_manager.pptx_export import TEMPLATE_VERSION
+    from portfolio_manager.pptx_export import TEMPLATE_VERSION, create_default_template
     
     # Check for project-level template first (same as Site Profile Builder)
     project_root = os.path.dirname(os.path.dirname(__file__))
@@ -2258,6 +2236,7 @@ def get_or_create_template(template_dir: str = "/tmp/pptx_templates") -> str:
 def generate_site_report_pptx(site: Dict, scores: Dict, stage: str, state_context: Dict, site_id: str) -> bytes:
     """Generate PowerPoint report for a site."""
     import tempfile
+    from .pptx_export import export_site_to_pptx, ExportConfig
     
     # Get or create template
     template_path = get_or_create_template()
@@ -2379,6 +2358,8 @@ def prepare_site_for_pptx_export(site: Dict, scores: Dict, state_context: Dict)
 
 def show_dashboard():
     """Main dashboard with portfolio overview."""
+    import plotly.express as px
+    
     st.title("📊 Portfolio Dashboard")
     
     db = st.session_state.db
@@ -2392,8 +2373,9 @@ def show_dashboard():
     
     total_sites = len(sites)
     total_mw = sum(s.get('target_mw', 0) for s in sites.values())
-    avg_score = sum(calculate_site_score(s, st.session_state.weights)['overall_score'] for s in sites.values()) / total_sites
-    stages = [determine_stage(s) for s in sites.values()]
+    score_matrix = get_score_matrix(db)
+    avg_score = float(score_matrix.overall(st.session_state.weights).mean())
+    stages = list(score_matrix.attributes['Stage'])
     
     col1.metric("Total Sites", total_sites)
     col2.metric("Total Pipeline MW", f"{total_mw:,.0f}")
@@ -2856,7 +2838,7 @@ def show_extracted_site_form(extracted_data):
                     st.info(f"Saving site with ID: {site_id}")
                     
                     # Save to Google Sheets database
-                    db = load_database()  # Reload from Sheets to get latest
+                    db = load_database(revalidate=True)  # Reload from Sheets to get latest
                     db['sites'][site_id] = new_site
                     save_database(db)
                     
@@ -3232,6 +3214,8 @@ def show_site_database():
 
 def show_site_details(site_id: str):
     """Show detailed view of a single site."""
+    import plotly.graph_objects as go
+    
     site = st.session_state.db['sites'].get(site_id, {})
     scores = calculate_site_score(site, st.session_state.weights)
     stage = determine_stage(site)
@@ -3469,7 +3453,7 @@ def show_site_details(site_id: str):
             key=f"download_pdf_{site_id}"
         )
     with col3:
-        if PPTX_AVAILABLE:
+        if optional_import('.pptx_export') is not None:
             try:
                 pptx_bytes = generate_site_report_pptx(site, scores, stage, state_context, site_id)
                 st.download_button(
@@ -3503,6 +3487,8 @@ def run_ai_site_research(site_id: str, site_data: Dict):
         st.warning("⚠️ Latitude and Longitude required for AI research. Please add them in 'Basic Info' below and save.")
         return
 
+    from .site_profile_builder import SiteProfileBuilder, SiteProfileData, build_research_prompt
+    
     # Initialize builder for this site
     builder = SiteProfileBuilder(site_data)
     
@@ -3965,6 +3951,7 @@ def show_add_edit_site():
                 'water_provider', 'water_capacity_gpd', 'fiber_provider', 'current_zoning',
                 'distance_to_transmission'
             ]
+            from .site_profile_builder import get_human_input_form_fields
             form_sections = get_human_input_form_fields(exclude_fields=EXCLUDED_FIELDS)
             
             # We need to store these inputs to save them later
@@ -4028,6 +4015,7 @@ def show_add_edit_site():
                 
                 # Filter for AI fields
                 ai_data = {}
+                from .site_profile_builder import AI_RESEARCHABLE_FIELDS
                 for field, desc in AI_RESEARCHABLE_FIELDS.items():
                     if field in profile_json:
                         ai_data[field] = profile_json[field]
@@ -4093,7 +4081,7 @@ def show_add_edit_site():
                     site_id = st.session_state.edit_site_id
                 else:
                     # Reload database to get latest data from Google Sheets before checking duplicates
-                    fresh_db = load_database()
+                    fresh_db = load_database(revalidate=True)
                     
                     site_id = name.lower().replace(' ', '_').replace('-', '_')
                     # Ensure unique ID by checking against fresh data from Sheets
@@ -4125,6 +4113,8 @@ def show_add_edit_site():
 
 def show_rankings():
     """Show site rankings with custom weighting."""
+    import plotly.express as px
+    
     st.title("🏆 Site Rankings")
     
     db = st.session_state.db
@@ -4151,26 +4141,8 @@ def show_rankings():
     else:
         st.session_state.weights = weights
     
-    rankings = []
-    for site_id, site in sites.items():
-        scores = calculate_site_score(site, weights)
-        stage = determine_stage(site)
-        state_profile = get_state_profile(site.get('state', ''))
-        
-        rankings.append({
-            'Site': site.get('name', site_id), 'State': site.get('state', ''),
-            'State Tier': state_profile.tier if state_profile else 'N/A',
-            'MW': site.get('target_mw', 0), 'Stage': stage,
-            'Overall': scores['overall_score'], 'State Score': scores['state_score'],
-            'Power': scores['power_score'], 'Relationship': scores['relationship_score'],
-            'Execution': scores['execution_score'], 'Fundamentals': scores['fundamentals_score'],
-            'Financial': scores['financial_score']
-        })
-    
-    rankings.sort(key=lambda x: x['Overall'], reverse=True)
-    for i, r in enumerate(rankings): r['Rank'] = i + 1
-    
-    df = pd.DataFrame(rankings)
+    # Component scores are computed once per load; sliders only re-weight
+    df = get_score_matrix(db).ranked(weights)
     df = df[['Rank', 'Site', 'State', 'State Tier', 'MW', 'Stage', 'Overall', 'State Score', 'Power', 'Relationship', 'Execution', 'Fundamentals', 'Financial']]
     
     st.dataframe(df, column_config={
@@ -4192,6 +4164,8 @@ def show_rankings():
 
 def show_state_analysis():
     """State-level analysis view."""
+    import plotly.graph_objects as go
+    
     st.title("🗺️ State Analysis")
     
     col1, col2 = st.columns([2, 1])
@@ -4243,9 +4217,11 @@ def show_utility_research():
     st.title("🔍 Utility Research Agent")
     st.write("Autonomous agent for deep utility research and data collection.")
     
-    if not UTILITY_AGENT_AVAILABLE:
+    utility_agent = optional_import('.utility_agent')
+    if utility_agent is None:
         st.error("Utility Agent module not available. Please install dependencies.")
         return
+    UtilityResearchAgent = utility_agent.UtilityResearchAgent
 
     col1, col2 = st.columns(2)
     with col1:
@@ -4377,7 +4353,7 @@ def show_settings():
     
     with col2:
         if st.button("📥 Export Database"):
-            db_json = json.dumps(st.session_state.db, indent=2, default=str)
+            db_json = json.dumps(st.session_state.db, indent=2, default=json_default)
             st.download_button("Download JSON", db_json, file_name="site_database.json", mime="application/json")
     
     with col3:
@@ -4391,6 +4367,106 @@ def show_settings():
                 st.rerun()
             except Exception as e:
                 st.error(f"Error importing database: {e}")
+    
+    st.markdown("---")
+    st.subheader("Local Cache")
+    cache = get_snapshot_cache(get_db_cache_ttl())
+    stats = cache.stats
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Cache Hits", stats['hits'])
+    c2.metric("Revalidated", stats['revalidated'])
+    c3.metric("Misses (full load)", stats['misses'])
+    c4.metric("Hit Rate", f"{cache.hit_rate()*100:.0f}%")
+    st.caption(f"Snapshot file: `{cache.path}` · write-throughs: {stats['writes']} · errors: {stats['errors']}")
+    
+    col1, col2 = st.columns(2)
+    with col1:
+        new_ttl = st.number_input(
+            "Cache TTL (seconds)", min_value=0, max_value=86400,
+            value=int(cache.ttl_seconds), step=30,
+            help="Loads within this window skip Google Sheets entirely. After it, only the Metadata revision is checked."
+        )
+        if new_ttl != int(cache.ttl_seconds):
+            cache.ttl_seconds = new_ttl
+            get_portfolio_store().ttl_seconds = new_ttl
+    with col2:
+        if st.button("🔄 Refresh from Google Sheets"):
+            st.session_state.db = load_database(force_refresh=True)
+            st.success("Reloaded from Google Sheets")
+            st.rerun()
+    
+    st.markdown("---")
+    st.subheader("Shared Portfolio Store")
+    store_stats = get_portfolio_store().metrics()
+    c1, c2, c3, c4 = st.columns(4)
+    c1.metric("Version", store_stats['version'])
+    c2.metric("Open Sessions", store_stats['sessions'])
+    c3.metric("Copied Records", store_stats['cloned_records'])
+    c4.metric("Sheet Loads", store_stats['loads'])
+    db = st.session_state.db
+    session_note = f"v{db.version}" if isinstance(db, SessionPortfolio) else "detached copy"
+    st.caption(
+        f"This session: {session_note} · sessions per version: {store_stats['sessions_per_version']} · "
+        f"commits: {store_stats['commits']} (rebased: {store_stats['rebased']}) · "
+        f"revision checks: {store_stats['revalidations']}"
+    )
+    
+    st.markdown("---")
+    st.subheader("LLM Response Cache")
+    gateway = get_llm_gateway()
+    if not gateway.enabled:
+        st.caption("Disabled (PORTFOLIO_LLM_CACHE=0) - every LLM call goes to the provider.")
+    else:
+        metrics = gateway.metrics()
+        c1, c2, c3, c4 = st.columns(4)
+        c1.metric("Cache Hits", metrics['hits'])
+        c2.metric("Billed Calls", metrics['calls'])
+        c3.metric("Stored Responses", metrics['entries'])
+        c4.metric("Hit Rate", f"{metrics['hit_rate']*100:.0f}%")
+        st.caption(
+            f"Cache file: `{metrics['path']}` · {metrics['bytes'] / 1024:.0f} KB · "
+            f"evicted: {metrics['evicted']} · expired: {metrics['expired']} · "
+            f"pooled clients: {metrics['pooled_clients']}"
+        )
+        if st.button("🗑️ Clear LLM Cache"):
+            gateway.cache.invalidate()
+            st.success("Cleared cached LLM responses")
+    
+    st.markdown("---")
+    st.subheader("Startup Profile")
+    st.caption("Page modules and heavy dependencies are imported the first time they are needed.")
+    loaded = import_status()
+    if loaded:
+        st.dataframe(pd.DataFrame(loaded), column_config={
+            'import_ms': st.column_config.NumberColumn("Import (ms)", format="%.0f"),
+        }, hide_index=True, use_container_width=True)
+    else:
+        st.caption("No page modules loaded on demand yet in this process.")
+    
+    targets = {"App startup": __name__}
+    targets.update(get_page_registry().lazy_modules())
+    col1, col2 = st.columns([2, 1])
+    with col1:
+        target = st.selectbox("Profile cold import of", options=list(targets),
+                              help="Runs `python -X importtime` in a fresh interpreter")
+    with col2:
+        st.write("")
+        if st.button("⏱️ Profile Imports"):
+            with st.spinner("Profiling imports..."):
+                st.session_state.import_profile = profile_imports([targets[target]])
+    
+    profile = st.session_state.get('import_profile')
+    if profile:
+        if profile.error:
+            st.warning(f"Import failed: {profile.error}")
+        st.metric(f"Cold import of {', '.join(profile.modules)}", f"{profile.total_ms:,.0f} ms")
+        st.dataframe(pd.DataFrame([
+            {'Module': '· ' * (r.depth - 1) + r.module, 'Cumulative (ms)': r.cumulative_ms, 'Self (ms)': r.self_ms}
+            for r in profile.top(30, max_depth=3)
+        ]), column_config={
+            'Cumulative (ms)': st.column_config.NumberColumn(format="%.1f"),
+            'Self (ms)': st.column_config.NumberColumn(format="%.1f"),
+        }, hide_index=True, use_container_width=True)
 
 
 if __name__ == "__main__":
@@ -30,6 +30,7 @@ from .prompts import (
     format_utility_intel_prompt,
     format_market_snapshot_prompt,
 )
+from ..llm_gateway import get_llm_gateway
 
 
 # =============================================================================
@@ -39,20 +40,52 @@ from .prompts import (
 def get_gemini_model(model_name: str = "models/gemini-2.0-flash-exp"):
     """
     Get configured Gemini model.
-    Uses Streamlit secrets for API key.
+    Uses Streamlit secrets for API key; the model comes from the gateway's
+    client pool, so genai.configure only runs when the key changes.
     """
     try:
-        import google.generativeai as genai
+        import google.generativeai  # noqa: F401
         import streamlit as st
-        
-        api_key = st.secrets.get("GEMINI_API_KEY")
-        if not api_key:
-            raise ValueError("GEMINI_API_KEY not found in Streamlit secrets")
-        
-        genai.configure(api_key=api_key)
-        return genai.GenerativeModel(model_name)
     except ImportError:
         raise ImportError("google-generativeai package not installed")
+    
+    api_key = st.secrets.get("GEMINI_API_KEY")
+    if not api_key:
+        raise ValueError("GEMINI_API_KEY not found in Streamlit secrets")
+    
+    return get_llm_gateway().gemini_model(api_key, model_name)
+
+
+def _generate_cached(prompt: str, model_name: str, accept=None) -> str:
+    """Gemini response text through the gateway's response cache."""
+    def call():
+        return get_gemini_model(model_name).generate_content(prompt).text
+    return get_llm_gateway().complete(f"gemini:{model_name}", prompt, call, accept=accept)
+
+
+def _parse_json_response(raw_text: str) -> Tuple[Dict, Optional[str]]:
+    """Parse JSON out of a model response (fenced block, bare fence or braces)."""
+    json_str = raw_text
+    
+    # Strategy 1: Look for ```json blocks
+    if "```json" in raw_text:
+        json_str = raw_text.split("```json")[1].split("```")[0].strip()
+    # Strategy 2: Look for generic ``` blocks
+    elif "```" in raw_text:
+        parts = raw_text.split("```")
+        if len(parts) >= 2:
+            json_str = parts[1].strip()
+    # Strategy 3: Look for { } braces
+    elif "{" in raw_text and "}" in raw_text:
+        match = re.search(r'\{.*\}', raw_text, re.DOTALL)
+        if match:
+            json_str = match.group(0)
+    
+    # Attempt to parse
+    try:
+        return json.loads(json_str), None
+    except json.JSONDecodeError as e:
+        return {}, f"JSON parse error: {e}. Raw response: {raw_text[:500]}"
 
 
 def call_gemini_structured(
@@ -61,6 +94,8 @@ def call_gemini_structured(
 ) -> Tuple[Dict, Optional[str]]:
     """
     Call Gemini with a structured prompt, parse JSON response.
+    Identical prompts are served from the LLM response cache; responses
+    that don't parse are never cached.
     
     Returns:
         Tuple of (parsed_dict, error_message)
@@ -68,36 +103,11 @@ def call_gemini_structured(
         If failed, parsed_dict is empty and error_message contains details
     """
     try:
-        model = get_gemini_model(model_name)
-        response = model.generate_content(prompt)
-        
-        # Extract text from response
-        raw_text = response.text.strip()
-        
-        # Parse JSON with multiple fallback strategies
-        json_str = raw_text
-        
-        # Strategy 1: Look for ```json blocks
-        if "```json" in raw_text:
-            json_str = raw_text.split("```json")[1].split("```")[0].strip()
-        # Strategy 2: Look for generic ``` blocks
-        elif "```" in raw_text:
-            parts = raw_text.split("```")
-            if len(parts) >= 2:
-                json_str = parts[1].strip()
-        # Strategy 3: Look for { } braces
-        elif "{" in raw_text and "}" in raw_text:
-            match = re.search(r'\{.*\}', raw_text, re.DOTALL)
-            if match:
-                json_str = match.group(0)
-        
-        # Attempt to parse
-        try:
-            parsed = json.loads(json_str)
-            return parsed, None
-        except json.JSONDecodeError as e:
-            return {}, f"JSON parse error: {e}. Raw response: {raw_text[:500]}"
-            
+        raw_text = _generate_cached(
+            prompt, model_name,
+            accept=lambda text: _parse_json_response(text.strip())[1] is None
+        ).strip()
+        return _parse_json_response(raw_text)
     except Exception as e:
         return {}, f"Gemini API error: {str(e)}"
 
@@ -107,15 +117,13 @@ def call_gemini_simple(
     model_name: str = "models/gemini-2.0-flash-exp"
 ) -> Tuple[str, Optional[str]]:
     """
-    Call Gemini and return raw text response.
+    Call Gemini and return raw text response (cached like call_gemini_structured).
     
     Returns:
         Tuple of (response_text, error_message)
     """
     try:
-        model = get_gemini_model(model_name)
-        response = model.generate_content(prompt)
-        return response.text.strip(), None
+        return _generate_cached(prompt, model_name).strip(), None
     except Exception as e:
         return "", f"Gemini API error: {str(e)}"
 
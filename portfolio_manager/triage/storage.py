@@ -11,17 +11,44 @@ from typing import Dict, List, Optional, Any
 
 from .models import (
     TriageLogRecord, TriageResult, DiagnosisResult,
-    TRIAGE_LOG_COLUMNS, SITES_TRIAGE_COLUMNS, SITES_DIAGNOSIS_COLUMNS,
+    TRIAGE_LOG_COLUMNS,
 )
 
 
+# =============================================================================
+# CONNECTION
+# =============================================================================
+
+def _open_tracker_spreadsheet():
+    """Open the main app's spreadsheet with the service account from secrets."""
+    import streamlit as st
+    import gspread
+    from google.oauth2.service_account import Credentials
+    
+    scopes = [
+        "https://www.googleapis.com/auth/spreadsheets",
+        "https://www.googleapis.com/auth/drive"
+    ]
+    
+    credentials = Credentials.from_service_account_info(
+        st.secrets["gcp_service_account"],
+        scopes=scopes
+    )
+    
+    client = gspread.authorize(credentials)
+    
+    spreadsheet_name = st.secrets.get("GOOGLE_SHEET_NAME", "Sites Tracker - App")
+    return client.open(spreadsheet_name)
+
+
 # =============================================================================
 # TRIAGE LOG OPERATIONS
 # =============================================================================
 
 def save_triage_to_log(
     record: TriageLogRecord,
-    sheet_name: str = "Triage_Log"
+    sheet_name: str = "Triage_Log",
+    spreadsheet=None,
 ) -> bool:
     """
     Save a triage record to the Triage_Log sheet.
@@ -29,26 +56,10 @@ def save_triage_to_log(
     Returns True if successful.
     """
     try:
-        import streamlit as st
         import gspread
-        from google.oauth2.service_account import Credentials
-        
-        # Get sheets client (reuse from main app if available)
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        
-        credentials = Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"],
-            scopes=scopes
-        )
-        
-        client = gspread.authorize(credentials)
         
         # Open the spreadsheet (use same sheet as main app)
-        spreadsheet_name = st.secrets.get("GOOGLE_SHEET_NAME", "Sites Tracker - App")
-        sheet = client.open(spreadsheet_name)
+        sheet = spreadsheet or _open_tracker_spreadsheet()
         
         # Get or create Triage_Log worksheet
         try:
@@ -72,6 +83,7 @@ def save_triage_to_log(
 def load_triage_log(
     sheet_name: str = "Triage_Log",
     limit: int = 100,
+    spreadsheet=None,
 ) -> List[TriageLogRecord]:
     """
     Load triage log records from Google Sheets.
@@ -79,24 +91,9 @@ def load_triage_log(
     Returns list of TriageLogRecord objects.
     """
     try:
-        import streamlit as st
         import gspread
-        from google.oauth2.service_account import Credentials
-        
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        
-        credentials = Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"],
-            scopes=scopes
-        )
-        
-        client = gspread.authorize(credentials)
         
-        spreadsheet_name = st.secrets.get("GOOGLE_SHEET_NAME", "Sites Tracker - App")
-        sheet = client.open(spreadsheet_name)
+        sheet = spreadsheet or _open_tracker_spreadsheet()
         
         try:
             ws = sheet.worksheet(sheet_name)
@@ -279,49 +276,22 @@ def update_site_diagnosis_fields(
 # SCHEMA MIGRATION
 # =============================================================================
 
-def ensure_triage_columns_exist(sheet_name: str = "Sites") -> bool:
+def ensure_triage_columns_exist(sheet_name: str = "Sites", spreadsheet=None) -> bool:
     """
     Ensure the Sites sheet has all required triage/diagnosis columns.
     Adds missing columns if needed.
+    
+    Runs the versioned schema migrations for that tab (see
+    schema_migrations): all missing headers go out in one batch request.
     """
     try:
-        import streamlit as st
-        import gspread
-        from google.oauth2.service_account import Credentials
-        
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        
-        credentials = Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"],
-            scopes=scopes
-        )
-        
-        client = gspread.authorize(credentials)
-        
-        spreadsheet_name = st.secrets.get("GOOGLE_SHEET_NAME", "Sites Tracker - App")
-        sheet = client.open(spreadsheet_name)
-        ws = sheet.worksheet(sheet_name)
-        
-        # Get existing headers
-        existing_headers = ws.row_values(1)
-        
-        # Required new columns
-        required_columns = SITES_TRIAGE_COLUMNS + SITES_DIAGNOSIS_COLUMNS
+        from ..schema_migrations import migrate_schema
         
-        # Find missing columns
-        missing = [col for col in required_columns if col not in existing_headers]
+        sheet = spreadsheet or _open_tracker_spreadsheet()
+        result = migrate_schema(sheet, force=True, sheets=[sheet_name])
         
-        if missing:
-            print(f"[INFO] Adding {len(missing)} missing columns: {missing}")
-            
-            # Add missing columns
-            next_col = len(existing_headers) + 1
-            for col_name in missing:
-                ws.update_cell(1, next_col, col_name)
-                next_col += 1
+        for ws_name, missing in result.added_columns.items():
+            print(f"[INFO] Added {len(missing)} missing columns to {ws_name}: {missing}")
         
         return True
         
@@ -330,41 +300,20 @@ def ensure_triage_columns_exist(sheet_name: str = "Sites") -> bool:
         return False
 
 
-def ensure_triage_log_sheet_exists() -> bool:
+def ensure_triage_log_sheet_exists(spreadsheet=None) -> bool:
     """
     Ensure the Triage_Log sheet exists with proper headers.
     """
     try:
-        import streamlit as st
-        import gspread
-        from google.oauth2.service_account import Credentials
-        
-        scopes = [
-            "https://www.googleapis.com/auth/spreadsheets",
-            "https://www.googleapis.com/auth/drive"
-        ]
-        
-        credentials = Credentials.from_service_account_info(
-            st.secrets["gcp_service_account"],
-            scopes=scopes
-        )
+        from ..schema_migrations import TRIAGE_LOG_SHEET, migrate_schema
         
-        client = gspread.authorize(credentials)
+        sheet = spreadsheet or _open_tracker_spreadsheet()
+        result = migrate_schema(sheet, force=True, sheets=[TRIAGE_LOG_SHEET])
         
-        spreadsheet_name = st.secrets.get("GOOGLE_SHEET_NAME", "Sites Tracker - App")
-        sheet = client.open(spreadsheet_name)
-        
-        try:
-            ws = sheet.worksheet("Triage_Log")
-            # Verify headers
-            headers = ws.row_values(1)
-            if headers != TRIAGE_LOG_COLUMNS:
-                print("[INFO] Updating Triage_Log headers")
-                ws.update('A1', [TRIAGE_LOG_COLUMNS])
-        except gspread.WorksheetNotFound:
-            print("[INFO] Creating Triage_Log sheet")
-            ws = sheet.add_worksheet(title="Triage_Log", rows=1000, cols=len(TRIAGE_LOG_COLUMNS))
-            ws.append_row(TRIAGE_LOG_COLUMNS)
+        if TRIAGE_LOG_SHEET in result.created_sheets:
+            print("[INFO] Created Triage_Log sheet")
+        elif TRIAGE_LOG_SHEET in result.rewritten_headers:
+            print("[INFO] Updated Triage_Log headers")
         
         return True
         
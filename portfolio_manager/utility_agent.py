@@ -5,6 +5,7 @@ Agentic module for performing deep web research on utility companies.
 Uses DuckDuckGo for search and Gemini/Claude for analysis.
 """
 
+import asyncio
 import time
 import requests
 from bs4 import BeautifulSoup
@@ -17,6 +18,8 @@ import PyPDF2
 
 # Import our modules
 from .llm_integration import GeminiClient, ClaudeClient
+from .llm_gateway import get_llm_gateway
+from .research_crawler import ResearchCrawler, run_async
 from .state_analysis import generate_utility_research_queries
 
 class UtilityResearchAgent:
@@ -26,22 +29,26 @@ class UtilityResearchAgent:
     
     def __init__(self, provider: str = "gemini", api_key: str = None):
         self.provider = provider
+        self.api_key = api_key
         self.client = None
         
         # Initialize LLM client
-        if provider == "gemini":
-            self.client = GeminiClient(api_key)
-        elif provider == "claude":
-            self.client = ClaudeClient(api_key)
-        else:
+        if provider not in ("gemini", "claude"):
             raise ValueError("Invalid provider")
+        self.client = self._new_client()
             
         self.ddgs = DDGS()
         
-    def search_web(self, query: str, max_results: int = 3) -> List[Dict]:
+    def _new_client(self):
+        """Fresh LLM client; chat sessions are stateful, so concurrent topics each get their own."""
+        if self.provider == "gemini":
+            return GeminiClient(self.api_key)
+        return ClaudeClient(self.api_key)
+        
+    def search_web(self, query: str, max_results: int = 3, ddgs: Optional[DDGS] = None) -> List[Dict]:
         """Perform web search using DuckDuckGo."""
         try:
-            results = list(self.ddgs.text(query, max_results=max_results))
+            results = list((ddgs or self.ddgs).text(query, max_results=max_results))
             return results
         except Exception as e:
             print(f"Search error: {e}")
@@ -110,8 +117,8 @@ class UtilityResearchAgent:
         except:
             return utility
 
-    def analyze_content(self, topic: str, content: str, utility: str, state: str) -> str:
-        """Use LLM to extract specific facts from content."""
+    def analyze_content(self, topic: str, content: str, utility: str, state: str, client=None) -> str:
+        """Use LLM to extract specific facts from content (on ``client`` if given)."""
         if not content:
             return "No content available to analyze."
             
@@ -130,49 +137,79 @@ class UtilityResearchAgent:
         {content[:15000]}
         """
         
-        try:
+        system_prompt = "You are a research assistant."
+        client = client or self.client
+        
+        def call():
             # We use a fresh chat session for each analysis to avoid context pollution
-            if self.provider == "gemini":
-                self.client.start_chat("You are a research assistant.")
-                return self.client.send_message(prompt)
-            else:
-                # Claude client doesn't need explicit start_chat for single message if we structured it right,
-                # but our wrapper does.
-                self.client.start_chat("You are a research assistant.")
-                return self.client.send_message(prompt)
+            # (both client wrappers need start_chat before send_message)
+            client.start_chat(system_prompt)
+            response = client.send_message(prompt)
+            # ClaudeClient returns text; GeminiClient returns the response object
+            return response if isinstance(response, str) else response.text
+        
+        try:
+            # Same page + topic on a rerun is served from the LLM response cache
+            return get_llm_gateway().complete(
+                self._model_id(), prompt, call, system=system_prompt
+            )
         except Exception as e:
             return f"Analysis error: {e}"
 
+    def _model_id(self) -> str:
+        """Provider-qualified model name used in LLM cache keys."""
+        model = self.client.model
+        return f"{self.provider}:{getattr(model, 'model_name', model)}"
+
     def research_topic(self, utility: str, state: str, topic: str, queries: List[str]) -> Dict:
         """Research a specific topic (e.g. 'Queue Status')."""
+        async def run():
+            with ResearchCrawler() as crawler:
+                return await self.research_topic_async(crawler, utility, state, topic, queries)
+        return run_async(run())
+
+    async def research_topic_async(
+        self, crawler: ResearchCrawler, utility: str, state: str, topic: str, queries: List[str]
+    ) -> Dict:
+        """
+        Research one topic on the crawler's event loop.
+        Pages are fetched in parallel (and shared with other topics in the same run).
+        """
         print(f"Researching {topic}...")
         
-        # 1. Search
+        # 1. Search (one DDGS session per query so searches can overlap)
         search_results = []
-        for q in queries[:2]: # Limit to top 2 queries per topic to save time
-            results = self.search_web(q, max_results=2)
+        batches = await asyncio.gather(*(
+            crawler.run_blocking(self.search_web, q, 2, DDGS())
+            for q in queries[:2] # Limit to top 2 queries per topic to save time
+        ))
+        for results in batches:
             search_results.extend(results)
         
         # Deduplicate by URL
-        unique_results = {r['href']: r for r in search_results}.values()
+        unique_results = list({r['href']: r for r in search_results}.values())[:3] # Limit to top 3 URLs total
         
         # 2. Fetch & Analyze
         findings = []
         sources = []
         
-        for res in list(unique_results)[:3]: # Limit to top 3 URLs total
+        contents = await crawler.fetch_many(res['href'] for res in unique_results)
+        readable = [
+            (res, content) for res, content in zip(unique_results, contents)
+            if len(content) >= 500 # Skip empty/blocked pages
+        ]
+        for res, _ in readable:
+            print(f"  Reading: {res['title']}")
+        
+        # Pages are analyzed in parallel, each on its own chat client
+        analyses = await asyncio.gather(*(
+            crawler.run_blocking(self.analyze_content, topic, content, utility, state, self._new_client())
+            for _, content in readable
+        ))
+        
+        for (res, _), analysis in zip(readable, analyses):
             url = res['href']
             title = res['title']
-            print(f"  Reading: {title}")
-            
-            print(f"  Reading: {title}")
-            
-            content = self.fetch_content(url)
-            if len(content) < 500: # Skip empty/blocked pages
-                continue
-                
-            analysis = self.analyze_content(topic, content, utility, state)
-            
             if "No relevant information found" not in analysis and "Analysis error" not in analysis:
                 findings.append(analysis)
                 sources.append({'title': title, 'url': url})
@@ -189,8 +226,13 @@ class UtilityResearchAgent:
         {json.dumps(findings)}
         """
         
+        def synthesize():
+            client = self._new_client()
+            client.start_chat("You are a research assistant.")
+            return client.send_message(synthesis_prompt)
+        
         try:
-            summary = self.client.send_message(synthesis_prompt)
+            summary = await crawler.run_blocking(synthesize)
         except:
             summary = "\n".join(findings)
             
@@ -199,6 +241,16 @@ class UtilityResearchAgent:
             'sources': sources
         }
 
+    async def research_topics_async(self, utility: str, state: str, topic_queries: Dict[str, List[str]]) -> Dict:
+        """All topics concurrently over one crawler; returns {topic: result}."""
+        with ResearchCrawler() as crawler:
+            results = await asyncio.gather(*(
+                self.research_topic_async(crawler, utility, state, topic, queries)
+                for topic, queries in topic_queries.items()
+            ))
+            print(f"Crawler: {crawler.stats}")
+        return dict(zip(topic_queries, results))
+
     def research_with_grounding(self, utility: str, state: str, parent_co: str) -> Dict:
         """
         Use Google Search Grounding (Gemini) for deep research.
@@ -387,14 +439,16 @@ class UtilityResearchAgent:
             'regulatory_filings'
         ]
         
+        topic_queries = {}
         for topic in topics_to_research:
             queries = all_queries.get(topic, [])
             # Add specific PDF hunting queries for IRPs and RFPs
             if topic == 'capacity_and_generation':
                 queries.append(f"{utility} Integrated Resource Plan {time.strftime('%Y')} filetype:pdf")
                 queries.append(f"{parent_co} IRP {state} filetype:pdf")
-            
-            topic_result = self.research_topic(utility, state, topic, queries)
-            results['topics'][topic] = topic_result
+            topic_queries[topic] = queries
+        
+        # Topics run concurrently; the run takes about as long as the slowest topic
+        results['topics'] = run_async(self.research_topics_async(utility, state, topic_queries))
             
         return results
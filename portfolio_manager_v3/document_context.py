@@ -18,12 +18,23 @@ import json
 import os
 import re
 import io
+import sqlite3
 import tempfile
 from datetime import datetime, timedelta
 from typing import Dict, List, Optional, Any, Tuple
 from dataclasses import dataclass, field, asdict
 from enum import Enum
 
+from document_store import DocumentStore
+from drive_sync import (
+    CHANGE_FIELDS,
+    CHANGES_PAGE_SIZE,
+    FOLDER_MIME_TYPE,
+    FolderCache,
+    SyncLedger,
+    content_md5,
+)
+
 # PDF/Doc extraction
 try:
     from PyPDF2 import PdfReader
@@ -36,7 +47,7 @@ except ImportError:
 try:
     from google.oauth2 import service_account
     from googleapiclient.discovery import build
-    from googleapiclient.http import MediaIoBaseDownload
+    from googleapiclient.http import HttpRequest, MediaIoBaseDownload
     GOOGLE_AVAILABLE = True
 except ImportError:
     GOOGLE_AVAILABLE = False
@@ -166,33 +177,67 @@ def extract_document_text(file_content: bytes, file_name: str) -> str:
 # =============================================================================
 
 class SiteDocumentManager:
-    """Manages site document folders in Google Drive."""
+    """
+    Manages site document folders in Google Drive.
     
-    def __init__(self, credentials_json: str, documents_folder_id: str):
+    Scans are incremental: after the first (full) scan, only the Drive
+    changes feed is read. Folder metadata and processed-file hashes are kept
+    in a local ledger (drive_sync.py) so unchanged files are not downloaded
+    or re-extracted.
+    """
+    
+    def __init__(
+        self,
+        credentials_json: Optional[str],
+        documents_folder_id: str,
+        drive_service: Any = None,
+        sync_state_path: Optional[str] = None,
+    ):
         """
         Initialize with Google credentials and root folder ID.
         
         Args:
             credentials_json: Service account credentials JSON string
             documents_folder_id: ID of "Site Documents" folder in Drive
+            drive_service: Ready-made Drive service (e.g. drive_sync.LocalDrive);
+                credentials_json is ignored when given
+            sync_state_path: SQLite file for the sync ledger (default: cache dir)
         """
         self.documents_folder_id = documents_folder_id
         
-        # Initialize Google Drive API
-        creds_dict = json.loads(credentials_json)
-        credentials = service_account.Credentials.from_service_account_info(
-            creds_dict,
-            scopes=['https://www.googleapis.com/auth/drive']
-        )
-        self.drive_service = build('drive', 'v3', credentials=credentials)
+        if drive_service is None:
+            # Initialize Google Drive API
+            creds_dict = json.loads(credentials_json)
+            credentials = service_account.Credentials.from_service_account_info(
+                creds_dict,
+                scopes=['https://www.googleapis.com/auth/drive']
+            )
+            drive_service = build('drive', 'v3', credentials=credentials)
+        self.drive_service = drive_service
         
-        # Cache for folder IDs
+        # Cache for site folder IDs
         self._folder_cache = {}
         
+        # Sync ledger: changes-feed token, folder metadata, content hashes
+        self.sync_ledger = SyncLedger(sync_state_path)
+        self.folders = FolderCache(self.sync_ledger, documents_folder_id, self._fetch_folder)
+        self._pending_page_token: Optional[str] = None
+        self.removed_file_ids: List[str] = []  # deleted/trashed in the last incremental scan
+        self.sync_stats = {
+            'full_scans': 0,
+            'incremental_scans': 0,
+            'changes_read': 0,
+            'downloads': 0,
+            'skipped_unchanged': 0,
+        }
+        
         # Document index (in production, store in Google Sheet or database)
         self.document_index: Dict[str, ProcessedDocument] = {}
         self.last_sync_time: Optional[datetime] = None
     
+    def _fetch_folder(self, folder_id: str) -> Dict:
+        return self.drive_service.files().get(fileId=folder_id, fields="id, name, parents").execute()
+    
     def get_or_create_site_folder(self, site_id: str) -> str:
         """Get or create folder for a site."""
         if site_id in self._folder_cache:
@@ -222,8 +267,10 @@ class SiteDocumentManager:
                     'mimeType': 'application/vnd.google-apps.folder',
                     'parents': [folder_id]
                 }
-                self.drive_service.files().create(body=sub_metadata, fields='id').execute()
+                sub = self.drive_service.files().create(body=sub_metadata, fields='id').execute()
+                self.folders.put(sub['id'], subfolder, folder_id)
         
+        self.folders.put(folder_id, site_id, self.documents_folder_id)
         self._folder_cache[site_id] = folder_id
         return folder_id
     
@@ -234,27 +281,32 @@ class SiteDocumentManager:
             q=query,
             fields="files(id, name, modifiedTime)"
         ).execute()
-        return results.get('files', [])
+        folders = results.get('files', [])
+        self.folders.put_many(folders, self.documents_folder_id)
+        for folder in folders:
+            self._folder_cache[folder['name']] = folder['id']
+        return folders
     
     def list_site_documents(self, site_id: str, since: datetime = None) -> List[Dict]:
         """
         List all documents for a site, optionally filtered by modification time.
         
-        Returns list of dicts with: id, name, mimeType, modifiedTime, parents
+        Returns list of dicts with: id, name, mimeType, modifiedTime, parents, md5Checksum
         """
         site_folder_id = self.get_or_create_site_folder(site_id)
         
         # Build query - search recursively in site folder
-        query = f"'{site_folder_id}' in parents or "
+        parent_clauses = [f"'{site_folder_id}' in parents"]
         
         # Get subfolders
         subfolder_query = f"'{site_folder_id}' in parents and mimeType='application/vnd.google-apps.folder' and trashed=false"
-        subfolders = self.drive_service.files().list(q=subfolder_query, fields="files(id)").execute()
+        subfolders = self.drive_service.files().list(q=subfolder_query, fields="files(id, name)").execute()
+        self.folders.put_many(subfolders.get('files', []), site_folder_id)
         
         for sf in subfolders.get('files', []):
-            query += f"'{sf['id']}' in parents or "
+            parent_clauses.append(f"'{sf['id']}' in parents")
         
-        query = query.rstrip(" or ")
+        query = f"({' or '.join(parent_clauses)})"
         query += " and mimeType!='application/vnd.google-apps.folder' and trashed=false"
         
         if since:
@@ -262,7 +314,7 @@ class SiteDocumentManager:
         
         results = self.drive_service.files().list(
             q=query,
-            fields="files(id, name, mimeType, modifiedTime, parents)",
+            fields="files(id, name, mimeType, modifiedTime, parents, md5Checksum)",
             orderBy="modifiedTime desc"
         ).execute()
         
@@ -271,6 +323,10 @@ class SiteDocumentManager:
     def get_document_content(self, file_id: str) -> bytes:
         """Download file content."""
         request = self.drive_service.files().get_media(fileId=file_id)
+        if not GOOGLE_AVAILABLE or not isinstance(request, HttpRequest):
+            # In-memory services (drive_sync.LocalDrive) return the bytes directly
+            return request.execute()
+        
         buffer = io.BytesIO()
         downloader = MediaIoBaseDownload(buffer, request)
         
@@ -296,25 +352,47 @@ class SiteDocumentManager:
             return DocumentType.OTHER
     
     def get_folder_path(self, file_id: str, parents: List[str]) -> str:
-        """Get folder path for a file."""
+        """Get folder path for a file (name of its parent folder, cached)."""
         if not parents:
             return ""
         
-        try:
-            parent = self.drive_service.files().get(
-                fileId=parents[0],
-                fields="name, parents"
-            ).execute()
-            return parent.get('name', '')
-        except:
-            return ""
+        return self.folders.name(parents[0])
     
-    def scan_for_changes(self, since_hours: int = 24) -> Dict[str, List[Dict]]:
+    def scan_for_changes(self, since_hours: int = 24, full_scan: bool = False) -> Dict[str, List[Dict]]:
         """
-        Scan all site folders for new/modified documents.
+        Scan for new/modified documents.
+        
+        The first scan (or full_scan=True) lists every site folder, limited to
+        files modified in the last since_hours. Later scans read the Drive
+        changes feed from where the previous committed scan stopped, and
+        since_hours is not used. Files whose content hash matches the ledger
+        are left out, and files that failed last time are included again.
+        Call commit_sync() once the returned files have been handled.
         
         Returns: {site_id: [list of changed files]}
         """
+        page_token = None if full_scan else self.sync_ledger.get_page_token(self.documents_folder_id)
+        if page_token is None:
+            changes = self._full_scan(since_hours)
+        else:
+            changes = self._incremental_scan(page_token)
+        
+        # Retry files that failed to process on an earlier scan
+        for site_id, file_info in self.sync_ledger.pending_files():
+            site_docs = changes.setdefault(site_id, [])
+            if all(doc['id'] != file_info['id'] for doc in site_docs):
+                site_docs.append(file_info)
+        
+        return changes
+    
+    def _full_scan(self, since_hours: int) -> Dict[str, List[Dict]]:
+        # Take the feed position before listing so edits made meanwhile are seen next time
+        self.removed_file_ids = []
+        self._pending_page_token = self.drive_service.changes().getStartPageToken(
+            supportsAllDrives=True
+        ).execute()['startPageToken']
+        self.sync_stats['full_scans'] += 1
+        
         since = datetime.utcnow() - timedelta(hours=since_hours)
         changes = {}
         
@@ -329,14 +407,88 @@ class SiteDocumentManager:
         
         return changes
     
-    def process_document(self, file_info: Dict, site_id: str) -> ProcessedDocument:
+    def _incremental_scan(self, page_token: str) -> Dict[str, List[Dict]]:
+        self.sync_stats['incremental_scans'] += 1
+        self.removed_file_ids = []
+        
+        # Latest change per file; a file can appear several times in the feed
+        latest: Dict[str, Dict] = {}
+        while page_token:
+            response = self.drive_service.changes().list(
+                pageToken=page_token,
+                fields=CHANGE_FIELDS,
+                pageSize=CHANGES_PAGE_SIZE,
+                includeRemoved=True,
+                supportsAllDrives=True,
+                includeItemsFromAllDrives=True,
+            ).execute()
+            for change in response.get('changes', []):
+                latest[change['fileId']] = change
+            self.sync_stats['changes_read'] += len(response.get('changes', []))
+            page_token = response.get('nextPageToken')
+            if not page_token:
+                self._pending_page_token = response.get('newStartPageToken')
+        
+        # Folder changes first, so files moved into new/renamed folders resolve correctly
+        files = []
+        for file_id, change in latest.items():
+            meta = change.get('file') or {}
+            if change.get('removed') or meta.get('trashed'):
+                self.removed_file_ids.append(file_id)
+                self.folders.forget(file_id)
+                self.sync_ledger.forget_file(file_id)
+                self._folder_cache = {k: v for k, v in self._folder_cache.items() if v != file_id}
+            elif meta.get('mimeType') == FOLDER_MIME_TYPE:
+                parents = meta.get('parents') or []
+                self.folders.put(file_id, meta.get('name', ''), parents[0] if parents else '')
+            else:
+                files.append(meta)
+        
+        changes = {}
+        for meta in files:
+            parents = meta.get('parents') or []
+            location = self.folders.locate(parents[0]) if parents else None
+            if location is None:
+                continue  # outside the Site Documents tree
+            site_id = location[0]
+            
+            known = self.sync_ledger.get_file(meta['id'])
+            if known and known['site_id'] == site_id and meta.get('md5Checksum') == known['content_md5']:
+                # Rename, move within the site or other metadata-only change
+                self.sync_stats['skipped_unchanged'] += 1
+                continue
+            
+            changes.setdefault(site_id, []).append(meta)
+        
+        for docs in changes.values():
+            docs.sort(key=lambda d: d.get('modifiedTime', ''), reverse=True)
+        return changes
+    
+    def commit_sync(self):
+        """Save the changes-feed position reached by the last scan."""
+        if self._pending_page_token:
+            self.sync_ledger.set_page_token(self.documents_folder_id, self._pending_page_token)
+            self._pending_page_token = None
+        self.last_sync_time = datetime.utcnow()
+    
+    def mark_failed(self, file_info: Dict, site_id: str):
+        """Keep a file that could not be processed for the next scan."""
+        self.sync_ledger.mark_pending(file_info, site_id)
+    
+    def process_document(self, file_info: Dict, site_id: str, force: bool = False) -> Optional[ProcessedDocument]:
         """
         Download and process a single document.
         
-        Returns ProcessedDocument with extracted text.
+        Returns ProcessedDocument with extracted text, or None when the
+        content is unchanged since it was last processed (unless force).
         """
         file_id = file_info['id']
         file_name = file_info['name']
+        known = None if force else self.sync_ledger.get_file(file_id)
+        if known and known['site_id'] == site_id and file_info.get('md5Checksum') == known['content_md5']:
+            self.sync_stats['skipped_unchanged'] += 1
+            self.sync_ledger.clear_pending(file_id)
+            return None
         
         # Get folder path for doc type detection
         parents = file_info.get('parents', [])
@@ -345,6 +497,13 @@ class SiteDocumentManager:
         
         # Download and extract text
         content = self.get_document_content(file_id)
+        self.sync_stats['downloads'] += 1
+        digest = content_md5(content)
+        if known and known['site_id'] == site_id and digest == known['content_md5']:
+            # No md5Checksum from Drive (e.g. exported formats) but same bytes
+            self.sync_stats['skipped_unchanged'] += 1
+            self.sync_ledger.record_file(file_id, site_id, digest, file_info.get('modifiedTime', ''))
+            return None
         text = extract_document_text(content, file_name)
         
         # Create processed document
@@ -361,6 +520,7 @@ class SiteDocumentManager:
         
         # Store in index
         self.document_index[file_id] = doc
+        self.sync_ledger.record_file(file_id, site_id, digest, doc.modified_time)
         
         return doc
 
@@ -571,6 +731,8 @@ def detect_status_signals(text: str, current_status: Dict) -> List[Dict]:
 # LLM-BASED STATUS INFERENCE
 # =============================================================================
 
+CLAUDE_MODEL = "claude-opus-4-20250514"
+
 STATUS_INFERENCE_PROMPT = """You are analyzing a document for a data center development site to identify any status changes that should be reflected in our project tracker.
 
 SITE INFORMATION:
@@ -665,14 +827,93 @@ Respond in JSON format:
 
 If no status changes are warranted, return an empty proposed_changes array but still provide the summary and other fields."""
 
+# Shared with the single-document prompt so the two can't drift
+_TRACKER_FIELDS_GUIDE = STATUS_INFERENCE_PROMPT[
+    STATUS_INFERENCE_PROMPT.index("TRACKER FIELDS AND STAGES:"):STATUS_INFERENCE_PROMPT.index("ANALYSIS INSTRUCTIONS:")
+]
+_INFERENCE_RESULT_SCHEMA = STATUS_INFERENCE_PROMPT[
+    STATUS_INFERENCE_PROMPT.index("Respond in JSON format:\n") + len("Respond in JSON format:\n"):
+    STATUS_INFERENCE_PROMPT.index("\n\nIf no status changes")
+].replace("{{", "{").replace("}}", "}")
+
+BATCH_STATUS_INFERENCE_PROMPT = """You are analyzing {document_count} documents for a data center development site to identify any status changes that should be reflected in our project tracker.
+
+SITE INFORMATION:
+- Site ID: {site_id}
+- Site Name: {site_name}
+- Current Status:
+{current_status}
+
+DOCUMENTS:
+{documents}
+{tracker_fields}ANALYSIS INSTRUCTIONS:
+1. Analyze each document on its own; do not use evidence from one document for another
+2. Identify any information that indicates a status change from current values
+3. Only propose ADVANCEMENTS (higher stage numbers)
+4. Provide specific evidence (quotes) for each proposed change
+5. Assign confidence (0.0-1.0) based on how explicit the evidence is
+
+Respond in JSON format with exactly one entry per document, in document order:
+{{"documents": [{{"document": 1, ...}}, {{"document": 2, ...}}]}}
+
+Each entry has "document" (the document number) plus these fields:
+{result_schema}
+
+If no status changes are warranted for a document, return an empty proposed_changes array for it but still provide the summary and other fields."""
+
+BATCH_DOCUMENT_TEMPLATE = """[Document {number}]
+- File: {file_name}
+- Type: {doc_type}
+- Date: {doc_date}
+Content:
+{document_text}
+"""
+
 
 def build_status_inference_prompt(
     doc: ProcessedDocument,
     site_data: Dict,
 ) -> str:
     """Build prompt for LLM status inference."""
-    
-    # Format current status
+    return STATUS_INFERENCE_PROMPT.format(
+        site_id=doc.site_id,
+        site_name=site_data.get('name', doc.site_id),
+        current_status=_format_current_status(site_data),
+        file_name=doc.file_name,
+        doc_type=doc.doc_type,
+        doc_date=doc.modified_time[:10] if doc.modified_time else 'Unknown',
+        document_text=doc.content_text[:30000],  # Limit for context window
+    )
+
+
+def build_batch_inference_prompt(
+    docs: List[ProcessedDocument],
+    site_data: Dict,
+) -> str:
+    """Build one prompt covering several (small) documents from the same site."""
+    site_id = docs[0].site_id
+    documents = "\n".join(
+        BATCH_DOCUMENT_TEMPLATE.format(
+            number=i,
+            file_name=doc.file_name,
+            doc_type=doc.doc_type,
+            doc_date=doc.modified_time[:10] if doc.modified_time else 'Unknown',
+            document_text=doc.content_text[:30000],
+        )
+        for i, doc in enumerate(docs, start=1)
+    )
+    return BATCH_STATUS_INFERENCE_PROMPT.format(
+        document_count=len(docs),
+        site_id=site_id,
+        site_name=site_data.get('name', site_id),
+        current_status=_format_current_status(site_data),
+        documents=documents,
+        tracker_fields=_TRACKER_FIELDS_GUIDE,
+        result_schema=_INFERENCE_RESULT_SCHEMA,
+    )
+
+
+def _format_current_status(site_data: Dict) -> str:
     status_lines = []
     status_fields = [
         ('power_stage', 'Power'),
@@ -687,16 +928,54 @@ def build_status_inference_prompt(
     for field, label in status_fields:
         value = site_data.get(field, 'N/A')
         status_lines.append(f"  - {label}: {value}")
+    return "\n".join(status_lines)
+
+
+def call_llm(llm_client: Any, prompt: str, use_claude: bool = True, max_tokens: int = 4000) -> str:
+    """Send one prompt to Claude or Gemini and return the response text."""
+    if use_claude:
+        response = llm_client.messages.create(
+            model=CLAUDE_MODEL,
+            max_tokens=max_tokens,
+            messages=[{"role": "user", "content": prompt}]
+        )
+        return response.content[0].text
+    response = llm_client.generate_content(prompt)
+    return response.text
+
+
+def parse_inference_response(response_text: str) -> Dict:
+    """JSON object from a model response (tolerates markdown fences and prose)."""
+    json_match = re.search(r'\{[\s\S]*\}', response_text)
+    if json_match:
+        return json.loads(json_match.group())
+    return {"summary": "Parse error", "proposed_changes": [], "error": "No JSON"}
+
+
+def parse_batch_inference_response(response_text: str, document_count: int) -> List[Optional[Dict]]:
+    """
+    Per-document results from a batch response, in document order.
     
-    return STATUS_INFERENCE_PROMPT.format(
-        site_id=doc.site_id,
-        site_name=site_data.get('name', doc.site_id),
-        current_status="\n".join(status_lines),
-        file_name=doc.file_name,
-        doc_type=doc.doc_type,
-        doc_date=doc.modified_time[:10] if doc.modified_time else 'Unknown',
-        document_text=doc.content_text[:30000],  # Limit for context window
-    )
+    Entries the model left out (or numbered out of range) come back as None
+    so the caller can re-run those documents on their own.
+    """
+    results: List[Optional[Dict]] = [None] * document_count
+    parsed = parse_inference_response(response_text)
+    entries = parsed.get('documents') if isinstance(parsed, dict) else None
+    if not isinstance(entries, list):
+        return results
+    for position, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            continue
+        number = entry.pop('document', position + 1)
+        try:
+            index = int(number) - 1
+        except (TypeError, ValueError):
+            continue
+        if 0 <= index < document_count and results[index] is None:
+            entry.setdefault('proposed_changes', [])
+            results[index] = entry
+    return results
 
 
 async def infer_status_with_llm(
@@ -723,7 +1002,7 @@ async def infer_status_with_llm(
         if use_claude:
             # Claude API
             response = llm_client.messages.create(
-                model="claude-opus-4-20250514",
+                model=CLAUDE_MODEL,
                 max_tokens=4000,
                 messages=[{"role": "user", "content": prompt}]
             )
@@ -764,22 +1043,7 @@ def infer_status_with_llm_sync(
     prompt = build_status_inference_prompt(doc, site_data)
     
     try:
-        if use_claude:
-            response = llm_client.messages.create(
-                model="claude-opus-4-20250514",
-                max_tokens=4000,
-                messages=[{"role": "user", "content": prompt}]
-            )
-            response_text = response.content[0].text
-        else:
-            response = llm_client.generate_content(prompt)
-            response_text = response.text
-        
-        json_match = re.search(r'\{[\s\S]*\}', response_text)
-        if json_match:
-            return json.loads(json_match.group())
-        else:
-            return {"summary": "Parse error", "proposed_changes": [], "error": "No JSON"}
+        return parse_inference_response(call_llm(llm_client, prompt, use_claude))
     
     except Exception as e:
         return {"summary": f"Error: {str(e)}", "proposed_changes": [], "error": str(e)}
@@ -857,18 +1121,33 @@ class ChangeProposalManager:
 
 
 # =============================================================================
-# DOCUMENT INDEX (Simple in-memory, would use vector DB in production)
+# DOCUMENT INDEX (in-memory view over the persistent search store)
 # =============================================================================
 
 class DocumentIndex:
-    """Simple document index for search and retrieval."""
+    """
+    Document index for search and retrieval.
+
+    Documents are mirrored into a local SQLite/FTS5 store (document_store.py),
+    so searches are ranked and indexed and the index survives restarts.
+    Pass persistent=False for a purely in-memory index.
+    """
     
-    def __init__(self):
+    def __init__(self, store_path: Optional[str] = None, persistent: bool = True):
         self.documents: Dict[str, ProcessedDocument] = {}
         self.by_site: Dict[str, List[str]] = {}  # site_id -> [file_ids]
+        self.store: Optional[DocumentStore] = None
+        
+        if persistent:
+            try:
+                self.store = DocumentStore(store_path)
+                for data in self.store.load_documents():
+                    self._remember(ProcessedDocument.from_dict(data))
+            except (sqlite3.Error, OSError, TypeError, ValueError) as e:
+                self.store = None
+                print(f"[document_context] Document store unavailable, index is in-memory only: {e}")
     
-    def add_document(self, doc: ProcessedDocument):
-        """Add document to index."""
+    def _remember(self, doc: ProcessedDocument):
         self.documents[doc.file_id] = doc
         
         if doc.site_id not in self.by_site:
@@ -876,36 +1155,89 @@ class DocumentIndex:
         if doc.file_id not in self.by_site[doc.site_id]:
             self.by_site[doc.site_id].append(doc.file_id)
     
+    def add_document(self, doc: ProcessedDocument):
+        """Add (or replace) a document in the index and the persistent store."""
+        previous = self.documents.get(doc.file_id)
+        if previous is not None and previous.site_id != doc.site_id:
+            site_ids = self.by_site.get(previous.site_id, [])
+            if doc.file_id in site_ids:
+                site_ids.remove(doc.file_id)
+        
+        self._remember(doc)
+        if self.store is not None:
+            self.store.upsert([doc.to_dict()])
+    
+    def remove_document(self, file_id: str):
+        """Drop a document from the index and the persistent store."""
+        doc = self.documents.pop(file_id, None)
+        if doc is not None and file_id in self.by_site.get(doc.site_id, []):
+            self.by_site[doc.site_id].remove(file_id)
+        if self.store is not None:
+            self.store.delete(file_id)
+    
     def get_site_documents(self, site_id: str) -> List[ProcessedDocument]:
         """Get all documents for a site."""
         file_ids = self.by_site.get(site_id, [])
         return [self.documents[fid] for fid in file_ids if fid in self.documents]
     
-    def search_text(self, query: str, site_id: str = None) -> List[ProcessedDocument]:
-        """Simple text search across documents."""
+    def search_text(
+        self,
+        query: str,
+        site_id: str = None,
+        modified_after: Any = None,
+        modified_before: Any = None,
+        limit: Optional[int] = None,
+    ) -> List[ProcessedDocument]:
+        """
+        Full-text search across documents, best matches first.
+        
+        Args:
+            query: Words to find (prefix match, all words required)
+            site_id: Restrict to one site
+            modified_after: Inclusive lower bound on modified_time (datetime or ISO string)
+            modified_before: Exclusive upper bound on modified_time
+            limit: Maximum number of results
+        """
+        if self.store is not None:
+            hits = self.store.search(query, site_id, modified_after, modified_before, limit)
+            return [self.documents[fid] for fid, _ in hits if fid in self.documents]
+        
+        # In-memory fallback: substring scan
         query_lower = query.lower()
-        results = []
+        after = modified_after.isoformat() if hasattr(modified_after, 'isoformat') else modified_after
+        before = modified_before.isoformat() if hasattr(modified_before, 'isoformat') else modified_before
         
         docs = self.documents.values()
         if site_id:
             docs = self.get_site_documents(site_id)
         
+        results = []
         for doc in docs:
+            if after and doc.modified_time < after:
+                continue
+            if before and doc.modified_time >= before:
+                continue
             if query_lower in doc.content_text.lower():
                 results.append(doc)
         
-        return results
+        return results[:limit] if limit is not None else results
     
     def get_recent_documents(self, hours: int = 24, site_id: str = None) -> List[ProcessedDocument]:
-        """Get recently modified documents."""
+        """Get recently modified documents, newest first."""
         cutoff = datetime.utcnow() - timedelta(hours=hours)
         cutoff_str = cutoff.isoformat()
         
+        if self.store is not None:
+            file_ids = self.store.modified_between(cutoff_str, site_id=site_id)
+            return [self.documents[fid] for fid in file_ids if fid in self.documents]
+        
         docs = self.documents.values()
         if site_id:
             docs = self.get_site_documents(site_id)
         
-        return [d for d in docs if d.modified_time >= cutoff_str]
+        recent = [d for d in docs if d.modified_time >= cutoff_str]
+        recent.sort(key=lambda d: d.modified_time, reverse=True)
+        return recent
 
 
 # =============================================================================
@@ -925,12 +1257,18 @@ class SiteContextManager:
         documents_folder_id: str,
         llm_client: Any = None,
         use_claude: bool = True,
+        drive_service: Any = None,
+        max_llm_concurrency: int = 8,
+        batch_small_docs: bool = False,
     ):
-        self.doc_manager = SiteDocumentManager(credentials_json, documents_folder_id)
+        self.doc_manager = SiteDocumentManager(credentials_json, documents_folder_id, drive_service=drive_service)
         self.doc_index = DocumentIndex()
         self.proposal_manager = ChangeProposalManager()
         self.llm_client = llm_client
         self.use_claude = use_claude
+        self.max_llm_concurrency = max_llm_concurrency
+        self.batch_small_docs = batch_small_docs
+        self.inference_stats: Dict[str, Any] = {}
         
         # Processing log
         self.last_scan_time: Optional[datetime] = None
@@ -940,13 +1278,16 @@ class SiteContextManager:
         self,
         sites_data: Dict[str, Dict],
         since_hours: int = 24,
+        full_scan: bool = False,
     ) -> Dict:
         """
         Scan for new/modified documents, process them, and generate proposals.
         
         Args:
             sites_data: Dict of site_id -> site data (for current status)
-            since_hours: Look back period for changes
+            since_hours: Look back period for changes (first/full scan only;
+                later scans pick up everything changed since the last one)
+            full_scan: Re-list every site folder instead of reading the changes feed
         
         Returns:
             Summary of processing results
@@ -956,6 +1297,8 @@ class SiteContextManager:
             'sites_scanned': 0,
             'documents_found': 0,
             'documents_processed': 0,
+            'documents_unchanged': 0,
+            'documents_removed': 0,
             'proposals_generated': 0,
             'errors': [],
             'details': [],
@@ -963,9 +1306,17 @@ class SiteContextManager:
         
         try:
             # Scan for changes
-            changes = self.doc_manager.scan_for_changes(since_hours=since_hours)
+            changes = self.doc_manager.scan_for_changes(since_hours=since_hours, full_scan=full_scan)
             results['sites_scanned'] = len(changes)
             
+            for file_id in self.doc_manager.removed_file_ids:
+                if file_id in self.doc_index.documents:
+                    self.doc_index.remove_document(file_id)
+                    results['documents_removed'] += 1
+            
+            # (processed document, site data) awaiting LLM inference
+            pending_inference: List[Tuple[ProcessedDocument, Dict]] = []
+            
             for site_id, docs in changes.items():
                 results['documents_found'] += len(docs)
                 
@@ -974,42 +1325,33 @@ class SiteContextManager:
                 for doc_info in docs:
                     try:
                         # Process document
-                        processed = self.doc_manager.process_document(doc_info, site_id)
+                        # Unchanged content is skipped, unless the index lost the document
+                        processed = self.doc_manager.process_document(
+                            doc_info, site_id,
+                            force=doc_info['id'] not in self.doc_index.documents,
+                        )
+                        if processed is None:
+                            results['documents_unchanged'] += 1
+                            continue
                         self.doc_index.add_document(processed)
                         results['documents_processed'] += 1
                         
-                        # Run inference if LLM available
+                        # Queue inference if LLM available
                         if self.llm_client and processed.content_text:
-                            inference = infer_status_with_llm_sync(
-                                processed,
-                                site_data,
-                                self.llm_client,
-                                self.use_claude
-                            )
-                            
-                            # Generate proposals
-                            proposals = self.proposal_manager.add_proposals_from_inference(
-                                inference,
-                                processed,
-                                site_data
-                            )
-                            results['proposals_generated'] += len(proposals)
-                            
-                            results['details'].append({
-                                'site_id': site_id,
-                                'file': doc_info['name'],
-                                'summary': inference.get('summary', ''),
-                                'proposals': len(proposals),
-                                'action_items': inference.get('action_items', []),
-                            })
+                            pending_inference.append((processed, site_data))
                     
                     except Exception as e:
+                        self.doc_manager.mark_failed(doc_info, site_id)
                         results['errors'].append({
                             'site_id': site_id,
                             'file': doc_info.get('name', 'unknown'),
                             'error': str(e)
                         })
             
+            if pending_inference:
+                self._run_inference(pending_inference, results)
+            
+            self.doc_manager.commit_sync()
             self.last_scan_time = datetime.utcnow()
             self.processing_log.append(results)
             
@@ -1018,6 +1360,44 @@ class SiteContextManager:
         
         return results
     
+    def _run_inference(self, pending: List[Tuple[ProcessedDocument, Dict]], results: Dict):
+        """Run status inference for the scan's documents concurrently and record proposals."""
+        from inference_scheduler import InferenceJob, InferenceScheduler
+        
+        scheduler = InferenceScheduler(
+            self.llm_client,
+            use_claude=self.use_claude,
+            max_concurrency=self.max_llm_concurrency,
+            batch_small_docs=self.batch_small_docs,
+        )
+        inferences = scheduler.run_sync([InferenceJob(doc, site_data) for doc, site_data in pending])
+        self.inference_stats = dict(scheduler.stats)
+        
+        for (processed, site_data), inference in zip(pending, inferences):
+            try:
+                # Generate proposals
+                proposals = self.proposal_manager.add_proposals_from_inference(
+                    inference,
+                    processed,
+                    site_data
+                )
+                results['proposals_generated'] += len(proposals)
+                
+                results['details'].append({
+                    'site_id': processed.site_id,
+                    'file': processed.file_name,
+                    'summary': inference.get('summary', ''),
+                    'proposals': len(proposals),
+                    'action_items': inference.get('action_items', []),
+                })
+            
+            except Exception as e:
+                results['errors'].append({
+                    'site_id': processed.site_id,
+                    'file': processed.file_name,
+                    'error': str(e)
+                })
+    
     def get_site_context(self, site_id: str, max_docs: int = 10) -> str:
         """
         Get combined context from all documents for a site.
@@ -1078,6 +1458,10 @@ __all__ = [
     'SiteContextManager',
     'detect_status_signals',
     'build_status_inference_prompt',
+    'build_batch_inference_prompt',
+    'call_llm',
+    'parse_inference_response',
+    'parse_batch_inference_response',
     'infer_status_with_llm_sync',
     'STATUS_DETECTION_CONFIG',
 ]
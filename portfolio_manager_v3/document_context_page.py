@@ -93,11 +93,22 @@ def get_context_manager(data_layer) -> Optional[SiteContextManager]:
             except ImportError:
                 pass
         
+        requests_per_minute = st.secrets.get("LLM_REQUESTS_PER_MINUTE")
+        if requests_per_minute:
+            from inference_scheduler import configure_rate_limit
+            configure_rate_limit(
+                'claude' if use_claude else 'gemini',
+                float(requests_per_minute),
+                burst=int(st.secrets.get("LLM_MAX_CONCURRENCY", 8)),
+            )
+        
         manager = SiteContextManager(
             credentials_json=credentials_json,
             documents_folder_id=documents_folder_id,
             llm_client=llm_client,
             use_claude=use_claude,
+            max_llm_concurrency=int(st.secrets.get("LLM_MAX_CONCURRENCY", 8)),
+            batch_small_docs=bool(st.secrets.get("LLM_BATCH_SMALL_DOCS", False)),
         )
         
         st.session_state.context_manager = manager
@@ -212,7 +223,12 @@ def show_scan_tab(context_manager: SiteContextManager, sites: Dict):
             min_value=1,
             max_value=168,  # 1 week
             value=24,
-            help="Scan for documents modified within this time period"
+            help="Used on the first scan (or a full rescan); later scans pick up every change since the last scan"
+        )
+        full_scan = st.checkbox(
+            "Full rescan",
+            value=False,
+            help="Re-list every site folder instead of reading Drive's change feed. Unchanged files are still skipped."
         )
     
     with col2:
@@ -224,7 +240,8 @@ def show_scan_tab(context_manager: SiteContextManager, sites: Dict):
         with st.spinner("Scanning for document changes..."):
             results = context_manager.scan_and_process(
                 sites_data=sites,
-                since_hours=hours
+                since_hours=hours,
+                full_scan=full_scan,
             )
             st.session_state.last_scan_results = results
     
@@ -241,7 +258,10 @@ def show_scan_tab(context_manager: SiteContextManager, sites: Dict):
         with col2:
             st.metric("Documents Found", results['documents_found'])
         with col3:
-            st.metric("Processed", results['documents_processed'])
+            st.metric(
+                "Processed", results['documents_processed'],
+                help=f"{results.get('documents_unchanged', 0)} unchanged file(s) skipped"
+            )
         with col4:
             st.metric("Proposals Generated", results['proposals_generated'])
         
@@ -380,22 +400,34 @@ def show_browser_tab(context_manager: SiteContextManager, sites: Dict):
     selected = st.selectbox("Select Site", options=list(site_options.keys()))
     site_id = site_options[selected]
     
+    query = st.text_input("Search documents", placeholder="e.g. SIS results, interconnection agreement")
+
     # Get documents
-    if site_id:
+    if query.strip():
+        docs = context_manager.doc_index.search_text(query, site_id=site_id, limit=200)
+    elif site_id:
         docs = context_manager.doc_index.get_site_documents(site_id)
     else:
         docs = list(context_manager.doc_index.documents.values())
     
     if not docs:
-        st.info("No documents indexed yet. Run a scan to process documents.")
+        if query.strip():
+            st.info(f"No documents match '{query}'.")
+        else:
+            st.info("No documents indexed yet. Run a scan to process documents.")
         return
     
     st.write(f"**{len(docs)} document(s)**")
     
     # Sort options
-    sort_by = st.radio("Sort by", ["Date (newest)", "Date (oldest)", "Name"], horizontal=True)
-    
-    if sort_by == "Date (newest)":
+    sort_options = ["Date (newest)", "Date (oldest)", "Name"]
+    if query.strip():
+        sort_options.insert(0, "Relevance")
+    sort_by = st.radio("Sort by", sort_options, horizontal=True)
+    
+    if sort_by == "Relevance":
+        pass  # search_text returns best matches first
+    elif sort_by == "Date (newest)":
         docs.sort(key=lambda d: d.modified_time or "", reverse=True)
     elif sort_by == "Date (oldest)":
         docs.sort(key=lambda d: d.modified_time or "")
@@ -16,15 +16,22 @@ Uses pattern matching and keyword extraction to identify:
 - Voltage levels
 - Equipment specifications
 - Financial figures
+
+Zip uploads are streamed: members are read straight out of the archive
+(never extracted to disk) and parsed in a process pool, a bounded number
+at a time. Per-file results are merged into the VDRExtractionResult in
+archive order, so the outcome does not depend on which worker finished
+first.
 """
 
+import io
 import re
 import os
 import json
 import zipfile
-import tempfile
+from collections import deque
 from datetime import datetime, date
-from typing import Dict, List, Optional, Tuple, Any
+from typing import Dict, List, Optional, Tuple, Any, BinaryIO, Iterator, Union
 from dataclasses import dataclass, field, asdict
 from pathlib import Path
 
@@ -180,15 +187,14 @@ CATEGORY_KEYWORDS = {
 # FILE PARSING FUNCTIONS
 # =============================================================================
 
-def extract_text_from_pdf(file_path: str) -> str:
-    """Extract text from PDF file."""
+def extract_text_from_pdf(file_path: Union[str, BinaryIO]) -> str:
+    """Extract text from PDF file (path or binary file object)."""
     try:
         import PyPDF2
         text = ""
-        with open(file_path, 'rb') as f:
-            reader = PyPDF2.PdfReader(f)
-            for page in reader.pages:
-                text += page.extract_text() or ""
+        reader = PyPDF2.PdfReader(file_path)
+        for page in reader.pages:
+            text += page.extract_text() or ""
         return text
     except ImportError:
         # Fallback: try pdfplumber
@@ -205,8 +211,8 @@ def extract_text_from_pdf(file_path: str) -> str:
         return f"[Error extracting PDF: {str(e)}]"
 
 
-def extract_text_from_docx(file_path: str) -> str:
-    """Extract text from Word document."""
+def extract_text_from_docx(file_path: Union[str, BinaryIO]) -> str:
+    """Extract text from Word document (path or binary file object)."""
     try:
         from docx import Document
         doc = Document(file_path)
@@ -225,8 +231,8 @@ def extract_text_from_docx(file_path: str) -> str:
         return f"[Error extracting DOCX: {str(e)}]"
 
 
-def extract_text_from_xlsx(file_path: str) -> str:
-    """Extract text from Excel file."""
+def extract_text_from_xlsx(file_path: Union[str, BinaryIO]) -> str:
+    """Extract text from Excel file (path or binary file object)."""
     try:
         import openpyxl
         wb = openpyxl.load_workbook(file_path, data_only=True)
@@ -271,6 +277,27 @@ def extract_text_from_file(file_path: str) -> Tuple[str, str]:
         return f"[Unsupported file type: {ext}]", 'unknown'
 
 
+def extract_text_from_bytes(content: bytes, filename: str) -> Tuple[str, str]:
+    """
+    Extract text from in-memory file content (e.g. a zip member).
+    Returns (text, file_type), same as extract_text_from_file.
+    """
+    ext = Path(filename).suffix.lower()
+    
+    if ext == '.pdf':
+        return extract_text_from_pdf(io.BytesIO(content)), 'pdf'
+    elif ext in ['.docx', '.doc']:
+        return extract_text_from_docx(io.BytesIO(content)), 'docx'
+    elif ext in ['.xlsx', '.xls']:
+        return extract_text_from_xlsx(io.BytesIO(content)), 'xlsx'
+    elif ext in ['.txt', '.csv', '.md']:
+        # TextIOWrapper gives the same newline handling as open(..., 'r')
+        with io.TextIOWrapper(io.BytesIO(content), encoding='utf-8', errors='ignore') as f:
+            return f.read(), 'text'
+    else:
+        return f"[Unsupported file type: {ext}]", 'unknown'
+
+
 # =============================================================================
 # DATA EXTRACTION FUNCTIONS
 # =============================================================================
@@ -427,25 +454,320 @@ def extract_state(text: str) -> Optional[str]:
     return None
 
 
+# =============================================================================
+# FIELD SCANNER (single compiled pass per document)
+# =============================================================================
+# The extract_* functions above are the reference behaviour. scan_document()
+# produces exactly the same results, faster:
+# - patterns are compiled once, with re.ASCII, and run over an ASCII stand-in
+#   of the text (same length, so spans line up; values and contexts are cut
+#   from the original text)
+# - a pattern is skipped outright when none of its keyword anchors occur
+# - study statuses and utility/state lookups share one lowercased copy
+#
+# The stand-in is exact because the patterns only use ASCII literals and
+# ranges, \d, \s, \w and \b. check_scanner_parity() compares the two paths.
+
+# Non-ASCII characters that re.IGNORECASE matches against ASCII letters
+_CASE_FOLD_FIXES = {'\u0130': 'i', '\u0131': 'i', '\u017f': 's', '\u212a': 'k'}
+
+# Non-ASCII characters, plus the ASCII separators \x1c-\x1f that only
+# Unicode \s matches
+_NEEDS_STAND_IN = re.compile(r'[^\x00-\x1b\x20-\x7f]')
+
+
+class _AsciiStandIns(dict):
+    """char -> ASCII char that every scanner pattern treats the same way."""
+
+    def __missing__(self, ch: str) -> str:
+        if ch in _CASE_FOLD_FIXES:
+            stand_in = _CASE_FOLD_FIXES[ch]
+        elif ch.isspace():
+            stand_in = ' '
+        elif ch.isdecimal():
+            stand_in = '0'   # matches \d but no ASCII digit range such as [1-4]
+        elif ch.isalnum():
+            stand_in = '_'   # word character for \b, but no letter class
+        else:
+            stand_in = '~'   # punctuation none of the patterns mention
+        self[ch] = stand_in
+        return stand_in
+
+
+_ascii_stand_ins = _AsciiStandIns()
+
+
+def _ascii_haystack(text: str) -> str:
+    """Same-length ASCII copy of text for the re.ASCII scanner patterns."""
+    if text.isascii() and not _NEEDS_STAND_IN.search(text):
+        return text
+    return _NEEDS_STAND_IN.sub(lambda m: _ascii_stand_ins[m.group()], text)
+
+_MONTH_ABBREVIATIONS = ('jan', 'feb', 'mar', 'apr', 'may', 'jun', 'jul', 'aug', 'sep', 'oct', 'nov', 'dec')
+_MONTH_NAMES = ('january', 'february', 'march', 'april', 'may', 'june', 'july', 'august',
+                'september', 'october', 'november', 'december')
+
+# pattern -> (anchors, lead). Every match contains one of the (lowercase)
+# anchors; lead lists every possible first letter. Keyed by the pattern text,
+# so editing a pattern drops its hints instead of making them stale.
+_SCAN_HINTS = {
+    MW_PATTERNS[0]: (('mw', 'megawatt'), ''),
+    MW_PATTERNS[1]: (('capacity',), ''),
+    MW_PATTERNS[2]: (('mw',), ''),
+    MW_PATTERNS[3]: (('phase',), ''),
+    MW_PATTERNS[4]: (('total',), ''),
+    VOLTAGE_PATTERNS[0]: (('kv',), ''),
+    VOLTAGE_PATTERNS[1]: (('kilovolt',), ''),
+    VOLTAGE_PATTERNS[2]: (('kv',), ''),
+    DATE_PATTERNS[0]: (('/', '-'), ''),
+    DATE_PATTERNS[1]: (_MONTH_ABBREVIATIONS, 'jfmasond'),
+    DATE_PATTERNS[2]: (('q',), ''),
+    DATE_PATTERNS[4]: (_MONTH_NAMES, 'jfmasond'),
+    COST_PATTERNS[0]: (('$',), ''),
+    COST_PATTERNS[1]: (('$',), ''),
+    COST_PATTERNS[2]: (('$',), ''),
+    COST_PATTERNS[3]: (('dollars', '$'), ''),
+    COST_PATTERNS[4]: (('cost',), ''),
+    UTILITY_PATTERNS[0]: (('served', 'utility', 'provider'), ''),
+    UTILITY_PATTERNS[1]: (('pso', 'aep', 'duke', 'dominion', 'georgia', 'southern', 'xcel', 'pg&e', 'sce'), 'padgsx'),
+    UTILITY_PATTERNS[2]: (('power', 'electric', 'energy'), ''),
+}
+
+COMMON_TRANSMISSION_KV = frozenset([69, 115, 138, 161, 230, 345, 500, 765])
+
+STATE_CODES = {
+    'Oklahoma': 'OK', 'Texas': 'TX', 'Georgia': 'GA',
+    'Virginia': 'VA', 'Ohio': 'OH', 'Indiana': 'IN',
+    'Pennsylvania': 'PA', 'Nevada': 'NV', 'California': 'CA',
+    'Wyoming': 'WY'
+}
+
+
+@dataclass(frozen=True)
+class ScanPattern:
+    """A precompiled extractor pattern with its prefilter anchors."""
+    kind: str
+    regex: 're.Pattern'
+    anchors: Tuple[str, ...] = ()
+
+    def applies_to(self, lowered_haystack: str) -> bool:
+        return not self.anchors or any(a in lowered_haystack for a in self.anchors)
+
+
+def _compile_scan_patterns(kind: str, patterns: List[str], flags: int = re.IGNORECASE,
+                           dedupe_case: bool = False) -> Tuple[ScanPattern, ...]:
+    compiled = []
+    seen = set()
+    for pattern in patterns:
+        if dedupe_case and not re.search(r'\\[A-Z]', pattern):
+            # Identical under IGNORECASE; only valid for set-valued fields
+            if pattern.lower() in seen:
+                continue
+            seen.add(pattern.lower())
+        anchors, lead = _SCAN_HINTS.get(pattern, ((), ''))
+        source = f'(?=[{lead}]){pattern}' if lead else pattern
+        compiled.append(ScanPattern(kind, re.compile(source, flags), anchors))
+    return tuple(compiled)
+
+
+_SCAN_FLAGS = re.IGNORECASE | re.ASCII
+
+_MW_SCAN = _compile_scan_patterns('mw', MW_PATTERNS, _SCAN_FLAGS)
+_VOLTAGE_SCAN = _compile_scan_patterns('voltage', VOLTAGE_PATTERNS, _SCAN_FLAGS, dedupe_case=True)
+_DATE_SCAN = _compile_scan_patterns('date', DATE_PATTERNS, _SCAN_FLAGS)
+_COST_SCAN = _compile_scan_patterns('cost', COST_PATTERNS, _SCAN_FLAGS)
+_UTILITY_SCAN = _compile_scan_patterns('utility', UTILITY_PATTERNS, _SCAN_FLAGS)
+# Case-sensitive, so these run on the original text (the stand-ins fold case)
+_STATE_SCAN = _compile_scan_patterns('state', STATE_PATTERNS, flags=0)
+# Matched against the lowercased text, as extract_study_status does
+_STUDY_SCAN = {study: _compile_scan_patterns('study', patterns, flags=0)
+               for study, patterns in STUDY_PATTERNS.items()}
+
+
+@dataclass
+class FieldMatch:
+    """One typed extractor hit with its context window."""
+    kind: str  # mw, voltage, date, cost
+    value: Any
+    start: int
+    end: int
+    context: str
+
+
+@dataclass
+class DocumentScan:
+    """Everything the field extractors find in one document."""
+    source: str
+    matches: List[FieldMatch] = field(default_factory=list)
+    study_statuses: Dict[str, str] = field(default_factory=dict)
+    utility: Optional[str] = None
+    state: Optional[str] = None
+
+    def of_kind(self, kind: str) -> List[FieldMatch]:
+        return [m for m in self.matches if m.kind == kind]
+
+    # Same shapes as the extract_* functions
+    @property
+    def mw_figures(self) -> List[Tuple[str, int, str]]:
+        return [(m.context, m.value, self.source) for m in self.of_kind('mw')]
+
+    @property
+    def voltages(self) -> List[int]:
+        return sorted({m.value for m in self.of_kind('voltage')}, reverse=True)
+
+    @property
+    def dates(self) -> List[Tuple[str, str, str]]:
+        return [(m.context, m.value, self.source) for m in self.of_kind('date')]
+
+    @property
+    def costs(self) -> List[Tuple[str, float, str]]:
+        return [(m.context, m.value, self.source) for m in self.of_kind('cost')]
+
+
+def _context_window(text: str, start: int, end: int) -> str:
+    return text[max(0, start - 50):min(len(text), end + 50)].replace('\n', ' ').strip()
+
+
+# Parsers take the original text: the match is against the ASCII stand-in
+
+def _parse_mw(text: str, match) -> Optional[int]:
+    value = int(text[match.start(1):match.end(1)].replace(',', ''))
+    return value if 1 <= value <= 5000 else None
+
+
+def _parse_voltage(text: str, match) -> Optional[int]:
+    value = int(text[match.start(1):match.end(1)])
+    return value if value in COMMON_TRANSMISSION_KV else None
+
+
+def _parse_date(text: str, match) -> str:
+    return text[match.start(1):match.end(1)]
+
+
+def _parse_cost(text: str, match) -> Optional[float]:
+    value = float(text[match.start(1):match.end(1)].replace(',', ''))
+    full_match = text[match.start():match.end()].lower()
+    if 'million' in full_match or full_match.endswith('m'):
+        value *= 1_000_000
+    elif 'thousand' in full_match or full_match.endswith('k'):
+        value *= 1_000
+    return value if value >= 1000 else None
+
+
+_FIELD_SCANS = (
+    (_MW_SCAN, _parse_mw),
+    (_VOLTAGE_SCAN, _parse_voltage),
+    (_DATE_SCAN, _parse_date),
+    (_COST_SCAN, _parse_cost),
+)
+
+
+def _scan_study_status(text_lower: str) -> Dict[str, str]:
+    statuses = {}
+    status = None
+    for study_type, patterns in _STUDY_SCAN.items():
+        if not any(p.regex.search(text_lower) for p in patterns):
+            continue
+        if status is None:
+            # Same keyword checks as extract_study_status (whole document)
+            if 'complete' in text_lower or 'finished' in text_lower:
+                status = 'complete'
+            elif 'in progress' in text_lower or 'ongoing' in text_lower:
+                status = 'in_progress'
+            elif 'executed' in text_lower or 'signed' in text_lower:
+                status = 'executed'
+            elif 'pending' in text_lower or 'requested' in text_lower:
+                status = 'requested'
+            else:
+                status = 'mentioned'
+        statuses[study_type] = status
+    return statuses
+
+
+def scan_document(text: str, source: str) -> DocumentScan:
+    """
+    Run every field extractor over text in one scan.
+
+    Equivalent to calling extract_mw_figures, extract_voltages,
+    extract_dates, extract_costs, extract_study_status,
+    extract_utility_name and extract_state (see check_scanner_parity).
+    """
+    haystack = _ascii_haystack(text)
+    lowered_haystack = haystack.lower()
+    scan = DocumentScan(source=source)
+
+    for patterns, parse in _FIELD_SCANS:
+        for pattern in patterns:
+            if not pattern.applies_to(lowered_haystack):
+                continue
+            for match in pattern.regex.finditer(haystack):
+                try:
+                    value = parse(text, match)
+                except (ValueError, IndexError):
+                    continue
+                if value is not None:
+                    scan.matches.append(FieldMatch(
+                        pattern.kind, value, match.start(), match.end(),
+                        _context_window(text, match.start(), match.end()),
+                    ))
+
+    scan.study_statuses = _scan_study_status(text.lower())
+
+    for pattern in _UTILITY_SCAN:
+        if pattern.applies_to(lowered_haystack):
+            match = pattern.regex.search(haystack)
+            if match:
+                scan.utility = text[match.start(1):match.end(1)].strip()
+                break
+
+    for pattern in _STATE_SCAN:
+        match = pattern.regex.search(text)
+        if match:
+            scan.state = STATE_CODES.get(match.group(1), match.group(1))
+            break
+
+    return scan
+
+
+def check_scanner_parity(text: str, source: str = 'doc') -> List[str]:
+    """Fields where scan_document disagrees with the extract_* functions (empty = match)."""
+    scan = scan_document(text, source)
+    expected = {
+        'mw_figures': (extract_mw_figures(text, source), scan.mw_figures),
+        'voltages': (extract_voltages(text), scan.voltages),
+        'dates': (extract_dates(text, source), scan.dates),
+        'costs': (extract_costs(text, source), scan.costs),
+        'study_statuses': (extract_study_status(text), scan.study_statuses),
+        'utility': (extract_utility_name(text), scan.utility),
+        'state': (extract_state(text), scan.state),
+    }
+    return [name for name, (reference, scanned) in expected.items() if reference != scanned]
+
+
 # =============================================================================
 # MAIN VDR PROCESSING
 # =============================================================================
 
-def process_vdr_upload(file_path: str) -> VDRExtractionResult:
+# Members larger than this are reported as failed instead of read into memory
+VDR_MAX_MEMBER_BYTES = 256 * 1024 * 1024
+
+# Files queued per worker ahead of the merge point (bounds memory on big rooms)
+VDR_JOBS_PER_WORKER = 2
+
+
+def process_vdr_upload(file_path: str, workers: Optional[int] = None) -> VDRExtractionResult:
     """
     Process a VDR upload (zip file or directory).
     Returns consolidated extraction result.
+    
+    Zip members and directory files are parsed in a process pool of
+    ``workers`` processes (default: os.cpu_count(); 1 = in-process).
     """
     result = VDRExtractionResult()
     
-    # Handle zip file
-    if file_path.endswith('.zip'):
-        with tempfile.TemporaryDirectory() as temp_dir:
-            with zipfile.ZipFile(file_path, 'r') as zip_ref:
-                zip_ref.extractall(temp_dir)
-            result = _process_directory(temp_dir, result)
-    elif os.path.isdir(file_path):
-        result = _process_directory(file_path, result)
+    if file_path.endswith('.zip') or os.path.isdir(file_path):
+        for outcome in iter_vdr_outcomes(file_path, workers):
+            _reduce_outcome(result, outcome)
     else:
         # Single file
         result = _process_single_file(file_path, result)
@@ -457,26 +779,145 @@ def process_vdr_upload(file_path: str) -> VDRExtractionResult:
     return result
 
 
-def _process_directory(dir_path: str, result: VDRExtractionResult) -> VDRExtractionResult:
-    """Process all files in a directory recursively."""
+def _is_hidden(relative_path: str) -> bool:
+    """Hidden files and anything under a hidden directory are skipped."""
+    return any(part.startswith('.') for part in relative_path.replace('\\', '/').split('/') if part)
+
+
+def list_vdr_jobs(file_path: str) -> List[Tuple[Optional[str], str, str]]:
+    """
+    Files to process in a zip or directory, as (zip_path, member_or_path, filename).
     
-    for root, dirs, files in os.walk(dir_path):
-        # Skip hidden directories
-        dirs[:] = [d for d in dirs if not d.startswith('.')]
-        
-        for filename in files:
-            if filename.startswith('.'):
-                continue
-            
-            file_path = os.path.join(root, filename)
-            result.total_files += 1
+    zip_path is None for files on disk. Zip members are listed from the
+    archive's central directory; nothing is extracted.
+    """
+    jobs = []
+    if file_path.endswith('.zip'):
+        with zipfile.ZipFile(file_path, 'r') as zip_ref:
+            for info in zip_ref.infolist():
+                if info.is_dir() or _is_hidden(info.filename):
+                    continue
+                jobs.append((file_path, info.filename, os.path.basename(info.filename)))
+    else:
+        for root, dirs, files in os.walk(file_path):
+            # Skip hidden directories
+            dirs[:] = [d for d in dirs if not d.startswith('.')]
             
+            for filename in files:
+                if filename.startswith('.'):
+                    continue
+                jobs.append((None, os.path.join(root, filename), filename))
+    return jobs
+
+
+# Open archives, one per worker process (and one in-process for serial runs)
+_vdr_zip_handles: Dict[str, zipfile.ZipFile] = {}
+
+
+def _open_vdr_zip(zip_path: str) -> zipfile.ZipFile:
+    zip_ref = _vdr_zip_handles.get(zip_path)
+    if zip_ref is None:
+        zip_ref = _vdr_zip_handles[zip_path] = zipfile.ZipFile(zip_path, 'r')
+    return zip_ref
+
+
+def _close_vdr_zips():
+    for zip_ref in _vdr_zip_handles.values():
+        zip_ref.close()
+    _vdr_zip_handles.clear()
+
+
+def _extract_vdr_job(job: Tuple[Optional[str], str, str]) -> Dict[str, Any]:
+    """
+    Parse and analyze one file. Runs in a pool worker.
+    
+    Returns {filename, document (ExtractedDocument or None if the text could
+    not be extracted), error (str if processing raised)}.
+    """
+    zip_path, member, filename = job
+    outcome = {'filename': filename, 'document': None, 'error': None}
+    try:
+        if zip_path is None:
+            text, file_type = extract_text_from_file(member)
+        else:
+            zip_ref = _open_vdr_zip(zip_path)
+            size = zip_ref.getinfo(member).file_size
+            if size > VDR_MAX_MEMBER_BYTES:
+                raise ValueError(f"file too large ({size / 1e6:.0f} MB)")
+            text, file_type = extract_text_from_bytes(zip_ref.read(member), filename)
+        
+        if file_type != 'unknown' and not text.startswith('['):
+            outcome['document'] = analyze_document(text, filename, file_type)
+    except Exception as e:
+        outcome['error'] = str(e)
+    return outcome
+
+
+def iter_vdr_outcomes(file_path: str, workers: Optional[int] = None) -> Iterator[Dict[str, Any]]:
+    """
+    Yield _extract_vdr_job outcomes for a zip or directory, in listing order.
+    
+    At most VDR_JOBS_PER_WORKER files per worker are in flight at once, so
+    memory stays bounded however large the data room is.
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    
+    jobs = list_vdr_jobs(file_path)
+    if not jobs:
+        return
+    
+    workers = min(workers or os.cpu_count() or 1, len(jobs))
+    pool = None
+    if workers > 1:
+        try:
+            pool = ProcessPoolExecutor(max_workers=workers)
+        except Exception as e:
+            print(f"Process pool unavailable, processing VDR serially: {e}")
+    
+    if pool is None:
+        try:
+            for job in jobs:
+                yield _extract_vdr_job(job)
+        finally:
+            _close_vdr_zips()
+        return
+    
+    def collect(job, future):
+        try:
+            return future.result()
+        except Exception as e:
+            # Worker died or the result could not be pickled; retry in-process
+            print(f"Pool extraction failed for {job[2]} ({e}), retrying in-process")
             try:
-                result = _process_single_file(file_path, result)
-                result.processed_files += 1
-            except Exception as e:
-                result.failed_files.append(f"{filename}: {str(e)}")
+                return _extract_vdr_job(job)
+            finally:
+                _close_vdr_zips()
+    
+    max_in_flight = workers * VDR_JOBS_PER_WORKER
+    with pool:
+        pending = deque()
+        for job in jobs:
+            pending.append((job, pool.submit(_extract_vdr_job, job)))
+            if len(pending) >= max_in_flight:
+                yield collect(*pending.popleft())
+        while pending:
+            yield collect(*pending.popleft())
+
+
+def _reduce_outcome(result: VDRExtractionResult, outcome: Dict[str, Any]) -> VDRExtractionResult:
+    """Fold one file's outcome into the running result."""
+    filename = outcome['filename']
+    result.total_files += 1
+    
+    if outcome['error'] is not None:
+        result.failed_files.append(f"{filename}: {outcome['error']}")
+        return result
     
+    if outcome['document'] is None:
+        result.failed_files.append(filename)
+    else:
+        _merge_document(result, outcome['document'])
+    result.processed_files += 1
     return result
 
 
@@ -491,69 +932,62 @@ def _process_single_file(file_path: str, result: VDRExtractionResult) -> VDRExtr
         result.failed_files.append(filename)
         return result
     
+    return _merge_document(result, analyze_document(text, filename, file_type))
+
+
+def analyze_document(text: str, filename: str, file_type: str) -> ExtractedDocument:
+    """Categorize a document and run every field extractor over its text."""
     # Categorize document
     category = categorize_document(text, filename)
     
-    # Extract data
+    # Extract data (one scan_document pass instead of one pass per extractor)
+    scan = scan_document(text, filename)
     extracted_data = {}
     keywords_found = []
     
     # MW figures
-    mw_figures = extract_mw_figures(text, filename)
+    mw_figures = scan.mw_figures
     if mw_figures:
         extracted_data['mw_figures'] = mw_figures
-        result.all_mw_figures.extend(mw_figures)
         keywords_found.append('MW capacity')
     
     # Voltages
-    voltages = extract_voltages(text)
+    voltages = scan.voltages
     if voltages:
         extracted_data['voltages'] = voltages
-        result.voltages_found.extend(voltages)
         keywords_found.append('voltage')
     
     # Dates
-    dates = extract_dates(text, filename)
+    dates = scan.dates
     if dates:
         extracted_data['dates'] = dates
-        result.all_dates.extend(dates)
         keywords_found.append('dates')
     
     # Costs
-    costs = extract_costs(text, filename)
+    costs = scan.costs
     if costs:
         extracted_data['costs'] = costs
-        result.all_costs.extend(costs)
         keywords_found.append('costs')
     
     # Study statuses
-    study_statuses = extract_study_status(text)
-    if study_statuses:
-        extracted_data['study_statuses'] = study_statuses
-        result.study_statuses.update(study_statuses)
+    if scan.study_statuses:
+        extracted_data['study_statuses'] = scan.study_statuses
         keywords_found.append('study status')
     
     # Utility
-    utility = extract_utility_name(text)
-    if utility:
-        extracted_data['utility'] = utility
-        if not result.utility:
-            result.utility = utility
+    if scan.utility:
+        extracted_data['utility'] = scan.utility
         keywords_found.append('utility')
     
     # State
-    state = extract_state(text)
-    if state:
-        extracted_data['state'] = state
-        if not result.state:
-            result.state = state
+    if scan.state:
+        extracted_data['state'] = scan.state
         keywords_found.append('state')
     
     # Calculate confidence
     confidence = min(len(keywords_found) / 5, 1.0)
     
-    # Create document record
-    doc = ExtractedDocument(
+    return ExtractedDocument(
         filename=filename,
         file_type=file_type,
         category=category,
@@ -562,9 +996,24 @@ def _process_single_file(file_path: str, result: VDRExtractionResult) -> VDRExtr
         confidence=confidence,
         keywords_found=keywords_found
     )
+
+
+def _merge_document(result: VDRExtractionResult, doc: ExtractedDocument) -> VDRExtractionResult:
+    """Add one analyzed document to the result (reducer)."""
+    data = doc.extracted_data
+    result.all_mw_figures.extend(data.get('mw_figures', []))
+    result.voltages_found.extend(data.get('voltages', []))
+    result.all_dates.extend(data.get('dates', []))
+    result.all_costs.extend(data.get('costs', []))
+    result.study_statuses.update(data.get('study_statuses', {}))
     
-    result.documents.append(doc)
+    # First document that names a utility / state wins
+    if data.get('utility') and not result.utility:
+        result.utility = data['utility']
+    if data.get('state') and not result.state:
+        result.state = data['state']
     
+    result.documents.append(doc)
     return result
 
 
@@ -798,3 +1247,44 @@ if __name__ == "__main__":
     print("-" * 50)
     result = parse_conversational_input(test_description)
     print(json.dumps(result, indent=2))
+    
+    # Scanner regression check: python document_extraction.py [vdr.zip | folder]
+    import sys
+    import time
+    
+    corpus = [
+        test_description,
+        "Phase 1: 300 MW by Q3 2027; total load - 900. 345kV and 138 KV lines, 765 kilovolt backbone.",
+        "LGIA executed 03/15/2026. Network upgrade costs of $12.5 million, $450 K deposit, 2 million dollars.",
+        "Served by Grand River Energy Company in Texas; PG&E and Georgia Power noted. January 2028, Mar 3, 2026.",
+        "Unicode: \u0661\u0662\u0663 MW, 345\u00a0kV, Q\u0663 2027, Texa\u017f, co\u017ft 5000, \u2022 OK \u2013 TX",
+    ]
+    if len(sys.argv) > 1:
+        for job in list_vdr_jobs(sys.argv[1]):
+            zip_path, member, filename = job
+            if zip_path is None:
+                text, _ = extract_text_from_file(member)
+            else:
+                with zipfile.ZipFile(zip_path) as zip_ref:
+                    text, _ = extract_text_from_bytes(zip_ref.read(member), filename)
+            corpus.append(text)
+    
+    print("\nScanner parity:")
+    print("-" * 50)
+    mismatches = {i: check_scanner_parity(text) for i, text in enumerate(corpus)}
+    mismatches = {i: fields for i, fields in mismatches.items() if fields}
+    print(f"{len(corpus)} documents, {len(mismatches)} mismatches {mismatches or ''}")
+    
+    big_text = "\n".join(corpus) * max(1, 2_000_000 // max(1, sum(len(t) for t in corpus)))
+    started = time.perf_counter()
+    for extract in (lambda: extract_mw_figures(big_text, 'bench'), lambda: extract_voltages(big_text),
+                    lambda: extract_dates(big_text, 'bench'), lambda: extract_costs(big_text, 'bench'),
+                    lambda: extract_study_status(big_text), lambda: extract_utility_name(big_text),
+                    lambda: extract_state(big_text)):
+        extract()
+    per_extractor = time.perf_counter() - started
+    started = time.perf_counter()
+    scan_document(big_text, 'bench')
+    scanned = time.perf_counter() - started
+    print(f"{len(big_text) / 1e6:.1f}M chars: extractors {per_extractor * 1000:.0f} ms, "
+          f"scan_document {scanned * 1000:.0f} ms ({per_extractor / scanned:.1f}x)")
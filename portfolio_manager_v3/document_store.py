@@ -0,0 +1,378 @@
+"""
+Document Search Store
+=====================
+Persistent full-text index behind DocumentIndex.
+
+DocumentIndex.search_text used to lowercase and substring-scan the text of
+every document on every query, get_recent_documents compared ISO strings
+one document at a time, and the whole index was lost on restart. Documents
+are now kept in a local SQLite file with an FTS5 index over file name,
+summary and content:
+
+- search() ranks matches with BM25 (file name and summary weigh more than
+  body text) and filters by site and modified-time range in the same query
+- modified_between() answers time-range queries from a (site_id,
+  modified_time) index
+- upsert() writes one document at a time as scans ingest them; triggers keep
+  the FTS index in step with the documents table
+- everything survives a process restart
+
+Query words are matched as prefixes ("interconnect" finds
+"interconnection"), all words must appear. If the local SQLite build has no
+FTS5, search() falls back to a case-insensitive substring match (the old
+behaviour) over the same table.
+
+Run ``python document_store.py`` for a micro-benchmark against the old
+substring scan.
+"""
+
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional, Tuple
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "power_tracker")
+
+# BM25 column weights: file_name, summary, content_text
+BM25_WEIGHTS = (4.0, 2.0, 1.0)
+
+_TOKEN_RE = re.compile(r"\w+", re.UNICODE)
+
+_SCHEMA = """
+    CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY,
+        file_id TEXT NOT NULL UNIQUE,
+        site_id TEXT NOT NULL,
+        modified_time TEXT NOT NULL DEFAULT '',
+        file_name TEXT NOT NULL DEFAULT '',
+        summary TEXT NOT NULL DEFAULT '',
+        content_text TEXT NOT NULL DEFAULT '',
+        doc_json TEXT NOT NULL
+    );
+    CREATE INDEX IF NOT EXISTS documents_site_time ON documents (site_id, modified_time);
+    CREATE INDEX IF NOT EXISTS documents_time ON documents (modified_time);
+"""
+
+# External-content FTS table: the text lives once, in documents
+_FTS_SCHEMA = """
+    CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+        file_name, summary, content_text,
+        content='documents', content_rowid='id',
+        tokenize='unicode61 remove_diacritics 2'
+    );
+    CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+        INSERT INTO documents_fts (rowid, file_name, summary, content_text)
+        VALUES (new.id, new.file_name, new.summary, new.content_text);
+    END;
+    CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+        INSERT INTO documents_fts (documents_fts, rowid, file_name, summary, content_text)
+        VALUES ('delete', old.id, old.file_name, old.summary, old.content_text);
+    END;
+    CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+        INSERT INTO documents_fts (documents_fts, rowid, file_name, summary, content_text)
+        VALUES ('delete', old.id, old.file_name, old.summary, old.content_text);
+        INSERT INTO documents_fts (rowid, file_name, summary, content_text)
+        VALUES (new.id, new.file_name, new.summary, new.content_text);
+    END;
+"""
+
+
+def match_expression(query: str) -> str:
+    """FTS5 MATCH expression for free text: every word, as a prefix."""
+    tokens = _TOKEN_RE.findall(query.lower())
+    return " AND ".join(f'"{token}"*' for token in tokens)
+
+
+def _like_pattern(query: str) -> str:
+    escaped = query.lower().replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+    return f"%{escaped}%"
+
+
+def _time_bound(value: Any) -> Optional[str]:
+    """datetime or ISO string -> ISO string (compared the way modified_time is stored)."""
+    if value is None or value == "":
+        return None
+    if hasattr(value, "isoformat"):
+        return value.isoformat()
+    return str(value)
+
+
+class DocumentStore:
+    """
+    SQLite document table plus FTS5 index.
+
+    Stores whatever dict the caller hands it (ProcessedDocument.to_dict());
+    only file_id, site_id, modified_time, file_name, summary and
+    content_text are interpreted.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            cache_dir = os.environ.get("PORTFOLIO_CACHE_DIR", DEFAULT_CACHE_DIR)
+            path = os.path.join(cache_dir, "document_index.sqlite")
+        self.path = path
+        self.fts_available = False
+        self._lock = threading.Lock()
+        self.stats = {
+            'searches': 0,
+            'upserts': 0,
+            'errors': 0,
+        }
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _init_db(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, self._connect() as conn:
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.executescript(_SCHEMA)
+            try:
+                conn.executescript(_FTS_SCHEMA)
+                self.fts_available = True
+            except sqlite3.OperationalError as e:
+                print(f"[document_store] FTS5 unavailable, using substring search: {e}")
+
+    # -- writes --------------------------------------------------------------
+
+    def upsert(self, documents: Iterable[Dict[str, Any]]) -> int:
+        """Insert or replace documents (keyed by file_id) in one transaction."""
+        rows = []
+        for data in documents:
+            meta = {k: v for k, v in data.items() if k != 'content_text'}
+            rows.append((
+                data['file_id'],
+                data.get('site_id') or '',
+                data.get('modified_time') or '',
+                data.get('file_name') or '',
+                data.get('summary') or '',
+                data.get('content_text') or '',
+                json.dumps(meta, default=str),
+            ))
+        if not rows:
+            return 0
+        try:
+            with self._lock, self._connect() as conn:
+                conn.executemany(
+                    "INSERT INTO documents "
+                    "(file_id, site_id, modified_time, file_name, summary, content_text, doc_json) "
+                    "VALUES (?, ?, ?, ?, ?, ?, ?) "
+                    "ON CONFLICT(file_id) DO UPDATE SET "
+                    "site_id = excluded.site_id, modified_time = excluded.modified_time, "
+                    "file_name = excluded.file_name, summary = excluded.summary, "
+                    "content_text = excluded.content_text, doc_json = excluded.doc_json",
+                    rows
+                )
+            self.stats['upserts'] += len(rows)
+            return len(rows)
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[document_store] Could not store documents: {e}")
+            return 0
+
+    def delete(self, file_id: str):
+        """Drop one document from the store."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM documents WHERE file_id = ?", (file_id,))
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[document_store] Could not delete {file_id}: {e}")
+
+    def clear(self):
+        """Drop every stored document."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute("DELETE FROM documents")
+                if self.fts_available:
+                    conn.execute("INSERT INTO documents_fts (documents_fts) VALUES ('rebuild')")
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[document_store] Could not clear store: {e}")
+
+    # -- reads ---------------------------------------------------------------
+
+    def load_documents(self) -> List[Dict[str, Any]]:
+        """Every stored document as a dict (content_text included)."""
+        try:
+            with self._lock, self._connect() as conn:
+                rows = conn.execute("SELECT doc_json, content_text FROM documents ORDER BY id").fetchall()
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[document_store] Could not load documents: {e}")
+            return []
+        documents = []
+        for doc_json, content_text in rows:
+            data = json.loads(doc_json)
+            data['content_text'] = content_text
+            documents.append(data)
+        return documents
+
+    def _filters(self, site_id: Optional[str], modified_after: Any, modified_before: Any) -> Tuple[str, List]:
+        clauses, params = [], []
+        if site_id:
+            clauses.append("d.site_id = ?")
+            params.append(site_id)
+        after = _time_bound(modified_after)
+        if after:
+            clauses.append("d.modified_time >= ?")
+            params.append(after)
+        before = _time_bound(modified_before)
+        if before:
+            clauses.append("d.modified_time < ?")
+            params.append(before)
+        return "".join(f" AND {c}" for c in clauses), params
+
+    def search(
+        self,
+        query: str,
+        site_id: Optional[str] = None,
+        modified_after: Any = None,
+        modified_before: Any = None,
+        limit: Optional[int] = None,
+    ) -> List[Tuple[str, float]]:
+        """
+        Ranked (file_id, score) matches for a free-text query.
+
+        Args:
+            query: Words to look for (each matched as a prefix, all required)
+            site_id: Only this site's documents
+            modified_after: Inclusive lower bound on modified_time (datetime or ISO string)
+            modified_before: Exclusive upper bound on modified_time
+            limit: Maximum number of results (None for all)
+
+        Scores are BM25 (lower is better); the substring fallback scores 0.
+        """
+        filters, params = self._filters(site_id, modified_after, modified_before)
+        if self.fts_available:
+            expression = match_expression(query)
+            if not expression:
+                return []
+            sql = (
+                "SELECT d.file_id, bm25(documents_fts, ?, ?, ?) AS score "
+                "FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid "
+                f"WHERE documents_fts MATCH ?{filters} ORDER BY score"
+            )
+            params = [*BM25_WEIGHTS, expression, *params]
+        else:
+            if not query.strip():
+                return []
+            sql = (
+                "SELECT d.file_id, 0.0 AS score FROM documents d "
+                f"WHERE lower(d.content_text) LIKE ? ESCAPE '\\'{filters} ORDER BY d.modified_time DESC"
+            )
+            params = [_like_pattern(query), *params]
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(int(limit))
+
+        self.stats['searches'] += 1
+        try:
+            with self._lock, self._connect() as conn:
+                return conn.execute(sql, params).fetchall()
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[document_store] Search failed for {query!r}: {e}")
+            return []
+
+    def modified_between(
+        self,
+        modified_after: Any = None,
+        modified_before: Any = None,
+        site_id: Optional[str] = None,
+    ) -> List[str]:
+        """file_ids modified in [modified_after, modified_before), newest first."""
+        filters, params = self._filters(site_id, modified_after, modified_before)
+        try:
+            with self._lock, self._connect() as conn:
+                rows = conn.execute(
+                    f"SELECT d.file_id FROM documents d WHERE 1{filters} ORDER BY d.modified_time DESC",
+                    params
+                ).fetchall()
+            return [row[0] for row in rows]
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[document_store] Time-range query failed: {e}")
+            return []
+
+    def count(self) -> int:
+        try:
+            with self._lock, self._connect() as conn:
+                return conn.execute("SELECT COUNT(*) FROM documents").fetchone()[0]
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[document_store] Could not count documents: {e}")
+            return 0
+
+
+# =============================================================================
+# MICRO-BENCHMARK
+# =============================================================================
+
+def benchmark(num_documents: int = 3000, chars_per_document: int = 20000) -> Dict[str, float]:
+    """Milliseconds per query: FTS5 store vs the old lowercase substring scan."""
+    import random
+    import tempfile
+
+    rng = random.Random(7)
+    vocabulary = (
+        "substation transmission interconnection study utility capacity megawatt "
+        "zoning parcel agreement letter intent facilities county water fiber "
+        "easement queue schedule energization transformer breaker feeder"
+    ).split()
+    documents = []
+    for i in range(num_documents):
+        words, length = [], 0
+        while length < chars_per_document:
+            word = rng.choice(vocabulary)
+            words.append(word)
+            length += len(word) + 1
+        if i % 50 == 0:
+            words.insert(rng.randrange(len(words)), "SIS results received")
+        documents.append({
+            'file_id': f"doc{i}",
+            'site_id': f"site{i % 40}",
+            'file_name': f"notes_{i}.txt",
+            'modified_time': f"2024-{1 + i % 12:02d}-{1 + i % 28:02d}T00:00:00Z",
+            'content_text': " ".join(words),
+        })
+
+    with tempfile.TemporaryDirectory() as tmp:
+        store = DocumentStore(os.path.join(tmp, "bench.sqlite"))
+        started = time.perf_counter()
+        store.upsert(documents)
+        load_ms = (time.perf_counter() - started) * 1000
+
+        queries = ["SIS results", "interconnection agreement", "transformer"]
+
+        def substring_scan(query):
+            needle = query.lower()
+            return [d['file_id'] for d in documents if needle in d['content_text'].lower()]
+
+        def timed(func, repeat=5):
+            func()
+            started = time.perf_counter()
+            for _ in range(repeat):
+                func()
+            return (time.perf_counter() - started) / repeat * 1000
+
+        results = {'index build (total)': load_ms}
+        for query in queries:
+            results[f"scan   '{query}'"] = timed(lambda: substring_scan(query), repeat=2)
+            results[f"fts    '{query}'"] = timed(lambda: store.search(query, limit=20))
+            results[f"fts    '{query}' site+range"] = timed(
+                lambda: store.search(query, site_id="site0", modified_after="2024-06-01", limit=20)
+            )
+        return results
+
+
+if __name__ == "__main__":
+    for name, ms in benchmark().items():
+        print(f"{name:<48} {ms:9.2f} ms")
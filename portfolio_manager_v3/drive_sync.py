@@ -0,0 +1,601 @@
+"""
+Drive Sync State
+================
+Incremental sync support for SiteDocumentManager.
+
+scan_for_changes used to list every site folder and then every folder's
+documents on each scan, get_folder_path fetched a parent folder per file,
+and process_document downloaded and re-extracted files whose content had
+not changed. Sync now works off the Drive changes feed:
+
+- the first scan (or a full rescan) lists the folders once, the way the old
+  scan did, and records a changes-feed start token taken *before* the
+  listing, so nothing modified during the listing is missed
+- later scans only read ``changes().list`` from the saved token, so their
+  cost follows the number of changed files, not the number of site folders
+- FolderCache keeps folder id -> (name, parent) and resolves a file's site
+  from its parent chain without API calls once warm; folder renames and
+  moves arrive through the same feed
+- SyncLedger records the MD5 of every processed file. Changes whose Drive
+  md5Checksum matches are dropped before download; downloads whose hash
+  matches are not re-extracted
+- files that fail to process are kept in the ledger and retried on the
+  next scan, so advancing the token never loses them
+
+Everything lives in $PORTFOLIO_CACHE_DIR/drive_sync.sqlite and survives
+restarts.
+
+LocalDrive is an in-memory stand-in for the Drive v3 service (files and
+changes resources, ``.execute()`` requests, per-method call counts) for
+tests and the demo below. Run ``python drive_sync.py`` to compare API calls
+per scan with the old listing.
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "power_tracker")
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+# Fields requested from the changes feed; md5Checksum lets unchanged content skip the download
+CHANGE_FIELDS = (
+    "nextPageToken, newStartPageToken, "
+    "changes(fileId, removed, file(id, name, mimeType, modifiedTime, parents, trashed, md5Checksum))"
+)
+CHANGES_PAGE_SIZE = 1000
+
+# Deepest folder nesting followed when resolving a file's site
+MAX_FOLDER_DEPTH = 16
+
+
+def content_md5(content: bytes) -> str:
+    """MD5 hex digest, comparable with Drive's md5Checksum."""
+    return hashlib.md5(content, usedforsecurity=False).hexdigest()
+
+
+# =============================================================================
+# SYNC LEDGER
+# =============================================================================
+
+class SyncLedger:
+    """
+    SQLite store for changes-feed tokens, the folder cache, processed-file
+    hashes and files waiting for a retry.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        if path is None:
+            cache_dir = os.environ.get("PORTFOLIO_CACHE_DIR", DEFAULT_CACHE_DIR)
+            path = os.path.join(cache_dir, "drive_sync.sqlite")
+        self.path = path
+        self._lock = threading.Lock()
+        self.stats = {'errors': 0}
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _init_db(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, self._connect() as conn:
+            conn.executescript("""
+                CREATE TABLE IF NOT EXISTS sync_tokens (
+                    root_id TEXT PRIMARY KEY,
+                    page_token TEXT NOT NULL,
+                    updated_at REAL NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS folders (
+                    folder_id TEXT PRIMARY KEY,
+                    name TEXT NOT NULL,
+                    parent_id TEXT NOT NULL DEFAULT ''
+                );
+                CREATE TABLE IF NOT EXISTS files (
+                    file_id TEXT PRIMARY KEY,
+                    site_id TEXT NOT NULL,
+                    content_md5 TEXT NOT NULL,
+                    modified_time TEXT NOT NULL DEFAULT '',
+                    processed_time TEXT NOT NULL DEFAULT ''
+                );
+                CREATE TABLE IF NOT EXISTS pending (
+                    file_id TEXT PRIMARY KEY,
+                    site_id TEXT NOT NULL,
+                    file_json TEXT NOT NULL
+                );
+            """)
+
+    def _execute(self, sql: str, params: Tuple = (), many: bool = False, fetch: bool = False):
+        try:
+            with self._lock, self._connect() as conn:
+                if many:
+                    conn.executemany(sql, params)
+                    return None
+                cursor = conn.execute(sql, params)
+                return cursor.fetchall() if fetch else None
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[drive_sync] Ledger query failed: {e}")
+            return [] if fetch else None
+
+    # -- changes feed token --------------------------------------------------
+
+    def get_page_token(self, root_id: str) -> Optional[str]:
+        rows = self._execute("SELECT page_token FROM sync_tokens WHERE root_id = ?", (root_id,), fetch=True)
+        return rows[0][0] if rows else None
+
+    def set_page_token(self, root_id: str, token: str):
+        self._execute(
+            "INSERT OR REPLACE INTO sync_tokens (root_id, page_token, updated_at) VALUES (?, ?, ?)",
+            (root_id, token, time.time())
+        )
+
+    def reset_page_token(self, root_id: str):
+        self._execute("DELETE FROM sync_tokens WHERE root_id = ?", (root_id,))
+
+    # -- folders -------------------------------------------------------------
+
+    def load_folders(self) -> Dict[str, Tuple[str, str]]:
+        rows = self._execute("SELECT folder_id, name, parent_id FROM folders", fetch=True)
+        return {folder_id: (name, parent_id) for folder_id, name, parent_id in rows}
+
+    def put_folders(self, folders: List[Tuple[str, str, str]]):
+        if folders:
+            self._execute(
+                "INSERT OR REPLACE INTO folders (folder_id, name, parent_id) VALUES (?, ?, ?)",
+                folders, many=True
+            )
+
+    def forget_folder(self, folder_id: str):
+        self._execute("DELETE FROM folders WHERE folder_id = ?", (folder_id,))
+
+    # -- processed files -----------------------------------------------------
+
+    def get_file(self, file_id: str) -> Optional[Dict[str, str]]:
+        rows = self._execute(
+            "SELECT site_id, content_md5, modified_time, processed_time FROM files WHERE file_id = ?",
+            (file_id,), fetch=True
+        )
+        if not rows:
+            return None
+        site_id, md5, modified_time, processed_time = rows[0]
+        return {'site_id': site_id, 'content_md5': md5, 'modified_time': modified_time,
+                'processed_time': processed_time}
+
+    def record_file(self, file_id: str, site_id: str, md5: str, modified_time: str):
+        """Remember a processed file's content hash (and clear any pending retry)."""
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO files (file_id, site_id, content_md5, modified_time, processed_time) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (file_id, site_id, md5, modified_time or '', datetime.utcnow().isoformat())
+                )
+                conn.execute("DELETE FROM pending WHERE file_id = ?", (file_id,))
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[drive_sync] Could not record {file_id}: {e}")
+
+    def forget_file(self, file_id: str):
+        self._execute("DELETE FROM files WHERE file_id = ?", (file_id,))
+        self._execute("DELETE FROM pending WHERE file_id = ?", (file_id,))
+
+    # -- retries -------------------------------------------------------------
+
+    def mark_pending(self, file_info: Dict, site_id: str):
+        self._execute(
+            "INSERT OR REPLACE INTO pending (file_id, site_id, file_json) VALUES (?, ?, ?)",
+            (file_info['id'], site_id, json.dumps(file_info))
+        )
+
+    def clear_pending(self, file_id: str):
+        self._execute("DELETE FROM pending WHERE file_id = ?", (file_id,))
+
+    def pending_files(self) -> List[Tuple[str, Dict]]:
+        rows = self._execute("SELECT site_id, file_json FROM pending", fetch=True)
+        return [(site_id, json.loads(file_json)) for site_id, file_json in rows]
+
+
+# =============================================================================
+# FOLDER CACHE
+# =============================================================================
+
+class FolderCache:
+    """
+    folder id -> (name, parent id), persisted in the ledger.
+
+    fetch(folder_id) is only called for folders not seen before and must
+    return the Drive metadata dict (name, parents).
+    """
+
+    def __init__(self, ledger: SyncLedger, root_id: str, fetch: Callable[[str], Optional[Dict]]):
+        self.ledger = ledger
+        self.root_id = root_id
+        self._fetch = fetch
+        self._folders = ledger.load_folders()
+        self.stats = {'hits': 0, 'fetches': 0}
+
+    def put(self, folder_id: str, name: str, parent_id: str = ''):
+        if self._folders.get(folder_id) == (name, parent_id):
+            return
+        self._folders[folder_id] = (name, parent_id)
+        self.ledger.put_folders([(folder_id, name, parent_id)])
+
+    def put_many(self, folders: List[Dict], parent_id: str):
+        """Cache folders from a files().list result under a known parent."""
+        new = []
+        for folder in folders:
+            entry = (folder.get('name', ''), parent_id)
+            if self._folders.get(folder['id']) != entry:
+                self._folders[folder['id']] = entry
+                new.append((folder['id'], *entry))
+        self.ledger.put_folders(new)
+
+    def forget(self, folder_id: str):
+        if self._folders.pop(folder_id, None) is not None:
+            self.ledger.forget_folder(folder_id)
+
+    def get(self, folder_id: str) -> Optional[Tuple[str, str]]:
+        """(name, parent_id) for a folder, fetching it once if unknown."""
+        entry = self._folders.get(folder_id)
+        if entry is not None:
+            self.stats['hits'] += 1
+            return entry
+        self.stats['fetches'] += 1
+        try:
+            meta = self._fetch(folder_id)
+        except Exception as e:
+            print(f"[drive_sync] Could not fetch folder {folder_id}: {e}")
+            return None
+        if not meta:
+            return None
+        parents = meta.get('parents') or []
+        entry = (meta.get('name', ''), parents[0] if parents else '')
+        self.put(folder_id, *entry)
+        return entry
+
+    def name(self, folder_id: str) -> str:
+        entry = self.get(folder_id)
+        return entry[0] if entry else ""
+
+    def locate(self, folder_id: str) -> Optional[Tuple[str, str]]:
+        """
+        (site_id, path below the site folder) for a folder, or None when it
+        is not inside the documents root.
+        """
+        names = []
+        current = folder_id
+        for _ in range(MAX_FOLDER_DEPTH):
+            if current == self.root_id:
+                if not names:
+                    return None  # the root itself, not a site folder
+                names.reverse()
+                return names[0], "/".join(names[1:])
+            entry = self.get(current)
+            if entry is None or not entry[1]:
+                return None
+            names.append(entry[0])
+            current = entry[1]
+        return None
+
+
+# =============================================================================
+# LOCAL DRIVE STUB
+# =============================================================================
+
+class _Request:
+    """Deferred call with the googleapiclient ``.execute()`` interface."""
+
+    def __init__(self, func: Callable[[], Any]):
+        self._func = func
+
+    def execute(self, num_retries: int = 0) -> Any:
+        return self._func()
+
+
+_QUERY_TOKEN_RE = re.compile(
+    r"\s*(?:(?P<lparen>\()|(?P<rparen>\))|(?P<op>and|or)\b|"
+    r"'(?P<parent>[^']*)'\s+in\s+parents|"
+    r"(?P<field>name|mimeType|modifiedTime|trashed)\s*(?P<cmp>!=|>=|<=|=|>|<)\s*(?P<value>'[^']*'|true|false))",
+    re.IGNORECASE,
+)
+
+
+def _parse_query(query: str) -> List[Tuple[str, Any]]:
+    tokens = []
+    pos = 0
+    while pos < len(query):
+        if query[pos:].strip() == "":
+            break
+        match = _QUERY_TOKEN_RE.match(query, pos)
+        if not match:
+            raise ValueError(f"Unsupported query near: {query[pos:pos + 40]!r}")
+        pos = match.end()
+        if match.group('lparen'):
+            tokens.append(('(', None))
+        elif match.group('rparen'):
+            tokens.append((')', None))
+        elif match.group('op'):
+            tokens.append((match.group('op').lower(), None))
+        elif match.group('parent') is not None:
+            tokens.append(('term', ('parents', 'in', match.group('parent'))))
+        else:
+            value = match.group('value')
+            value = value[1:-1] if value.startswith("'") else value.lower() == 'true'
+            tokens.append(('term', (match.group('field'), match.group('cmp'), value)))
+    return tokens
+
+
+class LocalDrive:
+    """
+    In-memory Drive v3 service covering the calls SiteDocumentManager makes:
+    files().list/get/get_media/create and changes().getStartPageToken/list.
+
+    Queries support ``'id' in parents``, name/mimeType/modifiedTime/trashed
+    comparisons, and/or and parentheses. Every executed request is counted
+    in ``calls``.
+    """
+
+    def __init__(self):
+        self._files: Dict[str, Dict[str, Any]] = {}
+        self._content: Dict[str, bytes] = {}
+        self._changes: List[Dict[str, Any]] = []
+        self._next_id = 0
+        self._clock = 0
+        self.calls: Dict[str, int] = {}
+
+    # -- test helpers --------------------------------------------------------
+
+    def _now(self) -> str:
+        # Strictly increasing timestamps so modifiedTime ordering is stable
+        self._clock += 1
+        base = datetime(2025, 1, 1, tzinfo=timezone.utc).timestamp() + self._clock
+        return datetime.fromtimestamp(base, tz=timezone.utc).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+
+    def _record_change(self, file_id: str, removed: bool = False):
+        self._changes.append({'fileId': file_id, 'removed': removed})
+
+    def add_folder(self, name: str, parent_id: Optional[str] = None) -> str:
+        return self._create({'name': name, 'mimeType': FOLDER_MIME_TYPE,
+                             'parents': [parent_id] if parent_id else []})
+
+    def add_file(self, name: str, parent_id: str, content: bytes, mime_type: str = "text/plain") -> str:
+        return self._create({'name': name, 'mimeType': mime_type, 'parents': [parent_id]}, content)
+
+    def update_file(self, file_id: str, content: Optional[bytes] = None, name: Optional[str] = None):
+        meta = self._files[file_id]
+        if content is not None:
+            self._content[file_id] = content
+            meta['md5Checksum'] = content_md5(content)
+        if name is not None:
+            meta['name'] = name
+        meta['modifiedTime'] = self._now()
+        self._record_change(file_id)
+
+    def move(self, file_id: str, new_parent_id: str):
+        self._files[file_id]['parents'] = [new_parent_id]
+        self._files[file_id]['modifiedTime'] = self._now()
+        self._record_change(file_id)
+
+    def trash(self, file_id: str):
+        self._files[file_id]['trashed'] = True
+        self._record_change(file_id)
+
+    def delete(self, file_id: str):
+        self._files.pop(file_id, None)
+        self._content.pop(file_id, None)
+        self._record_change(file_id, removed=True)
+
+    def reset_calls(self):
+        self.calls = {}
+
+    def total_calls(self) -> int:
+        return sum(self.calls.values())
+
+    # -- service surface -----------------------------------------------------
+
+    def files(self) -> '_Resource':
+        return _Resource(self, 'files')
+
+    def changes(self) -> '_Resource':
+        return _Resource(self, 'changes')
+
+    def _count(self, method: str):
+        self.calls[method] = self.calls.get(method, 0) + 1
+
+    def _create(self, body: Dict, content: Optional[bytes] = None) -> str:
+        self._next_id += 1
+        file_id = f"local{self._next_id:06d}"
+        meta = {
+            'id': file_id,
+            'name': body.get('name', ''),
+            'mimeType': body.get('mimeType', 'application/octet-stream'),
+            'parents': list(body.get('parents') or []),
+            'modifiedTime': self._now(),
+            'trashed': False,
+        }
+        if meta['mimeType'] != FOLDER_MIME_TYPE:
+            self._content[file_id] = content or b""
+            meta['md5Checksum'] = content_md5(self._content[file_id])
+        self._files[file_id] = meta
+        self._record_change(file_id)
+        return file_id
+
+    def _matches(self, meta: Dict, term: Tuple[str, str, Any]) -> bool:
+        field_name, cmp, value = term
+        if field_name == 'parents':
+            return value in meta['parents']
+        actual = meta.get(field_name)
+        if field_name == 'modifiedTime':
+            actual, value = actual[:19], value[:19]
+        if cmp == '=':
+            return actual == value
+        if cmp == '!=':
+            return actual != value
+        if cmp == '>':
+            return actual > value
+        if cmp == '>=':
+            return actual >= value
+        if cmp == '<':
+            return actual < value
+        return actual <= value
+
+    def _evaluate(self, tokens: List, meta: Dict) -> bool:
+        position = 0
+
+        def expression() -> bool:
+            nonlocal position
+            result = conjunction()
+            while position < len(tokens) and tokens[position][0] == 'or':
+                position += 1
+                result = conjunction() or result
+            return result
+
+        def conjunction() -> bool:
+            nonlocal position
+            result = atom()
+            while position < len(tokens) and tokens[position][0] == 'and':
+                position += 1
+                result = atom() and result
+            return result
+
+        def atom() -> bool:
+            nonlocal position
+            kind, value = tokens[position]
+            position += 1
+            if kind == '(':
+                result = expression()
+                position += 1  # ')'
+                return result
+            return self._matches(meta, value)
+
+        return expression() if tokens else True
+
+    @staticmethod
+    def _project(meta: Dict, fields: str) -> Dict:
+        inner = re.search(r"\(([^)]*)\)", fields or "")
+        wanted = {f.strip() for f in (inner.group(1) if inner else fields or "").split(",") if f.strip()}
+        if not wanted:
+            return dict(meta)
+        return {k: v for k, v in meta.items() if k in wanted}
+
+    def files_list(self, q: str = "", fields: str = "", orderBy: str = "", **_) -> Dict:
+        self._count('files.list')
+        tokens = _parse_query(q)
+        found = [meta for meta in self._files.values() if self._evaluate(tokens, meta)]
+        if orderBy.startswith('modifiedTime'):
+            found.sort(key=lambda m: m['modifiedTime'], reverse=orderBy.endswith('desc'))
+        return {'files': [self._project(meta, fields) for meta in found]}
+
+    def files_get(self, fileId: str, fields: str = "", **_) -> Dict:
+        self._count('files.get')
+        if fileId not in self._files:
+            raise FileNotFoundError(fileId)
+        return self._project(self._files[fileId], fields)
+
+    def files_get_media(self, fileId: str, **_) -> bytes:
+        self._count('files.get_media')
+        return self._content[fileId]
+
+    def files_create(self, body: Dict, fields: str = "", **_) -> Dict:
+        self._count('files.create')
+        return {'id': self._create(body)}
+
+    def changes_getStartPageToken(self, **_) -> Dict:
+        self._count('changes.getStartPageToken')
+        return {'startPageToken': str(len(self._changes))}
+
+    def changes_list(self, pageToken: str, pageSize: int = CHANGES_PAGE_SIZE, includeRemoved: bool = True,
+                     **_) -> Dict:
+        self._count('changes.list')
+        start = int(pageToken)
+        end = min(start + pageSize, len(self._changes))
+        changes = []
+        for entry in self._changes[start:end]:
+            change = dict(entry)
+            meta = self._files.get(entry['fileId'])
+            if meta is None:
+                change['removed'] = True
+            elif not entry['removed']:
+                change['file'] = dict(meta)
+            if change['removed'] and not includeRemoved:
+                continue
+            changes.append(change)
+        result = {'changes': changes}
+        if end < len(self._changes):
+            result['nextPageToken'] = str(end)
+        else:
+            result['newStartPageToken'] = str(end)
+        return result
+
+
+class _Resource:
+    """``service.files()`` / ``service.changes()`` returning deferred requests."""
+
+    def __init__(self, drive: LocalDrive, name: str):
+        self._drive = drive
+        self._name = name
+
+    def __getattr__(self, method: str):
+        func = getattr(self._drive, f"{self._name}_{method}")
+        return lambda **kwargs: _Request(lambda: func(**kwargs))
+
+
+# =============================================================================
+# DEMO
+# =============================================================================
+
+def demo(num_sites: int = 50, docs_per_site: int = 4, changed: int = 3):
+    """API calls per scan: old full listing vs changes feed, on a LocalDrive."""
+    import tempfile
+    from document_context import SiteDocumentManager
+
+    drive = LocalDrive()
+    root = drive.add_folder("Site Documents")
+    file_ids = []
+    for s in range(num_sites):
+        site_folder = drive.add_folder(f"site_{s:03d}", root)
+        studies = drive.add_folder("studies", site_folder)
+        drive.add_folder("meeting_notes", site_folder)
+        for d in range(docs_per_site):
+            file_ids.append(drive.add_file(f"study_{d}.txt", studies, f"SIS results {s}-{d}".encode()))
+
+    with tempfile.TemporaryDirectory() as tmp:
+        manager = SiteDocumentManager(None, root, drive_service=drive,
+                                      sync_state_path=os.path.join(tmp, "sync.sqlite"))
+
+        def scan(label: str, **kwargs):
+            drive.reset_calls()
+            changes = manager.scan_for_changes(since_hours=24 * 365 * 10, **kwargs)
+            processed = skipped = 0
+            for site_id, docs in changes.items():
+                for info in docs:
+                    if manager.process_document(info, site_id) is None:
+                        skipped += 1
+                    else:
+                        processed += 1
+            manager.commit_sync()
+            found = sum(len(docs) for docs in changes.values())
+            print(f"{label:<34} {drive.total_calls():5d} API calls  {found:4d} found  "
+                  f"{processed:4d} extracted  {skipped:3d} unchanged   {dict(sorted(drive.calls.items()))}")
+
+        scan("first scan (full listing)")
+        for file_id in file_ids[:changed]:
+            drive.update_file(file_id, content=b"IA executed " + file_id.encode())
+        drive.update_file(file_ids[changed], name="renamed.txt")  # metadata only
+        scan(f"incremental ({changed} edited, 1 renamed)")
+        scan("incremental (nothing changed)")
+        scan("full rescan", full_scan=True)
+
+
+if __name__ == "__main__":
+    demo()
@@ -0,0 +1,651 @@
+"""
+Inference Scheduler
+===================
+Concurrent, rate-limited LLM status inference for SiteContextManager.
+
+scan_and_process used to call infer_status_with_llm_sync once per document,
+one after another, so a scan over 100 changed documents waited on 100
+sequential model round trips. InferenceScheduler runs the same prompts on
+an asyncio loop:
+
+- at most ``max_concurrency`` requests are in flight at once
+- every request (including retries) first takes a token from the provider's
+  TokenBucket, shared process-wide, so the configured requests-per-minute
+  is never exceeded even when several scans run at the same time
+- rate-limit, overload, timeout and 5xx errors are retried with
+  exponential backoff and full jitter (honouring Retry-After when given);
+  other errors fail the document straight away
+- with ``batch_small_docs=True``, short documents from the same site are
+  sent together in one prompt (build_batch_inference_prompt); documents
+  the model leaves out of a batch response are re-run on their own
+
+Results have the same shape as infer_status_with_llm_sync, in job order.
+
+FakeLLMServer is a local HTTP server with the shape of the Anthropic
+Messages API (configurable latency, 429s and server-side rate limit), and
+FakeLLMClient talks to it in either the Claude or the Gemini call style.
+Run ``python inference_scheduler.py`` to compare serial and scheduled scans
+against it.
+"""
+
+import asyncio
+import inspect
+import json
+import random
+import re
+import threading
+import time
+import urllib.error
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional
+
+from document_context import (
+    CLAUDE_MODEL,
+    ProcessedDocument,
+    build_batch_inference_prompt,
+    build_status_inference_prompt,
+    call_llm,
+    parse_batch_inference_response,
+    parse_inference_response,
+)
+
+
+@dataclass
+class RateLimit:
+    """Requests per minute plus how many may go out back to back."""
+    requests_per_minute: float
+    burst: int = 1
+
+
+# Conservative defaults for the models document_context uses; raise them to
+# match the account's tier with configure_rate_limit()
+DEFAULT_RATE_LIMITS = {
+    'claude': RateLimit(requests_per_minute=50, burst=5),
+    'gemini': RateLimit(requests_per_minute=60, burst=5),
+}
+
+DEFAULT_MAX_CONCURRENCY = 8
+DEFAULT_MAX_RETRIES = 4
+RETRY_BASE_DELAY = 1.0      # seconds; doubles per attempt before jitter
+RETRY_MAX_DELAY = 30.0
+
+# Batching: documents up to BATCH_CHAR_LIMIT characters are grouped per site,
+# at most BATCH_MAX_DOCUMENTS / BATCH_MAX_CHARS of content per prompt
+BATCH_CHAR_LIMIT = 4000
+BATCH_MAX_DOCUMENTS = 5
+BATCH_MAX_CHARS = 16000
+
+SINGLE_MAX_TOKENS = 4000
+BATCH_MAX_TOKENS = 16000
+
+_RETRYABLE_STATUS = {408, 409, 425, 429, 500, 502, 503, 504, 529}
+_RETRYABLE_NAMES = (
+    'RateLimit', 'TooManyRequests', 'ResourceExhausted', 'Overloaded',
+    'ServiceUnavailable', 'InternalServer', 'Timeout', 'DeadlineExceeded', 'Connection',
+)
+
+
+# =============================================================================
+# RATE LIMITING
+# =============================================================================
+
+class TokenBucket:
+    """
+    Thread-safe token bucket usable from any event loop.
+
+    Callers reserve a token and sleep until their slot; the balance may go
+    negative, which queues later callers behind earlier ones instead of
+    letting them race for the next refill.
+    """
+
+    def __init__(self, requests_per_minute: float, burst: int = 1):
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        self.rate = requests_per_minute / 60.0
+        self.capacity = max(1, int(burst))
+        self._tokens = float(self.capacity)
+        self._updated = time.monotonic()
+        self._lock = threading.Lock()
+        self.stats = {'acquired': 0, 'waited_seconds': 0.0}
+
+    def reserve(self) -> float:
+        """Take a token; returns how many seconds to wait before using it."""
+        with self._lock:
+            now = time.monotonic()
+            self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+            self._updated = now
+            self._tokens -= 1
+            wait = 0.0 if self._tokens >= 0 else -self._tokens / self.rate
+            self.stats['acquired'] += 1
+            self.stats['waited_seconds'] += wait
+            return wait
+
+    async def acquire(self):
+        wait = self.reserve()
+        if wait > 0:
+            await asyncio.sleep(wait)
+
+
+_limiters: Dict[str, TokenBucket] = {}
+_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(provider: str) -> TokenBucket:
+    """Process-wide token bucket for a provider ('claude' or 'gemini')."""
+    with _limiters_lock:
+        if provider not in _limiters:
+            limit = DEFAULT_RATE_LIMITS.get(provider, DEFAULT_RATE_LIMITS['gemini'])
+            _limiters[provider] = TokenBucket(limit.requests_per_minute, limit.burst)
+        return _limiters[provider]
+
+
+def configure_rate_limit(provider: str, requests_per_minute: float, burst: int = 1) -> TokenBucket:
+    """Replace a provider's bucket (e.g. from secrets for a higher API tier)."""
+    bucket = TokenBucket(requests_per_minute, burst)
+    with _limiters_lock:
+        _limiters[provider] = bucket
+    return bucket
+
+
+# =============================================================================
+# RETRIES
+# =============================================================================
+
+def _status_code(exc: BaseException) -> Optional[int]:
+    for attr in ('status_code', 'code', 'status'):
+        value = getattr(exc, attr, None)
+        if isinstance(value, int):
+            return value
+    response = getattr(exc, 'response', None)
+    for attr in ('status_code', 'status'):
+        value = getattr(response, attr, None)
+        if isinstance(value, int):
+            return value
+    return None
+
+
+def is_retryable(exc: BaseException) -> bool:
+    """Rate limits, overload, timeouts, connection problems and 5xx."""
+    if isinstance(exc, (TimeoutError, ConnectionError, asyncio.TimeoutError)):
+        return True
+    code = _status_code(exc)
+    if code is not None:
+        return code in _RETRYABLE_STATUS
+    name = type(exc).__name__
+    return any(part in name for part in _RETRYABLE_NAMES)
+
+
+def _retry_after(exc: BaseException) -> Optional[float]:
+    value = getattr(exc, 'retry_after', None)
+    if value is None:
+        headers = getattr(getattr(exc, 'response', None), 'headers', None) or {}
+        try:
+            value = headers.get('retry-after')
+        except AttributeError:
+            value = None
+    try:
+        return float(value) if value is not None else None
+    except (TypeError, ValueError):
+        return None
+
+
+def backoff_delay(attempt: int, exc: Optional[BaseException] = None,
+                  base: float = RETRY_BASE_DELAY, cap: float = RETRY_MAX_DELAY) -> float:
+    """Full-jitter exponential backoff, never shorter than a Retry-After hint."""
+    delay = random.uniform(0, min(cap, base * (2 ** attempt)))
+    hint = _retry_after(exc) if exc is not None else None
+    return max(delay, hint) if hint is not None else delay
+
+
+# =============================================================================
+# SCHEDULER
+# =============================================================================
+
+@dataclass
+class InferenceJob:
+    """One document to run status inference on."""
+    doc: ProcessedDocument
+    site_data: Dict
+
+
+def _error_result(exc: BaseException) -> Dict:
+    return {"summary": f"Error: {str(exc)}", "proposed_changes": [], "error": str(exc)}
+
+
+class InferenceScheduler:
+    """Runs status inference for many documents concurrently within a rate limit."""
+
+    def __init__(
+        self,
+        llm_client: Any,
+        use_claude: bool = True,
+        max_concurrency: int = DEFAULT_MAX_CONCURRENCY,
+        rate_limiter: Optional[TokenBucket] = None,
+        max_retries: int = DEFAULT_MAX_RETRIES,
+        retry_base_delay: float = RETRY_BASE_DELAY,
+        batch_small_docs: bool = False,
+        batch_char_limit: int = BATCH_CHAR_LIMIT,
+        batch_max_documents: int = BATCH_MAX_DOCUMENTS,
+        batch_max_chars: int = BATCH_MAX_CHARS,
+    ):
+        self.llm_client = llm_client
+        self.use_claude = use_claude
+        self.provider = 'claude' if use_claude else 'gemini'
+        self.max_concurrency = max(1, int(max_concurrency))
+        self.rate_limiter = rate_limiter or get_rate_limiter(self.provider)
+        self.max_retries = max_retries
+        self.retry_base_delay = retry_base_delay
+        self.batch_small_docs = batch_small_docs
+        self.batch_char_limit = batch_char_limit
+        self.batch_max_documents = batch_max_documents
+        self.batch_max_chars = batch_max_chars
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._in_flight = 0
+        self.stats = {
+            'documents': 0,
+            'requests': 0,
+            'retries': 0,
+            'failures': 0,
+            'batches': 0,
+            'batched_documents': 0,
+            'batch_fallbacks': 0,
+            'max_in_flight': 0,
+            'elapsed_seconds': 0.0,
+        }
+
+    # -- planning ------------------------------------------------------------
+
+    def plan(self, jobs: List[InferenceJob]) -> List[List[int]]:
+        """Job indices per request: singles, or per-site batches of small documents."""
+        if not self.batch_small_docs:
+            return [[i] for i in range(len(jobs))]
+
+        groups: List[List[int]] = []
+        open_batch: Dict[str, List[int]] = {}
+        open_chars: Dict[str, int] = {}
+        for i, job in enumerate(jobs):
+            size = len(job.doc.content_text)
+            if size > self.batch_char_limit:
+                groups.append([i])
+                continue
+            site_id = job.doc.site_id
+            batch = open_batch.get(site_id)
+            if (batch is None or len(batch) >= self.batch_max_documents
+                    or open_chars[site_id] + size > self.batch_max_chars):
+                batch = open_batch[site_id] = []
+                open_chars[site_id] = 0
+                groups.append(batch)
+            batch.append(i)
+            open_chars[site_id] += size
+        return groups
+
+    # -- requests ------------------------------------------------------------
+
+    async def _call(self, prompt: str, max_tokens: int) -> str:
+        client = self.llm_client
+        if self.use_claude and inspect.iscoroutinefunction(getattr(client.messages, 'create', None)):
+            response = await client.messages.create(
+                model=CLAUDE_MODEL,
+                max_tokens=max_tokens,
+                messages=[{"role": "user", "content": prompt}],
+            )
+            return response.content[0].text
+        if not self.use_claude and hasattr(client, 'generate_content_async'):
+            response = await client.generate_content_async(prompt)
+            return response.text
+        # Blocking SDK clients run on the scheduler's own threads
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(
+            self._executor, call_llm, client, prompt, self.use_claude, max_tokens
+        )
+
+    async def _request(self, prompt: str, max_tokens: int = SINGLE_MAX_TOKENS) -> str:
+        attempt = 0
+        while True:
+            await self.rate_limiter.acquire()
+            self.stats['requests'] += 1
+            self._in_flight += 1
+            self.stats['max_in_flight'] = max(self.stats['max_in_flight'], self._in_flight)
+            try:
+                return await self._call(prompt, max_tokens)
+            except Exception as e:
+                if attempt >= self.max_retries or not is_retryable(e):
+                    raise
+                self.stats['retries'] += 1
+                delay = backoff_delay(attempt, e, base=self.retry_base_delay)
+                attempt += 1
+            finally:
+                self._in_flight -= 1
+            await asyncio.sleep(delay)
+
+    async def _infer_one(self, job: InferenceJob) -> Dict:
+        try:
+            return parse_inference_response(
+                await self._request(build_status_inference_prompt(job.doc, job.site_data))
+            )
+        except Exception as e:
+            self.stats['failures'] += 1
+            return _error_result(e)
+
+    async def _infer_batch(self, jobs: List[InferenceJob]) -> List[Optional[Dict]]:
+        docs = [job.doc for job in jobs]
+        self.stats['batches'] += 1
+        self.stats['batched_documents'] += len(docs)
+        try:
+            text = await self._request(
+                build_batch_inference_prompt(docs, jobs[0].site_data),
+                max_tokens=min(BATCH_MAX_TOKENS, SINGLE_MAX_TOKENS * len(docs)),
+            )
+            return parse_batch_inference_response(text, len(docs))
+        except Exception as e:
+            print(f"[inference_scheduler] Batch of {len(docs)} failed, retrying singly: {e}")
+            return [None] * len(docs)
+
+    async def _run_group(self, jobs: List[InferenceJob], indices: List[int],
+                         results: List[Optional[Dict]], semaphore: asyncio.Semaphore):
+        async with semaphore:
+            if len(indices) == 1:
+                results[indices[0]] = await self._infer_one(jobs[indices[0]])
+                return
+            batch_results = await self._infer_batch([jobs[i] for i in indices])
+
+        missing = [i for i, result in zip(indices, batch_results) if result is None]
+        for i, result in zip(indices, batch_results):
+            if result is not None:
+                results[i] = result
+        if missing:
+            self.stats['batch_fallbacks'] += len(missing)
+            await asyncio.gather(*(self._run_group(jobs, [i], results, semaphore) for i in missing))
+
+    async def run(self, jobs: List[InferenceJob]) -> List[Dict]:
+        """Inference results for every job, in job order."""
+        started = time.perf_counter()
+        results: List[Optional[Dict]] = [None] * len(jobs)
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+        self._executor = ThreadPoolExecutor(max_workers=self.max_concurrency, thread_name_prefix="llm")
+        try:
+            await asyncio.gather(*(
+                self._run_group(jobs, indices, results, semaphore) for indices in self.plan(jobs)
+            ))
+        finally:
+            self._executor.shutdown(wait=False)
+            self._executor = None
+        self.stats['documents'] += len(jobs)
+        self.stats['elapsed_seconds'] += time.perf_counter() - started
+        return results
+
+    def run_sync(self, jobs: List[InferenceJob]) -> List[Dict]:
+        """run() from synchronous code (Streamlit callbacks, scan_and_process)."""
+        if not jobs:
+            return []
+        try:
+            asyncio.get_running_loop()
+        except RuntimeError:
+            return asyncio.run(self.run(jobs))
+        # Already inside an event loop (e.g. a notebook): use a helper thread
+        with ThreadPoolExecutor(max_workers=1) as helper:
+            return helper.submit(asyncio.run, self.run(jobs)).result()
+
+
+# =============================================================================
+# FAKE LLM SERVER (tests / benchmark)
+# =============================================================================
+
+_FILE_LINE_RE = re.compile(r"^- File: (.*)$", re.MULTILINE)
+
+
+def fake_inference_response(prompt: str) -> str:
+    """Canned JSON answer for a single-document or batch inference prompt."""
+    files = _FILE_LINE_RE.findall(prompt)
+
+    def result(file_name: str) -> Dict:
+        return {
+            "summary": f"Fake summary of {file_name}",
+            "key_dates": [],
+            "key_entities": [],
+            "proposed_changes": [],
+            "action_items": [f"Review {file_name}"],
+            "risks_mentioned": [],
+            "next_steps": [],
+        }
+
+    if "DOCUMENTS:\n[Document 1]" in prompt:
+        payload = {"documents": [{"document": i, **result(name)} for i, name in enumerate(files, start=1)]}
+    else:
+        payload = result(files[0] if files else "document")
+    return "```json\n" + json.dumps(payload) + "\n```"
+
+
+class FakeLLMServer:
+    """
+    Local HTTP server answering POST /v1/messages in the Anthropic response
+    shape after ``latency`` seconds.
+
+    failure_rate returns random 429s; server_rpm rejects requests beyond a
+    sliding one-minute window (with Retry-After). ``stats`` records request
+    times and peak concurrency so tests can check the client's behaviour.
+    """
+
+    def __init__(self, latency: float = 0.2, failure_rate: float = 0.0,
+                 server_rpm: Optional[float] = None, seed: int = 0, port: int = 0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.server_rpm = server_rpm
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self._active = 0
+        self.request_times: List[float] = []
+        self.stats = {'requests': 0, 'rejected': 0, 'max_concurrent': 0}
+        self._server = ThreadingHTTPServer(('127.0.0.1', port), self._handler_class())
+        self._server.daemon_threads = True
+        self._thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def start(self) -> 'FakeLLMServer':
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
+
+    def __enter__(self) -> 'FakeLLMServer':
+        return self.start()
+
+    def __exit__(self, *exc):
+        self.stop()
+
+    def peak_rate(self, window: float = 60.0) -> int:
+        """Most requests seen in any window of the given length (seconds)."""
+        times = sorted(self.request_times)
+        peak, start = 0, 0
+        for end in range(len(times)):
+            while times[end] - times[start] >= window:
+                start += 1
+            peak = max(peak, end - start + 1)
+        return peak
+
+    def _admit(self) -> Optional[float]:
+        """None to serve the request, else seconds the client should wait."""
+        with self._lock:
+            now = time.monotonic()
+            self.stats['requests'] += 1
+            if self.server_rpm:
+                recent = [t for t in self.request_times if now - t < 60]
+                if len(recent) >= self.server_rpm:
+                    self.stats['rejected'] += 1
+                    return max(0.0, 60 - (now - recent[0]))
+            if self.failure_rate and self._random.random() < self.failure_rate:
+                self.stats['rejected'] += 1
+                return 0.0
+            self.request_times.append(now)
+            self._active += 1
+            self.stats['max_concurrent'] = max(self.stats['max_concurrent'], self._active)
+            return None
+
+    def _handler_class(self):
+        server = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def log_message(self, *args):
+                pass
+
+            def _reply(self, status: int, payload: Dict, headers: Optional[Dict] = None):
+                body = json.dumps(payload).encode('utf-8')
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(body)))
+                for name, value in (headers or {}).items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+            def do_POST(self):
+                length = int(self.headers.get('Content-Length', 0))
+                request = json.loads(self.rfile.read(length) or b"{}")
+                if not self.path.rstrip('/').endswith('/v1/messages'):
+                    self._reply(404, {"type": "error", "error": {"type": "not_found_error"}})
+                    return
+
+                wait = server._admit()
+                if wait is not None:
+                    self._reply(429, {"type": "error", "error": {"type": "rate_limit_error"}},
+                                {'retry-after': f"{wait:.2f}"})
+                    return
+                try:
+                    time.sleep(server.latency)
+                    content = request.get('messages', [{}])[0].get('content', '')
+                    if isinstance(content, list):
+                        content = "".join(block.get('text', '') for block in content)
+                    self._reply(200, {
+                        "id": f"msg_fake_{server.stats['requests']}",
+                        "type": "message",
+                        "role": "assistant",
+                        "model": request.get('model', 'fake'),
+                        "content": [{"type": "text", "text": fake_inference_response(content)}],
+                        "stop_reason": "end_turn",
+                        "usage": {"input_tokens": len(content) // 4, "output_tokens": 200},
+                    })
+                finally:
+                    with server._lock:
+                        server._active -= 1
+
+        return Handler
+
+
+class FakeLLMError(Exception):
+    """HTTP error from the fake server (status_code / retry_after like the SDKs)."""
+
+    def __init__(self, status_code: int, retry_after: Optional[float] = None):
+        super().__init__(f"HTTP {status_code}")
+        self.status_code = status_code
+        self.retry_after = retry_after
+
+
+class _Text:
+    def __init__(self, text: str):
+        self.text = text
+
+
+class _Message:
+    def __init__(self, text: str):
+        self.content = [_Text(text)]
+
+
+class FakeLLMClient:
+    """
+    Blocking client for FakeLLMServer with both call styles used by
+    call_llm: ``client.messages.create(...)`` (Claude) and
+    ``client.generate_content(prompt)`` (Gemini).
+    """
+
+    def __init__(self, base_url: str, timeout: float = 30.0):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        self.messages = self
+
+    def _post(self, prompt: str, model: str, max_tokens: int) -> str:
+        body = json.dumps({
+            "model": model,
+            "max_tokens": max_tokens,
+            "messages": [{"role": "user", "content": prompt}],
+        }).encode('utf-8')
+        request = urllib.request.Request(
+            f"{self.base_url}/v1/messages", data=body,
+            headers={'Content-Type': 'application/json'}, method='POST',
+        )
+        try:
+            with urllib.request.urlopen(request, timeout=self.timeout) as response:
+                payload = json.loads(response.read())
+        except urllib.error.HTTPError as e:
+            retry_after = e.headers.get('retry-after') if e.headers else None
+            raise FakeLLMError(e.code, float(retry_after) if retry_after else None) from None
+        return payload['content'][0]['text']
+
+    def create(self, model: str, max_tokens: int, messages: List[Dict], **_) -> _Message:
+        return _Message(self._post(messages[0]['content'], model, max_tokens))
+
+    def generate_content(self, prompt: str) -> _Text:
+        return _Text(self._post(prompt, 'fake-gemini', SINGLE_MAX_TOKENS))
+
+
+# =============================================================================
+# BENCHMARK
+# =============================================================================
+
+def benchmark(num_documents: int = 40, latency: float = 0.25, max_concurrency: int = 8, burst: int = 8):
+    """Serial infer_status_with_llm_sync vs the scheduler against a FakeLLMServer."""
+    from document_context import infer_status_with_llm_sync
+
+    docs = [
+        ProcessedDocument(
+            file_id=f"doc{i}", file_name=f"notes_{i}.txt", site_id=f"site{i % 8}",
+            doc_type="meeting_notes", file_path="", modified_time="2025-01-01T00:00:00Z",
+            processed_time="", content_text=f"Meeting notes {i}: SIS results received. " * (5 if i % 3 else 200),
+        )
+        for i in range(num_documents)
+    ]
+    jobs = [InferenceJob(doc, {'name': doc.site_id}) for doc in docs]
+
+    def report(label: str, server: FakeLLMServer, elapsed: float, results: List[Dict],
+               rpm: Optional[float] = None, retries: int = 0):
+        errors = sum(1 for r in results if r.get('error'))
+        allowed = f"(allowed {rpm / 60 + burst:.0f})" if rpm else ""
+        print(f"{label:<34} {elapsed:6.2f}s  {server.stats['requests']:3d} requests  "
+              f"{retries:2d} retries  peak {server.stats['max_concurrent']:2d} concurrent  "
+              f"busiest second {server.peak_rate(1.0):3d} {allowed:<12} {errors} errors")
+
+    with FakeLLMServer(latency=latency) as server:
+        client = FakeLLMClient(server.url)
+        started = time.perf_counter()
+        results = [infer_status_with_llm_sync(job.doc, job.site_data, client) for job in jobs]
+        report("serial", server, time.perf_counter() - started, results)
+
+    cases = (
+        (f"scheduler x{max_concurrency}", 1200, {}, {}),
+        (f"scheduler x{max_concurrency}, 300 rpm", 300, {}, {}),
+        (f"scheduler x{max_concurrency} + batching", 1200, {}, {'batch_small_docs': True}),
+        (f"scheduler x{max_concurrency}, 20% 429s", 1200, {'failure_rate': 0.2, 'seed': 3},
+         {'retry_base_delay': 0.1}),
+    )
+    for label, rpm, server_kwargs, scheduler_kwargs in cases:
+        with FakeLLMServer(latency=latency, **server_kwargs) as server:
+            scheduler = InferenceScheduler(
+                FakeLLMClient(server.url), max_concurrency=max_concurrency,
+                rate_limiter=TokenBucket(rpm, burst), **scheduler_kwargs,
+            )
+            started = time.perf_counter()
+            results = scheduler.run_sync(jobs)
+            report(label, server, time.perf_counter() - started, results, rpm, scheduler.stats['retries'])
+
+
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,427 @@
+"""
+LLM Gateway
+===========
+Shared entry point for one-shot LLM calls (triage, utility research,
+PACES image analysis).
+
+Streamlit reruns, retries and re-opened pages used to resend the exact same
+prompt and pay for it again, and ``get_gemini_model`` re-ran
+``genai.configure`` on every call. The gateway adds:
+
+- a persistent response cache (SQLite, next to the portfolio snapshot)
+  keyed by model + hash of the whitespace-normalized prompt + a digest of
+  any attachments (image bytes, files)
+- TTL expiry and size-based eviction (least recently used first)
+- a pool of configured client objects, one per (provider, key, model)
+- hit/miss counters for the Settings page
+
+Only successful responses are stored; errors and responses rejected by the
+caller's ``accept`` check are never cached.
+
+Configuration (environment):
+    PORTFOLIO_LLM_CACHE=0           disable the response cache
+    PORTFOLIO_LLM_CACHE_TTL=604800  seconds a response stays valid
+    PORTFOLIO_LLM_CACHE_MB=64       cache size cap
+
+Run ``python llm_gateway.py`` for a self-check against a fake client.
+"""
+
+import hashlib
+import os
+import re
+import sqlite3
+import threading
+import time
+from typing import Any, Callable, Dict, Iterable, Optional, Tuple, Union
+
+
+DEFAULT_CACHE_DIR = os.path.join(os.path.expanduser("~"), ".cache", "power_tracker")
+DEFAULT_TTL_SECONDS = 7 * 24 * 3600
+DEFAULT_MAX_MB = 64
+
+Attachment = Union[bytes, str]
+
+
+def _env_float(name: str, default: float) -> float:
+    try:
+        return float(os.environ.get(name, default))
+    except ValueError:
+        return default
+
+
+CACHE_ENABLED = os.environ.get("PORTFOLIO_LLM_CACHE", "1").strip().lower() not in ("0", "false", "no")
+CACHE_TTL_SECONDS = _env_float("PORTFOLIO_LLM_CACHE_TTL", DEFAULT_TTL_SECONDS)
+CACHE_MAX_BYTES = int(_env_float("PORTFOLIO_LLM_CACHE_MB", DEFAULT_MAX_MB) * 1024 * 1024)
+
+
+# =============================================================================
+# CACHE KEYS
+# =============================================================================
+
+_WHITESPACE = re.compile(r'\s+')
+
+
+def normalize_prompt(prompt: str) -> str:
+    """Collapse whitespace runs so indentation/trailing-space edits don't miss the cache."""
+    return _WHITESPACE.sub(' ', prompt or '').strip()
+
+
+def attachments_digest(attachments: Optional[Iterable[Attachment]]) -> str:
+    """sha256 over the attachments in order ('' when there are none)."""
+    if not attachments:
+        return ''
+    digest = hashlib.sha256()
+    for item in attachments:
+        data = item.encode('utf-8') if isinstance(item, str) else bytes(item)
+        digest.update(len(data).to_bytes(8, 'big'))
+        digest.update(data)
+    return digest.hexdigest()
+
+
+def cache_key(
+    model: str,
+    prompt: str,
+    attachments: Optional[Iterable[Attachment]] = None,
+    system: str = '',
+) -> str:
+    """Cache key for one call: model + normalized (system, prompt) + attachments."""
+    prompt_hash = hashlib.sha256(
+        (normalize_prompt(system) + '\x00' + normalize_prompt(prompt)).encode('utf-8')
+    ).hexdigest()
+    return hashlib.sha256(
+        '\x00'.join((model, prompt_hash, attachments_digest(attachments))).encode('utf-8')
+    ).hexdigest()
+
+
+# =============================================================================
+# RESPONSE CACHE
+# =============================================================================
+
+class ResponseCache:
+    """
+    SQLite-backed response store with TTL and LRU size eviction.
+
+    Counters are per-process; stored responses survive restarts.
+    """
+
+    def __init__(
+        self,
+        path: Optional[str] = None,
+        ttl_seconds: float = CACHE_TTL_SECONDS,
+        max_bytes: int = CACHE_MAX_BYTES,
+    ):
+        if path is None:
+            cache_dir = os.environ.get("PORTFOLIO_CACHE_DIR", DEFAULT_CACHE_DIR)
+            path = os.path.join(cache_dir, "llm_responses.sqlite")
+        self.path = path
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self.stats = {
+            'hits': 0,
+            'misses': 0,
+            'expired': 0,    # found but older than the TTL
+            'writes': 0,
+            'evicted': 0,
+            'errors': 0,
+        }
+        self._init_db()
+
+    def _connect(self) -> sqlite3.Connection:
+        return sqlite3.connect(self.path, timeout=5)
+
+    def _init_db(self):
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock, self._connect() as conn:
+            conn.execute("""
+                CREATE TABLE IF NOT EXISTS responses (
+                    key TEXT PRIMARY KEY,
+                    model TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_used REAL NOT NULL,
+                    size INTEGER NOT NULL,
+                    response TEXT NOT NULL
+                )
+            """)
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_responses_last_used ON responses(last_used)")
+
+    def get(self, key: str) -> Optional[str]:
+        """Cached response for key, or None if missing/expired."""
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute(
+                    "SELECT created_at, response FROM responses WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - row[0] >= self.ttl_seconds:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+                    self.stats['expired'] += 1
+                    row = None
+                if row:
+                    conn.execute("UPDATE responses SET last_used = ? WHERE key = ?", (now, key))
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[llm_gateway] Could not read response cache: {e}")
+            return None
+        if row is None:
+            self.stats['misses'] += 1
+            return None
+        self.stats['hits'] += 1
+        return row[1]
+
+    def put(self, key: str, model: str, response: str):
+        """Store a response, then evict least recently used entries above max_bytes."""
+        size = len(response.encode('utf-8'))
+        now = time.time()
+        try:
+            with self._lock, self._connect() as conn:
+                conn.execute(
+                    "INSERT OR REPLACE INTO responses (key, model, created_at, last_used, size, response) "
+                    "VALUES (?, ?, ?, ?, ?, ?)",
+                    (key, model, now, now, size, response)
+                )
+                self.stats['writes'] += 1
+                self._evict(conn)
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[llm_gateway] Could not write response cache: {e}")
+
+    def _evict(self, conn: sqlite3.Connection):
+        conn.execute("DELETE FROM responses WHERE created_at < ?", (time.time() - self.ttl_seconds,))
+        total = conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = conn.execute("SELECT key, size FROM responses ORDER BY last_used").fetchall()
+        stale = []
+        for key, size in rows:
+            if total <= self.max_bytes:
+                break
+            stale.append((key,))
+            total -= size
+        conn.executemany("DELETE FROM responses WHERE key = ?", stale)
+        self.stats['evicted'] += len(stale)
+
+    def invalidate(self, key: Optional[str] = None):
+        """Drop one response (or all of them)."""
+        try:
+            with self._lock, self._connect() as conn:
+                if key is None:
+                    conn.execute("DELETE FROM responses")
+                else:
+                    conn.execute("DELETE FROM responses WHERE key = ?", (key,))
+        except sqlite3.Error as e:
+            self.stats['errors'] += 1
+            print(f"[llm_gateway] Could not invalidate response cache: {e}")
+
+    def usage(self) -> Tuple[int, int]:
+        """(entries, bytes) currently stored."""
+        try:
+            with self._lock, self._connect() as conn:
+                row = conn.execute("SELECT COUNT(*), COALESCE(SUM(size), 0) FROM responses").fetchone()
+            return int(row[0]), int(row[1])
+        except sqlite3.Error:
+            return 0, 0
+
+    def hit_rate(self) -> float:
+        """Share of lookups served from the cache (0-1)."""
+        total = self.stats['hits'] + self.stats['misses']
+        return self.stats['hits'] / total if total else 0.0
+
+
+# =============================================================================
+# GATEWAY
+# =============================================================================
+
+class LLMGateway:
+    """
+    Pooled clients plus the response cache.
+
+    ``complete`` is the generic path: it takes the cache identity of a call
+    (model, prompt, attachments) and a zero-argument ``call`` that performs
+    the request and returns the response text.
+    """
+
+    def __init__(self, cache: Optional[ResponseCache] = None, enabled: bool = CACHE_ENABLED):
+        self.cache = cache
+        self.enabled = enabled and cache is not None
+        self._clients: Dict[Tuple[str, ...], Any] = {}
+        self._clients_lock = threading.Lock()
+        self._gemini_key: Optional[str] = None
+        self.stats = {'calls': 0, 'clients_created': 0, 'clients_reused': 0}
+
+    # -------------------------------------------------------------------------
+    # Client pool
+    # -------------------------------------------------------------------------
+
+    def _pooled(self, pool_key: Tuple[str, ...], factory: Callable[[], Any]) -> Any:
+        with self._clients_lock:
+            client = self._clients.get(pool_key)
+            if client is None:
+                client = self._clients[pool_key] = factory()
+                self.stats['clients_created'] += 1
+            else:
+                self.stats['clients_reused'] += 1
+            return client
+
+    def gemini_model(self, api_key: str, model_name: str):
+        """Configured ``genai.GenerativeModel``; genai.configure runs only when the key changes."""
+        import google.generativeai as genai
+
+        def create():
+            if self._gemini_key != api_key:
+                genai.configure(api_key=api_key)
+                self._gemini_key = api_key
+            return genai.GenerativeModel(model_name)
+
+        return self._pooled(('gemini', api_key, model_name), create)
+
+    def anthropic_client(self, api_key: str):
+        """Shared ``anthropic.Anthropic`` client (keeps its HTTP connection pool)."""
+        import anthropic
+        return self._pooled(('claude', api_key), lambda: anthropic.Anthropic(api_key=api_key))
+
+    def clear_clients(self):
+        with self._clients_lock:
+            self._clients.clear()
+            self._gemini_key = None
+
+    # -------------------------------------------------------------------------
+    # Cached calls
+    # -------------------------------------------------------------------------
+
+    def complete(
+        self,
+        model: str,
+        prompt: str,
+        call: Callable[[], str],
+        attachments: Optional[Iterable[Attachment]] = None,
+        system: str = '',
+        accept: Optional[Callable[[str], bool]] = None,
+        use_cache: bool = True,
+    ) -> str:
+        """
+        Response text for (model, prompt, attachments), from the cache or ``call()``.
+
+        Args:
+            model: Provider-qualified model name, e.g. "gemini:models/gemini-2.0-flash-exp"
+            prompt: Prompt text (whitespace is normalized for the key only)
+            call: Performs the request and returns the response text
+            attachments: Bytes/str payloads sent along with the prompt
+            system: System prompt, part of the key
+            accept: Only responses for which this returns True are stored
+            use_cache: False forces a fresh call (the result is still stored)
+
+        Exceptions from ``call`` propagate and nothing is stored.
+        """
+        attachments = list(attachments) if attachments else None
+        key = cache_key(model, prompt, attachments, system) if self.enabled else None
+        if key and use_cache:
+            cached = self.cache.get(key)
+            if cached is not None:
+                return cached
+        self.stats['calls'] += 1
+        text = call()
+        if key and isinstance(text, str) and text.strip() and (accept is None or accept(text)):
+            self.cache.put(key, model, text)
+        return text
+
+    def forget(self, model: str, prompt: str, attachments: Optional[Iterable[Attachment]] = None,
+               system: str = ''):
+        """Drop a stored response (e.g. one that later turned out to be unusable)."""
+        if self.enabled:
+            self.cache.invalidate(cache_key(model, prompt, list(attachments or []), system))
+
+    def generate_gemini(
+        self,
+        api_key: str,
+        model_name: str,
+        prompt: str,
+        attachments: Optional[Iterable[Dict[str, Any]]] = None,
+        **kwargs,
+    ) -> str:
+        """``generate_content`` on a pooled model; attachments are Gemini parts ({mime_type, data})."""
+        parts = list(attachments or [])
+
+        def call():
+            model = self.gemini_model(api_key, model_name)
+            response = model.generate_content([prompt, *parts] if parts else prompt)
+            return response.text
+
+        return self.complete(
+            f"gemini:{model_name}", prompt, call,
+            attachments=[part.get('data', b'') for part in parts], **kwargs
+        )
+
+    def hit_rate(self) -> float:
+        return self.cache.hit_rate() if self.cache else 0.0
+
+    def metrics(self) -> Dict[str, Any]:
+        """Cache and pool counters in one dict."""
+        metrics = dict(self.stats)
+        metrics['enabled'] = self.enabled
+        metrics['pooled_clients'] = len(self._clients)
+        if self.cache:
+            entries, size = self.cache.usage()
+            metrics.update(self.cache.stats)
+            metrics.update({
+                'hit_rate': self.cache.hit_rate(),
+                'entries': entries,
+                'bytes': size,
+                'path': self.cache.path,
+            })
+        return metrics
+
+
+_gateway: Optional[LLMGateway] = None
+_gateway_lock = threading.Lock()
+
+
+def get_llm_gateway() -> LLMGateway:
+    """Process-wide gateway (created on first use)."""
+    global _gateway
+    with _gateway_lock:
+        if _gateway is None:
+            cache = None
+            if CACHE_ENABLED:
+                try:
+                    cache = ResponseCache()
+                except (sqlite3.Error, OSError) as e:
+                    print(f"[llm_gateway] Response cache unavailable: {e}")
+            _gateway = LLMGateway(cache)
+        return _gateway
+
+
+# =============================================================================
+# SELF-CHECK
+# =============================================================================
+
+if __name__ == "__main__":
+    import tempfile
+
+    with tempfile.TemporaryDirectory() as tmp:
+        gateway = LLMGateway(ResponseCache(os.path.join(tmp, "llm.sqlite"), max_bytes=4096))
+        billed = []
+
+        def fake_call(text):
+            def call():
+                billed.append(text)
+                time.sleep(0.05)
+                return f"response to {text[:20]}"
+            return call
+
+        prompt = "Analyze the site.\n    Focus on power."
+        for _ in range(3):  # three reruns of the same page
+            gateway.complete("gemini:flash", prompt, fake_call(prompt))
+        gateway.complete("gemini:flash", "Analyze the site. Focus on power.  ", fake_call(prompt))
+        gateway.complete("gemini:flash", prompt, fake_call(prompt), attachments=[b"image-1"])
+        gateway.complete("gemini:flash", prompt, fake_call(prompt), attachments=[b"image-2"])
+        gateway.complete("claude:sonnet", prompt, fake_call(prompt))
+        print(f"7 requests -> {len(billed)} billed calls (hit rate {gateway.hit_rate():.0%})")
+
+        for i in range(200):  # overflow the 4 KB cap
+            gateway.complete("gemini:flash", f"prompt {i}", lambda: "x" * 100)
+        metrics = gateway.metrics()
+        print(f"after 200 distinct prompts: entries {metrics['entries']} · "
+              f"{metrics['bytes']} bytes · evicted {metrics['evicted']}")
@@ -37,6 +37,8 @@ try:
 except ImportError:
     HAS_STREAMLIT = False
 
+from llm_gateway import get_llm_gateway
+
 
 # =============================================================================
 # DATA STRUCTURES
@@ -343,9 +345,6 @@ def analyze_paces_image_gemini(
     if not GEMINI_AVAILABLE:
         raise ImportError("google-generativeai not installed")
     
-    genai.configure(api_key=api_key)
-    model_client = genai.GenerativeModel(model)
-    
     # Prepare image
     mime_type = get_image_mime_type(filename)
     image_part = {
@@ -353,9 +352,11 @@ def analyze_paces_image_gemini(
         "data": image_data
     }
     
-    # Send to Gemini
-    response = model_client.generate_content([PACES_ANALYSIS_PROMPT, image_part])
-    response_text = response.text
+    # Send to Gemini (pooled model; re-analyzing the same image hits the cache)
+    response_text = get_llm_gateway().generate_gemini(
+        api_key, model, PACES_ANALYSIS_PROMPT, attachments=[image_part],
+        accept=_is_parseable_response
+    )
     
     return parse_analysis_response(response_text)
 
@@ -381,41 +382,52 @@ def analyze_paces_image_claude(
     if not ANTHROPIC_AVAILABLE:
         raise ImportError("anthropic not installed")
     
-    client = anthropic.Anthropic(api_key=api_key)
+    gateway = get_llm_gateway()
+    client = gateway.anthropic_client(api_key)
     
     # Prepare image
     mime_type = get_image_mime_type(filename)
     base64_image = encode_image_bytes_to_base64(image_data)
     
-    # Send to Claude
-    response = client.messages.create(
-        model=model,
-        max_tokens=4096,
-        messages=[
-            {
-                "role": "user",
-                "content": [
-                    {
-                        "type": "image",
-                        "source": {
-                            "type": "base64",
-                            "media_type": mime_type,
-                            "data": base64_image,
+    # Send to Claude (re-analyzing the same image hits the cache)
+    def call():
+        response = client.messages.create(
+            model=model,
+            max_tokens=4096,
+            messages=[
+                {
+                    "role": "user",
+                    "content": [
+                        {
+                            "type": "image",
+                            "source": {
+                                "type": "base64",
+                                "media_type": mime_type,
+                                "data": base64_image,
+                            }
+                        },
+                        {
+                            "type": "text",
+                            "text": PACES_ANALYSIS_PROMPT
                         }
-                    },
-                    {
-                        "type": "text",
-                        "text": PACES_ANALYSIS_PROMPT
-                    }
-                ]
-            }
-        ]
-    )
+                    ]
+                }
+            ]
+        )
+        return response.content[0].text
     
-    response_text = response.content[0].text
+    response_text = gateway.complete(
+        f"claude:{model}", PACES_ANALYSIS_PROMPT, call,
+        attachments=[image_data], accept=_is_parseable_response
+    )
     return parse_analysis_response(response_text)
 
 
+def _is_parseable_response(response_text: str) -> bool:
+    """Only responses with a JSON object are worth caching."""
+    return "{" in response_text and "}" in response_text
+
+
 def parse_analysis_response(response_text: str) -> PACESAnalysisResult:
     """Parse the AI response into structured PACESAnalysisResult."""
     import re
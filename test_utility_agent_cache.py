@@ -0,0 +1,52 @@
+"""
+Quick Test: Utility research analysis through the LLM cache
+===========================================================
+Runs UtilityResearchAgent.analyze_content on the Gemini path (the default
+provider) with the Gemini chat call stubbed out, and checks that the answer
+is stored by the LLM gateway: a rerun of the same page + topic must not call
+Gemini again.
+
+Run with pytest or directly: python test_utility_agent_cache.py
+"""
+
+import os
+import sys
+import tempfile
+from unittest import mock
+
+sys.path.append(os.path.dirname(__file__))
+
+import google.generativeai as genai
+
+from portfolio_manager import llm_gateway
+from portfolio_manager.llm_gateway import LLMGateway, ResponseCache
+from portfolio_manager.utility_agent import UtilityResearchAgent
+
+
+class FakeGeminiResponse:
+    """Stands in for GenerateContentResponse (text is a property there too)."""
+
+    def __init__(self, text):
+        self.text = text
+
+
+def test_gemini_analysis_is_cached():
+    with tempfile.TemporaryDirectory() as tmp:
+        gateway = LLMGateway(ResponseCache(os.path.join(tmp, "llm.sqlite")))
+        answer = FakeGeminiResponse("Queue: 1.2 GW pending (Source: OG&E IRP)")
+
+        with mock.patch.object(llm_gateway, "_gateway", gateway), \
+                mock.patch.object(genai.ChatSession, "send_message", return_value=answer) as send:
+            agent = UtilityResearchAgent("gemini", api_key="test-key")
+            first = agent.analyze_content("Queue Status", "OG&E queue text", "OG&E", "OK")
+            second = agent.analyze_content("Queue Status", "OG&E queue text", "OG&E", "OK")
+
+        assert first == answer.text, first
+        assert second == answer.text, second
+        assert send.call_count == 1, f"Gemini called {send.call_count} times"
+        assert gateway.metrics()["entries"] == 1
+
+
+if __name__ == "__main__":
+    test_gemini_analysis_is_cached()
+    print("✅ Gemini analysis is cached by the LLM gateway")